@@ -0,0 +1,392 @@
+"""asyncio runtime: the capture pipeline and background jobs on one event loop."""
+
+import asyncio
+import logging
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+
+from .can_reader import CAN_MAX_DLEN, CANFD_MAX_DLEN, CANFrameBlock, RawSocketCANReader
+from .offline_buffer import is_priority_file
+from .pipeline import CapturePipeline
+from .profiling import timed
+from .realtime import apply_capture_thread_settings
+from .scheduler import PRIORITY_UPLOAD
+
+logger = logging.getLogger(__name__)
+
+# Seconds without a new block before the flush timer closes batches early
+_IDLE_SEC = 1.0
+
+
+class AsyncCapturePipeline(CapturePipeline):
+    """
+    ``CapturePipeline`` driven by an asyncio event loop instead of stage threads.
+
+    A ``RawSocketCANReader`` socket is registered with ``loop.add_reader()``:
+    queued frames are drained into a block whenever the socket is readable,
+    and a ``call_later`` timer hands a partial block on after
+    ``block_latency_ms``.  After a socket error the reader reconnects on a
+    thread and the new socket is registered in place of the old one.  Other
+    readers, including the python-can ``socketcan`` reader (whose bus has a
+    ``fileno()`` but no non-blocking drain), are iterated on one helper
+    thread that passes blocks to the loop.
+
+    Filtering and Parquet writing run on a single-thread executor, so the
+    loop never waits for the disk; uploads run one at a time in the default
+    executor, event captures first.  Closing idle batches is a timer task.
+    Listeners keep their own threads.  Run with ``await pipeline.run(stop)``
+    instead of ``start()``/``stop()``.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Initialize the pipeline (same arguments as ``CapturePipeline``)."""
+        super().__init__(*args, **kwargs)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._frames_ready: Optional[asyncio.Event] = None
+        self._upload_ready: Optional[asyncio.Event] = None
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-writer")
+        self._last_block = 0.0
+
+    # ------------------------------------------------------------------
+    # Hooks called by the shared stage code
+    # ------------------------------------------------------------------
+
+    def _dispatch(self, block: CANFrameBlock) -> None:
+        """Hand a block on (loop thread only) and wake the writer."""
+        super()._dispatch(block)
+        self._last_block = self._loop.time()
+        self._frames_ready.set()
+
+    def _queue_upload(self, path: Path, urgent: bool = False) -> None:
+        """Queue a file from the writer thread and wake the upload task."""
+        super()._queue_upload(path, urgent)
+        self._loop.call_soon_threadsafe(self._upload_ready.set)
+
+    # ------------------------------------------------------------------
+    # Capture
+    # ------------------------------------------------------------------
+
+    async def _capture_socket(self, stop: asyncio.Event) -> None:
+        """Drain the raw socket from the loop whenever it is readable."""
+        reader: RawSocketCANReader = self.reader
+        loop = self._loop
+        await self._run_until_stopped(reader.open, stop)
+        if stop.is_set():
+            return
+        max_dlen = CANFD_MAX_DLEN if reader.fd else CAN_MAX_DLEN
+        latency = self.block_latency_ms / 1000.0
+
+        def new_block() -> CANFrameBlock:
+            return CANFrameBlock(self.block_frames, max_dlen=max_dlen, channel=reader.channel)
+
+        block = new_block()
+        timer: Optional[asyncio.TimerHandle] = None
+        reopening: Optional[asyncio.Task] = None
+        fd = reader.fileno()
+
+        def hand_on() -> None:
+            nonlocal block, timer
+            if timer is not None:
+                timer.cancel()
+                timer = None
+            if block.count:
+                self._dispatch(block)
+                block = new_block()
+
+        async def reopen() -> None:
+            nonlocal fd
+            # The reconnect backoff sleeps, so it runs on a thread, not the loop
+            await self._run_until_stopped(reader.reopen, stop)
+            if not stop.is_set() and reader.fileno() >= 0:
+                fd = reader.fileno()
+                loop.add_reader(fd, on_readable)
+                logger.info("Capture re-registered with the event loop (fd %d)", fd)
+
+        def on_readable() -> None:
+            nonlocal timer, fd, reopening
+            try:
+                while True:
+                    with timed(self.timers, "capture.recv"):
+                        more = reader.drain_into(block)
+                    if not (more and block.is_full):
+                        break
+                    hand_on()
+                if block.count and timer is None:
+                    timer = loop.call_later(latency, hand_on)
+                if reader.fileno() < 0:
+                    # Socket error: stop watching the closed socket until reconnected
+                    loop.remove_reader(fd)
+                    fd = -1
+                    hand_on()
+                    if not stop.is_set():
+                        reopening = loop.create_task(reopen())
+            except Exception as exc:  # noqa: BLE001
+                logger.error("Capture callback failed: %s", exc, exc_info=True)
+                stop.set()
+
+        loop.add_reader(fd, on_readable)
+        logger.info("Capture registered with the event loop (fd %d)", fd)
+        try:
+            await stop.wait()
+        finally:
+            if fd >= 0:
+                loop.remove_reader(fd)
+            reader.stop()
+            if reopening is not None:
+                await reopening
+            hand_on()
+
+    async def _capture_thread(self, stop: asyncio.Event) -> None:
+        """Iterate a reader without a descriptor on a helper thread."""
+        loop = self._loop
+
+        def pump() -> None:
+            apply_capture_thread_settings(self.realtime)
+            for block in self._reader_blocks():
+                loop.call_soon_threadsafe(self._dispatch, block)
+                if self._stopping.is_set():
+                    break
+
+        await self._run_until_stopped(pump, stop)
+
+    async def _run_until_stopped(self, job: Callable[[], None], stop: asyncio.Event) -> None:
+        """Run a blocking reader call on a thread; on ``stop``, stop the reader and wait."""
+        running = asyncio.ensure_future(asyncio.to_thread(job))
+        stopped = asyncio.ensure_future(stop.wait())
+        await asyncio.wait({running, stopped}, return_when=asyncio.FIRST_COMPLETED)
+        stopped.cancel()
+        if not running.done():
+            self._stopping.set()
+            if hasattr(self.reader, "stop"):
+                self.reader.stop()
+        # Blocks the job scheduled on the loop are dispatched before its result arrives
+        await running
+
+    async def _capture(self, stop: asyncio.Event) -> None:
+        """Run the capture stage until ``stop`` is set or the reader ends."""
+        logger.info("Capture stage started")
+        try:
+            if isinstance(self.reader, RawSocketCANReader):
+                await self._capture_socket(stop)
+            else:
+                await self._capture_thread(stop)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Capture stage failed: %s", exc, exc_info=True)
+        finally:
+            self._end_capture()
+            self._frames_ready.set()
+            logger.info("Capture stage stopped")
+
+    # ------------------------------------------------------------------
+    # Writer, flush timer, uploads
+    # ------------------------------------------------------------------
+
+    async def _write(self) -> None:
+        """Feed queued blocks to the writer executor until capture ends."""
+        logger.info("Writer stage started")
+        loop = self._loop
+        try:
+            while True:
+                block = self.frame_queue.get(timeout=0)
+                if block is None:
+                    if self.frame_queue.closed:
+                        break
+                    # Blocks are only queued on the loop thread, so no wakeup is lost
+                    self._frames_ready.clear()
+                    await self._frames_ready.wait()
+                    continue
+                await loop.run_in_executor(self._writer, self._write_block, block)
+            await loop.run_in_executor(self._writer, self._finish_writing)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Writer stage failed: %s", exc, exc_info=True)
+        finally:
+            self.upload_queue.close()
+            self._upload_ready.set()
+            logger.info("Writer stage stopped")
+
+    async def _flush_timer(self) -> None:
+        """Close batch windows and event captures while the bus is idle."""
+        loop = self._loop
+        while not self.frame_queue.closed:
+            await asyncio.sleep(_IDLE_SEC)
+            if loop.time() - self._last_block >= _IDLE_SEC and not len(self.frame_queue):
+                await loop.run_in_executor(self._writer, self._flush_idle)
+
+    async def _upload_files(self) -> None:
+        """Upload queued files one at a time until the writer is done."""
+        logger.info("Upload stage started")
+        while True:
+            path = self.upload_queue.get(timeout=0)
+            if path is None:
+                if self.upload_queue.closed:
+                    break
+                self._upload_ready.clear()
+                if len(self.upload_queue):
+                    continue
+                await self._upload_ready.wait()
+                continue
+            if self.budget is not None and not is_priority_file(path):
+                deadline = self._upload_deadline()
+                reason = self.budget.reason_to_wait(PRIORITY_UPLOAD)
+                # Until the writer is done: then queued files are drained regardless
+                while reason is not None and not self.upload_queue.closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    await asyncio.sleep(min(1.0, remaining))
+                    self.budget.sample()
+                    reason = self.budget.reason_to_wait(PRIORITY_UPLOAD)
+                self._end_upload_wait(None if self.upload_queue.closed else reason)
+            await asyncio.to_thread(self._upload, path)
+        logger.info("Upload stage stopped")
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """
+        Run all stages until ``stop`` is set or the reader ends, then shut down.
+
+        Shutdown writes out the open batch and finishes queued uploads; files
+        still queued after ``shutdown_timeout_sec`` are moved to pending.
+
+        Args:
+            stop: Set to end capture
+        """
+        loop = self._loop = asyncio.get_running_loop()
+        self._frames_ready = asyncio.Event()
+        self._upload_ready = asyncio.Event()
+        self._last_block = loop.time()
+        if self.gc_monitor is not None:
+            self.gc_monitor.install()
+        for name, listener, queue in self._listeners:
+            t = threading.Thread(
+                target=self._listener_worker,
+                args=(name, listener, queue),
+                daemon=True,
+                name=f"pipeline-{name}",
+            )
+            t.start()
+            self._threads.append(t)
+
+        capture = asyncio.create_task(self._capture(stop), name="capture")
+        writer = timer = uploads = None
+        if self.batcher is not None:
+            writer = asyncio.create_task(self._write(), name="writer")
+            timer = asyncio.create_task(self._flush_timer(), name="flush-timer")
+            if self.uploader is not None:
+                uploads = asyncio.create_task(self._upload_files(), name="upload")
+
+        deadline = None
+        try:
+            await capture
+            deadline = loop.time() + self.shutdown_timeout_sec
+            for task in (writer, uploads):
+                if task is None:
+                    continue
+                try:
+                    await asyncio.wait_for(asyncio.shield(task), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    logger.warning("Shutdown timeout, cancelling %s", task.get_name())
+                    task.cancel()
+        finally:
+            for task in (capture, writer, timer, uploads):
+                if task is not None and not task.done():
+                    task.cancel()
+            await asyncio.gather(
+                *(t for t in (capture, writer, timer, uploads) if t is not None),
+                return_exceptions=True,
+            )
+            remaining = max(0.0, deadline - loop.time()) if deadline is not None else 0.0
+            for t in self._threads:
+                await asyncio.to_thread(t.join, remaining)
+            for path in self.upload_queue.drain():
+                self.offline_buffer.add_to_pending(path)
+            self._writer.shutdown(wait=False)
+            if self.gc_monitor is not None:
+                self.gc_monitor.uninstall()
+
+    def start(self) -> None:
+        """Not supported; use ``run()``."""
+        raise RuntimeError("AsyncCapturePipeline runs with 'await pipeline.run(stop)'")
+
+
+async def run_periodic(
+    name: str,
+    interval_sec: float,
+    job: Callable[[], None],
+    stop: asyncio.Event,
+) -> None:
+    """
+    Run a blocking job in the default executor every ``interval_sec`` until ``stop``.
+
+    Args:
+        name: Job name for logs
+        interval_sec: Time between runs (the first run is one interval in)
+        job: Blocking callable; exceptions are logged and the job continues
+        stop: Ends the loop (a run in progress is awaited unless cancelled)
+    """
+    logger.info("Started %s (interval=%d s)", name, interval_sec)
+    while True:
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval_sec)
+            break
+        except asyncio.TimeoutError:
+            pass
+        try:
+            await asyncio.to_thread(job)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Error in %s: %s", name, exc)
+    logger.info("%s stopped", name)
+
+
+async def run_async_agent(
+    pipeline: AsyncCapturePipeline,
+    jobs: list[tuple[str, float, Callable[[], None]]],
+    shutdown: Optional[threading.Event] = None,
+) -> None:
+    """
+    Run the pipeline and periodic jobs on the current loop until a signal arrives.
+
+    SIGINT and SIGTERM stop capture cleanly; SIGUSR1 starts an event capture
+    when one is configured.
+
+    Args:
+        pipeline: Pipeline to run
+        jobs: (name, interval_sec, blocking callable) run as periodic tasks,
+            e.g. the passes of the background scheduler
+        shutdown: Set when a stop signal arrives, for code outside the loop
+    """
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+
+    def on_stop(signum: int) -> None:
+        logger.info("Received signal %d, initiating graceful shutdown...", signum)
+        stop.set()
+        if shutdown is not None:
+            shutdown.set()
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, on_stop, signum)
+    if pipeline.event_capture is not None:
+        loop.add_signal_handler(signal.SIGUSR1, pipeline.trigger)
+
+    tasks = [
+        asyncio.create_task(run_periodic(name, interval, job, stop), name=name)
+        for name, interval, job in jobs
+    ]
+    try:
+        await pipeline.run(stop)
+    finally:
+        stop.set()
+        # A retry pass may sit in a backoff sleep; do not wait for it
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGUSR1):
+            loop.remove_signal_handler(signum)
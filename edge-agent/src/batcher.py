@@ -2,14 +2,21 @@
 
 import logging
 import os
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterator
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterator
 
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 
-from .can_reader import CANFrame
+from .can_reader import CANFrame, CANFrameBlock
+from .profiling import StageTimers, timed
+
+if TYPE_CHECKING:
+    from .wal import FrameWAL
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +30,7 @@ class CANFrameBatcher:
         window_sec: int = 60,
         max_frames: int = 100000,
         output_dir: str = "./data",
+        wal: "FrameWAL | None" = None,
     ):
         """
         Initialize batcher.
@@ -32,17 +40,40 @@ class CANFrameBatcher:
             window_sec: Batch window size in seconds
             max_frames: Maximum frames per batch (safety limit)
             output_dir: Directory for output files
+            wal: Write-ahead log for frames not yet written (optional)
         """
         self.vehicle_id = vehicle_id
         self.window_sec = window_sec
         self.max_frames = max_frames
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.wal = wal
+
+        # Stage timings for --profile (writer.to_arrow, writer.parquet, ...)
+        self.timers: StageTimers | None = None
 
         # Batch state
         self.current_batch: list[CANFrame] = []
         self.batch_start_time: float | None = None
 
+        # Columnar chunks from add_block(), already converted to Arrow
+        self._chunks: list[pa.Table] = []
+        self._chunk_rows = 0
+
+        # (first, last) frame timestamp of the most recently written batch
+        self.last_batch_span: tuple[float, float] | None = None
+
+        # Returns schema metadata for a batch from its (first, last) frame
+        # timestamp, e.g. the bus-load summary of the window; set by the pipeline
+        self.batch_metadata: Callable[[float, float], dict[str, str]] | None = None
+
+        # frames, seconds, arrow_bytes and file_bytes of the most recent write
+        self.last_write: dict | None = None
+
+        # (window_sec, max_frames) from reconfigure(), applied when a window opens
+        self._next_limits: tuple[int, int] | None = None
+        self._limits_lock = threading.Lock()
+
         logger.info(
             f"Initialized batcher: vehicle={vehicle_id}, "
             f"window={window_sec}s, max_frames={max_frames}"
@@ -61,6 +92,8 @@ class CANFrameBatcher:
             ("dlc", pa.uint8()),
             ("data", pa.binary()),
             ("vehicle_id", pa.string()),
+            ("channel", pa.string()),
+            ("suppressed", pa.uint32()),
         ])
 
     def _frames_to_table(self, frames: list[CANFrame]) -> pa.Table:
@@ -79,6 +112,7 @@ class CANFrameBatcher:
         dlcs = [f.dlc for f in frames]
         data_bytes = [f.data for f in frames]
         vehicle_ids = [self.vehicle_id] * len(frames)
+        channels = [f.channel for f in frames]
 
         # Create table
         table = pa.table({
@@ -87,25 +121,83 @@ class CANFrameBatcher:
             "dlc": pa.array(dlcs, type=pa.uint8()),
             "data": pa.array(data_bytes, type=pa.binary()),
             "vehicle_id": pa.array(vehicle_ids, type=pa.string()),
+            "channel": pa.array(channels, type=pa.string()),
+            "suppressed": pa.repeat(pa.scalar(0, pa.uint32()), len(frames)),
         }, schema=self._get_parquet_schema())
 
         return table
 
-    def _get_output_path(self, timestamp: float) -> Path:
+    def _block_to_table(self, block: CANFrameBlock) -> pa.Table:
+        """
+        Wrap a columnar frame block as a PyArrow table without copying.
+
+        Args:
+            block: Filled CAN frame block
+
+        Returns:
+            PyArrow table backed by the block's buffers
+        """
+        n = block.count
+        channels = block.channels[:n] if block.channels is not None else [block.channel] * n
+        if block.suppressed is not None:
+            suppressed = pa.Array.from_buffers(
+                pa.uint32(), n, [None, pa.py_buffer(block.suppressed)]
+            )
+        else:
+            suppressed = pa.repeat(pa.scalar(0, pa.uint32()), n)
+        return pa.Table.from_arrays(
+            [
+                pa.Array.from_buffers(
+                    pa.timestamp("ns"), n, [None, pa.py_buffer(block.timestamps_ns)]
+                ),
+                pa.Array.from_buffers(pa.uint32(), n, [None, pa.py_buffer(block.arb_ids)]),
+                pa.Array.from_buffers(pa.uint8(), n, [None, pa.py_buffer(block.dlcs)]),
+                pa.Array.from_buffers(
+                    pa.binary(),
+                    n,
+                    [None, pa.py_buffer(block.offsets), pa.py_buffer(block.payload)],
+                ),
+                pa.array([self.vehicle_id] * n, type=pa.string()),
+                pa.array(channels, type=pa.string()),
+                suppressed,
+            ],
+            schema=self._get_parquet_schema(),
+        )
+
+    def _pending_count(self) -> int:
+        """Number of frames waiting in the current batch."""
+        return len(self.current_batch) + self._chunk_rows
+
+    def _seal_frames(self) -> None:
+        """Move buffered ``CANFrame`` objects into the columnar chunk list."""
+        if self.current_batch:
+            with timed(self.timers, "writer.to_arrow"):
+                self._chunks.append(self._frames_to_table(self.current_batch))
+            self._chunk_rows += len(self.current_batch)
+            self.current_batch = []
+
+    def _get_output_path(self, timestamp: float, tag: str = "raw", offset_ns: int = 0) -> Path:
         """
         Generate Hive-partitioned output path.
 
+        Files with any tag other than "raw" (event captures) go under an
+        ``events/`` directory, apart from the routine batches.
+
         Args:
             timestamp: Batch start timestamp
+            tag: File name suffix ("raw" for routine batches)
+            offset_ns: Added to the timestamp in the file name
 
         Returns:
             Output file path
         """
-        dt = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+        stamp_ns = round(timestamp * 1e9) + offset_ns
+        dt = datetime.fromtimestamp(stamp_ns // 1_000_000_000, tz=timezone.utc)
+        root = self.output_dir if tag == "raw" else self.output_dir / "events"
 
         # Create Hive partitioning: vehicle_id=X/year=Y/month=M/day=D/
         partition_dir = (
-            self.output_dir
+            root
             / f"vehicle_id={self.vehicle_id}"
             / f"year={dt.year}"
             / f"month={dt.month:02d}"
@@ -113,45 +205,104 @@ class CANFrameBatcher:
         )
         partition_dir.mkdir(parents=True, exist_ok=True)
 
-        # Filename: timestamp_raw.parquet
-        filename = f"{dt.strftime('%Y%m%dT%H%M%S')}Z_raw.parquet"
+        # Filename: timestamp_<tag>.parquet, to the nanosecond so that
+        # batches closed early by max_frames get their own file
+        filename = (
+            f"{dt.strftime('%Y%m%dT%H%M%S')}.{stamp_ns % 1_000_000_000:09d}Z_{tag}.parquet"
+        )
         return partition_dir / filename
 
-    def _write_batch(self, frames: list[CANFrame], start_time: float) -> Path:
+    def _create_output_file(self, timestamp: float, tag: str) -> tuple[Path, BinaryIO]:
+        """
+        Create a new batch file, never replacing an existing one.
+
+        If two batches start in the same nanosecond, the second name is
+        moved on by one nanosecond.
+
+        Args:
+            timestamp: Batch start timestamp
+            tag: File name suffix (see ``_get_output_path``)
+
+        Returns:
+            Output file path and the file opened for writing
+        """
+        offset_ns = 0
+        while True:
+            output_path = self._get_output_path(timestamp, tag, offset_ns)
+            try:
+                return output_path, open(output_path, "xb")
+            except FileExistsError:
+                offset_ns += 1
+                logger.warning(f"Batch file {output_path.name} exists, using the next name")
+
+    def _write_batch(self, table: pa.Table, start_time: float, tag: str = "raw") -> Path:
         """
         Write batch to Parquet file.
 
         Args:
-            frames: List of CAN frames
+            table: Batch contents
             start_time: Batch start timestamp
+            tag: File name suffix (see ``_get_output_path``)
 
         Returns:
             Path to written file
         """
-        # Convert to table
-        table = self._frames_to_table(frames)
-
-        # Get output path
-        output_path = self._get_output_path(start_time)
+        # Create the output file (exclusive, so no batch is overwritten)
+        output_path, sink = self._create_output_file(start_time, tag)
 
         # Write Parquet with compression
-        pq.write_table(
-            table,
-            output_path,
-            compression="zstd",
-            compression_level=3,
-            use_dictionary=True,
-            write_statistics=True,
-        )
+        started = time.perf_counter()
+        with timed(self.timers, "writer.parquet"), sink:
+            pq.write_table(
+                table,
+                sink,
+                compression="zstd",
+                compression_level=3,
+                use_dictionary=True,
+                write_statistics=True,
+            )
 
-        file_size_mb = output_path.stat().st_size / (1024 * 1024)
+        file_bytes = output_path.stat().st_size
+        self.last_write = {
+            "frames": table.num_rows,
+            "seconds": time.perf_counter() - started,
+            "arrow_bytes": table.nbytes,
+            "file_bytes": file_bytes,
+        }
+        file_size_mb = file_bytes / (1024 * 1024)
         logger.info(
-            f"Wrote batch: {len(frames)} frames, "
+            f"Wrote batch: {table.num_rows} frames, "
             f"{file_size_mb:.2f} MB, path={output_path}"
         )
 
         return output_path
 
+    def reconfigure(self, window_sec: int, max_frames: int) -> None:
+        """
+        Change the window length and frame limit from the next window on.
+
+        The open batch is still closed by the limits it started with, so a
+        config reload never splits or stretches a window.  Safe to call
+        from any thread.
+
+        Args:
+            window_sec: Batch window size in seconds
+            max_frames: Maximum frames per batch
+        """
+        with self._limits_lock:
+            self._next_limits = (window_sec, max_frames)
+
+    def _open_window(self, start_time: float) -> None:
+        """Start a new batch, applying limits passed to ``reconfigure``."""
+        self.batch_start_time = start_time
+        if self._next_limits is None:
+            return
+        with self._limits_lock:
+            (self.window_sec, self.max_frames), self._next_limits = self._next_limits, None
+        logger.info(
+            f"Batch limits changed: window={self.window_sec}s, max_frames={self.max_frames}"
+        )
+
     def should_flush(self, current_time: float) -> bool:
         """
         Check if current batch should be flushed.
@@ -162,7 +313,7 @@ class CANFrameBatcher:
         Returns:
             True if batch should be flushed
         """
-        if not self.current_batch:
+        if not self._pending_count():
             return False
 
         if self.batch_start_time is None:
@@ -173,7 +324,7 @@ class CANFrameBatcher:
             return True
 
         # Check max frames
-        if len(self.current_batch) >= self.max_frames:
+        if self._pending_count() >= self.max_frames:
             logger.warning(
                 f"Batch reached max frames ({self.max_frames}), flushing early"
             )
@@ -192,10 +343,12 @@ class CANFrameBatcher:
             Path to written file if batch was flushed, None otherwise
         """
         # Initialize batch if empty
-        if not self.current_batch:
-            self.batch_start_time = frame.timestamp
+        if not self._pending_count():
+            self._open_window(frame.timestamp)
 
         # Add frame
+        if self.wal is not None:
+            self.wal.append_frame(frame)
         self.current_batch.append(frame)
 
         # Check if we should flush
@@ -204,6 +357,43 @@ class CANFrameBatcher:
 
         return None
 
+    def add_block(self, block: CANFrameBlock) -> Path | None:
+        """
+        Add a columnar block of frames to the current batch.
+
+        The block is wrapped as Arrow buffers immediately; no per-frame
+        objects are created.  Flush checks run once per block, so a batch may
+        exceed ``max_frames`` by at most one block.
+
+        Args:
+            block: CAN frame block from ``RealCANReader.read_batches()``
+
+        Returns:
+            Path to written file if batch was flushed, None otherwise
+        """
+        if not block.count:
+            return None
+
+        # Initialize batch if empty
+        if not self._pending_count():
+            self._open_window(block.first_timestamp)
+
+        if self.wal is not None:
+            with timed(self.timers, "writer.wal"):
+                self.wal.append_block(block)
+
+        # Keep arrival order if frames were added individually before
+        self._seal_frames()
+        with timed(self.timers, "writer.to_arrow"):
+            self._chunks.append(self._block_to_table(block))
+        self._chunk_rows += block.count
+
+        # Check if we should flush
+        if self.should_flush(block.last_timestamp):
+            return self.flush()
+
+        return None
+
     def flush(self) -> Path | None:
         """
         Flush current batch to file.
@@ -211,22 +401,79 @@ class CANFrameBatcher:
         Returns:
             Path to written file, or None if batch is empty
         """
-        if not self.current_batch:
+        if not self._pending_count():
             return None
 
+        self._seal_frames()
+
         if self.batch_start_time is None:
             logger.warning("Batch start time not set, using first frame timestamp")
-            self.batch_start_time = self.current_batch[0].timestamp
+            first_ts = self._chunks[0].column("timestamp")[0].value
+            self.batch_start_time = first_ts / 1e9
 
         # Write batch
-        output_path = self._write_batch(self.current_batch, self.batch_start_time)
+        table = pa.concat_tables(self._chunks)
+        last_ts = pc.max(table.column("timestamp")).value / 1e9
+        if self.batch_metadata is not None:
+            metadata = self.batch_metadata(self.batch_start_time, last_ts)
+            if metadata:
+                table = table.replace_schema_metadata(metadata)
+        output_path = self._write_batch(table, self.batch_start_time)
+        if self.wal is not None:
+            self.wal.commit(output_path)
+        self.last_batch_span = (self.batch_start_time, last_ts)
 
         # Reset batch
-        self.current_batch = []
+        self._chunks = []
+        self._chunk_rows = 0
         self.batch_start_time = None
 
         return output_path
 
+    def sync(self) -> None:
+        """Flush the write-ahead log to storage if its sync interval has passed."""
+        if self.wal is not None:
+            self.wal.sync(force=False)
+
+    def write_blocks(
+        self,
+        blocks: list[CANFrameBlock],
+        tag: str,
+        start_ns: int,
+        end_ns: int,
+        metadata: dict[str, str] | None = None,
+    ) -> Path | None:
+        """
+        Write the frames of ``blocks`` within a time window as a separate file.
+
+        Used for event captures; the current batch is not touched.  The file
+        is written under ``<output_dir>/events/``.
+
+        Args:
+            blocks: Frame blocks in time order (not modified)
+            tag: File name suffix, e.g. ``event-<trigger>``
+            start_ns: First timestamp to include (ns)
+            end_ns: Last timestamp to include (ns)
+            metadata: Key/value pairs stored in the Parquet schema metadata
+
+        Returns:
+            Path to written file, or None if no frame falls in the window
+        """
+        tables = [self._block_to_table(b) for b in blocks if b.count]
+        if not tables:
+            return None
+        table = pa.concat_tables(tables)
+        ts = table.column("timestamp").cast(pa.int64())
+        table = table.filter(
+            pc.and_(pc.greater_equal(ts, start_ns), pc.less_equal(ts, end_ns))
+        )
+        if not table.num_rows:
+            return None
+        if metadata:
+            table = table.replace_schema_metadata(metadata)
+        first_ts = pc.min(table.column("timestamp")).value / 1e9
+        return self._write_batch(table, first_ts, tag)
+
     def process_frames(self, frames: Iterator[CANFrame]) -> Iterator[Path]:
         """
         Process CAN frames and yield paths to written files.
@@ -251,3 +498,28 @@ class CANFrameBatcher:
             final_path = self.flush()
             if final_path is not None:
                 yield final_path
+
+    def process_blocks(self, blocks: Iterator[CANFrameBlock]) -> Iterator[Path]:
+        """
+        Process columnar CAN frame blocks and yield paths to written files.
+
+        Args:
+            blocks: Iterator of CAN frame blocks
+
+        Yields:
+            Paths to written Parquet files
+        """
+        try:
+            for block in blocks:
+                output_path = self.add_block(block)
+                if output_path is not None:
+                    yield output_path
+
+        except Exception as e:
+            logger.error(f"Error processing frame blocks: {e}")
+            raise
+        finally:
+            # Flush any remaining frames
+            final_path = self.flush()
+            if final_path is not None:
+                yield final_path
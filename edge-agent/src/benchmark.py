@@ -0,0 +1,312 @@
+"""On-device throughput benchmark: ramp a synthetic frame rate through the pipeline."""
+
+import logging
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+import pyarrow as pa
+
+from .batcher import CANFrameBatcher
+from .can_reader import CANFrameBlock, LoadGeneratorCANReader
+from .offline_buffer import OfflineBuffer
+from .pipeline import CapturePipeline
+
+logger = logging.getLogger(__name__)
+
+# Achieved rate below this share of the target: capture could not keep up
+_MIN_RATE_RATIO = 0.95
+
+
+class DirectoryUploader:
+    """
+    Local S3 stand-in: "uploads" a file by copying it into a directory.
+
+    Exercises the upload stage (a thread reading whole files while capture
+    and writing run) without a network, then removes the source like
+    ``S3Uploader`` moving it to the archive.
+    """
+
+    def __init__(self, root: str) -> None:
+        """
+        Initialize the stand-in.
+
+        Args:
+            root: Directory receiving the copies
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.retries = 0
+        self.uploads = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    def upload(self, local_path: Path) -> bool:
+        """Copy one file; always succeeds unless the copy fails."""
+        started = time.perf_counter()
+        size = local_path.stat().st_size
+        shutil.copyfile(local_path, self.root / local_path.name)
+        local_path.unlink()
+        elapsed = time.perf_counter() - started
+        self.uploads += 1
+        self.bytes += size
+        self.seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+        return True
+
+
+class _BenchmarkPipeline(CapturePipeline):
+    """Capture pipeline recording how far the writer lags behind capture."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Seconds from a block's newest frame until the writer has added it
+        self.lags: list[float] = []
+
+    def _write_block(self, block: CANFrameBlock) -> None:
+        super()._write_block(block)
+        self.lags.append(time.time() - block.last_timestamp)
+
+
+def _rss_mb() -> float:
+    """Resident set size of this process (peak RSS where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _platform_info() -> dict:
+    """Hardware and software the benchmark ran on."""
+    info = {
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "python": sys.version.split()[0],
+        "pyarrow": pa.__version__,
+    }
+    try:
+        info["model"] = Path("/proc/device-tree/model").read_text().rstrip("\x00\n")
+    except OSError:
+        pass
+    return info
+
+
+def assess_step(step: dict, max_latency_ms: float) -> list[str]:
+    """
+    Return why a step is not sustainable (empty if it is).
+
+    Args:
+        step: Step result from ``run_step``
+        max_latency_ms: Highest acceptable p99 writer lag
+
+    Returns:
+        Reasons among: drops, latency, capture (rate not reached)
+    """
+    reasons = []
+    if step["dropped_frames"]:
+        reasons.append("drops")
+    if step["writer_lag_p99_ms"] > max_latency_ms:
+        reasons.append("latency")
+    if step["achieved_fps"] < step["target_fps"] * _MIN_RATE_RATIO:
+        reasons.append("capture")
+    return reasons
+
+
+def run_step(
+    config: dict,
+    pipeline_config: dict,
+    bench: dict,
+    target_fps: float,
+    base_fps: float,
+    work_dir: Path,
+    cpu_temp: Optional[Callable[[], Optional[float]]] = None,
+) -> dict:
+    """
+    Run the pipeline at one frame rate for ``bench["step_sec"]``.
+
+    Args:
+        config: Normalised configuration dictionary
+        pipeline_config: Resolved ``pipeline`` section
+        bench: ``benchmark`` config section, defaults applied
+        target_fps: Frame rate to generate
+        base_fps: Rate of the DBC schedule at ``rate_scale`` 1
+        work_dir: Scratch directory for this step's files
+        cpu_temp: Returns the CPU temperature in °C, or None
+
+    Returns:
+        Step measurements
+    """
+    batcher = CANFrameBatcher(
+        vehicle_id=config.get("vehicle_id", "BENCHMARK"),
+        window_sec=bench["batch_interval_sec"],
+        max_frames=int(config.get("batch", {}).get("max_frames", 100000)),
+        output_dir=str(work_dir / "raw"),
+    )
+    uploader: Optional[DirectoryUploader] = None
+    if bench.get("upload_dir"):
+        uploader = DirectoryUploader(str(Path(bench["upload_dir"]) / work_dir.name))
+    offline_buffer = OfflineBuffer(pending_dir=str(work_dir / "pending"))
+    reader = LoadGeneratorCANReader(
+        config["dbc"]["path"],
+        rate_scale=target_fps / base_fps,
+        duration_sec=bench["step_sec"],
+        realtime=True,
+    )
+
+    with reader:
+        pipeline = _BenchmarkPipeline(
+            reader, batcher, uploader, offline_buffer, pipeline_config
+        )
+        cpu_start = time.process_time()
+        started = time.monotonic()
+        pipeline.start()
+        pipeline.wait_for_capture()
+        captured = time.monotonic()
+        pipeline.stop()
+        finished = time.monotonic()
+        cpu_sec = time.process_time() - cpu_start
+
+    p_stats = pipeline.get_stats()
+    r_stats = reader.get_stats()
+    capture_sec = max(captured - started, 1e-9)
+    written = sorted((work_dir / "raw").rglob("*.parquet"))
+    step = {
+        "target_fps": round(target_fps),
+        "achieved_fps": round(r_stats["frames"] / capture_sec),
+        "frames": r_stats["frames"],
+        "dropped_frames": p_stats["frame_queue"]["dropped_units"],
+        "late_slices": r_stats["late_slices"],
+        "frame_queue_max_depth": p_stats["frame_queue"]["max_depth"],
+        "writer_lag_p50_ms": round(_percentile(pipeline.lags, 50) * 1000, 1),
+        "writer_lag_p99_ms": round(_percentile(pipeline.lags, 99) * 1000, 1),
+        "writer_lag_max_ms": round(max(pipeline.lags, default=0.0) * 1000, 1),
+        "drain_ms": round((finished - captured) * 1000, 1),
+        "batches": p_stats["batches"],
+        # Uploaded files have left raw/
+        "parquet_bytes": sum(p.stat().st_size for p in written)
+        + (uploader.bytes if uploader is not None else 0),
+        "cpu_pct": round(cpu_sec / (finished - started) * 100, 1),
+        "rss_mb": round(_rss_mb(), 1),
+        "cpu_temp_c": cpu_temp() if cpu_temp is not None else None,
+    }
+    if uploader is not None:
+        step["uploads"] = uploader.uploads
+        step["upload_ms_avg"] = round(uploader.seconds / max(uploader.uploads, 1) * 1000, 1)
+        step["upload_ms_max"] = round(uploader.max_seconds * 1000, 1)
+        step["upload_mb_per_sec"] = round(
+            uploader.bytes / max(uploader.seconds, 1e-9) / (1024 * 1024), 1
+        )
+    return step
+
+
+def run_benchmark(
+    config: dict,
+    pipeline_config: Optional[dict] = None,
+    cpu_temp: Optional[Callable[[], Optional[float]]] = None,
+    should_stop: Callable[[], bool] = lambda: False,
+) -> dict:
+    """
+    Ramp the generated frame rate until the pipeline stops keeping up.
+
+    Frames come from the load generator over ``dbc.path`` (real message
+    layouts, so Parquet sizes are realistic) and go through the capture,
+    writer and (with ``upload_dir``) upload stages of a ``CapturePipeline``
+    with the given pipeline settings.  Each step multiplies the
+    rate by ``step_factor``; the ramp ends at the first step that drops
+    frames, whose p99 writer lag exceeds ``max_latency_ms`` or whose
+    generator cannot reach the rate, or at ``max_fps``.
+
+    Args:
+        config: Normalised configuration dictionary; ``benchmark`` section:
+            start_fps (1000), max_fps (100000), step_factor (1.5),
+            step_sec (10), max_latency_ms (1000), batch_interval_sec (5),
+            upload_dir (local S3 stand-in, default none), work_dir
+            (default a temporary directory)
+        pipeline_config: Resolved ``pipeline`` section (decimation and
+            trigger rules); default none
+        cpu_temp: Returns the CPU temperature in °C, or None
+        should_stop: Polled between steps (e.g. after Ctrl-C)
+
+    Returns:
+        Report with keys: platform, settings, steps,
+        max_sustainable_fps and limit (first failing step and reasons,
+        None if ``max_fps`` was sustained)
+    """
+    bench = {
+        "start_fps": 1000.0,
+        "max_fps": 100_000.0,
+        "step_factor": 1.5,
+        "step_sec": 10.0,
+        "max_latency_ms": 1000.0,
+        "batch_interval_sec": 5,
+        **config.get("benchmark", {}),
+    }
+    if bench["step_factor"] <= 1:
+        raise ValueError("benchmark.step_factor must be > 1")
+    if not config.get("dbc", {}).get("path"):
+        raise ValueError("benchmark needs dbc.path for the load generator")
+
+    with LoadGeneratorCANReader(config["dbc"]["path"]) as probe:
+        base_fps = probe.target_fps
+
+    work_root = Path(bench.get("work_dir") or tempfile.mkdtemp(prefix="can-benchmark-"))
+    report: dict = {
+        "platform": _platform_info(),
+        "settings": {**bench, "dbc": config["dbc"]["path"]},
+        "steps": [],
+        "max_sustainable_fps": None,
+        "limit": None,
+    }
+    logger.info("Benchmark on %s: %s", report["platform"]["machine"], bench)
+
+    target = float(bench["start_fps"])
+    index = 0
+    try:
+        while target <= bench["max_fps"] and not should_stop():
+            step_dir = work_root / f"step-{index:02d}"
+            step = run_step(
+                config, pipeline_config or {}, bench, target, base_fps, step_dir, cpu_temp
+            )
+            shutil.rmtree(step_dir, ignore_errors=True)
+            reasons = assess_step(step, bench["max_latency_ms"])
+            step["sustained"] = not reasons
+            report["steps"].append(step)
+            logger.info(
+                "BENCHMARK: %d fps -> %d fps | cpu=%.0f%% rss=%.0fMB | lag p99=%.0fms "
+                "max=%.0fms | drops=%d | %s",
+                step["target_fps"],
+                step["achieved_fps"],
+                step["cpu_pct"],
+                step["rss_mb"],
+                step["writer_lag_p99_ms"],
+                step["writer_lag_max_ms"],
+                step["dropped_frames"],
+                "ok" if not reasons else "LIMIT: " + ",".join(reasons),
+            )
+            if reasons:
+                report["limit"] = {"fps": step["target_fps"], "reasons": reasons}
+                break
+            report["max_sustainable_fps"] = step["target_fps"]
+            target *= bench["step_factor"]
+            index += 1
+    finally:
+        if not bench.get("work_dir"):
+            shutil.rmtree(work_root, ignore_errors=True)
+    return report
@@ -0,0 +1,185 @@
+"""Bus utilization from received frames, using a worst-case frame-length model."""
+
+import logging
+import time
+from array import array
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Largest payload a frame can carry (CAN-FD)
+_MAX_LEN = 64
+
+# Bits after the CRC sequence: CRC delimiter, ACK slot + delimiter, EOF, IFS
+_TRAILER_BITS = 1 + 2 + 7 + 3
+
+
+def frame_bits(length: int, extended: bool = False, fd: bool = False) -> tuple[int, int]:
+    """
+    Worst-case length of a data frame on the wire, including stuff bits.
+
+    Classic CAN: every bit from SOF to the end of the CRC is subject to
+    stuffing (at most one stuff bit per four bits).  CAN-FD: the bits up to
+    BRS are sent at the nominal bitrate with dynamic stuffing; ESI, DLC, data,
+    the stuff count and the CRC follow in the data phase, where the CRC field
+    carries fixed stuff bits instead.
+
+    Args:
+        length: Payload length in bytes
+        extended: 29-bit identifier
+        fd: CAN-FD frame
+
+    Returns:
+        (bits in the arbitration phase, bits in the data phase); for classic
+        frames every bit is in the arbitration phase
+    """
+    if not fd:
+        # SOF + ID + RTR + IDE + r0 + DLC (+ SRR, IDE, ID ext, r1) + data + CRC15
+        stuffed = (54 if extended else 34) + 8 * length
+        return stuffed + (stuffed - 1) // 4 + _TRAILER_BITS, 0
+
+    # SOF + ID + RRS + IDE + FDF + res + BRS (+ SRR, 18-bit ID extension)
+    arbitration = 36 if extended else 17
+    nominal = arbitration + (arbitration - 1) // 4 + _TRAILER_BITS
+    # ESI + DLC + data, then stuff count (4) and CRC17/CRC21 with fixed stuff bits
+    dynamic = 5 + 8 * length
+    crc_bits, fixed_stuff = (17, 6) if length <= 16 else (21, 7)
+    data = dynamic + dynamic // 4 + 4 + crc_bits + fixed_stuff
+    return nominal, data
+
+
+class BusLoadMeter:
+    """
+    Bus time used by received frames, in a ring of one-second buckets.
+
+    The on-wire duration of every possible frame is precomputed per frame
+    kind (standard/extended, classic/FD, with/without bitrate switch) and
+    payload length, so ``record()`` is a table lookup and an addition.
+    Utilization is the bus time of a second divided by one second.  Like
+    ``FrameStats``, ``record()`` runs on the reader thread and the query
+    methods only take snapshots.
+    """
+
+    def __init__(
+        self,
+        bitrate: int,
+        data_bitrate: Optional[int] = None,
+        window_sec: int = 10,
+        history_sec: int = 120,
+    ) -> None:
+        """
+        Initialize the meter.
+
+        Args:
+            bitrate: Nominal (arbitration) bitrate in bps
+            data_bitrate: CAN-FD data-phase bitrate for frames with BRS set
+                (default: same as ``bitrate``)
+            window_sec: Averaging window of ``get_stats()``
+            history_sec: Seconds of per-second history kept for summaries
+        """
+        self.bitrate = int(bitrate)
+        self.data_bitrate = int(data_bitrate or bitrate)
+        self.window_sec = window_sec
+        self.history_sec = max(history_sec, window_sec + 1)
+
+        # Index: extended | fd << 1 | brs << 2 -> seconds per payload length
+        self._cost: list[list[float]] = []
+        for kind in range(8):
+            extended, fd, brs = bool(kind & 1), bool(kind & 2), bool(kind & 4)
+            data_rate = self.data_bitrate if brs else self.bitrate
+            table = []
+            for length in range(_MAX_LEN + 1):
+                nominal, data = frame_bits(length, extended, fd)
+                table.append(nominal / self.bitrate + data / data_rate)
+            self._cost.append(table)
+
+        self._bucket_ids = array("q", [-1] * self.history_sec)
+        self._bucket_time = array("d", [0.0] * self.history_sec)
+
+    def record(
+        self,
+        t: float,
+        length: int,
+        extended: bool = False,
+        fd: bool = False,
+        brs: bool = False,
+    ) -> None:
+        """
+        Account one received frame.
+
+        Args:
+            t: Frame timestamp (seconds)
+            length: Payload length in bytes
+            extended: 29-bit identifier
+            fd: CAN-FD frame
+            brs: CAN-FD bitrate switch (data phase at ``data_bitrate``)
+        """
+        cost = self._cost[extended | fd << 1 | brs << 2][length]
+        second = int(t)
+        idx = second % self.history_sec
+        if self._bucket_ids[idx] != second:
+            self._bucket_ids[idx] = second
+            self._bucket_time[idx] = cost
+        else:
+            self._bucket_time[idx] += cost
+
+    def per_second(self, start: float, end: float) -> list[tuple[int, float]]:
+        """
+        Return utilization per second for the seconds in ``[start, end]``.
+
+        Args:
+            start: First second (inclusive)
+            end: Last second (inclusive)
+
+        Returns:
+            (second, utilization %) pairs in time order; seconds without
+            frames or beyond the history are omitted
+        """
+        first, last = int(start), int(end)
+        ids = array("q", self._bucket_ids)
+        busy = array("d", self._bucket_time)
+        return sorted(
+            (b, round(u * 100, 2)) for b, u in zip(ids, busy) if first <= b <= last
+        )
+
+    def get_stats(self, now: Optional[float] = None) -> dict:
+        """
+        Return utilization over the window ending at ``now``.
+
+        Args:
+            now: Reference time (defaults to wall clock)
+
+        Returns:
+            Dict with keys: bus_load_pct (mean over the window) and
+            bus_load_peak_pct (busiest complete second in the window)
+        """
+        current = int(time.time() if now is None else now)
+        seconds = self.per_second(current - self.window_sec + 1, current)
+        total = sum(u for _, u in seconds)
+        peak = max((u for b, u in seconds if b < current), default=0.0)
+        return {
+            "bus_load_pct": round(total / self.window_sec, 2),
+            "bus_load_peak_pct": peak,
+        }
+
+    def summary(self, start: float, end: float) -> dict:
+        """
+        Summarize utilization over a batch window.
+
+        Args:
+            start: Window start (seconds)
+            end: Window end (seconds)
+
+        Returns:
+            Dict with keys: bitrate, data_bitrate, mean_pct, peak_pct and
+            per_second ([second, utilization %] pairs)
+        """
+        seconds = self.per_second(start, end)
+        span = int(end) - int(start) + 1
+        return {
+            "bitrate": self.bitrate,
+            "data_bitrate": self.data_bitrate,
+            "mean_pct": round(sum(u for _, u in seconds) / span, 2),
+            "peak_pct": max((u for _, u in seconds), default=0.0),
+            "per_second": [list(s) for s in seconds],
+        }
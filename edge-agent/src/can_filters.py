@@ -0,0 +1,218 @@
+"""Derive compact kernel CAN filters (can_id/can_mask) from a DBC."""
+
+import heapq
+import logging
+from typing import Iterable, Optional
+
+import cantools
+
+from .can_reader import CAN_EFF_MASK, CAN_SFF_MASK
+
+logger = logging.getLogger(__name__)
+
+# Value of can.filters that selects DBC-derived filters
+DBC_FILTERS = "dbc"
+
+
+def _matches(arb_id: int, can_id: int, can_mask: int) -> bool:
+    return (arb_id & can_mask) == (can_id & can_mask)
+
+
+def _merge_exact(filters: set[tuple[int, int]]) -> set[tuple[int, int]]:
+    """
+    Merge filters without admitting new IDs.
+
+    Two filters with the same mask whose IDs differ in exactly one masked bit
+    cover the same IDs as one filter with that bit cleared from the mask
+    (the combining step of Quine-McCluskey).  Repeats until nothing merges.
+    """
+    current = set(filters)
+    while True:
+        merged: set[tuple[int, int]] = set()
+        used: set[tuple[int, int]] = set()
+        for can_id, can_mask in sorted(current):
+            if (can_id, can_mask) in used:
+                continue
+            bit = 1
+            while bit <= can_mask:
+                if can_mask & bit:
+                    partner = ((can_id ^ bit) & can_mask, can_mask)
+                    if partner in current and partner not in used:
+                        used.add((can_id, can_mask))
+                        used.add(partner)
+                        merged.add((can_id & ~bit & can_mask, can_mask & ~bit))
+                        break
+                bit <<= 1
+        if not used:
+            return current
+        current = (current - used) | merged
+
+
+def _reduce(
+    filters: set[tuple[int, int]],
+    wanted: set[int],
+    denied: set[int],
+    max_filters: int,
+    width_mask: int,
+) -> set[tuple[int, int]]:
+    """
+    Merge filter pairs until at most ``max_filters`` remain.
+
+    Each step merges the pair whose combined filter admits the fewest IDs that
+    were not asked for; merges that would admit a denied ID are never made.
+    The cost of a pair depends only on its two filters, so every pair is
+    scored once and kept in a heap; a merge scores only the pairs of the new
+    filter, and pairs with a filter merged away are skipped when popped.
+    """
+    width = bin(width_mask).count("1")
+    # Unwanted IDs admitted by a merged filter, by filter
+    extra_cache: dict[tuple[int, int], int] = {}
+
+    def extra(can_id: int, can_mask: int) -> int:
+        cost = extra_cache.get((can_id, can_mask))
+        if cost is None:
+            covered = sum(1 for i in wanted if _matches(i, can_id, can_mask))
+            cost = (1 << (width - bin(can_mask).count("1"))) - covered
+            extra_cache[(can_id, can_mask)] = cost
+        return cost
+
+    def score(a: tuple[int, int], b: tuple[int, int]) -> Optional[tuple]:
+        """(cost, filter a, filter b, merged mask) with a < b, so ties go to the lowest pair."""
+        if b < a:
+            a, b = b, a
+        mask = a[1] & b[1] & ~(a[0] ^ b[0]) & width_mask
+        if any(_matches(d, a[0], mask) for d in denied):
+            return None
+        return extra(a[0] & mask, mask), a, b, mask
+
+    current = set(filters)
+    ordered = sorted(current)
+    heap = []
+    for i, a in enumerate(ordered):
+        for b in ordered[i + 1:]:
+            pair = score(a, b)
+            if pair is not None:
+                heap.append(pair)
+    heapq.heapify(heap)
+
+    while len(current) > max_filters:
+        while heap and (heap[0][1] not in current or heap[0][2] not in current):
+            heapq.heappop(heap)
+        if not heap:
+            logger.warning(
+                "Cannot reduce to %d filters without admitting denied IDs; using %d",
+                max_filters,
+                len(current),
+            )
+            break
+        _, a, b, mask = heapq.heappop(heap)
+        current -= {a, b}
+        new = (a[0] & mask, mask)
+        if new not in current:
+            for other in current:
+                pair = score(new, other)
+                if pair is not None:
+                    heapq.heappush(heap, pair)
+            current.add(new)
+    return current
+
+
+def build_filters(
+    arb_ids: Iterable[tuple[int, bool]],
+    deny: Iterable[int] = (),
+    max_filters: int = 16,
+) -> list[dict]:
+    """
+    Build a small set of python-can style filters accepting ``arb_ids``.
+
+    IDs are first merged losslessly; if more than ``max_filters`` remain,
+    filters are merged further at the cost of admitting some unwanted IDs
+    (dropped later in user space), never admitting a denied ID.
+
+    Args:
+        arb_ids: (arbitration ID, is_extended) pairs to accept
+        deny: IDs that must be rejected by the kernel
+        max_filters: Target number of filters (per frame format)
+
+    Returns:
+        [{"can_id": ..., "can_mask": ..., "extended": bool}, ...]
+    """
+    denied = set(deny)
+    result: list[dict] = []
+    for extended, width_mask in ((False, CAN_SFF_MASK), (True, CAN_EFF_MASK)):
+        wanted = {i for i, ext in arb_ids if ext == extended and i not in denied}
+        if not wanted:
+            continue
+        filters = _merge_exact({(i, width_mask) for i in wanted})
+        filters = _reduce(filters, wanted, denied, max_filters, width_mask)
+        result.extend(
+            {"can_id": can_id, "can_mask": can_mask, "extended": extended}
+            for can_id, can_mask in sorted(filters)
+        )
+    return result
+
+
+def filters_from_dbc(
+    dbc_path: str,
+    allow: Iterable[int] = (),
+    deny: Iterable[int] = (),
+    max_filters: int = 16,
+) -> list[dict]:
+    """
+    Derive kernel filters for the messages defined in a DBC.
+
+    Args:
+        dbc_path: DBC file path
+        allow: Extra IDs to accept (e.g. diagnostics); values above 0x7FF
+            are treated as extended
+        deny: IDs to reject even if defined in the DBC
+        max_filters: Target number of filters per frame format
+
+    Returns:
+        python-can style filter dicts
+    """
+    db = cantools.database.load_file(dbc_path)
+    arb_ids = {(m.frame_id, bool(m.is_extended_frame)) for m in db.messages}
+    arb_ids |= {(int(i), int(i) > CAN_SFF_MASK) for i in allow}
+    filters = build_filters(arb_ids, deny=deny, max_filters=max_filters)
+
+    admitted = 0
+    for f in filters:
+        width = 29 if f["extended"] else 11
+        admitted += 1 << (width - bin(f["can_mask"]).count("1"))
+    logger.info(
+        "Derived %d kernel filter(s) from %d IDs in %s (%d IDs admitted)",
+        len(filters),
+        len(arb_ids),
+        dbc_path,
+        admitted,
+    )
+    return filters
+
+
+def resolve_filters(config: dict) -> dict:
+    """
+    Replace ``can.filters: "dbc"`` with filters derived from ``dbc.path``.
+
+    Reads can.filter_allow, can.filter_deny and can.max_filters (default 16).
+
+    Args:
+        config: Full config dict
+
+    Returns:
+        The config, with a new ``can`` section if filters were derived
+    """
+    can_cfg = config["can"]
+    if can_cfg.get("filters") != DBC_FILTERS:
+        return config
+
+    dbc_path = config.get("dbc", {}).get("path")
+    if not dbc_path:
+        raise ValueError('can.filters: "dbc" requires dbc.path')
+    filters = filters_from_dbc(
+        dbc_path,
+        allow=can_cfg.get("filter_allow", ()),
+        deny=can_cfg.get("filter_deny", ()),
+        max_filters=int(can_cfg.get("max_filters", 16)),
+    )
+    return {**config, "can": {**can_cfg, "filters": filters}}
@@ -1,16 +1,64 @@
 """CAN bus reader implementations for real hardware and simulation."""
 
+import bisect
+import heapq
+import itertools
 import logging
+import math
+import queue
+import random
+import socket
+import struct
+import threading
 import time
+from array import array
 from collections import deque
 from dataclasses import dataclass
-from typing import Generator, Optional, Protocol
+from typing import Generator, Iterator, Optional, Protocol
 
 import can
 import cantools
 
+from .bus_load import BusLoadMeter
+from .frame_loss import InterfaceDropMonitor, SequenceChecker, sequence_checker_from_config
+from .frame_stats import FrameStats
+
 logger = logging.getLogger(__name__)
 
+# Maximum payload length for classic CAN and CAN-FD frames
+CAN_MAX_DLEN = 8
+CANFD_MAX_DLEN = 64
+
+# ``can.interface`` value that selects RawSocketCANReader
+RAW_SOCKETCAN_INTERFACE = "socketcan_raw"
+
+# SocketCAN constants (<linux/can.h>, <linux/can/raw.h>, <linux/can/error.h>)
+CAN_EFF_FLAG = 0x80000000  # extended frame format
+CAN_RTR_FLAG = 0x40000000  # remote transmission request
+CAN_ERR_FLAG = 0x20000000  # error frame
+CAN_SFF_MASK = 0x000007FF
+CAN_EFF_MASK = 0x1FFFFFFF
+CAN_ERR_MASK = 0x1FFFFFFF
+CAN_ERR_BUSOFF = 0x00000040
+CANFD_BRS = 0x01  # canfd_frame.flags: bit rate switch
+CAN_MTU = 16  # sizeof(struct can_frame)
+CANFD_MTU = 72  # sizeof(struct canfd_frame)
+SOL_CAN_RAW = 101
+CAN_RAW_FILTER = 1
+CAN_RAW_ERR_FILTER = 2
+CAN_RAW_RECV_OWN_MSGS = 4
+CAN_RAW_FD_FRAMES = 5
+SO_TIMESTAMP = 29
+SO_RCVBUFFORCE = 33
+SO_RXQ_OVFL = 40
+
+# can_id word at the start of struct can_frame / canfd_frame
+_CAN_ID = struct.Struct("=I")
+# struct timeval from SO_TIMESTAMP ancillary data
+_TIMEVAL = struct.Struct("@ll")
+# __u32 drop counter from SO_RXQ_OVFL ancillary data
+_DROP_COUNT = struct.Struct("=I")
+
 
 @dataclass
 class CANFrame:
@@ -25,6 +73,300 @@ class CANFrame:
     channel: str = "can0"  # Source CAN interface name
 
 
+def _pack_filters(filters: list[dict]) -> bytes:
+    """
+    Pack python-can style filter dicts into a ``CAN_RAW_FILTER`` array.
+
+    Args:
+        filters: [{"can_id": 0x1A0, "can_mask": 0x7FF, "extended": False}, ...]
+
+    Returns:
+        Packed ``struct can_filter`` array
+    """
+    words: list[int] = []
+    for f in filters:
+        can_id = int(f["can_id"])
+        can_mask = int(f["can_mask"])
+        if "extended" in f:
+            # Match on either 11-bit OR 29-bit IDs instead of both
+            can_mask |= CAN_EFF_FLAG
+            if f["extended"]:
+                can_id |= CAN_EFF_FLAG
+        words.extend((can_id, can_mask))
+    return struct.pack(f"={len(words)}I", *words)
+
+
+def _parse_ancillary(
+    ancdata: list[tuple[int, int, bytes]],
+) -> tuple[Optional[float], Optional[int]]:
+    """
+    Extract ``SO_TIMESTAMP`` and ``SO_RXQ_OVFL`` values from ``recvmsg``
+    ancillary data.
+
+    Returns:
+        (receive time in seconds, cumulative socket drop count); either is
+        None if the kernel did not attach it.
+    """
+    t: Optional[float] = None
+    drops: Optional[int] = None
+    for level, kind, data in ancdata:
+        if level != socket.SOL_SOCKET:
+            continue
+        if kind == SO_TIMESTAMP and len(data) >= _TIMEVAL.size:
+            sec, usec = _TIMEVAL.unpack_from(data)
+            t = sec + usec * 1e-6
+        elif kind == SO_RXQ_OVFL and len(data) >= _DROP_COUNT.size:
+            drops = _DROP_COUNT.unpack_from(data)[0]
+    return t, drops
+
+
+def _set_rcvbuf(sock: socket.socket, size: int, channel: str) -> None:
+    """
+    Enlarge a socket's receive buffer.
+
+    Tries ``SO_RCVBUFFORCE`` first (needs CAP_NET_ADMIN, ignores
+    ``net.core.rmem_max``) and falls back to ``SO_RCVBUF``.
+
+    Args:
+        sock: Socket to configure
+        size: Requested buffer size in bytes
+        channel: Interface name for log messages
+    """
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, SO_RCVBUFFORCE, size)
+    except OSError:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+        except OSError as exc:
+            logger.warning("Could not set receive buffer on %s: %s", channel, exc)
+            return
+    # The kernel doubles the value for bookkeeping overhead
+    actual = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+    logger.info("Receive buffer on %s: requested %d, effective %d bytes", channel, size, actual)
+
+
+def _loss_stats(
+    iface_drops: InterfaceDropMonitor, seq_checker: Optional[SequenceChecker]
+) -> dict:
+    """Collect interface and sequence-check loss counters for get_stats()."""
+    seq = (
+        seq_checker.get_stats()
+        if seq_checker is not None
+        else {"seq_gaps": 0, "seq_lost": 0, "seq_repeats": 0}
+    )
+    return {"iface_drops": iface_drops.get_drops(), **seq}
+
+
+def _frame_stats_from_config(config: dict) -> FrameStats:
+    """Build the per-reader statistics engine from the ``monitoring`` section."""
+    mon_cfg = config.get("monitoring", {})
+    return FrameStats(
+        window_sec=int(mon_cfg.get("fps_window_seconds", 10)),
+        missing_gap_factor=float(mon_cfg.get("missing_gap_factor", 10.0)),
+    )
+
+
+def _bus_load_from_config(config: dict) -> BusLoadMeter:
+    """Build the per-reader bus-load meter from the ``can`` and ``monitoring`` sections."""
+    can_cfg = config["can"]
+    mon_cfg = config.get("monitoring", {})
+    batch_sec = int(config.get("batch", {}).get("interval_sec", 60))
+    return BusLoadMeter(
+        bitrate=int(can_cfg["bitrate"]),
+        data_bitrate=can_cfg.get("data_bitrate"),
+        window_sec=int(mon_cfg.get("fps_window_seconds", 10)),
+        # Enough history to summarize a full batch window after it closes
+        history_sec=batch_sec + 60,
+    )
+
+
+class CANFrameBlock:
+    """
+    Struct-of-arrays chunk of CAN frames produced by ``read_batches()``.
+
+    All columns are preallocated to ``capacity`` rows so the receive loop can
+    fill them without creating a ``CANFrame`` per frame.  The payload bytes of
+    every frame are stored back to back in ``payload``; row ``i`` occupies
+    ``payload[offsets[i]:offsets[i + 1]]`` (the Arrow binary layout), which
+    lets the batcher wrap the columns as Arrow buffers without copying.
+
+    A yielded block is owned by the consumer; readers start a fresh block
+    instead of reusing one that has been handed out.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        max_dlen: int = CAN_MAX_DLEN,
+        channel: str = "can0",
+    ) -> None:
+        """
+        Allocate an empty block.
+
+        Args:
+            capacity: Maximum number of frames the block can hold
+            max_dlen: Maximum payload length per frame (8 for CAN, 64 for CAN-FD)
+            channel: Source CAN interface name for every frame in the block
+        """
+        self.capacity = capacity
+        self.channel = channel
+        self.timestamps_ns = array("q", bytes(8 * capacity))
+        self.arb_ids = array("I", bytes(4 * capacity))
+        self.dlcs = array("B", bytes(capacity))
+        self.offsets = array("i", bytes(4 * (capacity + 1)))
+        self.payload = bytearray(capacity * max_dlen)
+        self.count = 0
+        # Per-row channel names; only set for mixed-channel blocks
+        self.channels: Optional[list[str]] = None
+        # Per-row count of identical frames dropped before each row; only set
+        # by the change-only capture stage
+        self.suppressed: Optional[array] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def is_full(self) -> bool:
+        """True when no more frames fit in the block."""
+        return self.count >= self.capacity
+
+    @property
+    def first_timestamp(self) -> float:
+        """Timestamp of the first frame in seconds."""
+        return self.timestamps_ns[0] / 1e9
+
+    @property
+    def last_timestamp(self) -> float:
+        """Timestamp of the most recent frame in seconds."""
+        return self.timestamps_ns[self.count - 1] / 1e9
+
+    def append(self, timestamp: float, arb_id: int, dlc: int, data: bytes) -> None:
+        """
+        Append one frame to the block.
+
+        Args:
+            timestamp: Unix timestamp in seconds
+            arb_id: CAN arbitration ID
+            dlc: Data length code
+            data: Raw data bytes (any bytes-like object)
+        """
+        i = self.count
+        start = self.offsets[i]
+        end = start + len(data)
+        self.timestamps_ns[i] = int(timestamp * 1e9)
+        self.arb_ids[i] = arb_id
+        self.dlcs[i] = dlc
+        self.payload[start:end] = data
+        self.offsets[i + 1] = end
+        self.count = i + 1
+
+    def append_frame(self, frame: CANFrame) -> None:
+        """
+        Append a ``CANFrame``, tracking its channel per row if it differs
+        from the block's channel.
+
+        Blocks that may mix channels must be filled only through this method.
+        """
+        if self.channels is None and frame.channel != self.channel:
+            self.channels = [self.channel] * self.count
+        self.append(frame.timestamp, frame.arb_id, frame.dlc, frame.data)
+        if self.channels is not None:
+            self.channels.append(frame.channel)
+
+    def extend_from(self, src: "CANFrameBlock", start: int, stop: int) -> None:
+        """
+        Copy rows ``start:stop`` of another block, column by column.
+
+        The rows must fit (``stop - start`` at most the free capacity, and
+        payloads no longer than this block's ``max_dlen``).  Channels are
+        tracked per row as in ``append_frame``.
+
+        Args:
+            src: Source block (not modified)
+            start: First row to copy
+            stop: Row after the last one to copy
+        """
+        n = stop - start
+        i = self.count
+        self.timestamps_ns[i:i + n] = src.timestamps_ns[start:stop]
+        self.arb_ids[i:i + n] = src.arb_ids[start:stop]
+        self.dlcs[i:i + n] = src.dlcs[start:stop]
+        base, src_base = self.offsets[i], src.offsets[start]
+        size = src.offsets[stop] - src_base
+        self.payload[base:base + size] = src.payload[src_base:src_base + size]
+        shift = base - src_base
+        self.offsets[i + 1:i + n + 1] = array(
+            "i", [offset + shift for offset in src.offsets[start + 1:stop + 1]]
+        )
+
+        if src.channels is None and src.channel == self.channel:
+            if self.channels is not None:
+                self.channels.extend([src.channel] * n)
+        else:
+            if self.channels is None:
+                self.channels = [self.channel] * i
+            if src.channels is None:
+                self.channels.extend([src.channel] * n)
+            else:
+                self.channels.extend(src.channels[start:stop])
+        self.count = i + n
+
+    def frames(self, start: int = 0, stop: Optional[int] = None) -> Iterator[CANFrame]:
+        """
+        Yield the block's rows as ``CANFrame`` objects (slow path).
+
+        Args:
+            start: First row
+            stop: Row after the last one (default: all rows)
+        """
+        channels = self.channels
+        for i in range(start, self.count if stop is None else stop):
+            yield CANFrame(
+                timestamp=self.timestamps_ns[i] / 1e9,
+                arb_id=self.arb_ids[i],
+                dlc=self.dlcs[i],
+                data=bytes(self.payload[self.offsets[i]:self.offsets[i + 1]]),
+                channel=channels[i] if channels is not None else self.channel,
+            )
+
+
+def frames_to_blocks(
+    frames: Iterator[CANFrame],
+    max_frames: int = 1024,
+    max_latency_ms: float = 50.0,
+) -> Generator[CANFrameBlock, None, None]:
+    """
+    Pack a ``CANFrame`` stream into ``CANFrameBlock`` chunks.
+
+    Adapter for readers without a native ``read_batches()``.  The latency
+    bound is checked as frames arrive, so an idle source holds back its last
+    partial block until the next frame (or the end of the stream).
+
+    Args:
+        frames: Source frame iterator
+        max_frames: Block capacity (frames)
+        max_latency_ms: Maximum age of the first frame in a partial block
+
+    Yields:
+        Non-empty CANFrameBlock objects
+    """
+    max_latency = max_latency_ms / 1000.0
+    block: Optional[CANFrameBlock] = None
+    deadline = 0.0
+
+    for frame in frames:
+        if block is None:
+            block = CANFrameBlock(max_frames, max_dlen=CANFD_MAX_DLEN, channel=frame.channel)
+            deadline = time.monotonic() + max_latency
+        block.append_frame(frame)
+        if block.is_full or time.monotonic() >= deadline:
+            yield block
+            block = None
+
+    if block is not None:
+        yield block
+
+
 class CANReader(Protocol):
     """Protocol for CAN frame readers."""
 
@@ -53,9 +395,14 @@ class RealCANReader:
                 channel  (str): Linux interface name, e.g. "can0"
                 bitrate  (int): Bus bitrate in bps, e.g. 500000
                 fd       (bool, optional): Enable CAN-FD mode (default False)
+                data_bitrate (int, optional): CAN-FD data-phase bitrate, used
+                    for bus-load accounting (default: bitrate)
                 receive_own_messages (bool, optional): Echo own TX (default False)
                 filters  (list, optional): python-can filter dicts:
                     [{"can_id": 0x1A0, "can_mask": 0x7FF, "extended": False}]
+                rcvbuf_bytes (int, optional): Socket receive buffer size
+                sequence_checks (list, optional): Rolling-counter checks:
+                    [{"arb_id": 0x1A0, "byte": 7, "mask": 0x0F}]
         """
         can_cfg = config["can"]
         self.interface: str = can_cfg["interface"]
@@ -70,12 +417,23 @@ class RealCANReader:
         self._reconnect_delay: float = 1.0
         self._max_reconnect_delay: float = 30.0
 
+        self.rcvbuf_bytes: Optional[int] = can_cfg.get("rcvbuf_bytes")
+
         # Cumulative counters
-        self._stats: dict[str, int] = {"frames": 0, "errors": 0, "bus_off": 0}
+        self._stats: dict[str, int] = {
+            "frames": 0,
+            "errors": 0,
+            "bus_off": 0,
+            "kernel_drops": 0,
+        }
+
+        # O(1) frame-rate buckets and per-arb_id timing statistics
+        self.frame_stats = _frame_stats_from_config(config)
+        self.bus_load = _bus_load_from_config(config)
 
-        # Rolling deque for frames-per-second calculation (last 10 s)
-        self._frame_times: deque = deque()
-        self._fps_window: float = 10.0
+        # Frame-loss detection (python-can gives no socket drop counter)
+        self._iface_drops = InterfaceDropMonitor(self.channel)
+        self._seq_checker = sequence_checker_from_config(can_cfg)
 
         logger.info(
             "Initializing RealCANReader: interface=%s channel=%s bitrate=%d fd=%s",
@@ -108,6 +466,9 @@ class RealCANReader:
                 kwargs["can_filters"] = self.filters
 
             self.bus = can.Bus(**kwargs)
+            bus_socket = getattr(self.bus, "socket", None)
+            if self.rcvbuf_bytes and bus_socket is not None:
+                _set_rcvbuf(bus_socket, int(self.rcvbuf_bytes), self.channel)
             self._reconnect_delay = 1.0  # reset backoff on success
             logger.info("Connected to %s at %d bps", self.channel, self.bitrate)
             return True
@@ -143,6 +504,71 @@ class RealCANReader:
     # Frame reading
     # ------------------------------------------------------------------
 
+    def _start(self) -> None:
+        """Mark the reader as running and block until the bus is open."""
+        self._running = True
+
+        if not self.connect():
+            while self._running and not self.reconnect():
+                pass
+
+    def _recv_message(self, timeout: float) -> Optional[can.Message]:
+        """
+        Receive one data frame from the bus.
+
+        Error frames are counted and swallowed; bus-off and OS errors trigger
+        a reconnect.
+
+        Args:
+            timeout: Maximum time to wait for a frame (seconds)
+
+        Returns:
+            The received message, or None if nothing usable arrived in time.
+        """
+        try:
+            msg = self.bus.recv(timeout=timeout)  # type: ignore[union-attr]
+        except can.CanOperationError as exc:
+            logger.error("CAN bus-off / operation error on %s: %s", self.channel, exc)
+            self._stats["bus_off"] += 1
+            while self._running and not self.reconnect():
+                pass
+            return None
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Unexpected error reading CAN: %s", exc)
+            time.sleep(0.1)
+            return None
+
+        if msg is None:
+            # recv() timed out — caller checks _running and loops back
+            return None
+
+        if msg.is_error_frame:
+            self._stats["errors"] += 1
+            logger.debug("Error frame on %s: %s", self.channel, msg)
+            return None
+
+        return msg
+
+    def _record_frame(self, msg: can.Message) -> float:
+        """
+        Update statistics for a received frame.
+
+        Returns:
+            Frame timestamp (hardware timestamp if available, else wall clock)
+        """
+        # Prefer hardware timestamp from SocketCAN, fall back to wall clock
+        t: float = float(msg.timestamp) if msg.timestamp else time.time()
+
+        self._stats["frames"] += 1
+        self.frame_stats.record(msg.arbitration_id, t)
+        self.bus_load.record(
+            t, len(msg.data), msg.is_extended_id, msg.is_fd, msg.bitrate_switch
+        )
+        if self._seq_checker is not None and msg.arbitration_id in self._seq_checker:
+            self._seq_checker.check(msg.arbitration_id, msg.data)
+
+        return t
+
     def read_frames(self) -> Generator[CANFrame, None, None]:
         """
         Yield CAN frames from the bus indefinitely.
@@ -151,59 +577,91 @@ class RealCANReader:
         Call ``stop()`` (or close the context manager) to end the loop.
         Error frames are counted in stats but NOT yielded.
         """
-        self._running = True
+        self._start()
 
-        if not self.connect():
-            while self._running and not self.reconnect():
-                pass
+        while self._running:
+            msg = self._recv_message(timeout=1.0)
+            if msg is None:
+                continue
+
+            t = self._record_frame(msg)
+            yield CANFrame(
+                timestamp=t,
+                arb_id=msg.arbitration_id,
+                dlc=msg.dlc,
+                data=bytes(msg.data),
+                is_error=False,
+                is_fd=bool(getattr(msg, "is_fd", False)),
+                channel=self.channel,
+            )
+
+    def read_batches(
+        self,
+        max_frames: int = 1024,
+        max_latency_ms: float = 50.0,
+    ) -> Generator[CANFrameBlock, None, None]:
+        """
+        Yield CAN frames from the bus as columnar ``CANFrameBlock`` chunks.
+
+        The bus is drained into a preallocated block until it holds
+        ``max_frames`` frames or ``max_latency_ms`` has passed since the first
+        frame of the block arrived, whichever comes first.  No per-frame
+        ``CANFrame`` objects are created.  Reconnection, error-frame handling
+        and statistics behave exactly as in ``read_frames()``.
+
+        Args:
+            max_frames: Block capacity (frames)
+            max_latency_ms: Maximum time a frame may wait in a partial block
+
+        Yields:
+            Non-empty CANFrameBlock objects
+        """
+        max_latency = max_latency_ms / 1000.0
+        max_dlen = CANFD_MAX_DLEN if self.fd else CAN_MAX_DLEN
+
+        self._start()
+        block = CANFrameBlock(max_frames, max_dlen=max_dlen, channel=self.channel)
+        deadline = 0.0
 
         while self._running:
-            try:
-                msg = self.bus.recv(timeout=1.0)  # type: ignore[union-attr]
-                if msg is None:
-                    # recv() timed out — check _running flag and loop back
-                    continue
-
-                if msg.is_error_frame:
-                    self._stats["errors"] += 1
-                    logger.debug("Error frame on %s: %s", self.channel, msg)
-                    continue
-
-                # Prefer hardware timestamp from SocketCAN, fall back to wall clock
-                t: float = float(msg.timestamp) if msg.timestamp else time.time()
-
-                self._stats["frames"] += 1
-                self._frame_times.append(t)
-
-                # Prune stale entries from the rolling window
-                cutoff = t - self._fps_window
-                while self._frame_times and self._frame_times[0] < cutoff:
-                    self._frame_times.popleft()
-
-                yield CANFrame(
-                    timestamp=t,
-                    arb_id=msg.arbitration_id,
-                    dlc=msg.dlc,
-                    data=bytes(msg.data),
-                    is_error=False,
-                    is_fd=bool(getattr(msg, "is_fd", False)),
-                    channel=self.channel,
-                )
+            if block.count:
+                timeout = max(0.0, deadline - time.monotonic())
+            else:
+                timeout = 1.0
 
-            except can.CanOperationError as exc:
-                logger.error("CAN bus-off / operation error on %s: %s", self.channel, exc)
-                self._stats["bus_off"] += 1
-                while self._running and not self.reconnect():
-                    pass
+            msg = self._recv_message(timeout=timeout)
+            if msg is not None:
+                t = self._record_frame(msg)
+                if not block.count:
+                    deadline = time.monotonic() + max_latency
+                block.append(t, msg.arbitration_id, msg.dlc, msg.data)
 
-            except Exception as exc:  # noqa: BLE001
-                logger.error("Unexpected error reading CAN: %s", exc)
-                time.sleep(0.1)
+            if block.count and (block.is_full or time.monotonic() >= deadline):
+                yield block
+                block = CANFrameBlock(max_frames, max_dlen=max_dlen, channel=self.channel)
+
+        if block.count:
+            yield block
 
     # ------------------------------------------------------------------
     # Lifecycle
     # ------------------------------------------------------------------
 
+    def set_filters(self, filters: Optional[list]) -> None:
+        """
+        Replace the hardware filters on the open bus, without reconnecting.
+
+        Also used for later reconnects.  Frames already queued in the socket
+        were matched against the old filters.
+
+        Args:
+            filters: python-can filter dicts; None or [] receives every frame
+        """
+        self.filters = filters or None
+        if self.bus is not None:
+            self.bus.set_filters(self.filters)
+        logger.info("CAN filters on %s: %d", self.channel, len(filters or []))
+
     def stop(self) -> None:
         """Signal the read loop to exit on next iteration."""
         self._running = False
@@ -223,17 +681,38 @@ class RealCANReader:
     # Statistics
     # ------------------------------------------------------------------
 
-    def get_stats(self) -> dict:
+    def get_stats(self, top_n: int = 5) -> dict:
         """
         Return a snapshot of current statistics.
 
+        Args:
+            top_n: Number of highest-rate arbitration IDs to include
+
         Returns:
-            Dict with keys: frames, errors, bus_off, frames_per_sec
+            Dict with keys: frames, errors, bus_off, kernel_drops (always 0:
+            python-can exposes no socket drop counter), iface_drops,
+            seq_gaps, seq_lost, seq_repeats, frames_per_sec, bus_load_pct,
+            bus_load_peak_pct, top_ids (per-ID rate/jitter dicts) and
+            missing_ids
         """
         now = time.time()
-        recent = sum(1 for t in self._frame_times if now - t <= self._fps_window)
-        fps = round(recent / self._fps_window, 1)
-        return {**self._stats, "frames_per_sec": fps}
+        return {
+            **self._stats,
+            **_loss_stats(self._iface_drops, self._seq_checker),
+            **self.bus_load.get_stats(now),
+            "frames_per_sec": self.frame_stats.frames_per_sec(now),
+            "top_ids": self.frame_stats.top_ids(top_n, now),
+            "missing_ids": self.frame_stats.missing_ids(now),
+        }
+
+    def bus_load_summary(self, start: float, end: float) -> dict:
+        """
+        Return bus utilization over ``[start, end]`` (see ``BusLoadMeter.summary``).
+
+        Returns:
+            {channel: summary dict}
+        """
+        return {self.channel: self.bus_load.summary(start, end)}
 
     # ------------------------------------------------------------------
     # Context manager support
@@ -251,147 +730,963 @@ class RealCANReader:
         self.close()
 
 
-class SimulatedCANReader:
-    """Simulates CAN frames using a DBC file to generate realistic data."""
+class RawSocketCANReader:
+    """
+    Reads CAN frames directly from a Linux ``AF_CAN``/``CAN_RAW`` socket.
+
+    Bypasses python-can entirely: frames are received with ``recvmsg_into``
+    into a reusable buffer, the ``struct can_frame`` / ``struct canfd_frame``
+    header is decoded with a precompiled ``struct.Struct``, and the kernel
+    receive timestamp is taken from ``SO_TIMESTAMP`` ancillary data.  Frames
+    dropped because the socket receive queue overflowed are reported via
+    ``SO_RXQ_OVFL``.
+
+    Selected with ``can.interface: socketcan_raw``.  Accepts the same ``can``
+    config keys as ``RealCANReader``; ``bitrate`` is informational only since
+    the bitrate is configured on the interface (``ip link set can0 type can
+    bitrate ...``).
+    """
 
-    def __init__(
-        self,
-        dbc_path: str,
-        frequency: int = 100,
-        duration_sec: Optional[float] = None,
-    ) -> None:
+    def __init__(self, config: dict) -> None:
         """
-        Initialize simulated CAN reader.
+        Initialize from the full configuration dict.
 
         Args:
-            dbc_path: Path to DBC file
-            frequency: Simulation frequency in Hz (frames per second)
-            duration_sec: Optional duration to run simulation (None = infinite)
+            config: Full config dict; reads the ``can`` section (see RealCANReader)
         """
-        self.dbc_path = dbc_path
-        self.frequency = frequency
-        self.duration_sec = duration_sec
-        self.db: Optional[cantools.database.Database] = None
+        can_cfg = config["can"]
+        self.interface: str = can_cfg["interface"]
+        self.channel: str = can_cfg["channel"]
+        self.bitrate: int = can_cfg["bitrate"]
+        self.fd: bool = bool(can_cfg.get("fd", False))
+        self.filters: Optional[list] = can_cfg.get("filters")
+        self.receive_own: bool = bool(can_cfg.get("receive_own_messages", False))
+        self.rcvbuf_bytes: Optional[int] = can_cfg.get("rcvbuf_bytes")
+
+        self.sock: Optional[socket.socket] = None
+        self._running: bool = False
+        self._reconnect_delay: float = 1.0
+        self._max_reconnect_delay: float = 30.0
+
+        # Reusable receive buffer, sized for the largest frame we may get
+        self._buf = bytearray(CANFD_MTU)
+        self._view = memoryview(self._buf)
+        self._ancbufsize = socket.CMSG_SPACE(_TIMEVAL.size) + socket.CMSG_SPACE(
+            _DROP_COUNT.size
+        )
+        self._timestamp: float = 0.0
+        self._frame_size: int = 0
+
+        # Cumulative counters
+        self._stats: dict[str, int] = {
+            "frames": 0,
+            "errors": 0,
+            "bus_off": 0,
+            "kernel_drops": 0,
+        }
+
+        # O(1) frame-rate buckets and per-arb_id timing statistics
+        self.frame_stats = _frame_stats_from_config(config)
+        self.bus_load = _bus_load_from_config(config)
+
+        # Frame-loss detection
+        self._rxq_drops_seen: int = 0  # last SO_RXQ_OVFL value on this socket
+        self._iface_drops = InterfaceDropMonitor(self.channel)
+        self._seq_checker = sequence_checker_from_config(can_cfg)
 
         logger.info(
-            "Initializing simulated CAN reader: dbc=%s frequency=%dHz",
-            dbc_path,
-            frequency,
+            "Initializing RawSocketCANReader: channel=%s bitrate=%d fd=%s",
+            self.channel,
+            self.bitrate,
+            self.fd,
         )
 
-    def __enter__(self) -> "SimulatedCANReader":
-        """Context manager entry."""
+    # ------------------------------------------------------------------
+    # Connection management
+    # ------------------------------------------------------------------
+
+    def connect(self) -> bool:
+        """
+        Open and bind the raw CAN socket.
+
+        Returns:
+            True if the socket was opened successfully, False otherwise.
+        """
+        sock: Optional[socket.socket] = None
         try:
-            self.db = cantools.database.load_file(self.dbc_path)
-            logger.info(
-                "Loaded DBC file: %d messages, %d signals",
-                len(self.db.messages),
-                sum(len(msg.signals) for msg in self.db.messages),
+            sock = socket.socket(socket.AF_CAN, socket.SOCK_RAW, socket.CAN_RAW)
+            sock.setsockopt(
+                SOL_CAN_RAW, CAN_RAW_RECV_OWN_MSGS, 1 if self.receive_own else 0
             )
-        except Exception as exc:
-            logger.error("Failed to load DBC file: %s", exc)
-            raise
-        return self
+            if self.fd:
+                sock.setsockopt(SOL_CAN_RAW, CAN_RAW_FD_FRAMES, 1)
+            # Deliver error frames so they can be counted
+            sock.setsockopt(SOL_CAN_RAW, CAN_RAW_ERR_FILTER, CAN_ERR_MASK)
+            if self.filters:
+                sock.setsockopt(SOL_CAN_RAW, CAN_RAW_FILTER, _pack_filters(self.filters))
+            sock.setsockopt(socket.SOL_SOCKET, SO_TIMESTAMP, 1)
+            # Attach the socket's cumulative drop counter to every frame
+            sock.setsockopt(socket.SOL_SOCKET, SO_RXQ_OVFL, 1)
+            if self.rcvbuf_bytes:
+                _set_rcvbuf(sock, int(self.rcvbuf_bytes), self.channel)
+            sock.bind((self.channel,))
+        except OSError as exc:
+            logger.error("Failed to open raw CAN socket on %s: %s", self.channel, exc)
+            if sock is not None:
+                sock.close()
+            return False
 
-    def __exit__(
-        self,
-        exc_type: Optional[type],
-        exc_val: Optional[BaseException],
-        exc_tb: object,
-    ) -> None:
-        """Context manager exit."""
-        self.close()
+        self.sock = sock
+        self._rxq_drops_seen = 0  # counter restarts with every socket
+        if self._seq_checker is not None:
+            self._seq_checker.reset()
+        self._reconnect_delay = 1.0  # reset backoff on success
+        logger.info("Connected raw socket to %s", self.channel)
+        return True
 
-    def _generate_signal_value(
-        self, signal: cantools.database.Signal, t: float
-    ) -> float:
+    def reconnect(self) -> bool:
         """
-        Generate a realistic signal value based on its characteristics.
+        Close the current socket (if any) and try to reconnect with exponential
+        backoff (1 s -> 2 s -> 4 s ... up to 30 s).
+
+        Returns:
+            True if reconnection succeeded, False otherwise.
+        """
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except Exception:  # noqa: BLE001
+                pass
+            self.sock = None
+
+        logger.warning(
+            "Reconnecting to %s in %.1f s...", self.channel, self._reconnect_delay
+        )
+        time.sleep(self._reconnect_delay)
+        self._reconnect_delay = min(
+            self._reconnect_delay * 2, self._max_reconnect_delay
+        )
+        return self.connect()
+
+    # ------------------------------------------------------------------
+    # Frame reading
+    # ------------------------------------------------------------------
+
+    def _start(self) -> None:
+        """Mark the reader as running and block until the socket is open."""
+        self._running = True
+
+        if self.sock is None and not self.connect():
+            while self._running and not self.reconnect():
+                pass
+
+    def _recv_frame(self, timeout: float, reconnect: bool = True) -> int:
+        """
+        Receive one data frame into the reusable buffer.
+
+        Error frames are counted and swallowed; OS errors (interface down,
+        bus-off) trigger a reconnect.  On success ``self._timestamp`` holds the
+        kernel receive time of the frame.
 
         Args:
-            signal: DBC signal definition
-            t: Current simulation time in seconds
+            timeout: Maximum time to wait for a frame (seconds, 0 = poll)
+            reconnect: Reconnect (blocking) after an OS error; if False the
+                socket is only closed and ``fileno()`` returns -1
 
         Returns:
-            Generated physical value
+            CAN ID word (with EFF/RTR flags) of the received frame, or -1 if
+            nothing usable arrived in time.
         """
-        import math
-        import random
-
-        signal_name = signal.name.lower()
-
-        # Temperature signals: slow rise with noise
-        if "temp" in signal_name:
-            base = (signal.minimum + signal.maximum) / 2
-            rise = (signal.maximum - signal.minimum) * 0.3 * math.tanh(t / 300)
-            noise = random.gauss(0, (signal.maximum - signal.minimum) * 0.02)
-            return min(signal.maximum, max(signal.minimum, base + rise + noise))
-
-        # RPM: sinusoidal with ramps
-        elif "rpm" in signal_name:
-            if t < 60:
-                base = signal.minimum + (signal.maximum - signal.minimum) * (t / 60)
-            elif t < 300:
-                base = signal.maximum * 0.8
-            elif t < 360:
-                base = signal.maximum * 0.8 * (1 - (t - 300) / 60)
-            else:
-                base = signal.minimum
-            noise = random.gauss(0, signal.maximum * 0.02)
-            return min(signal.maximum, max(signal.minimum, base + noise))
-
-        # SOC: linear decrease
-        elif "soc" in signal_name:
-            rate = (signal.maximum - signal.minimum) / 3600
-            value = signal.maximum - rate * t
-            return max(signal.minimum, value)
-
-        # Voltage: stable with small noise
-        elif "voltage" in signal_name or "volt" in signal_name:
-            base = (
-                (signal.minimum + signal.maximum) / 2
-                + (signal.maximum - signal.minimum) * 0.2
+        sock = self.sock
+        try:
+            sock.settimeout(timeout)  # type: ignore[union-attr]
+            nbytes, ancdata, _flags, _addr = sock.recvmsg_into(  # type: ignore[union-attr]
+                [self._view], self._ancbufsize
             )
-            noise = random.gauss(0, (signal.maximum - signal.minimum) * 0.01)
-            return min(signal.maximum, max(signal.minimum, base + noise))
-
-        # Current: correlated with RPM pattern
-        elif "current" in signal_name:
-            if t < 60:
-                base = (
-                    signal.minimum
-                    + (signal.maximum - signal.minimum) * 0.3 * (t / 60)
-                )
-            elif t < 300:
-                base = (signal.maximum - signal.minimum) * 0.4
+        except (TimeoutError, BlockingIOError):
+            return -1
+        except OSError as exc:
+            logger.error("CAN socket error on %s: %s", self.channel, exc)
+            self._stats["bus_off"] += 1
+            if reconnect:
+                while self._running and not self.reconnect():
+                    pass
             else:
-                base = signal.minimum
-            noise = random.gauss(0, abs(signal.maximum - signal.minimum) * 0.05)
-            return min(signal.maximum, max(signal.minimum, base + noise))
+                try:
+                    sock.close()  # type: ignore[union-attr]
+                except Exception:  # noqa: BLE001
+                    pass
+                self.sock = None
+            return -1
+
+        t, drops = _parse_ancillary(ancdata)
+        if drops is not None and drops != self._rxq_drops_seen:
+            lost = (drops - self._rxq_drops_seen) & 0xFFFFFFFF
+            self._rxq_drops_seen = drops
+            self._stats["kernel_drops"] += lost
+            logger.warning(
+                "Socket receive queue on %s overflowed: %d frames dropped",
+                self.channel,
+                lost,
+            )
 
-        # Default: sinusoidal pattern
-        else:
-            mid = (signal.minimum + signal.maximum) / 2
-            amplitude = (signal.maximum - signal.minimum) * 0.3
-            period = 30.0
-            value = mid + amplitude * math.sin(2 * math.pi * t / period)
-            noise = random.gauss(0, amplitude * 0.05)
-            return min(signal.maximum, max(signal.minimum, value + noise))
+        if nbytes != CAN_MTU and nbytes != CANFD_MTU:
+            logger.debug("Ignoring short read of %d bytes on %s", nbytes, self.channel)
+            return -1
+
+        can_id = _CAN_ID.unpack_from(self._buf)[0]
+        if can_id & CAN_ERR_FLAG:
+            self._stats["errors"] += 1
+            if can_id & CAN_ERR_BUSOFF:
+                self._stats["bus_off"] += 1
+            logger.debug("Error frame on %s: 0x%08X", self.channel, can_id)
+            return -1
+
+        self._timestamp = t if t is not None else time.time()
+        self._frame_size = nbytes
+        return can_id
+
+    def _record_frame(self, can_id: int, arb_id: int, t: float) -> None:
+        """Update statistics for the frame in the receive buffer."""
+        self._stats["frames"] += 1
+        self.frame_stats.record(arb_id, t)
+        fd = self._frame_size == CANFD_MTU
+        self.bus_load.record(
+            t,
+            self._buf[4],
+            bool(can_id & CAN_EFF_FLAG),
+            fd,
+            fd and bool(self._buf[5] & CANFD_BRS),
+        )
+        if self._seq_checker is not None and arb_id in self._seq_checker:
+            self._seq_checker.check(arb_id, self._view[8:8 + self._buf[4]])
 
     def read_frames(self) -> Generator[CANFrame, None, None]:
         """
-        Generate simulated CAN frames.
+        Yield CAN frames from the socket indefinitely.
 
-        Yields:
-            CANFrame objects at the configured frequency
+        Automatically reconnects on socket errors.
+        Call ``stop()`` (or close the context manager) to end the loop.
+        Error frames are counted in stats but NOT yielded.
         """
-        if self.db is None:
-            raise RuntimeError("DBC not loaded. Use context manager.")
+        self._start()
+        buf = self._buf
 
-        logger.info("Starting CAN frame simulation...")
+        while self._running:
+            can_id = self._recv_frame(timeout=1.0)
+            if can_id < 0:
+                continue
+
+            t = self._timestamp
+            arb_id = can_id & (CAN_EFF_MASK if can_id & CAN_EFF_FLAG else CAN_SFF_MASK)
+            self._record_frame(can_id, arb_id, t)
+            length = buf[4]
+            yield CANFrame(
+                timestamp=t,
+                arb_id=arb_id,
+                dlc=length,
+                data=bytes(buf[8:8 + length]),
+                is_error=False,
+                is_fd=self._frame_size == CANFD_MTU,
+                channel=self.channel,
+            )
+
+    def read_batches(
+        self,
+        max_frames: int = 1024,
+        max_latency_ms: float = 50.0,
+    ) -> Generator[CANFrameBlock, None, None]:
+        """
+        Yield CAN frames from the socket as columnar ``CANFrameBlock`` chunks.
+
+        Same contract as ``RealCANReader.read_batches()``: a block is yielded
+        when it is full or ``max_latency_ms`` after its first frame arrived.
+
+        Args:
+            max_frames: Block capacity (frames)
+            max_latency_ms: Maximum time a frame may wait in a partial block
+
+        Yields:
+            Non-empty CANFrameBlock objects
+        """
+        max_latency = max_latency_ms / 1000.0
+        max_dlen = CANFD_MAX_DLEN if self.fd else CAN_MAX_DLEN
+        view = self._view
+
+        self._start()
+        block = CANFrameBlock(max_frames, max_dlen=max_dlen, channel=self.channel)
+        deadline = 0.0
+
+        while self._running:
+            if block.count:
+                timeout = max(0.0, deadline - time.monotonic())
+            else:
+                timeout = 1.0
+
+            can_id = self._recv_frame(timeout=timeout)
+            if can_id >= 0:
+                t = self._timestamp
+                arb_id = can_id & (CAN_EFF_MASK if can_id & CAN_EFF_FLAG else CAN_SFF_MASK)
+                self._record_frame(can_id, arb_id, t)
+                if not block.count:
+                    deadline = time.monotonic() + max_latency
+                length = view[4]
+                block.append(t, arb_id, length, view[8:8 + length])
+
+            if block.count and (block.is_full or time.monotonic() >= deadline):
+                yield block
+                block = CANFrameBlock(max_frames, max_dlen=max_dlen, channel=self.channel)
+
+        if block.count:
+            yield block
+
+    # ------------------------------------------------------------------
+    # Event-loop integration
+    # ------------------------------------------------------------------
+
+    def open(self) -> None:
+        """Open the socket for ``drain_into()``; retries until connected or ``stop()``."""
+        self._start()
+
+    def reopen(self) -> None:
+        """Reconnect with backoff after ``drain_into()`` closed the socket; blocks."""
+        while self._running and not self.reconnect():
+            pass
+
+    def fileno(self) -> int:
+        """Descriptor of the open socket for an event loop's reader callback (-1 if closed)."""
+        return self.sock.fileno() if self.sock is not None else -1
+
+    def drain_into(self, block: CANFrameBlock) -> int:
+        """
+        Move the frames already queued on the socket into ``block`` without waiting.
+
+        Meant to be called when the socket is readable.  Stops when nothing
+        more is queued, at an error frame, or when the block is full; the
+        socket stays readable in the last two cases.  A socket error closes
+        the socket instead of reconnecting here, so an event loop is never
+        held up by the backoff: ``fileno()`` then returns -1 and the caller
+        runs ``reopen()`` off the loop.
+
+        Args:
+            block: Block to append to
+
+        Returns:
+            Number of frames appended
+        """
+        view = self._view
+        appended = 0
+        while self._running and self.sock is not None and not block.is_full:
+            can_id = self._recv_frame(timeout=0.0, reconnect=False)
+            if can_id < 0:
+                break
+            t = self._timestamp
+            arb_id = can_id & (CAN_EFF_MASK if can_id & CAN_EFF_FLAG else CAN_SFF_MASK)
+            self._record_frame(can_id, arb_id, t)
+            length = view[4]
+            block.append(t, arb_id, length, view[8:8 + length])
+            appended += 1
+        return appended
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def set_filters(self, filters: Optional[list]) -> None:
+        """
+        Replace the ``CAN_RAW_FILTER`` list on the open socket, without rebinding.
+
+        Also used for later reconnects.  Frames already queued in the socket
+        were matched against the old filters.
+
+        Args:
+            filters: python-can filter dicts; None or [] receives every frame
+        """
+        self.filters = filters or None
+        if self.sock is not None:
+            # An empty filter list would receive nothing; 0/0 matches every ID
+            packed = _pack_filters(self.filters or [{"can_id": 0, "can_mask": 0}])
+            self.sock.setsockopt(SOL_CAN_RAW, CAN_RAW_FILTER, packed)
+        logger.info("CAN filters on %s: %d", self.channel, len(filters or []))
+
+    def stop(self) -> None:
+        """Signal the read loop to exit on next iteration."""
+        self._running = False
+
+    def close(self) -> None:
+        """Stop reading and close the socket."""
+        self.stop()
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except Exception:  # noqa: BLE001
+                pass
+            self.sock = None
+            logger.info("Raw CAN socket %s closed", self.channel)
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
+    def get_stats(self, top_n: int = 5) -> dict:
+        """
+        Return a snapshot of current statistics.
+
+        Args:
+            top_n: Number of highest-rate arbitration IDs to include
+
+        Returns:
+            Dict with keys: frames, errors, bus_off, kernel_drops (socket
+            receive-queue overflows, SO_RXQ_OVFL), iface_drops, seq_gaps,
+            seq_lost, seq_repeats, frames_per_sec, bus_load_pct,
+            bus_load_peak_pct, top_ids (per-ID rate/jitter dicts) and
+            missing_ids
+        """
+        now = time.time()
+        return {
+            **self._stats,
+            **_loss_stats(self._iface_drops, self._seq_checker),
+            **self.bus_load.get_stats(now),
+            "frames_per_sec": self.frame_stats.frames_per_sec(now),
+            "top_ids": self.frame_stats.top_ids(top_n, now),
+            "missing_ids": self.frame_stats.missing_ids(now),
+        }
+
+    def bus_load_summary(self, start: float, end: float) -> dict:
+        """
+        Return bus utilization over ``[start, end]`` (see ``BusLoadMeter.summary``).
+
+        Returns:
+            {channel: summary dict}
+        """
+        return {self.channel: self.bus_load.summary(start, end)}
+
+    # ------------------------------------------------------------------
+    # Context manager support
+    # ------------------------------------------------------------------
+
+    def __enter__(self) -> "RawSocketCANReader":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: object,
+    ) -> None:
+        self.close()
+
+
+class MultiChannelCANReader:
+    """
+    Captures several CAN channels concurrently and merges them into a single
+    timestamp-ordered stream.
+
+    Each channel gets its own hardware reader (built by ``create_reader``) and
+    receive thread.  Received blocks are pushed through one shared queue and
+    k-way merged by row index: a heap holds the next timestamp of each
+    channel, and runs of rows are copied column by column into mixed-channel
+    blocks, without a ``CANFrame`` per frame.  A row is released once the
+    newest timestamp seen on any channel is more than ``reorder_window_ms``
+    ahead of it (or the bus has been idle for that long).  Frames arriving
+    later than the window are still emitted and counted as ``late_frames``.
+    """
+
+    def __init__(self, config: dict) -> None:
+        """
+        Initialize from the full configuration dict.
+
+        Args:
+            config: Full config dict; reads the ``can`` section:
+                channels (list): Channel names, or dicts overriding any ``can``
+                    key per channel, e.g.
+                    ["can0", {"channel": "can1", "bitrate": 250000}]
+                reorder_window_ms (float, optional): Merge reorder window
+                    (default 20)
+                max_reorder_frames (int, optional): Upper bound on frames held
+                    for reordering (default 50000)
+                All other keys are shared defaults for every channel.
+        """
+        can_cfg = config["can"]
+        base = {k: v for k, v in can_cfg.items() if k != "channels"}
+
+        self.readers: list[RealCANReader | RawSocketCANReader] = []
+        # Channels with their own "filters" keep them when set_filters() is called
+        self._own_filters: list[bool] = []
+        for entry in can_cfg["channels"]:
+            overrides = entry if isinstance(entry, dict) else {"channel": entry}
+            self.readers.append(create_reader({**config, "can": {**base, **overrides}}))
+            self._own_filters.append("filters" in overrides)
+
+        self.channels: list[str] = [r.channel for r in self.readers]
+        self.reorder_window: float = float(can_cfg.get("reorder_window_ms", 20)) / 1000.0
+        self.max_reorder_frames: int = int(can_cfg.get("max_reorder_frames", 50000))
+
+        self._queue: queue.Queue = queue.Queue()
+        self._threads: list[threading.Thread] = []
+        self._running: bool = False
+        self._late_frames: int = 0
+
+        logger.info(
+            "Initializing MultiChannelCANReader: channels=%s reorder_window=%.0f ms",
+            ",".join(self.channels),
+            self.reorder_window * 1000,
+        )
+
+    # ------------------------------------------------------------------
+    # Receive threads and merge
+    # ------------------------------------------------------------------
+
+    def _receive_worker(self, reader: "RealCANReader | RawSocketCANReader") -> None:
+        """Drain one channel in blocks and hand them to the merge queue."""
+        latency_ms = max(1.0, self.reorder_window * 500)  # half the window
+        try:
+            index = self.readers.index(reader)
+            for block in reader.read_batches(max_latency_ms=latency_ms):
+                self._queue.put((index, block))
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Receive thread for %s failed: %s", reader.channel, exc)
+        logger.info("Receive thread for %s stopped", reader.channel)
+
+    def _start_threads(self) -> None:
+        """Start one receive thread per channel (idempotent)."""
+        if self._threads:
+            return
+        self._running = True
+        for reader in self.readers:
+            t = threading.Thread(
+                target=self._receive_worker,
+                args=(reader,),
+                daemon=True,
+                name=f"can-rx-{reader.channel}",
+            )
+            t.start()
+            self._threads.append(t)
+
+    def _merged(self) -> Generator[Optional[tuple[CANFrameBlock, int, int]], None, None]:
+        """
+        Yield merged runs of rows in timestamp order.
+
+        Each run is ``(block, start, stop)``: rows of one received block that
+        come before the next row of any other channel.  The block is only
+        valid until the next run is requested.  Yields None on idle ticks (no
+        data for one reorder window) so batching callers can enforce their
+        own latency deadlines.
+        """
+        self._start_threads()
+        # Per channel: received blocks and the next row of the first one
+        pending: list[deque[CANFrameBlock]] = [deque() for _ in self.readers]
+        rows = [0] * len(self.readers)
+        heap: list[tuple[int, int]] = []  # (next timestamp ns, channel index)
+        buffered = 0
+        newest_ns = 0
+        last_emitted_ns = 0
+
+        def release(cutoff_ns: float) -> Iterator[tuple[CANFrameBlock, int, int]]:
+            nonlocal buffered, last_emitted_ns
+            while heap and (heap[0][0] <= cutoff_ns or buffered > self.max_reorder_frames):
+                _, index = heapq.heappop(heap)
+                block, start = pending[index][0], rows[index]
+                timestamps = block.timestamps_ns
+                # Up to the next row of another channel, and not past the cutoff
+                bound = min(heap[0][0], cutoff_ns) if heap else cutoff_ns
+                if buffered > self.max_reorder_frames:
+                    bound = heap[0][0] if heap else math.inf
+                stop = max(start + 1, bisect.bisect_right(timestamps, bound, start, block.count))
+                late = bisect.bisect_left(timestamps, last_emitted_ns, start, stop) - start
+                self._late_frames += late
+                last_emitted_ns = max(last_emitted_ns, timestamps[stop - 1])
+                buffered -= stop - start
+
+                if stop < block.count:
+                    rows[index] = stop
+                else:
+                    pending[index].popleft()
+                    rows[index] = 0
+                if pending[index]:
+                    head = pending[index][0]
+                    heapq.heappush(heap, (head.timestamps_ns[rows[index]], index))
+                yield block, start, stop
+
+        while self._running:
+            try:
+                index, block = self._queue.get(timeout=self.reorder_window)
+            except queue.Empty:
+                block = None
+
+            if block is None:
+                # Bus idle for a full window: nothing can arrive earlier now
+                yield from release(math.inf)
+                yield None
+                continue
+            if not block.count:
+                continue
+            if not pending[index]:
+                heapq.heappush(heap, (block.timestamps_ns[0], index))
+            pending[index].append(block)
+            buffered += block.count
+            newest_ns = max(newest_ns, block.timestamps_ns[block.count - 1])
+            yield from release(newest_ns - self.reorder_window * 1e9)
+
+        yield from release(math.inf)
+
+    def read_frames(self) -> Generator[CANFrame, None, None]:
+        """
+        Yield frames from all channels as one timestamp-ordered stream.
+
+        Each frame carries its source interface in ``CANFrame.channel``.
+        """
+        for run in self._merged():
+            if run is not None:
+                block, start, stop = run
+                yield from block.frames(start, stop)
+
+    def read_batches(
+        self,
+        max_frames: int = 1024,
+        max_latency_ms: float = 50.0,
+    ) -> Generator[CANFrameBlock, None, None]:
+        """
+        Yield the merged stream as mixed-channel ``CANFrameBlock`` chunks.
+
+        Args:
+            max_frames: Block capacity (frames)
+            max_latency_ms: Maximum time a frame may wait in a partial block
+
+        Yields:
+            Non-empty CANFrameBlock objects with per-row channel names
+        """
+        max_latency = max_latency_ms / 1000.0
+        max_dlen = max(
+            CANFD_MAX_DLEN if r.fd else CAN_MAX_DLEN for r in self.readers
+        )
+        block = CANFrameBlock(max_frames, max_dlen=max_dlen, channel=self.channels[0])
+        deadline = 0.0
+
+        for run in self._merged():
+            if run is not None:
+                src, start, stop = run
+                while start < stop:
+                    if not block.count:
+                        deadline = time.monotonic() + max_latency
+                    n = min(stop - start, block.capacity - block.count)
+                    block.extend_from(src, start, start + n)
+                    start += n
+                    if block.is_full:
+                        yield block
+                        block = CANFrameBlock(
+                            max_frames, max_dlen=max_dlen, channel=self.channels[0]
+                        )
+
+            if block.count and time.monotonic() >= deadline:
+                yield block
+                block = CANFrameBlock(
+                    max_frames, max_dlen=max_dlen, channel=self.channels[0]
+                )
+
+        if block.count:
+            yield block
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def set_filters(self, filters: Optional[list]) -> None:
+        """
+        Replace the filters of every channel without filters of its own.
+
+        Args:
+            filters: python-can filter dicts; None or [] receives every frame
+        """
+        for reader, own in zip(self.readers, self._own_filters):
+            if not own:
+                reader.set_filters(filters)
+
+    def stop(self) -> None:
+        """Signal every receive loop and the merge loop to exit."""
+        self._running = False
+        for reader in self.readers:
+            reader.stop()
+
+    def close(self) -> None:
+        """Stop all channels, join receive threads and close the buses."""
+        self.stop()
+        for t in self._threads:
+            t.join(timeout=2.0)
+        self._threads = []
+        for reader in self.readers:
+            reader.close()
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
+    def get_stats(self, top_n: int = 5) -> dict:
+        """
+        Return a snapshot of statistics summed over all channels.
+
+        Args:
+            top_n: Number of highest-rate arbitration IDs to include
+
+        Returns:
+            Dict with the summed counters of the channel readers,
+            frames_per_sec, bus_load_pct and bus_load_peak_pct (busiest
+            channel), top_ids, missing_ids, late_frames and
+            ``channels`` (per-channel stats by name)
+        """
+        per_channel = {r.channel: r.get_stats(top_n) for r in self.readers}
+        totals = {
+            key: sum(s[key] for s in per_channel.values())
+            for key in (
+                "frames",
+                "errors",
+                "bus_off",
+                "kernel_drops",
+                "iface_drops",
+                "seq_gaps",
+                "seq_lost",
+                "seq_repeats",
+            )
+        }
+        fps = round(sum(s["frames_per_sec"] for s in per_channel.values()), 1)
+        top_ids = sorted(
+            (s for stats in per_channel.values() for s in stats["top_ids"]),
+            key=lambda s: s["rate_hz"],
+            reverse=True,
+        )[:top_n]
+        missing_ids = sorted(
+            {arb_id for stats in per_channel.values() for arb_id in stats["missing_ids"]}
+        )
+        return {
+            **totals,
+            "frames_per_sec": fps,
+            # Buses are independent: report the busiest one
+            "bus_load_pct": max(s["bus_load_pct"] for s in per_channel.values()),
+            "bus_load_peak_pct": max(s["bus_load_peak_pct"] for s in per_channel.values()),
+            "top_ids": top_ids,
+            "missing_ids": missing_ids,
+            "late_frames": self._late_frames,
+            "channels": per_channel,
+        }
+
+    def bus_load_summary(self, start: float, end: float) -> dict:
+        """
+        Return bus utilization over ``[start, end]`` for every channel.
+
+        Returns:
+            {channel: summary dict}
+        """
+        summary: dict = {}
+        for r in self.readers:
+            summary.update(r.bus_load_summary(start, end))
+        return summary
+
+    # ------------------------------------------------------------------
+    # Context manager support
+    # ------------------------------------------------------------------
+
+    def __enter__(self) -> "MultiChannelCANReader":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: object,
+    ) -> None:
+        self.close()
+
+
+def create_reader(
+    config: dict,
+) -> "RealCANReader | RawSocketCANReader | MultiChannelCANReader":
+    """
+    Build the hardware CAN reader selected by the ``can`` config section.
+
+    More than one entry in ``can.channels`` selects ``MultiChannelCANReader``;
+    otherwise ``can.interface: socketcan_raw`` selects ``RawSocketCANReader``
+    and every other interface is passed to python-can via ``RealCANReader``.
+
+    Args:
+        config: Full configuration dict
+
+    Returns:
+        Reader instance (not yet connected)
+    """
+    can_cfg = config["can"]
+    channels = can_cfg.get("channels")
+    if channels and len(channels) > 1:
+        return MultiChannelCANReader(config)
+    if channels:
+        entry = channels[0]
+        overrides = entry if isinstance(entry, dict) else {"channel": entry}
+        base = {k: v for k, v in can_cfg.items() if k != "channels"}
+        config = {**config, "can": {**base, **overrides}}
+
+    if config["can"]["interface"] == RAW_SOCKETCAN_INTERFACE:
+        return RawSocketCANReader(config)
+    return RealCANReader(config)
+
+
+def _generate_signal_value(
+    signal: cantools.database.Signal, t: float, rng: random.Random
+) -> float:
+    """
+    Generate a realistic signal value based on its characteristics.
+
+    Args:
+        signal: DBC signal definition
+        t: Current simulation time in seconds
+        rng: Random source for the noise component
+
+    Returns:
+        Generated physical value
+    """
+    signal_name = signal.name.lower()
+
+    # Temperature signals: slow rise with noise
+    if "temp" in signal_name:
+        base = (signal.minimum + signal.maximum) / 2
+        rise = (signal.maximum - signal.minimum) * 0.3 * math.tanh(t / 300)
+        noise = rng.gauss(0, (signal.maximum - signal.minimum) * 0.02)
+        return min(signal.maximum, max(signal.minimum, base + rise + noise))
+
+    # RPM: sinusoidal with ramps
+    elif "rpm" in signal_name:
+        if t < 60:
+            base = signal.minimum + (signal.maximum - signal.minimum) * (t / 60)
+        elif t < 300:
+            base = signal.maximum * 0.8
+        elif t < 360:
+            base = signal.maximum * 0.8 * (1 - (t - 300) / 60)
+        else:
+            base = signal.minimum
+        noise = rng.gauss(0, signal.maximum * 0.02)
+        return min(signal.maximum, max(signal.minimum, base + noise))
+
+    # SOC: linear decrease
+    elif "soc" in signal_name:
+        rate = (signal.maximum - signal.minimum) / 3600
+        value = signal.maximum - rate * t
+        return max(signal.minimum, value)
+
+    # Voltage: stable with small noise
+    elif "voltage" in signal_name or "volt" in signal_name:
+        base = (
+            (signal.minimum + signal.maximum) / 2
+            + (signal.maximum - signal.minimum) * 0.2
+        )
+        noise = rng.gauss(0, (signal.maximum - signal.minimum) * 0.01)
+        return min(signal.maximum, max(signal.minimum, base + noise))
+
+    # Current: correlated with RPM pattern
+    elif "current" in signal_name:
+        if t < 60:
+            base = (
+                signal.minimum
+                + (signal.maximum - signal.minimum) * 0.3 * (t / 60)
+            )
+        elif t < 300:
+            base = (signal.maximum - signal.minimum) * 0.4
+        else:
+            base = signal.minimum
+        noise = rng.gauss(0, abs(signal.maximum - signal.minimum) * 0.05)
+        return min(signal.maximum, max(signal.minimum, base + noise))
+
+    # Default: sinusoidal pattern
+    else:
+        mid = (signal.minimum + signal.maximum) / 2
+        amplitude = (signal.maximum - signal.minimum) * 0.3
+        period = 30.0
+        value = mid + amplitude * math.sin(2 * math.pi * t / period)
+        noise = rng.gauss(0, amplitude * 0.05)
+        return min(signal.maximum, max(signal.minimum, value + noise))
+
+
+class SimulatedCANReader:
+    """Simulates CAN frames using a DBC file to generate realistic data."""
+
+    def __init__(
+        self,
+        dbc_path: str,
+        frequency: int = 100,
+        duration_sec: Optional[float] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize simulated CAN reader.
+
+        Args:
+            dbc_path: Path to DBC file
+            frequency: Simulation frequency in Hz (frames per second)
+            duration_sec: Optional duration to run simulation (None = infinite)
+            seed: Seed for the signal noise (None = non-deterministic)
+        """
+        self.dbc_path = dbc_path
+        self.frequency = frequency
+        self.duration_sec = duration_sec
+        self.db: Optional[cantools.database.Database] = None
+        self._rng = random.Random(seed)
+
+        logger.info(
+            "Initializing simulated CAN reader: dbc=%s frequency=%dHz",
+            dbc_path,
+            frequency,
+        )
+
+    def __enter__(self) -> "SimulatedCANReader":
+        """Context manager entry."""
+        try:
+            self.db = cantools.database.load_file(self.dbc_path)
+            logger.info(
+                "Loaded DBC file: %d messages, %d signals",
+                len(self.db.messages),
+                sum(len(msg.signals) for msg in self.db.messages),
+            )
+        except Exception as exc:
+            logger.error("Failed to load DBC file: %s", exc)
+            raise
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: object,
+    ) -> None:
+        """Context manager exit."""
+        self.close()
+
+    def _generate_signal_value(
+        self, signal: cantools.database.Signal, t: float
+    ) -> float:
+        """
+        Generate a realistic signal value based on its characteristics.
+
+        Args:
+            signal: DBC signal definition
+            t: Current simulation time in seconds
+
+        Returns:
+            Generated physical value
+        """
+        return _generate_signal_value(signal, t, self._rng)
+
+    def read_frames(self) -> Generator[CANFrame, None, None]:
+        """
+        Generate simulated CAN frames.
+
+        Yields:
+            CANFrame objects at the configured frequency
+        """
+        if self.db is None:
+            raise RuntimeError("DBC not loaded. Use context manager.")
+
+        logger.info("Starting CAN frame simulation...")
         start_time = time.time()
         frame_count = 0
-        sleep_interval = 1.0 / self.frequency
+        tick = 0
+        tick_interval = 1.0 / self.frequency
 
         try:
             while True:
@@ -432,7 +1727,11 @@ class SimulatedCANReader:
                         "Simulated %d frames, elapsed=%.1f s", frame_count, elapsed
                     )
 
-                time.sleep(sleep_interval)
+                # Sleep until the next absolute tick so loop overhead does not drift
+                tick += 1
+                delay = start_time + tick * tick_interval - time.time()
+                if delay > 0:
+                    time.sleep(delay)
 
         except KeyboardInterrupt:
             logger.info("Simulation stopped. Total frames: %d", frame_count)
@@ -443,3 +1742,294 @@ class SimulatedCANReader:
     def close(self) -> None:
         """Clean up resources."""
         logger.info("Simulation reader closed")
+
+
+class LoadGeneratorCANReader:
+    """
+    High-rate, cycle-time-accurate CAN traffic generator for load testing.
+
+    Every DBC message is sent at its ``GenMsgCycleTime`` (or
+    ``default_cycle_ms``), divided by ``rate_scale``.  Frames are placed on an
+    absolute deadline schedule (``phase + k * period``), so rates do not drift
+    with loop overhead, and are produced one time slice at a time straight
+    into ``CANFrameBlock`` columns.  Signal waveforms are sampled and encoded
+    ``variants`` times per ``encode_interval_sec`` for each message and the
+    encoded payloads are reused by every frame in that interval, which keeps
+    cantools out of the per-frame path.
+
+    With a fixed ``seed`` and ``realtime=False`` the generated payloads and
+    (start-relative) timestamps are identical on every run.
+    """
+
+    def __init__(
+        self,
+        dbc_path: str,
+        rate_scale: float = 1.0,
+        seed: int = 0,
+        duration_sec: Optional[float] = None,
+        default_cycle_ms: float = 100.0,
+        realtime: bool = True,
+        encode_interval_sec: float = 1.0,
+        variants: int = 32,
+        channel: str = "sim0",
+    ) -> None:
+        """
+        Initialize the load generator.
+
+        Args:
+            dbc_path: Path to DBC file
+            rate_scale: Multiplier applied to every message rate
+            seed: Seed for signal noise and schedule phases
+            duration_sec: Simulated time to generate (None = infinite)
+            default_cycle_ms: Cycle time for messages without GenMsgCycleTime
+            realtime: Pace output to the wall clock; when False, generate as
+                fast as possible (timestamps still follow the schedule)
+            encode_interval_sec: Simulated time covered by one set of
+                precomputed payloads per message
+            variants: Encoded payloads per message and interval
+            channel: Channel name reported on every frame
+        """
+        if rate_scale <= 0:
+            raise ValueError(f"rate_scale must be positive, got {rate_scale}")
+        self.dbc_path = dbc_path
+        self.rate_scale = rate_scale
+        self.seed = seed
+        self.duration_sec = duration_sec
+        self.default_cycle_ms = default_cycle_ms
+        self.realtime = realtime
+        self.encode_interval_sec = encode_interval_sec
+        self.variants = max(1, variants)
+        self.channel = channel
+        self.db: Optional[cantools.database.Database] = None
+
+        self._rng = random.Random(seed)
+        self._running: bool = False
+        # Per message: (message, period_sec, phase_sec)
+        self._schedule: list[tuple[cantools.database.Message, float, float]] = []
+        # Per message: interval index and encoded payloads of that interval
+        self._payload_epochs: list[int] = []
+        self._payloads: list[list[bytes]] = []
+        self._stats: dict[str, int] = {"frames": 0, "late_slices": 0}
+
+        logger.info(
+            "Initializing load generator: dbc=%s rate_scale=%.1f seed=%d realtime=%s",
+            dbc_path,
+            rate_scale,
+            seed,
+            realtime,
+        )
+
+    def __enter__(self) -> "LoadGeneratorCANReader":
+        """Context manager entry: load the DBC and build the schedule."""
+        try:
+            self.db = cantools.database.load_file(self.dbc_path)
+        except Exception as exc:
+            logger.error("Failed to load DBC file: %s", exc)
+            raise
+
+        for message in self.db.messages:
+            cycle_ms = message.cycle_time or self.default_cycle_ms
+            period = cycle_ms / 1000.0 / self.rate_scale
+            # Real ECUs are not phase-aligned; spread messages over their period
+            phase = self._rng.uniform(0.0, period)
+            self._schedule.append((message, period, phase))
+        self._payload_epochs = [-1] * len(self._schedule)
+        self._payloads = [[] for _ in self._schedule]
+
+        logger.info(
+            "Load generator schedule: %d messages, target %.0f fps",
+            len(self._schedule),
+            self.target_fps,
+        )
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: object,
+    ) -> None:
+        """Context manager exit."""
+        self.close()
+
+    @property
+    def target_fps(self) -> float:
+        """Frame rate implied by the schedule."""
+        return sum(1.0 / period for _, period, _ in self._schedule)
+
+    def _payloads_for(self, index: int, epoch: int) -> list[bytes]:
+        """
+        Return the encoded payloads of message ``index`` for interval ``epoch``.
+
+        Signal values are sampled ``variants`` times across the interval and
+        encoded once; the result is cached until the interval changes.
+        """
+        if self._payload_epochs[index] == epoch:
+            return self._payloads[index]
+
+        message = self._schedule[index][0]
+        t0 = epoch * self.encode_interval_sec
+        step = self.encode_interval_sec / self.variants
+        payloads = []
+        for v in range(self.variants):
+            t = t0 + v * step
+            values = {
+                signal.name: _generate_signal_value(signal, t, self._rng)
+                for signal in message.signals
+            }
+            try:
+                payloads.append(bytes(message.encode(values, strict=False)))
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Failed to encode message %s: %s", message.name, exc)
+                payloads.append(bytes(message.length))
+
+        self._payload_epochs[index] = epoch
+        self._payloads[index] = payloads
+        return payloads
+
+    def _slice_schedule(self, t_start: float, t_end: float) -> list[tuple[float, int]]:
+        """Return (deadline, message index) of every frame due in [t_start, t_end)."""
+        due: list[tuple[float, int]] = []
+        for index, (_, period, phase) in enumerate(self._schedule):
+            k0 = max(0, math.ceil((t_start - phase) / period))
+            k1 = max(0, math.ceil((t_end - phase) / period))
+            if k1 > k0:
+                deadlines = [phase + k * period for k in range(k0, k1)]
+                due.extend(zip(deadlines, itertools.repeat(index)))
+        due.sort()
+        return due
+
+    def read_batches(
+        self,
+        max_frames: int = 1024,
+        max_latency_ms: float = 50.0,
+    ) -> Generator[CANFrameBlock, None, None]:
+        """
+        Yield generated frames as columnar ``CANFrameBlock`` chunks.
+
+        Simulated time advances in slices of ``max_latency_ms``; every slice's
+        frames are emitted in deadline order, in blocks of at most
+        ``max_frames``.  In realtime mode each slice is released when the wall
+        clock reaches its end.
+
+        Args:
+            max_frames: Block capacity (frames)
+            max_latency_ms: Length of one scheduling slice
+
+        Yields:
+            Non-empty CANFrameBlock objects
+        """
+        if self.db is None:
+            raise RuntimeError("DBC not loaded. Use context manager.")
+
+        slice_sec = max(max_latency_ms, 1.0) / 1000.0
+        max_dlen = max(
+            (message.length for message, _, _ in self._schedule), default=CAN_MAX_DLEN
+        )
+        interval = self.encode_interval_sec
+        variants = self.variants
+
+        self._running = True
+        wall_start = time.time()
+        t_start = 0.0
+        block = CANFrameBlock(max_frames, max_dlen=max_dlen, channel=self.channel)
+
+        logger.info("Starting load generation at %.0f fps...", self.target_fps)
+        while self._running:
+            t_end = t_start + slice_sec
+            if self.duration_sec is not None:
+                t_end = min(t_end, self.duration_sec)
+                if t_end <= t_start:
+                    break
+
+            if self.realtime:
+                delay = wall_start + t_end - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -slice_sec:
+                    self._stats["late_slices"] += 1
+
+            for deadline, index in self._slice_schedule(t_start, t_end):
+                message = self._schedule[index][0]
+                epoch = int(deadline / interval)
+                variant = int((deadline / interval - epoch) * variants) % variants
+                data = self._payloads_for(index, epoch)[variant]
+                block.append(wall_start + deadline, message.frame_id, len(data), data)
+                if block.is_full:
+                    self._stats["frames"] += block.count
+                    yield block
+                    block = CANFrameBlock(max_frames, max_dlen=max_dlen, channel=self.channel)
+
+            if block.count:
+                self._stats["frames"] += block.count
+                yield block
+                block = CANFrameBlock(max_frames, max_dlen=max_dlen, channel=self.channel)
+            t_start = t_end
+
+        logger.info(
+            "Load generation finished: %d frames in %.1f s",
+            self._stats["frames"],
+            time.time() - wall_start,
+        )
+
+    def read_frames(self) -> Generator[CANFrame, None, None]:
+        """
+        Generate frames one by one (slow path; prefer ``read_batches()``).
+
+        Yields:
+            CANFrame objects in deadline order
+        """
+        for block in self.read_batches():
+            yield from block.frames()
+
+    def get_stats(self) -> dict:
+        """
+        Return generator statistics.
+
+        Returns:
+            Dict with keys: frames, late_slices (realtime slices released more
+            than one slice behind the wall clock) and target_fps
+        """
+        return {**self._stats, "target_fps": round(self.target_fps, 1)}
+
+    def stop(self) -> None:
+        """Signal the generation loop to exit on next iteration."""
+        self._running = False
+
+    def close(self) -> None:
+        """Stop generating."""
+        self.stop()
+        logger.info("Load generator closed")
+
+
+def create_simulated_reader(config: dict) -> SimulatedCANReader | LoadGeneratorCANReader:
+    """
+    Build the reader for ``--simulate`` from the ``dbc`` and ``simulation``
+    config sections.
+
+    Args:
+        config: Full config dict
+
+    Returns:
+        LoadGeneratorCANReader when ``simulation.load_test`` is set, otherwise
+        a SimulatedCANReader
+    """
+    dbc_path = config["dbc"]["path"]
+    sim_cfg = config.get("simulation", {})
+    seed = sim_cfg.get("seed")
+
+    if sim_cfg.get("load_test", False):
+        return LoadGeneratorCANReader(
+            dbc_path=dbc_path,
+            rate_scale=float(sim_cfg.get("rate_scale", 1.0)),
+            seed=int(seed) if seed is not None else 0,
+            duration_sec=sim_cfg.get("duration_sec"),
+            default_cycle_ms=float(sim_cfg.get("default_cycle_ms", 100.0)),
+            realtime=bool(sim_cfg.get("realtime", True)),
+        )
+    return SimulatedCANReader(
+        dbc_path=dbc_path,
+        frequency=int(sim_cfg.get("frequency", 100)),
+        duration_sec=sim_cfg.get("duration_sec"),
+        seed=seed,
+    )
@@ -0,0 +1,117 @@
+"""Change-only capture: suppress frames whose payload did not change."""
+
+import logging
+from array import array
+
+from .can_reader import CANFrameBlock
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeOnlyFilter:
+    """
+    Drops frames that repeat the previous payload of their arbitration ID.
+
+    A frame is kept when its payload differs from the last frame of the same
+    (channel, arb_id), when the ID is seen for the first time, or when the
+    last kept frame is ``keyframe_sec`` old (a keyframe).  Every kept frame
+    carries in its ``suppressed`` column the number of identical frames
+    dropped since the previous kept frame of that ID, so consumers can
+    rebuild the step signal and the original frame count.
+
+    Runs on the writer thread; not thread-safe.
+    """
+
+    def __init__(self, keyframe_sec: float = 1.0) -> None:
+        """
+        Initialize the filter.
+
+        Args:
+            keyframe_sec: Force a kept frame per ID at least this often
+        """
+        if keyframe_sec <= 0:
+            raise ValueError(f"keyframe_sec must be positive, got {keyframe_sec}")
+        self.keyframe_sec = keyframe_sec
+        self._keyframe_ns = int(keyframe_sec * 1e9)
+        # (channel, arb_id) -> [last payload, last kept timestamp (ns), suppressed]
+        self._state: dict[tuple[str, int], list] = {}
+        self._stats: dict[str, int] = {"frames_in": 0, "frames_kept": 0, "suppressed": 0}
+
+        logger.info("Change-only capture enabled: keyframe every %.1f s", keyframe_sec)
+
+    def filter_block(self, block: CANFrameBlock) -> CANFrameBlock:
+        """
+        Return the frames of ``block`` that carry new information.
+
+        Args:
+            block: Block from the reader (not modified)
+
+        Returns:
+            A new block with a ``suppressed`` column, or ``block`` itself when
+            every frame is kept and nothing was pending
+        """
+        n = block.count
+        timestamps = block.timestamps_ns
+        arb_ids = block.arb_ids
+        offsets = block.offsets
+        payload = block.payload
+        channels = block.channels
+        state = self._state
+        keyframe_ns = self._keyframe_ns
+
+        kept: list[int] = []
+        counts = array("I")
+        max_dlen = 0
+        for i in range(n):
+            ts = timestamps[i]
+            start = offsets[i]
+            end = offsets[i + 1]
+            data = bytes(payload[start:end])
+            key = (channels[i] if channels is not None else block.channel, arb_ids[i])
+
+            entry = state.get(key)
+            if entry is None:
+                state[key] = [data, ts, 0]
+                count = 0
+            elif entry[0] == data and ts - entry[1] < keyframe_ns:
+                entry[2] += 1
+                continue
+            else:
+                count = entry[2]
+                entry[0] = data
+                entry[1] = ts
+                entry[2] = 0
+
+            kept.append(i)
+            counts.append(count)
+            if end - start > max_dlen:
+                max_dlen = end - start
+
+        self._stats["frames_in"] += n
+        self._stats["frames_kept"] += len(kept)
+        self._stats["suppressed"] += n - len(kept)
+
+        if len(kept) == n and not any(counts):
+            return block
+
+        out = CANFrameBlock(max(len(kept), 1), max_dlen=max_dlen, channel=block.channel)
+        for j, i in enumerate(kept):
+            out.append(0.0, arb_ids[i], block.dlcs[i], payload[offsets[i]:offsets[i + 1]])
+            # Exact ns timestamp; append() would round-trip through float seconds
+            out.timestamps_ns[j] = timestamps[i]
+        if channels is not None:
+            out.channels = [channels[i] for i in kept]
+        out.suppressed = counts
+        return out
+
+    def get_stats(self) -> dict:
+        """
+        Return filter counters.
+
+        Returns:
+            Dict with keys: frames_in, frames_kept, suppressed, ratio
+            (kept / in)
+        """
+        frames_in = self._stats["frames_in"]
+        ratio = self._stats["frames_kept"] / frames_in if frames_in else 1.0
+        return {**self._stats, "ratio": round(ratio, 3)}
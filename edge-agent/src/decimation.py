@@ -0,0 +1,297 @@
+"""Per-ID decimation: thin out high-rate arbitration IDs before batching."""
+
+import logging
+from array import array
+from typing import Optional
+
+import cantools
+
+from .can_reader import CANFrameBlock
+
+logger = logging.getLogger(__name__)
+
+# Decimation policies
+EVERY_NTH = "every_nth"  # keep frames 0, n, 2n, ... of the ID
+INTERVAL = "interval"  # keep at most one frame per interval_ms
+MIN_MAX = "min_max"  # keep the frames holding a signal's min and max per interval_ms
+DECIMATION_POLICIES = (EVERY_NTH, INTERVAL, MIN_MAX)
+
+# Row kept by the filter: (timestamp_ns, arb_id, dlc, data, channel, suppressed)
+_Row = tuple[int, int, int, bytes, str, int]
+
+
+def raw_signal_value(data: bytes, rule: dict) -> Optional[int]:
+    """Extract the raw integer of a rule's signal, or None if the payload is too short."""
+    start = rule["start_bit"]
+    length = rule["length"]
+    if rule["byte_order"] == "big_endian":
+        # cantools numbers Motorola start bits MSB-first within each byte
+        msb = (start // 8) * 8 + 7 - start % 8
+        shift = 8 * len(data) - msb - length
+        if shift < 0:
+            return None
+        value = (int.from_bytes(data, "big") >> shift) & ((1 << length) - 1)
+    else:
+        if start + length > 8 * len(data):
+            return None
+        value = (int.from_bytes(data, "little") >> start) & ((1 << length) - 1)
+    if rule["is_signed"] and value >> (length - 1):
+        value -= 1 << length
+    return value
+
+
+def resolve_signal_rules(rules: list[dict], dbc_path: Optional[str], section: str) -> list[dict]:
+    """
+    Resolve ``message``/``signal`` names in per-ID rules via the DBC.
+
+    Rules naming a ``message`` get its ``arb_id``; rules naming a ``signal``
+    get its bit layout (start_bit, length, byte_order, is_signed) and its
+    scale and offset.  Rules that already give these are returned unchanged.
+
+    Args:
+        rules: Rule list from the config
+        dbc_path: DBC file path (only needed for rules using names)
+        section: Config section name for error messages
+
+    Returns:
+        Rules keyed by arb_id
+    """
+    if not any("message" in r for r in rules):
+        return rules
+    if not dbc_path:
+        raise ValueError(f"{section} rules naming a message require dbc.path")
+
+    db = cantools.database.load_file(dbc_path)
+    resolved = []
+    for rule in rules:
+        rule = dict(rule)
+        if "message" in rule:
+            message = db.get_message_by_name(rule.pop("message"))
+            rule["arb_id"] = message.frame_id
+            if "signal" in rule:
+                signal = message.get_signal_by_name(rule.pop("signal"))
+                rule.update(
+                    start_bit=signal.start,
+                    length=signal.length,
+                    byte_order=signal.byte_order,
+                    is_signed=signal.is_signed,
+                    scale=signal.scale,
+                    offset=signal.offset,
+                )
+        resolved.append(rule)
+    return resolved
+
+
+def resolve_decimation_rules(rules: list[dict], dbc_path: Optional[str]) -> list[dict]:
+    """
+    Resolve ``message``/``signal`` names in decimation rules via the DBC.
+
+    Args:
+        rules: ``pipeline.decimation`` config list
+        dbc_path: DBC file path (only needed for rules using names)
+
+    Returns:
+        Rules keyed by arb_id (see ``resolve_signal_rules``)
+    """
+    return resolve_signal_rules(rules, dbc_path, "Decimation")
+
+
+class DecimationFilter:
+    """
+    Thins out configured arbitration IDs according to a per-ID policy.
+
+    Policies:
+        every_nth (n): keep every Nth frame of the ID
+        interval (interval_ms): keep a frame only if at least interval_ms
+            passed since the last kept frame of the ID
+        min_max (interval_ms, start_bit, length[, byte_order, is_signed]):
+            per aligned interval, keep the frames holding the minimum and the
+            maximum raw value of one signal.  A window's frames are emitted
+            when the ID's next window starts (or on ``flush()``), so they
+            arrive up to one interval late.
+
+    State is kept per (channel, arb_id); IDs without a rule pass through.
+    Runs on the writer thread; not thread-safe.
+    """
+
+    def __init__(self, rules: list[dict]) -> None:
+        """
+        Initialize the filter.
+
+        Args:
+            rules: Resolved rules, each with ``arb_id``, ``policy`` and the
+                policy's parameters (see ``resolve_decimation_rules``)
+        """
+        self._rules: dict[int, dict] = {}
+        for rule in rules:
+            policy = rule.get("policy")
+            if policy not in DECIMATION_POLICIES:
+                raise ValueError(
+                    f"Unknown decimation policy {policy!r}; use one of {DECIMATION_POLICIES}"
+                )
+            if "arb_id" not in rule:
+                raise ValueError(f"Decimation rule needs arb_id or message: {rule}")
+            compiled = {"policy": policy}
+            if policy == EVERY_NTH:
+                compiled["n"] = int(rule.get("n", 0))
+                if compiled["n"] < 1:
+                    raise ValueError(f"every_nth needs n >= 1: {rule}")
+            else:
+                interval_ms = float(rule.get("interval_ms", 0))
+                if interval_ms <= 0:
+                    raise ValueError(f"{policy} needs a positive interval_ms: {rule}")
+                compiled["interval_ns"] = int(interval_ms * 1e6)
+            if policy == MIN_MAX:
+                if "start_bit" not in rule or "length" not in rule:
+                    raise ValueError(f"min_max needs a signal or start_bit/length: {rule}")
+                compiled.update(
+                    start_bit=int(rule["start_bit"]),
+                    length=int(rule["length"]),
+                    byte_order=rule.get("byte_order", "little_endian"),
+                    is_signed=bool(rule.get("is_signed", False)),
+                )
+            self._rules[int(rule["arb_id"])] = compiled
+
+        # (channel, arb_id) -> every_nth: [count]; interval: [last kept ns];
+        # min_max: [window, min row, min value, max row, max value]
+        self._state: dict[tuple[str, int], list] = {}
+        self._stats: dict[str, int] = {"frames_in": 0, "frames_kept": 0}
+        self._removed: dict[str, int] = {p: 0 for p in DECIMATION_POLICIES}
+
+        logger.info(
+            "Decimation enabled for %d ID(s): %s",
+            len(self._rules),
+            ", ".join(f"0x{i:03X}={r['policy']}" for i, r in sorted(self._rules.items())),
+        )
+
+    def _close_window(self, entry: list, released: list[_Row]) -> None:
+        """Release the min and max frames of a min_max window."""
+        released.append(entry[1])
+        if entry[3] is not entry[1]:
+            released.append(entry[3])
+            self._removed[MIN_MAX] -= 1
+
+    def filter_block(self, block: CANFrameBlock) -> CANFrameBlock:
+        """
+        Return the frames of ``block`` that survive decimation.
+
+        Args:
+            block: Block from the reader (not modified)
+
+        Returns:
+            A new block, or ``block`` itself if it holds no decimated ID and
+            no min_max window closed
+        """
+        n = block.count
+        self._stats["frames_in"] += n
+        rules = self._rules
+        arb_ids = block.arb_ids
+        if not any(arb_ids[i] in rules for i in range(n)):
+            self._stats["frames_kept"] += n
+            return block
+
+        timestamps = block.timestamps_ns
+        dlcs = block.dlcs
+        offsets = block.offsets
+        payload = block.payload
+        channels = block.channels
+        suppressed = block.suppressed
+        state = self._state
+        removed = self._removed
+
+        out: list[_Row] = []
+        for i in range(n):
+            arb_id = arb_ids[i]
+            channel = channels[i] if channels is not None else block.channel
+            ts = timestamps[i]
+            sup = suppressed[i] if suppressed is not None else 0
+            rule = rules.get(arb_id)
+            if rule is None:
+                data = bytes(payload[offsets[i]:offsets[i + 1]])
+                out.append((ts, arb_id, dlcs[i], data, channel, sup))
+                continue
+
+            policy = rule["policy"]
+            key = (channel, arb_id)
+            entry = state.get(key)
+            if policy == EVERY_NTH:
+                if entry is None:
+                    entry = state[key] = [0]
+                keep = entry[0] % rule["n"] == 0
+                entry[0] += 1
+            elif policy == INTERVAL:
+                keep = entry is None or ts - entry[0] >= rule["interval_ns"]
+                if keep:
+                    state[key] = [ts]
+            else:
+                data = bytes(payload[offsets[i]:offsets[i + 1]])
+                row = (ts, arb_id, dlcs[i], data, channel, sup)
+                value = raw_signal_value(data, rule)
+                if value is None:
+                    # Payload too short to hold the signal: keep it as is
+                    out.append(row)
+                    continue
+                window = ts // rule["interval_ns"]
+                # Every frame counts as removed until its window is released
+                removed[MIN_MAX] += 1
+                if entry is not None and entry[0] == window:
+                    if value < entry[2]:
+                        entry[1], entry[2] = row, value
+                    elif value > entry[4]:
+                        entry[3], entry[4] = row, value
+                    continue
+                if entry is not None:
+                    self._close_window(entry, out)
+                    removed[MIN_MAX] -= 1
+                state[key] = [window, row, value, row, value]
+                continue
+
+            if keep:
+                data = bytes(payload[offsets[i]:offsets[i + 1]])
+                out.append((ts, arb_id, dlcs[i], data, channel, sup))
+            else:
+                removed[policy] += 1
+
+        return self._to_block(out, block.channel)
+
+    def _to_block(self, rows: list[_Row], channel: str) -> CANFrameBlock:
+        """Build a timestamp-ordered block from kept rows."""
+        rows.sort(key=lambda r: r[0])
+        self._stats["frames_kept"] += len(rows)
+        max_dlen = max((len(r[3]) for r in rows), default=0)
+        out = CANFrameBlock(max(len(rows), 1), max_dlen=max_dlen, channel=channel)
+        for j, (ts, arb_id, dlc, data, _, _) in enumerate(rows):
+            out.append(0.0, arb_id, dlc, data)
+            out.timestamps_ns[j] = ts
+        if any(r[4] != channel for r in rows):
+            out.channels = [r[4] for r in rows]
+        if any(r[5] for r in rows):
+            out.suppressed = array("I", (r[5] for r in rows))
+        return out
+
+    def flush(self) -> Optional[CANFrameBlock]:
+        """
+        Release the frames of all open min_max windows (call on shutdown).
+
+        Returns:
+            Block of released frames, or None if none were held
+        """
+        released: list[_Row] = []
+        for key, entry in list(self._state.items()):
+            if self._rules[key[1]]["policy"] == MIN_MAX:
+                self._close_window(entry, released)
+                self._removed[MIN_MAX] -= 1
+                del self._state[key]
+        if not released:
+            return None
+        return self._to_block(released, released[0][4])
+
+    def get_stats(self) -> dict:
+        """
+        Return decimation counters.
+
+        Returns:
+            Dict with keys: frames_in, frames_kept, removed (frames removed
+            per policy; open min_max windows count as removed until released)
+        """
+        return {**self._stats, "removed": dict(self._removed)}
@@ -0,0 +1,421 @@
+"""On-device diagnostics HTTP server over recently captured frames and signals."""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qs, urlparse
+
+from .can_reader import CANFrameBlock
+from .listeners import Listener
+from .live_decoder import CompiledDecoder
+from .openmetrics import OPENMETRICS_CONTENT_TYPE, PROMETHEUS_CONTENT_TYPE, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+# Width of the per-signal min/max buckets
+_BUCKET_SEC = 10
+
+
+class _SignalStats:
+    """Latest value and per-bucket ranges of one decoded signal."""
+
+    __slots__ = ("unit", "value", "timestamp", "samples", "buckets")
+
+    def __init__(self, unit: str) -> None:
+        self.unit = unit
+        self.value = 0.0
+        self.timestamp = 0.0
+        self.samples = 0
+        # [bucket start, min, max] per _BUCKET_SEC, oldest first
+        self.buckets: deque[list] = deque()
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Record one sample."""
+        self.value = value
+        self.timestamp = timestamp
+        self.samples += 1
+        bucket = int(timestamp) // _BUCKET_SEC * _BUCKET_SEC
+        buckets = self.buckets
+        if buckets and buckets[-1][0] == bucket:
+            entry = buckets[-1]
+            if value < entry[1]:
+                entry[1] = value
+            elif value > entry[2]:
+                entry[2] = value
+        else:
+            buckets.append([bucket, value, value])
+
+
+class RecentDataListener(Listener):
+    """
+    Keeps the last ``window_sec`` of captured blocks in memory.
+
+    Blocks are held by reference (they are already columnar and never
+    modified), evicted by age and by a total frame cap.  With a decoder,
+    every frame is also decoded on the listener thread into per-signal
+    latest values and min/max ranges over the window.  The query methods
+    are called from HTTP threads and only take snapshots.
+    """
+
+    def __init__(
+        self,
+        window_sec: float = 300,
+        max_frames: int = 500_000,
+        decoder: Optional[CompiledDecoder] = None,
+    ) -> None:
+        """
+        Initialize the listener.
+
+        Args:
+            window_sec: Age of the oldest frame kept
+            max_frames: Upper bound on frames kept, whatever their age
+            decoder: Compiled DBC decoder for signal statistics (None = raw
+                frames only)
+        """
+        self.window_sec = window_sec
+        self.max_frames = max_frames
+        self.decoder = decoder
+        self._blocks: deque[CANFrameBlock] = deque()
+        self._frames = 0
+        self._signals: dict[str, _SignalStats] = {}
+        self._lock = threading.Lock()
+
+    def on_block(self, block: CANFrameBlock) -> None:
+        """Keep the block and update the signal statistics."""
+        if not block.count:
+            return
+        horizon = block.timestamps_ns[block.count - 1] - int(self.window_sec * 1e9)
+        with self._lock:
+            blocks = self._blocks
+            blocks.append(block)
+            self._frames += block.count
+            while blocks and (
+                blocks[0].timestamps_ns[blocks[0].count - 1] < horizon
+                or self._frames - blocks[0].count >= self.max_frames
+            ):
+                self._frames -= blocks.popleft().count
+
+            if self.decoder is not None:
+                self._decode(block, horizon / 1e9)
+
+    def _decode(self, block: CANFrameBlock, horizon: float) -> None:
+        """Fold the decoded signals of a block into the statistics."""
+        decode = self.decoder.decode
+        signals = self._signals
+        timestamps = block.timestamps_ns
+        arb_ids = block.arb_ids
+        offsets = block.offsets
+        payload = block.payload
+        for i in range(block.count):
+            decoded = decode(arb_ids[i], bytes(payload[offsets[i]:offsets[i + 1]]))
+            if not decoded:
+                continue
+            t = timestamps[i] / 1e9
+            for key, value, unit in decoded:
+                stats = signals.get(key)
+                if stats is None:
+                    stats = signals[key] = _SignalStats(unit)
+                stats.add(t, value)
+        oldest_bucket = horizon // _BUCKET_SEC * _BUCKET_SEC
+        for stats in signals.values():
+            while stats.buckets and stats.buckets[0][0] < oldest_bucket:
+                stats.buckets.popleft()
+
+    def _snapshot(self) -> list[CANFrameBlock]:
+        with self._lock:
+            return list(self._blocks)
+
+    def frames(
+        self,
+        seconds: float = 10,
+        arb_id: Optional[int] = None,
+        limit: int = 1000,
+    ) -> list[dict]:
+        """
+        Return the newest frames.
+
+        Args:
+            seconds: Only frames this recent (relative to the newest frame)
+            arb_id: Only frames with this arbitration ID
+            limit: Maximum number of frames (the newest are kept)
+
+        Returns:
+            Frames in time order as dicts with keys: timestamp, arb_id,
+            dlc, data (hex) and channel
+        """
+        blocks = self._snapshot()
+        if not blocks:
+            return []
+        since = blocks[-1].timestamps_ns[blocks[-1].count - 1] - int(seconds * 1e9)
+        out: list[dict] = []
+        for block in reversed(blocks):
+            timestamps = block.timestamps_ns
+            if timestamps[block.count - 1] < since:
+                break
+            channels = block.channels
+            for i in range(block.count - 1, -1, -1):
+                if timestamps[i] < since or len(out) >= limit:
+                    break
+                if arb_id is not None and block.arb_ids[i] != arb_id:
+                    continue
+                out.append({
+                    "timestamp": timestamps[i] / 1e9,
+                    "arb_id": block.arb_ids[i],
+                    "dlc": block.dlcs[i],
+                    "data": block.payload[block.offsets[i]:block.offsets[i + 1]].hex(),
+                    "channel": channels[i] if channels is not None else block.channel,
+                })
+            if len(out) >= limit:
+                break
+        out.reverse()
+        return out
+
+    def signals(self) -> dict[str, dict]:
+        """
+        Return the latest value and window range of every decoded signal.
+
+        Returns:
+            "Message.Signal" -> dict with keys: value, unit, timestamp,
+            samples, min and max (over the kept window)
+        """
+        with self._lock:
+            return {
+                key: {
+                    "value": s.value,
+                    "unit": s.unit,
+                    "timestamp": s.timestamp,
+                    "samples": s.samples,
+                    "min": min((b[1] for b in s.buckets), default=s.value),
+                    "max": max((b[2] for b in s.buckets), default=s.value),
+                }
+                for key, s in sorted(self._signals.items())
+            }
+
+    def signal_history(self, key: str, seconds: float = 60) -> Optional[list[list[float]]]:
+        """
+        Decode one signal's samples from the kept frames.
+
+        Args:
+            key: "Message.Signal"
+            seconds: Only samples this recent (relative to the newest frame)
+
+        Returns:
+            [timestamp, value] pairs in time order, or None for a signal that
+            has not been seen
+        """
+        with self._lock:
+            known = key in self._signals
+        blocks = self._snapshot()
+        if self.decoder is None or not known or not blocks:
+            return None
+        frame_id = self.decoder.frame_ids[key.split(".", 1)[0]]
+        since = blocks[-1].timestamps_ns[blocks[-1].count - 1] - int(seconds * 1e9)
+        history = []
+        for block in blocks:
+            timestamps = block.timestamps_ns
+            if timestamps[block.count - 1] < since:
+                continue
+            for i in range(block.count):
+                if block.arb_ids[i] != frame_id or timestamps[i] < since:
+                    continue
+                data = bytes(block.payload[block.offsets[i]:block.offsets[i + 1]])
+                for name, value, _ in self.decoder.decode(frame_id, data) or ():
+                    if name == key:
+                        history.append([timestamps[i] / 1e9, value])
+        return history
+
+    def get_stats(self) -> dict:
+        """
+        Return what the buffer holds.
+
+        Returns:
+            Dict with keys: frames, blocks, signals, oldest and newest
+            (frame timestamps, None when empty)
+        """
+        blocks = self._snapshot()
+        return {
+            "frames": sum(b.count for b in blocks),
+            "blocks": len(blocks),
+            "signals": len(self._signals),
+            "oldest": blocks[0].first_timestamp if blocks else None,
+            "newest": blocks[-1].last_timestamp if blocks else None,
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """JSON endpoints over a ``DiagnosticsServer``."""
+
+    server: "DiagnosticsServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Never write access logs to stderr / the log file
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send(self, status: int, body: Any) -> None:
+        data = json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_metrics(self, registry: MetricsRegistry) -> None:
+        # Prometheus asks for OpenMetrics in Accept; anything else gets 0.0.4 text
+        openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+        data = registry.render(openmetrics=openmetrics).encode()
+        self.send_response(200)
+        self.send_header(
+            "Content-Type", OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE
+        )
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        recent = self.server.recent
+        try:
+            if url.path == "/":
+                self._send(200, {"endpoints": sorted(self.server.endpoints)})
+            elif url.path == "/metrics" and self.server.metrics is not None:
+                self._send_metrics(self.server.metrics)
+            elif url.path == "/api/status":
+                self._send(200, self.server.status())
+            elif url.path == "/api/frames":
+                arb_id = int(query["arb_id"], 0) if "arb_id" in query else None
+                self._send(200, recent.frames(
+                    seconds=float(query.get("seconds", 10)),
+                    arb_id=arb_id,
+                    limit=int(query.get("limit", 1000)),
+                ))
+            elif url.path == "/api/signals":
+                self._send(200, recent.signals())
+            elif url.path.startswith("/api/signals/"):
+                key = url.path[len("/api/signals/"):]
+                history = recent.signal_history(key, float(query.get("seconds", 60)))
+                if history is None:
+                    self._send(404, {"error": f"unknown signal {key}"})
+                else:
+                    self._send(200, {"signal": key, "samples": history})
+            else:
+                self._send(404, {"error": "not found"})
+        except ValueError as exc:
+            self._send(400, {"error": str(exc)})
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        if url.path == "/api/trigger" and self.server.trigger is not None:
+            name = parse_qs(url.query).get("name", ["http"])[-1]
+            if self.server.trigger(name):
+                self._send(202, {"triggered": name})
+            else:
+                self._send(409, {"error": "event capture is not configured"})
+        else:
+            self._send(404, {"error": "not found"})
+
+
+class DiagnosticsServer(ThreadingHTTPServer):
+    """
+    Embedded HTTP server for technicians at the vehicle.
+
+    Endpoints (JSON):
+        GET  /                       list of endpoints
+        GET  /api/status             pipeline and reader statistics
+        GET  /api/frames             newest frames (seconds, arb_id, limit)
+        GET  /api/signals            latest value and range per signal
+        GET  /api/signals/<M.S>      one signal's samples (seconds)
+        POST /api/trigger            event capture (name), if configured
+        GET  /metrics                agent metrics (OpenMetrics / Prometheus
+                                     text), if configured
+
+    Everything is served from ``RecentDataListener`` memory; nothing is read
+    from or written to disk.  Requests are handled on daemon threads, so a
+    slow client cannot hold up capture or shutdown.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        port: int,
+        recent: RecentDataListener,
+        status: Callable[[], dict],
+        trigger: Optional[Callable[[str], bool]] = None,
+        host: str = "127.0.0.1",
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        """
+        Bind the server (call ``start()`` to serve).
+
+        Args:
+            port: TCP port (0 = any free port)
+            recent: Buffer the endpoints read from
+            status: Returns the statistics for /api/status
+            trigger: Starts an event capture by name; returns False if
+                event capture is not configured
+            host: Address to bind; the endpoints are unauthenticated, so
+                "0.0.0.0" (every interface) is opt-in
+            metrics: Registry served on /metrics
+        """
+        super().__init__((host, port), _Handler)
+        self.recent = recent
+        self.status = status
+        self.trigger = trigger
+        self.metrics = metrics
+        self.endpoints = ["/api/status", "/api/frames", "/api/signals", "/api/signals/<name>"]
+        if trigger is not None:
+            self.endpoints.append("/api/trigger")
+        if metrics is not None:
+            self.endpoints.append("/metrics")
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        """Port actually bound."""
+        return self.server_address[1]
+
+    def start(self) -> None:
+        """Serve on a daemon thread."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.5}, daemon=True,
+            name="diagnostics-http",
+        )
+        self._thread.start()
+        logger.info("Diagnostics server listening on port %d", self.port)
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join(timeout=5)
+        self.server_close()
+
+
+def uptime_status(start: float, sources: dict[str, Callable[[], dict]]) -> Callable[[], dict]:
+    """
+    Build a /api/status callback collecting ``get_stats()`` of components.
+
+    Args:
+        start: Agent start time (``time.time()``)
+        sources: Section name -> stats callable; a failing source reports
+            its error instead
+
+    Returns:
+        Callable returning {"uptime_sec": ..., <section>: stats, ...}
+    """
+
+    def status() -> dict:
+        result: dict[str, Any] = {"uptime_sec": round(time.time() - start, 1)}
+        for name, get_stats in sources.items():
+            try:
+                result[name] = get_stats()
+            except Exception as exc:  # noqa: BLE001
+                result[name] = {"error": str(exc)}
+        return result
+
+    return status
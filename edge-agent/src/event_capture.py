@@ -0,0 +1,292 @@
+"""Event-triggered full-rate capture from a ring buffer of raw frame blocks."""
+
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .can_reader import CANFrameBlock
+from .decimation import raw_signal_value, resolve_signal_rules
+
+logger = logging.getLogger(__name__)
+
+# Trigger types
+FRAME = "frame"  # any frame whose arb_id matches (under an optional mask)
+THRESHOLD = "threshold"  # a signal crossing above/below a physical value
+TRIGGER_TYPES = (FRAME, THRESHOLD)
+
+# Name of triggers fired through EventCapture.trigger()
+MANUAL = "manual"
+
+_ALL_ID_BITS = 0x1FFFFFFF
+
+
+@dataclass
+class CapturedEvent:
+    """Raw frames around one trigger, ready to be written."""
+
+    name: str  # Name of the trigger that opened the event
+    trigger_ns: int  # Timestamp of the triggering frame (or manual request)
+    start_ns: int  # First timestamp of the capture window
+    end_ns: int  # Last timestamp of the capture window
+    blocks: list[CANFrameBlock] = field(default_factory=list)
+    triggers: int = 1  # Triggers that fired while the window was open
+
+
+def resolve_trigger_rules(rules: list[dict], dbc_path: Optional[str]) -> list[dict]:
+    """
+    Resolve ``message``/``signal`` names in trigger rules via the DBC.
+
+    Args:
+        rules: ``pipeline.trigger.rules`` config list
+        dbc_path: DBC file path (only needed for rules using names)
+
+    Returns:
+        Rules keyed by arb_id (see ``resolve_signal_rules``)
+    """
+    return resolve_signal_rules(rules, dbc_path, "Trigger")
+
+
+class EventCapture:
+    """
+    Keeps the last ``pre_sec`` of raw blocks and cuts events out of them.
+
+    Every block from the reader passes through ``add_block()`` before any
+    decimation or change-only filtering.  When a trigger fires, the blocks
+    covering ``pre_sec`` before the trigger are taken from the ring and
+    further blocks are collected until ``post_sec`` after it; the finished
+    ``CapturedEvent`` is then returned for writing.
+
+    Triggers:
+        frame (arb_id[, mask]): a frame whose ``arb_id & mask`` matches,
+            e.g. a DTC/fault message
+        threshold (arb_id, start_bit, length[, byte_order, is_signed,
+            scale, offset], above and/or below): the signal's physical value
+            goes above ``above`` or below ``below``; fires on the edge only
+            and re-arms once the value is back inside the limits
+        manual: ``trigger()`` from another thread (signal handler, HTTP)
+
+    Triggers firing while an event is open extend nothing; they are counted
+    on the open event.  A trigger that fired is ignored for ``holdoff_sec``
+    after its event ended, so a periodic fault frame does not produce
+    back-to-back events.  Blocks are shared with the other pipeline stages
+    and are never modified.  Runs on the writer thread; only ``trigger()``
+    is thread-safe.
+    """
+
+    def __init__(self, config: dict) -> None:
+        """
+        Initialize the ring buffer and triggers.
+
+        Args:
+            config: ``pipeline.trigger`` config section:
+                pre_sec (float): Seconds kept before the trigger (default 30)
+                post_sec (float): Seconds captured after it (default 10)
+                holdoff_sec (float): Quiet time per trigger after its event
+                    (default 0)
+                rules (list[dict]): Resolved trigger rules, each with
+                    ``name``, ``type`` and the type's parameters
+        """
+        self.pre_ns = int(float(config.get("pre_sec", 30)) * 1e9)
+        self.post_ns = int(float(config.get("post_sec", 10)) * 1e9)
+        self.holdoff_ns = int(float(config.get("holdoff_sec", 0)) * 1e9)
+        if self.pre_ns < 0 or self.post_ns < 0 or self.holdoff_ns < 0:
+            raise ValueError("Trigger pre_sec, post_sec and holdoff_sec must be >= 0")
+
+        # mask -> (arb_id & mask) -> compiled rules; usually a single mask
+        self._rules: dict[int, dict[int, list[dict]]] = {}
+        names = set()
+        for rule in config.get("rules", []):
+            kind = rule.get("type", FRAME)
+            if kind not in TRIGGER_TYPES:
+                raise ValueError(f"Unknown trigger type {kind!r}; use one of {TRIGGER_TYPES}")
+            if "arb_id" not in rule:
+                raise ValueError(f"Trigger rule needs arb_id or message: {rule}")
+            name = str(rule.get("name", f"0x{int(rule['arb_id']):03X}"))
+            if name in names or name == MANUAL:
+                raise ValueError(f"Duplicate trigger name {name!r}")
+            names.add(name)
+
+            compiled = {"name": name, "type": kind}
+            mask = _ALL_ID_BITS
+            if kind == FRAME:
+                mask = int(rule.get("mask", _ALL_ID_BITS))
+            else:
+                if "start_bit" not in rule or "length" not in rule:
+                    raise ValueError(f"threshold needs a signal or start_bit/length: {rule}")
+                if "above" not in rule and "below" not in rule:
+                    raise ValueError(f"threshold needs above and/or below: {rule}")
+                compiled.update(
+                    start_bit=int(rule["start_bit"]),
+                    length=int(rule["length"]),
+                    byte_order=rule.get("byte_order", "little_endian"),
+                    is_signed=bool(rule.get("is_signed", False)),
+                    scale=float(rule.get("scale", 1.0)),
+                    offset=float(rule.get("offset", 0.0)),
+                    above=float(rule["above"]) if "above" in rule else None,
+                    below=float(rule["below"]) if "below" in rule else None,
+                    armed=True,
+                )
+            by_id = self._rules.setdefault(mask, {})
+            by_id.setdefault(int(rule["arb_id"]) & mask, []).append(compiled)
+
+        self._ring: deque[CANFrameBlock] = deque()
+        self._event: Optional[CapturedEvent] = None
+        # Trigger name -> end of its last event (ns), for the hold-off
+        self._last_end: dict[str, int] = {}
+
+        self._manual: list[str] = []
+        self._lock = threading.Lock()
+
+        self._stats = {"events": 0, "fired": 0, "absorbed": 0, "held_off": 0}
+
+        logger.info(
+            "Event capture: %.1f s before / %.1f s after %d trigger(s)",
+            self.pre_ns / 1e9,
+            self.post_ns / 1e9,
+            len(names),
+        )
+
+    def trigger(self, name: str = MANUAL) -> None:
+        """
+        Request an event at the next block (thread-safe).
+
+        Args:
+            name: Name recorded for the event
+        """
+        with self._lock:
+            self._manual.append(name)
+
+    def _take_manual(self) -> list[str]:
+        """Return and clear the pending manual trigger names."""
+        with self._lock:
+            names, self._manual = self._manual, []
+        return names
+
+    def _fire(self, name: str, ts: int) -> None:
+        """Open an event at ``ts`` unless one is open or the trigger is held off."""
+        if self._event is not None:
+            self._event.triggers += 1
+            self._stats["absorbed"] += 1
+            return
+        last_end = self._last_end.get(name)
+        if last_end is not None and ts - last_end < self.holdoff_ns:
+            self._stats["held_off"] += 1
+            return
+
+        self._stats["fired"] += 1
+        start = ts - self.pre_ns
+        self._event = CapturedEvent(
+            name=name,
+            trigger_ns=ts,
+            start_ns=start,
+            end_ns=ts + self.post_ns,
+            blocks=[b for b in self._ring if b.timestamps_ns[b.count - 1] >= start],
+        )
+        logger.info("Trigger %s fired, capturing %.1f s of frames", name, self.post_ns / 1e9)
+
+    def _scan(self, block: CANFrameBlock) -> None:
+        """Check every frame of the block against the trigger rules."""
+        arb_ids = block.arb_ids
+        timestamps = block.timestamps_ns
+        for mask, by_id in self._rules.items():
+            for i in range(block.count):
+                rules = by_id.get(arb_ids[i] & mask)
+                if rules is None:
+                    continue
+                for rule in rules:
+                    if rule["type"] == FRAME:
+                        self._fire(rule["name"], timestamps[i])
+                        continue
+                    data = block.payload[block.offsets[i]:block.offsets[i + 1]]
+                    raw = raw_signal_value(data, rule)
+                    if raw is None:
+                        continue
+                    value = raw * rule["scale"] + rule["offset"]
+                    outside = (rule["above"] is not None and value > rule["above"]) or (
+                        rule["below"] is not None and value < rule["below"]
+                    )
+                    if not outside:
+                        rule["armed"] = True
+                    elif rule["armed"]:
+                        rule["armed"] = False
+                        self._fire(rule["name"], timestamps[i])
+
+    def _close(self, now_ns: int) -> Optional[CapturedEvent]:
+        """Return the open event if its post-trigger window has passed."""
+        event = self._event
+        if event is None or now_ns < event.end_ns:
+            return None
+        self._event = None
+        self._last_end[event.name] = event.end_ns
+        self._stats["events"] += 1
+        return event
+
+    def add_block(self, block: CANFrameBlock) -> Optional[CapturedEvent]:
+        """
+        Buffer a block, evaluate the triggers on it and advance the open event.
+
+        Args:
+            block: Raw block from the reader (not modified)
+
+        Returns:
+            The event whose window this block completed, or None
+        """
+        if not block.count:
+            return None
+        last_ns = block.timestamps_ns[block.count - 1]
+
+        ring = self._ring
+        ring.append(block)
+        while ring and ring[0].timestamps_ns[ring[0].count - 1] < last_ns - self.pre_ns:
+            ring.popleft()
+
+        if self._event is not None:
+            self._event.blocks.append(block)
+        for name in self._take_manual():
+            self._fire(name, block.timestamps_ns[0])
+        if self._rules:
+            self._scan(block)
+        return self._close(last_ns)
+
+    def poll(self, now: float) -> Optional[CapturedEvent]:
+        """
+        Handle manual triggers and finish the open event on an idle bus.
+
+        Args:
+            now: Current time in seconds
+
+        Returns:
+            The event whose window has passed, or None
+        """
+        now_ns = int(now * 1e9)
+        for name in self._take_manual():
+            self._fire(name, now_ns)
+        return self._close(now_ns)
+
+    def finish(self) -> Optional[CapturedEvent]:
+        """
+        Return the open event with what was captured so far (call on shutdown).
+
+        Returns:
+            The truncated event, or None if no event was open
+        """
+        if self._event is None:
+            return None
+        return self._close(self._event.end_ns)
+
+    def get_stats(self) -> dict:
+        """
+        Return trigger counters.
+
+        Returns:
+            Dict with keys: events (completed), fired, absorbed (fired while
+            an event was open), held_off, open (an event is being captured)
+            and ring_frames (frames held for the pre-trigger window)
+        """
+        return {
+            **self._stats,
+            "open": self._event is not None,
+            "ring_frames": sum(b.count for b in list(self._ring)),
+        }
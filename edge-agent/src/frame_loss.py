@@ -0,0 +1,134 @@
+"""Frame-loss detection: interface drop counters and rolling-counter checks."""
+
+import logging
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Per-interface counters exposed by the kernel for every netdev
+_IFACE_COUNTERS = ("rx_dropped", "rx_over_errors", "rx_fifo_errors")
+
+
+def read_interface_counters(channel: str) -> dict[str, int]:
+    """
+    Read receive drop/overrun counters of a network interface from sysfs.
+
+    ``rx_over_errors`` / ``rx_fifo_errors`` count controller FIFO overruns,
+    ``rx_dropped`` frames the driver could not hand to the network stack.
+
+    Args:
+        channel: Interface name, e.g. "can0"
+
+    Returns:
+        Dict of counter name -> value (missing counters are omitted)
+    """
+    base = Path("/sys/class/net") / channel / "statistics"
+    counters: dict[str, int] = {}
+    for name in _IFACE_COUNTERS:
+        try:
+            counters[name] = int((base / name).read_text().strip())
+        except (OSError, ValueError):
+            continue
+    return counters
+
+
+class InterfaceDropMonitor:
+    """Reports interface drop counters relative to when capture started."""
+
+    def __init__(self, channel: str) -> None:
+        self.channel = channel
+        self._baseline = read_interface_counters(channel)
+
+    def get_drops(self) -> int:
+        """Frames dropped or overrun on the interface since construction."""
+        current = read_interface_counters(self.channel)
+        return sum(
+            max(0, value - self._baseline.get(name, value))
+            for name, value in current.items()
+        )
+
+
+class SequenceChecker:
+    """
+    Detects lost frames from per-arbitration-ID rolling counters.
+
+    Each configured ID carries an alive/rolling counter in one payload byte;
+    a jump of more than one step between consecutive frames means frames were
+    lost somewhere between the sender and us.
+    """
+
+    def __init__(self, checks: list[dict]) -> None:
+        """
+        Initialize from ``can.sequence_checks`` config entries.
+
+        Args:
+            checks: [{"arb_id": 0x1A0, "byte": 7, "mask": 0x0F}, ...];
+                ``mask`` selects the counter bits within ``byte`` (default 0xFF)
+        """
+        # arb_id -> (byte index, mask, shift, modulus)
+        self._specs: dict[int, tuple[int, int, int, int]] = {}
+        for check in checks:
+            mask = int(check.get("mask", 0xFF))
+            if not 0 < mask <= 0xFF:
+                raise ValueError(f"Invalid sequence counter mask: {mask:#x}")
+            shift = (mask & -mask).bit_length() - 1
+            modulus = (mask >> shift) + 1
+            self._specs[int(check["arb_id"])] = (int(check["byte"]), mask, shift, modulus)
+
+        self._last: dict[int, int] = {}
+        self.gaps = 0  # number of discontinuities
+        self.lost = 0  # frames missing according to the counters
+        self.repeats = 0  # counter did not advance
+
+        if self._specs:
+            logger.info(
+                "Sequence checks enabled for %s",
+                ", ".join(f"0x{arb_id:03X}" for arb_id in self._specs),
+            )
+
+    def __contains__(self, arb_id: int) -> bool:
+        return arb_id in self._specs
+
+    def check(self, arb_id: int, data: bytes) -> None:
+        """
+        Account one frame of a checked ID.
+
+        Args:
+            arb_id: CAN arbitration ID (must be a configured ID)
+            data: Frame payload
+        """
+        byte, mask, shift, modulus = self._specs[arb_id]
+        if byte >= len(data):
+            return
+        value = (data[byte] & mask) >> shift
+        prev = self._last.get(arb_id)
+        self._last[arb_id] = value
+        if prev is None:
+            return
+
+        step = (value - prev) % modulus
+        if step == 0:
+            self.repeats += 1
+        elif step > 1:
+            self.gaps += 1
+            self.lost += step - 1
+
+    def reset(self) -> None:
+        """Forget the last counter values (e.g. after a reconnect)."""
+        self._last.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Return sequence-check counters.
+
+        Returns:
+            Dict with keys: seq_gaps, seq_lost, seq_repeats
+        """
+        return {"seq_gaps": self.gaps, "seq_lost": self.lost, "seq_repeats": self.repeats}
+
+
+def sequence_checker_from_config(can_cfg: dict) -> Optional[SequenceChecker]:
+    """Build a SequenceChecker from ``can.sequence_checks``, or None if unset."""
+    checks = can_cfg.get("sequence_checks")
+    return SequenceChecker(checks) if checks else None
@@ -0,0 +1,231 @@
+"""Constant-time frame rate and per-arbitration-ID timing statistics."""
+
+import logging
+import math
+import time
+from array import array
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ArbIdStats:
+    """Running timing statistics for a single arbitration ID."""
+
+    __slots__ = (
+        "count",
+        "first_seen",
+        "last_seen",
+        "gap_mean",
+        "gap_m2",
+        "max_gap",
+        "gap_ewma",
+    )
+
+    def __init__(self, t: float) -> None:
+        self.count = 1
+        self.first_seen = t
+        self.last_seen = t
+        self.gap_mean = 0.0  # mean inter-arrival time (s), Welford
+        self.gap_m2 = 0.0  # sum of squared deviations, Welford
+        self.max_gap = 0.0
+        self.gap_ewma = 0.0  # recent inter-arrival time (s), time-weighted EWMA
+
+    def update(self, t: float, tau: float) -> None:
+        """
+        Account one more frame received at ``t``.
+
+        Args:
+            t: Frame timestamp (seconds)
+            tau: Time constant of the recent-period average (seconds)
+        """
+        gap = t - self.last_seen
+        self.last_seen = t
+        self.count += 1
+        n = self.count - 1  # number of gaps
+        delta = gap - self.gap_mean
+        self.gap_mean += delta / n
+        self.gap_m2 += delta * (gap - self.gap_mean)
+        if gap > self.max_gap:
+            self.max_gap = gap
+
+        # Each gap weighs by the time it spans, so the average covers the
+        # last ~tau seconds whatever the message period
+        gap = max(gap, 0.0)
+        if n == 1:
+            self.gap_ewma = gap
+        else:
+            self.gap_ewma += (1.0 - math.exp(-gap / tau)) * (gap - self.gap_ewma)
+
+    def rate(self, now: Optional[float] = None) -> float:
+        """
+        Recent frame rate in Hz (0 until two frames were seen).
+
+        Args:
+            now: Reference time; silence since the last frame longer than the
+                recent period lowers the rate (None = ignore silence)
+        """
+        period = self.gap_ewma
+        if now is not None:
+            period = max(period, now - self.last_seen)
+        return 1.0 / period if self.count > 1 and period > 0 else 0.0
+
+    @property
+    def gap_stddev(self) -> float:
+        """Standard deviation of the inter-arrival time (jitter) in seconds."""
+        n = self.count - 1
+        return math.sqrt(self.gap_m2 / (n - 1)) if n > 1 else 0.0
+
+    def to_dict(self, arb_id: int, now: Optional[float] = None) -> dict:
+        """Return the stats as a plain dict (``rate_hz`` as of ``now``)."""
+        return {
+            "arb_id": arb_id,
+            "count": self.count,
+            "rate_hz": round(self.rate(now), 1),
+            "gap_mean_ms": round(self.gap_mean * 1000, 3),
+            "gap_stddev_ms": round(self.gap_stddev * 1000, 3),
+            "max_gap_ms": round(self.max_gap * 1000, 3),
+            "last_seen": self.last_seen,
+        }
+
+
+class FrameStats:
+    """
+    Frame counters with O(1) cost per frame.
+
+    The bus-wide frame rate is kept in a fixed ring of one-second buckets
+    instead of a deque of timestamps, and every arbitration ID gets an
+    ``ArbIdStats`` with Welford running mean/variance of its inter-arrival
+    time (jitter) and a time-weighted moving average of its recent period
+    (``rate_hz``, following a changed or stopped message within about
+    ``window_sec``).  ``record()`` is called from the reader thread; the query methods
+    may run concurrently on the health thread and only take atomic snapshots
+    (``list(dict.items())``, ``array`` copies), so no lock is needed.
+    """
+
+    def __init__(self, window_sec: int = 10, missing_gap_factor: float = 10.0) -> None:
+        """
+        Initialize the statistics engine.
+
+        Args:
+            window_sec: Length of the frame-rate window (seconds, one bucket each)
+            missing_gap_factor: An ID is reported missing once it has been silent
+                for this many mean inter-arrival times (and at least 1 s)
+        """
+        self.window_sec = window_sec
+        self.missing_gap_factor = missing_gap_factor
+        self.total = 0
+        self._bucket_ids = array("q", [-1] * window_sec)
+        self._bucket_counts = array("Q", [0] * window_sec)
+        self._ids: dict[int, ArbIdStats] = {}
+
+    def record(self, arb_id: int, t: float) -> None:
+        """
+        Account one received frame.
+
+        Args:
+            arb_id: CAN arbitration ID
+            t: Frame timestamp (seconds)
+        """
+        self.total += 1
+
+        second = int(t)
+        idx = second % self.window_sec
+        if self._bucket_ids[idx] != second:
+            self._bucket_ids[idx] = second
+            self._bucket_counts[idx] = 1
+        else:
+            self._bucket_counts[idx] += 1
+
+        stats = self._ids.get(arb_id)
+        if stats is None:
+            self._ids[arb_id] = ArbIdStats(t)
+        else:
+            stats.update(t, self.window_sec)
+
+    def frames_per_sec(self, now: Optional[float] = None) -> float:
+        """
+        Average bus-wide frame rate over the window ending at ``now``.
+
+        Args:
+            now: Reference time (defaults to wall clock)
+
+        Returns:
+            Frames per second, rounded to 0.1
+        """
+        current = int(time.time() if now is None else now)
+        ids = array("q", self._bucket_ids)
+        counts = array("Q", self._bucket_counts)
+        oldest = current - self.window_sec
+        recent = sum(c for b, c in zip(ids, counts) if oldest < b <= current)
+        return round(recent / self.window_sec, 1)
+
+    def id_stats(self, now: Optional[float] = None) -> dict[int, dict]:
+        """
+        Return per-arbitration-ID statistics keyed by arb_id.
+
+        Args:
+            now: Reference time for the recent rates (defaults to wall clock)
+        """
+        now = time.time() if now is None else now
+        return {arb_id: s.to_dict(arb_id, now) for arb_id, s in list(self._ids.items())}
+
+    def top_ids(self, n: int = 5, now: Optional[float] = None) -> list[dict]:
+        """
+        Return the ``n`` arbitration IDs with the highest recent frame rate.
+
+        Args:
+            n: Number of IDs to return
+            now: Reference time for the recent rates (defaults to wall clock)
+
+        Returns:
+            Per-ID stat dicts, highest rate first
+        """
+        now = time.time() if now is None else now
+        items = list(self._ids.items())
+        items.sort(key=lambda kv: kv[1].rate(now), reverse=True)
+        return [s.to_dict(arb_id, now) for arb_id, s in items[:n]]
+
+    def missing_ids(self, now: Optional[float] = None) -> list[int]:
+        """
+        Return arbitration IDs that were periodic but have gone silent.
+
+        Args:
+            now: Reference time (defaults to wall clock)
+
+        Returns:
+            Sorted list of missing arb_ids
+        """
+        now = time.time() if now is None else now
+        missing = []
+        for arb_id, s in list(self._ids.items()):
+            if s.count < 2:
+                continue
+            limit = max(1.0, s.gap_mean * self.missing_gap_factor)
+            if now - s.last_seen > limit:
+                missing.append(arb_id)
+        return sorted(missing)
+
+
+def format_id_summary(top: list[dict], missing: list[int]) -> list[str]:
+    """
+    Format top talkers and missing IDs as HEALTH log fields.
+
+    Args:
+        top: Output of ``FrameStats.top_ids()``
+        missing: Output of ``FrameStats.missing_ids()``
+
+    Returns:
+        ``key=value`` strings (empty list when there is nothing to report)
+    """
+    parts = []
+    if top:
+        parts.append(
+            "top="
+            + ",".join(
+                f"0x{s['arb_id']:03X}:{s['rate_hz']}Hz±{s['gap_stddev_ms']}ms" for s in top
+            )
+        )
+    if missing:
+        parts.append("missing=" + ",".join(f"0x{arb_id:03X}" for arb_id in missing))
+    return parts
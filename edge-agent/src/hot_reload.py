@@ -0,0 +1,232 @@
+"""Apply config file changes to a running agent (SIGHUP or a watched file)."""
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Optional
+
+from .batcher import CANFrameBatcher
+from .can_filters import resolve_filters
+
+logger = logging.getLogger(__name__)
+
+# Keys applied without a restart, per section (None = the whole section)
+LIVE_KEYS: dict[str, Optional[frozenset]] = {
+    "can": frozenset({"filters", "filter_allow", "filter_deny", "max_filters"}),
+    "batch": frozenset({"interval_sec", "max_frames"}),
+    "s3": None,
+    "upload": frozenset({"max_retries", "initial_backoff_sec", "max_backoff_sec"}),
+}
+
+# Raw sections of the RPi schema; their effect shows in the canonical sections
+_SCHEMA_ALIASES = frozenset({"batching", "offline_buffer"})
+
+_FILTER_KEYS = ("filters", "filter_allow", "filter_deny", "max_filters")
+
+
+def _section_changes(old: Any, new: Any) -> set[str]:
+    """Keys that differ between two config sections (the section itself if not dicts)."""
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return {""} if old != new else set()
+    return {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+
+
+def restart_required(old: dict, new: dict) -> list[str]:
+    """
+    Changed config keys that only take effect after a restart.
+
+    Args:
+        old: Running configuration
+        new: Reloaded configuration
+
+    Returns:
+        Sorted ``section`` or ``section.key`` names
+    """
+    changed = []
+    for section in sorted((old.keys() | new.keys()) - _SCHEMA_ALIASES):
+        keys = _section_changes(old.get(section), new.get(section))
+        live = LIVE_KEYS.get(section, frozenset())
+        if live is None:
+            continue
+        for key in sorted(keys - live):
+            changed.append(f"{section}.{key}" if key else section)
+    return changed
+
+
+class ConfigReloader:
+    """
+    Re-reads the config file and applies what can change while capturing.
+
+    Live changes, with no gap in capture:
+
+    * ``can.filters`` (and ``filter_allow``/``filter_deny``/``max_filters``,
+      or ``dbc.path`` with ``filters: "dbc"``): ``set_filters`` on the open
+      bus or socket
+    * ``batch.interval_sec``/``max_frames``: ``CANFrameBatcher.reconfigure``,
+      effective from the next window (the open batch is not touched)
+    * ``s3`` and the upload retry settings: a new uploader replaces the old
+      one; each file is uploaded whole by one of them
+
+    Any other change is logged as needing a restart, and the running value
+    stays in effect.  A config file that fails to load is logged and ignored.
+
+    ``request()`` is safe to call from a signal handler; the reload itself
+    runs on the next ``poll()``, which also notices a changed file when
+    watching.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        config: dict,
+        load_config: Callable[[str], dict],
+        reader: Any,
+        batcher: CANFrameBatcher,
+        create_uploader: Optional[Callable[[dict], Any]] = None,
+        swap_uploader: Optional[Callable[[Any], None]] = None,
+        watch: bool = False,
+    ) -> None:
+        """
+        Initialize the reloader.
+
+        Args:
+            path: Config file to re-read
+            config: Configuration the agent is running with
+            load_config: Reads and normalises a config file
+            reader: Frame source; filters are applied if it has ``set_filters``
+            batcher: Batcher receiving new window limits
+            create_uploader: Builds an uploader from a config (None when
+                uploads are disabled)
+            swap_uploader: Installs a new uploader wherever the old one is used
+            watch: Also reload when the file's modification time changes
+        """
+        self.path = path
+        self.config = config
+        self.load_config = load_config
+        self.reader = reader
+        self.batcher = batcher
+        self.create_uploader = create_uploader
+        self.swap_uploader = swap_uploader
+        self.watch = watch
+        self.reloads = 0
+        self._requested = threading.Event()
+        self._mtime = self._read_mtime()
+
+    def _read_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def request(self) -> None:
+        """Ask for a reload on the next ``poll()`` (e.g. from the SIGHUP handler)."""
+        self._requested.set()
+
+    def poll(self) -> None:
+        """Reload if requested, or if the watched file has changed."""
+        if self.watch:
+            mtime = self._read_mtime()
+            if mtime is not None and mtime != self._mtime:
+                self._mtime = mtime
+                logger.info("Config file %s changed", self.path)
+                self._requested.set()
+        if self._requested.is_set():
+            self._requested.clear()
+            self.reload()
+
+    def reload(self) -> bool:
+        """
+        Re-read the config file and apply the live changes.
+
+        Returns:
+            True if the file was loaded (even if nothing changed)
+        """
+        try:
+            new = self.load_config(self.path)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Config reload failed, keeping the running config: %s", exc)
+            return False
+        self._mtime = self._read_mtime()
+        old = self.config
+        # The running config: only what was applied is taken from the new file
+        running = dict(old)
+        applied = []
+
+        if self._filters_changed(old, new) and self._apply_filters(new):
+            running["can"] = {
+                **{k: v for k, v in old["can"].items() if k not in _FILTER_KEYS},
+                **{k: v for k, v in new["can"].items() if k in _FILTER_KEYS},
+            }
+            applied.append("can filters")
+
+        old_batch, new_batch = old.get("batch", {}), new.get("batch", {})
+        if _section_changes(old_batch, new_batch) & LIVE_KEYS["batch"]:
+            self.batcher.reconfigure(
+                int(new_batch.get("interval_sec", self.batcher.window_sec)),
+                int(new_batch.get("max_frames", self.batcher.max_frames)),
+            )
+            running["batch"] = {
+                **old_batch,
+                **{k: v for k, v in new_batch.items() if k in LIVE_KEYS["batch"]},
+            }
+            applied.append("batch limits (next window)")
+
+        if self._upload_changed(old, new) and self._apply_uploader(new):
+            running["s3"] = new["s3"]
+            running["upload"] = {
+                **old.get("upload", {}),
+                **{k: v for k, v in new["upload"].items() if k in LIVE_KEYS["upload"]},
+            }
+            applied.append("upload settings")
+
+        restart = restart_required(running, new)
+        self.config = running
+        self.reloads += 1
+
+        logger.info(
+            "Config reloaded from %s: %s",
+            self.path,
+            ", ".join(applied) if applied else "no live changes",
+        )
+        if restart:
+            logger.warning("Config changes that need a restart: %s", ", ".join(restart))
+        return True
+
+    def _filters_changed(self, old: dict, new: dict) -> bool:
+        old_can, new_can = old.get("can", {}), new.get("can", {})
+        if any(old_can.get(k) != new_can.get(k) for k in _FILTER_KEYS):
+            return True
+        # Filters derived from the DBC follow its path
+        return new_can.get("filters") == "dbc" and old.get("dbc") != new.get("dbc")
+
+    def _apply_filters(self, new: dict) -> bool:
+        if not hasattr(self.reader, "set_filters"):
+            logger.warning("CAN filters changed, but this frame source has none to update")
+            return False
+        try:
+            filters = resolve_filters(new)["can"].get("filters")
+            self.reader.set_filters(filters)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Could not apply CAN filters, keeping the old ones: %s", exc)
+            return False
+        return True
+
+    def _upload_changed(self, old: dict, new: dict) -> bool:
+        if old.get("s3") != new.get("s3"):
+            return True
+        old_up, new_up = old.get("upload", {}), new.get("upload", {})
+        return any(old_up.get(k) != new_up.get(k) for k in LIVE_KEYS["upload"])
+
+    def _apply_uploader(self, new: dict) -> bool:
+        if self.create_uploader is None or self.swap_uploader is None:
+            logger.warning("Upload settings changed, but uploads are disabled")
+            return False
+        try:
+            uploader = self.create_uploader(
+                {**self.config, "s3": new["s3"], "upload": new["upload"]}
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Could not create the new uploader, keeping the old one: %s", exc)
+            return False
+        self.swap_uploader(uploader)
+        return True
@@ -0,0 +1,109 @@
+"""Consumers of captured frame blocks, fanned out by ``CapturePipeline``."""
+
+import logging
+from typing import Optional
+
+from .can_reader import CANFrameBlock
+from .frame_stats import FrameStats, format_id_summary
+
+logger = logging.getLogger(__name__)
+
+
+class Listener:
+    """
+    Consumer of capture blocks, fed through its own queue and thread.
+
+    Modelled on python-can's ``Listener``: ``on_block()`` is called for every
+    block in capture order, ``on_idle()`` when no block arrived for a second,
+    and ``stop()`` once after the last block.  Blocks are shared by all
+    listeners and must not be modified.
+    """
+
+    def on_block(self, block: CANFrameBlock) -> None:
+        """Handle one block of frames."""
+        raise NotImplementedError
+
+    def on_idle(self) -> None:
+        """Called when the bus has been idle for a while."""
+
+    def stop(self) -> None:
+        """Called once after the last block."""
+
+
+class FrameLogListener(Listener):
+    """Logs every frame (``--dry-run``)."""
+
+    def __init__(self) -> None:
+        self.frames = 0
+
+    def on_block(self, block: CANFrameBlock) -> None:
+        """Log each frame of the block."""
+        self.frames += block.count
+        for frame in block.frames():
+            logger.info(
+                "FRAME arb_id=0x%03X dlc=%d data=%s ts=%.6f ch=%s",
+                frame.arb_id,
+                frame.dlc,
+                frame.data.hex(),
+                frame.timestamp,
+                frame.channel,
+            )
+
+
+class MetricsListener(Listener):
+    """
+    Frame rate and per-ID timing statistics computed off the capture thread.
+
+    Gives readers without their own ``FrameStats`` (simulation, replay) the
+    same metrics as the hardware readers.
+    """
+
+    def __init__(self, window_sec: int = 10, missing_gap_factor: float = 10.0) -> None:
+        """
+        Initialize the listener.
+
+        Args:
+            window_sec: Frame-rate window (see ``FrameStats``)
+            missing_gap_factor: Missing-ID threshold (see ``FrameStats``)
+        """
+        self.frame_stats = FrameStats(window_sec, missing_gap_factor)
+        self._last_timestamp: Optional[float] = None
+
+    def on_block(self, block: CANFrameBlock) -> None:
+        """Record every frame of the block."""
+        record = self.frame_stats.record
+        timestamps = block.timestamps_ns
+        arb_ids = block.arb_ids
+        for i in range(block.count):
+            record(arb_ids[i], timestamps[i] / 1e9)
+        self._last_timestamp = block.last_timestamp
+
+    def get_stats(self, top_n: int = 5) -> dict:
+        """
+        Return a snapshot of the statistics.
+
+        Frame rate and missing IDs are evaluated at the newest frame
+        timestamp, so replayed and simulated time work as well as wall time.
+
+        Args:
+            top_n: Number of highest-rate arbitration IDs to include
+
+        Returns:
+            Dict with keys: frames, frames_per_sec, top_ids, missing_ids
+        """
+        now = self._last_timestamp
+        if now is None:
+            return {"frames": 0, "frames_per_sec": 0.0, "top_ids": [], "missing_ids": []}
+        return {
+            "frames": self.frame_stats.total,
+            "frames_per_sec": self.frame_stats.frames_per_sec(now),
+            "top_ids": self.frame_stats.top_ids(top_n, now),
+            "missing_ids": self.frame_stats.missing_ids(now),
+        }
+
+    def summary(self, top_n: int = 5) -> str:
+        """Return the statistics as one log line."""
+        stats = self.get_stats(top_n)
+        parts = [f"frames={stats['frames']}", f"fps={stats['frames_per_sec']}"]
+        parts.extend(format_id_summary(stats["top_ids"], stats["missing_ids"]))
+        return " | ".join(parts)
@@ -0,0 +1,258 @@
+"""Fast DBC decoding and throttled terminal output for --decode-live."""
+
+import logging
+import sys
+import time
+from typing import Callable, Optional, TextIO
+
+import cantools
+
+from .can_reader import CANFrameBlock
+from .listeners import Listener
+
+logger = logging.getLogger(__name__)
+
+# ANSI: cursor home + clear to end of screen
+_REDRAW = "\x1b[H\x1b[J"
+
+
+class _CompiledMessage:
+    """Per-message lookup entry built once from the DBC."""
+
+    __slots__ = ("name", "decode", "signals")
+
+    def __init__(self, message: cantools.database.Message) -> None:
+        self.name: str = message.name
+        self.decode: Callable = message.decode
+        # signal name -> ("Message.Signal", unit)
+        self.signals: dict[str, tuple[str, str]] = {
+            s.name: (f"{message.name}.{s.name}", s.unit or "") for s in message.signals
+        }
+
+
+class CompiledDecoder:
+    """
+    arb_id -> message table compiled from a DBC.
+
+    Replaces ``db.get_message_by_frame_id()`` + ``get_signal_by_name()`` per
+    frame with one dict lookup; unknown IDs are remembered so they are only
+    logged once.
+    """
+
+    def __init__(self, db: cantools.database.Database) -> None:
+        """
+        Build the lookup table.
+
+        Args:
+            db: Loaded cantools database
+        """
+        self._messages: dict[int, _CompiledMessage] = {
+            m.frame_id: _CompiledMessage(m) for m in db.messages
+        }
+        # message name -> arb_id
+        self.frame_ids: dict[str, int] = {m.name: m.frame_id for m in db.messages}
+        self.unknown_ids: set[int] = set()
+        self.decode_errors = 0
+
+    def decode(self, arb_id: int, data: bytes) -> Optional[list[tuple[str, float, str]]]:
+        """
+        Decode one frame.
+
+        Args:
+            arb_id: CAN arbitration ID
+            data: Frame payload
+
+        Returns:
+            List of ("Message.Signal", value, unit), or None for unknown IDs
+            and undecodable payloads
+        """
+        compiled = self._messages.get(arb_id)
+        if compiled is None:
+            if arb_id not in self.unknown_ids:
+                self.unknown_ids.add(arb_id)
+                logger.debug("Unknown frame 0x%03X: %s", arb_id, data.hex())
+            return None
+        try:
+            decoded = compiled.decode(data, decode_choices=False)
+        except Exception as exc:  # noqa: BLE001
+            self.decode_errors += 1
+            logger.debug("Decode error for 0x%03X: %s", arb_id, exc)
+            return None
+        result = []
+        for name, value in decoded.items():
+            key, unit = compiled.signals[name]
+            result.append((key, value, unit))
+        return result
+
+
+class ScrollingOutput:
+    """
+    Prints one line per signal sample, throttled per signal and buffered.
+
+    Lines are collected and written with a single ``write()`` at most every
+    ``flush_interval_sec`` so a fast bus cannot make the terminal the
+    bottleneck.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        min_interval_sec: float = 0.0,
+        flush_interval_sec: float = 0.1,
+    ) -> None:
+        """
+        Initialize the output.
+
+        Args:
+            stream: Output stream (default sys.stdout)
+            min_interval_sec: Print each signal at most once per interval
+                (0 = every sample)
+            flush_interval_sec: Maximum time lines stay buffered
+        """
+        self.stream = stream or sys.stdout
+        self.min_interval_sec = min_interval_sec
+        self.flush_interval_sec = flush_interval_sec
+        self._last_printed: dict[str, float] = {}
+        self._lines: list[str] = []
+        self._last_flush = time.monotonic()
+        self.throttled = 0
+
+    def add(self, timestamp: float, signals: list[tuple[str, float, str]]) -> None:
+        """Queue the decoded signals of one frame."""
+        ts_str = f"[{timestamp:.3f}]"
+        for key, value, unit in signals:
+            if self.min_interval_sec:
+                last = self._last_printed.get(key)
+                if last is not None and timestamp - last < self.min_interval_sec:
+                    self.throttled += 1
+                    continue
+                self._last_printed[key] = timestamp
+            self._lines.append(f"{ts_str} {key} = {value} {unit}\n")
+
+    def tick(self, idle: bool = False) -> None:
+        """
+        Flush buffered lines if the flush interval has passed.
+
+        Args:
+            idle: The reader has caught up with the bus; flush right away
+        """
+        if idle or time.monotonic() - self._last_flush >= self.flush_interval_sec:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered lines."""
+        if self._lines:
+            self.stream.write("".join(self._lines))
+            self._lines.clear()
+            self.stream.flush()
+        self._last_flush = time.monotonic()
+
+
+class DashboardOutput:
+    """
+    Keeps the latest value of every signal and redraws them in place.
+
+    The screen is redrawn at most every ``refresh_sec`` regardless of the bus
+    rate.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, refresh_sec: float = 0.25) -> None:
+        """
+        Initialize the dashboard.
+
+        Args:
+            stream: Output stream (default sys.stdout)
+            refresh_sec: Redraw interval
+        """
+        self.stream = stream or sys.stdout
+        self.refresh_sec = refresh_sec
+        # "Message.Signal" -> [value, unit, timestamp, sample count]
+        self._latest: dict[str, list] = {}
+        self._last_flush = time.monotonic()
+
+    def add(self, timestamp: float, signals: list[tuple[str, float, str]]) -> None:
+        """Record the decoded signals of one frame."""
+        latest = self._latest
+        for key, value, unit in signals:
+            entry = latest.get(key)
+            if entry is None:
+                latest[key] = [value, unit, timestamp, 1]
+            else:
+                entry[0] = value
+                entry[2] = timestamp
+                entry[3] += 1
+
+    def render(self) -> str:
+        """Return the dashboard screen as text."""
+        width = max((len(k) for k in self._latest), default=6)
+        lines = [f"{'SIGNAL':<{width}}  {'VALUE':>14}  {'UNIT':<8}  {'COUNT':>9}  LAST"]
+        for key in sorted(self._latest):
+            value, unit, ts, count = self._latest[key]
+            lines.append(f"{key:<{width}}  {value:>14.4g}  {unit:<8}  {count:>9}  {ts:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def tick(self, idle: bool = False) -> None:
+        """Redraw if the refresh interval has passed (``idle`` is ignored)."""
+        if time.monotonic() - self._last_flush >= self.refresh_sec:
+            self.flush()
+
+    def flush(self) -> None:
+        """Redraw the screen."""
+        if self._latest:
+            self.stream.write(_REDRAW + self.render())
+            self.stream.flush()
+        self._last_flush = time.monotonic()
+
+
+def decode_block(
+    decoder: CompiledDecoder,
+    block: CANFrameBlock,
+    output: ScrollingOutput | DashboardOutput,
+) -> None:
+    """
+    Decode every frame of a block into ``output``.
+
+    Args:
+        decoder: Compiled decoder
+        block: Frames to decode
+        output: Scrolling or dashboard output
+    """
+    timestamps = block.timestamps_ns
+    arb_ids = block.arb_ids
+    offsets = block.offsets
+    payload = block.payload
+    for i in range(block.count):
+        signals = decoder.decode(arb_ids[i], bytes(payload[offsets[i]:offsets[i + 1]]))
+        if signals:
+            output.add(timestamps[i] / 1e9, signals)
+    # A partial block means the reader drained the socket
+    output.tick(idle=not block.is_full)
+
+
+class LiveDecoderListener(Listener):
+    """Decodes captured blocks into a scrolling or dashboard output."""
+
+    def __init__(self, decoder: CompiledDecoder, output: ScrollingOutput | DashboardOutput) -> None:
+        """
+        Initialize the listener.
+
+        Args:
+            decoder: Compiled decoder
+            output: Scrolling or dashboard output
+        """
+        self.decoder = decoder
+        self.output = output
+        self.frames = 0
+
+    def on_block(self, block: CANFrameBlock) -> None:
+        """Decode the block."""
+        self.frames += block.count
+        decode_block(self.decoder, block, self.output)
+
+    def on_idle(self) -> None:
+        """Flush pending output while the bus is quiet."""
+        self.output.tick(idle=True)
+
+    def stop(self) -> None:
+        """Write out whatever is still buffered."""
+        self.output.flush()
@@ -1,6 +1,9 @@
 """Main entry point for CAN telemetry edge agent."""
 
 import argparse
+import asyncio
+import functools
+import json
 import logging
 import shutil
 import signal
@@ -9,15 +12,49 @@ import threading
 import time
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import NoReturn, Optional
+from typing import Callable, NoReturn, Optional
 
 import cantools
 import yaml
 
+from .async_runtime import AsyncCapturePipeline, run_async_agent
 from .batcher import CANFrameBatcher
-from .can_reader import RealCANReader, SimulatedCANReader
+from .benchmark import run_benchmark
+from .can_filters import resolve_filters
+from .can_reader import (
+    CAN_MAX_DLEN,
+    CANFD_MAX_DLEN,
+    LoadGeneratorCANReader,
+    MultiChannelCANReader,
+    RawSocketCANReader,
+    RealCANReader,
+    SimulatedCANReader,
+    create_reader,
+    create_simulated_reader,
+)
+from .decimation import resolve_decimation_rules
+from .diagnostics import DiagnosticsServer, RecentDataListener, uptime_status
+from .event_capture import resolve_trigger_rules
+from .frame_stats import format_id_summary
+from .hot_reload import ConfigReloader
+from .listeners import FrameLogListener, MetricsListener
+from .live_decoder import (
+    CompiledDecoder,
+    DashboardOutput,
+    LiveDecoderListener,
+    ScrollingOutput,
+)
 from .offline_buffer import OfflineBuffer
+from .openmetrics import AgentMetrics, MetricsRegistry, write_textfile
+from .pipeline import CapturePipeline, iter_reader_blocks
+from .profiling import Profiler
+from .realtime import apply_capture_thread_settings, apply_process_settings, freeze_gc
+from .replay import ReplayCANReader
+from .scheduler import PRIORITY_UPLOAD, BackgroundScheduler, ResourceBudget
+from .shm_ring import SharedFrameRing, SharedRingReader
+from .supervisor import ProcessSupervisor, ignore_interrupts, init_child_logging
 from .uploader import S3Uploader
+from .wal import FrameWAL, recover_segments
 
 # Global flag for graceful shutdown
 shutdown_event = threading.Event()
@@ -37,6 +74,11 @@ def signal_handler(signum: int, frame: object) -> None:
     shutdown_event.set()
 
 
+def ignore_reload_signal(signum: int, frame: object) -> None:
+    """Handle SIGHUP in modes without config reload, instead of exiting."""
+    logger.warning("Received SIGHUP, but this mode cannot reload its config; ignored")
+
+
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
@@ -131,6 +173,7 @@ def _normalize_config(raw: dict) -> dict:
             "bucket": upload.get("s3_bucket", ""),
             "region": upload.get("region", "us-east-1"),
             "prefix": upload.get("s3_prefix", "raw"),
+            "events_prefix": upload.get("s3_events_prefix", "events"),
         }
         cfg["upload"] = {
             "enabled": bool(upload.get("enabled", True)),
@@ -144,12 +187,21 @@ def _normalize_config(raw: dict) -> dict:
     if "offline" not in cfg and ob:
         cfg["offline"] = {
             "check_interval_sec": int(ob.get("retry_interval_seconds", 300)),
+            "evict_interval_sec": int(ob.get("evict_interval_seconds", 10)),
             "max_queue_size": 100,
         }
 
     return cfg
 
 
+def _channel_names(can_config: dict) -> str:
+    """Return the configured CAN channel name(s) for log messages."""
+    channels = can_config.get("channels")
+    if not channels:
+        return can_config["channel"]
+    return ",".join(c["channel"] if isinstance(c, dict) else c for c in channels)
+
+
 # ---------------------------------------------------------------------------
 # Config loading
 # ---------------------------------------------------------------------------
@@ -175,30 +227,20 @@ def load_config(config_path: str) -> dict:
 # ---------------------------------------------------------------------------
 
 
-def retry_pending_worker(uploader: S3Uploader, interval_sec: int) -> None:
+def retry_pending_once(
+    uploader: S3Uploader, should_stop: Optional[Callable[[], bool]] = None
+) -> None:
     """
-    Background worker that periodically retries pending S3 uploads.
+    Retry every pending S3 upload once and log the outcome.
 
     Args:
         uploader: S3Uploader instance
-        interval_sec: Retry interval in seconds
+        should_stop: Checked before each file; True ends the pass early
     """
-    logger.info("Started pending retry worker (interval=%d s)", interval_sec)
-
-    while not shutdown_event.is_set():
-        try:
-            if shutdown_event.wait(timeout=interval_sec):
-                break
-            logger.debug("Running pending upload retry...")
-            success, failed = uploader.retry_pending()
-            if success > 0 or failed > 0:
-                logger.info(
-                    "Pending retry: %d succeeded, %d failed", success, failed
-                )
-        except Exception as exc:  # noqa: BLE001
-            logger.error("Error in retry worker: %s", exc)
-
-    logger.info("Pending retry worker stopped")
+    logger.debug("Running pending upload retry...")
+    success, failed = uploader.retry_pending(should_stop)
+    if success > 0 or failed > 0:
+        logger.info("Pending retry: %d succeeded, %d failed", success, failed)
 
 
 def _read_cpu_temp() -> Optional[float]:
@@ -210,129 +252,189 @@ def _read_cpu_temp() -> Optional[float]:
         return None
 
 
-def health_monitor_worker(
-    reader: RealCANReader,
+def log_health(
+    reader: RealCANReader | RawSocketCANReader | MultiChannelCANReader,
     pending_dir: str,
     data_dir: str,
-    interval_sec: int,
+    session_start: float,
+    top_ids: int = 5,
+    pipeline: Optional[CapturePipeline] = None,
 ) -> None:
     """
-    Background thread that logs health stats at a regular interval.
+    Log one HEALTH line.
 
-    Logs frames/sec, cumulative counts, pending uploads, disk usage,
-    and CPU temperature (Raspberry Pi only).
+    Covers frames/sec, cumulative counts, pending uploads, disk usage,
+    the noisiest arbitration IDs, IDs that went silent, pipeline queue
+    depths and drops, and CPU temperature (Raspberry Pi only).
 
     Args:
-        reader: The active RealCANReader
+        reader: The active hardware CAN reader
         pending_dir: Directory holding files waiting for upload
         data_dir: Root data directory (for disk-usage check)
-        interval_sec: How often to log stats (seconds)
+        session_start: Agent start time (seconds since the epoch)
+        top_ids: Number of highest-rate arbitration IDs to report (0 = none)
+        pipeline: Running capture pipeline whose queue metrics to report
     """
-    logger.info("Started health monitor (interval=%d s)", interval_sec)
-    session_start = time.time()
+    stats = reader.get_stats(top_n=top_ids)
+    pending_count = (
+        len(list(Path(pending_dir).glob("*.parquet")))
+        if Path(pending_dir).exists()
+        else 0
+    )
+    try:
+        usage = shutil.disk_usage(data_dir)
+        disk_used_gb = usage.used / (1024 ** 3)
+        disk_free_gb = usage.free / (1024 ** 3)
+    except Exception:  # noqa: BLE001
+        disk_used_gb = disk_free_gb = 0.0
+
+    cpu_temp = _read_cpu_temp()
+    uptime_min = (time.time() - session_start) / 60.0
+
+    parts = [
+        f"uptime={uptime_min:.1f}min",
+        f"frames={stats['frames']}",
+        f"fps={stats['frames_per_sec']}",
+        f"errors={stats['errors']}",
+        f"bus_off={stats['bus_off']}",
+        f"kernel_drops={stats['kernel_drops']}",
+        f"iface_drops={stats['iface_drops']}",
+        f"pending={pending_count}",
+        f"disk_used={disk_used_gb:.1f}GB",
+        f"disk_free={disk_free_gb:.1f}GB",
+    ]
+    if "bus_load_pct" in stats:
+        parts.append(
+            f"bus_load={stats['bus_load_pct']}%(peak {stats['bus_load_peak_pct']}%)"
+        )
+    for channel, ch_stats in stats.get("channels", {}).items():
+        parts.append(f"{channel}_fps={ch_stats['frames_per_sec']}")
+        parts.append(f"{channel}_load={ch_stats['bus_load_pct']}%")
+    if stats["seq_gaps"]:
+        parts.append(f"seq_lost={stats['seq_lost']}/{stats['seq_gaps']}gaps")
+    if "late_frames" in stats:
+        parts.append(f"late={stats['late_frames']}")
+    parts.extend(format_id_summary(stats["top_ids"], stats["missing_ids"]))
+    if pipeline is not None:
+        p_stats = pipeline.get_stats()
+        fq = p_stats["frame_queue"]
+        uq = p_stats["upload_queue"]
+        parts.append(f"frame_q={fq['depth']}/{fq['capacity']}")
+        parts.append(f"frames_dropped={fq['dropped_units']}")
+        parts.append(f"upload_q={uq['depth']}/{uq['capacity']}")
+        if "events" in p_stats:
+            parts.append(f"events={p_stats['events']['written']}")
+        if "decimation" in p_stats:
+            dec = p_stats["decimation"]
+            parts.append(f"decimated={dec['frames_in'] - dec['frames_kept']}")
+        if "change_only" in p_stats:
+            parts.append(f"kept_ratio={p_stats['change_only']['ratio']}")
+        if "stalls" in p_stats:
+            st = p_stats["stalls"]
+            parts.append(f"stalls={st['stalls']}(max {st['max_stall_ms']}ms)")
+            parts.append(f"gc_max={st['gc_max_pause_ms']}ms")
+    if cpu_temp is not None:
+        parts.append(f"cpu_temp={cpu_temp:.1f}C")
+
+    logger.info("HEALTH: %s", " | ".join(parts))
+
+
+def create_scheduler(
+    config: dict, capture_backlog: Optional[Callable[[], float]] = None
+) -> BackgroundScheduler:
+    """
+    Create the background task scheduler from the ``scheduler`` config section.
 
-    while not shutdown_event.is_set():
-        if shutdown_event.wait(timeout=interval_sec):
-            break
-        try:
-            stats = reader.get_stats()
-            pending_count = (
-                len(list(Path(pending_dir).glob("*.parquet")))
-                if Path(pending_dir).exists()
-                else 0
-            )
-            try:
-                usage = shutil.disk_usage(data_dir)
-                disk_used_gb = usage.used / (1024 ** 3)
-                disk_free_gb = usage.free / (1024 ** 3)
-            except Exception:  # noqa: BLE001
-                disk_used_gb = disk_free_gb = 0.0
-
-            cpu_temp = _read_cpu_temp()
-            uptime_min = (time.time() - session_start) / 60.0
-
-            parts = [
-                f"uptime={uptime_min:.1f}min",
-                f"frames={stats['frames']}",
-                f"fps={stats['frames_per_sec']}",
-                f"errors={stats['errors']}",
-                f"bus_off={stats['bus_off']}",
-                f"pending={pending_count}",
-                f"disk_used={disk_used_gb:.1f}GB",
-                f"disk_free={disk_free_gb:.1f}GB",
-            ]
-            if cpu_temp is not None:
-                parts.append(f"cpu_temp={cpu_temp:.1f}C")
-
-            logger.info("HEALTH: %s", " | ".join(parts))
-        except Exception as exc:  # noqa: BLE001
-            logger.error("Health monitor error: %s", exc)
+    Args:
+        config: Normalised configuration dictionary
+        capture_backlog: Returns the capture queue fill level; above
+            ``max_capture_backlog`` uploads and maintenance wait
 
-    logger.info("Health monitor stopped")
+    Returns:
+        Scheduler without tasks
+    """
+    sched_config: dict = config.get("scheduler", {})
+    budget = ResourceBudget(
+        cpu_temp=_read_cpu_temp,
+        capture_backlog=capture_backlog,
+        max_cpu_pct=float(sched_config.get("max_cpu_pct", 85)),
+        backoff_temp_c=float(sched_config.get("backoff_temp_c", 75)),
+        pause_temp_c=float(sched_config.get("pause_temp_c", 80)),
+        max_capture_backlog=float(sched_config.get("max_capture_backlog", 0.5)),
+    )
+    return BackgroundScheduler(
+        budget,
+        max_defer_sec=float(sched_config.get("max_defer_sec", 900)),
+        nice=int(sched_config.get("nice", 10)),
+    )
 
 
 # ---------------------------------------------------------------------------
-# Dry-run mode
+# Reader selection
 # ---------------------------------------------------------------------------
 
 
-def run_dry_run(config: dict) -> NoReturn:
-    """
-    Read real CAN frames and log them to the console without batching or uploading.
-
-    Useful for verifying the CAN connection before a full capture session.
-
-    Args:
-        config: Normalised configuration dictionary
-    """
-    logger.info("=== DRY-RUN MODE — no data will be written or uploaded ===")
-    reader = RealCANReader(config)
-
-    try:
-        with reader:
-            for frame in reader.read_frames():
-                if shutdown_event.is_set():
-                    break
-                logger.info(
-                    "FRAME arb_id=0x%03X dlc=%d data=%s ts=%.6f",
-                    frame.arb_id,
-                    frame.dlc,
-                    frame.data.hex(),
-                    frame.timestamp,
-                )
-    except KeyboardInterrupt:
-        pass
-    finally:
-        shutdown_event.set()
-        logger.info(
-            "Dry-run finished. Total frames: %d", reader.get_stats()["frames"]
-        )
-
-    sys.exit(0)
+def _open_reader(
+    config: dict,
+    simulate: bool,
+    replay_path: Optional[str] = None,
+    replay_speed: float = 1.0,
+    replay_rebase: bool = False,
+) -> (
+    SimulatedCANReader
+    | LoadGeneratorCANReader
+    | ReplayCANReader
+    | RealCANReader
+    | RawSocketCANReader
+    | MultiChannelCANReader
+):
+    """Create the frame source: a replay, the simulator or real hardware."""
+    if replay_path:
+        return ReplayCANReader(replay_path, speed=replay_speed, rebase=replay_rebase)
+    if simulate:
+        logger.info("Using simulated CAN with DBC: %s", config["dbc"]["path"])
+        return create_simulated_reader(config)
+    logger.info(
+        "Using real CAN interface: %s %s",
+        config["can"]["interface"],
+        _channel_names(config["can"]),
+    )
+    return create_reader(resolve_filters(config))
 
 
 # ---------------------------------------------------------------------------
-# Decode-live mode
+# Live decoding
 # ---------------------------------------------------------------------------
 
 
-def run_decode_live(config: dict) -> NoReturn:
+def build_live_decoder(
+    config: dict,
+    dashboard: bool = False,
+    signal_rate_hz: float = 0.0,
+) -> LiveDecoderListener:
     """
-    Read real CAN frames, decode them with the configured DBC file, and print
-    decoded signal values to stdout in real time.
+    Load the configured DBC and build a listener printing decoded signals.
 
-    Output format:
+    Output format (scrolling):
         [timestamp] MessageName.SignalName = value unit
 
+    Frames are decoded through a precompiled arb_id table and output is
+    buffered on the listener's own thread, so the terminal cannot
+    back-pressure the CAN socket.
+
     Args:
         config: Normalised configuration dictionary
+        dashboard: Redraw the latest value of every signal in place instead
+            of scrolling every sample
+        signal_rate_hz: Print each signal at most this often (0 = every
+            sample); scrolling mode only
     """
     dbc_path: Optional[str] = config.get("dbc", {}).get("path")
     if not dbc_path:
         logger.error("No DBC path configured. Set dbc.path in your config file.")
         sys.exit(1)
 
-    logger.info("=== DECODE-LIVE MODE — loading DBC: %s ===", dbc_path)
+    logger.info("Loading DBC for live decoding: %s", dbc_path)
     try:
         db = cantools.database.load_file(dbc_path)
     except Exception as exc:
@@ -344,43 +446,211 @@ def run_decode_live(config: dict) -> NoReturn:
         len(db.messages),
         sum(len(m.signals) for m in db.messages),
     )
-    logger.info("Listening on %s...", config["can"]["channel"])
 
-    reader = RealCANReader(config)
-    frame_count = 0
-    decode_errors = 0
+    output: ScrollingOutput | DashboardOutput
+    if dashboard:
+        output = DashboardOutput()
+    else:
+        output = ScrollingOutput(
+            min_interval_sec=1.0 / signal_rate_hz if signal_rate_hz > 0 else 0.0
+        )
+    return LiveDecoderListener(CompiledDecoder(db), output)
+
+
+def _log_live_decoder_stats(listener: LiveDecoderListener) -> None:
+    logger.info(
+        "Live decoding: %d frames, %d decode errors, %d unknown IDs",
+        listener.frames,
+        listener.decoder.decode_errors,
+        len(listener.decoder.unknown_ids),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Diagnostics HTTP server
+# ---------------------------------------------------------------------------
+
+
+def start_diagnostics_server(
+    config: dict,
+    pipeline: CapturePipeline,
+    reader: object,
+    metrics: Optional[MetricsListener] = None,
+    registry: Optional[MetricsRegistry] = None,
+) -> Optional[DiagnosticsServer]:
+    """
+    Serve recent frames and signals over HTTP if ``monitoring.http_port`` is set.
+
+    Adds a ``RecentDataListener`` to the pipeline, so it must be called
+    before ``pipeline.start()``.  A port that cannot be bound is logged and
+    capture continues without the server.
+
+    Args:
+        config: Normalised configuration dictionary
+        pipeline: Pipeline to feed the buffer from and report on
+        reader: Frame source whose ``get_stats()`` is reported, if it has one
+        metrics: Frame statistics for readers without their own
+        registry: Agent metrics served on /metrics
+
+    Returns:
+        The running server, or None if disabled or not bindable
+    """
+    monitoring_config: dict = config.get("monitoring", {})
+    port = int(monitoring_config.get("http_port") or 0)
+    if not port:
+        return None
+
+    decoder: Optional[CompiledDecoder] = None
+    dbc_path: Optional[str] = config.get("dbc", {}).get("path")
+    if dbc_path:
+        try:
+            decoder = CompiledDecoder(cantools.database.load_file(dbc_path))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Diagnostics server without signals, DBC failed to load: %s", exc)
+
+    recent = RecentDataListener(
+        window_sec=float(monitoring_config.get("http_window_sec", 300)),
+        max_frames=int(monitoring_config.get("http_max_frames", 500_000)),
+        decoder=decoder,
+    )
+    sources = {"pipeline": pipeline.get_stats, "buffer": recent.get_stats}
+    if hasattr(reader, "get_stats"):
+        sources["reader"] = reader.get_stats
+    if metrics is not None:
+        sources["capture"] = metrics.get_stats
+    try:
+        server = DiagnosticsServer(
+            port,
+            recent,
+            uptime_status(time.time(), sources),
+            trigger=pipeline.trigger if pipeline.event_capture is not None else None,
+            host=monitoring_config.get("http_host", "127.0.0.1"),
+            metrics=registry,
+        )
+    except OSError as exc:
+        logger.error("Diagnostics server could not bind port %d: %s", port, exc)
+        return None
+
+    pipeline.add_listener("diagnostics", recent)
+    server.start()
+    return server
+
+
+# ---------------------------------------------------------------------------
+# Listen-only mode (--dry-run, --decode-live)
+# ---------------------------------------------------------------------------
+
+
+def run_listen_only(
+    config: dict,
+    reader: (
+        SimulatedCANReader
+        | LoadGeneratorCANReader
+        | ReplayCANReader
+        | RealCANReader
+        | RawSocketCANReader
+        | MultiChannelCANReader
+    ),
+    live_decoder: Optional[LiveDecoderListener] = None,
+) -> NoReturn:
+    """
+    Capture frames and hand them to listeners without batching or uploading.
+
+    Without ``live_decoder`` every frame is logged (``--dry-run``), which is
+    useful for verifying the CAN connection before a full capture session.
+
+    Args:
+        config: Normalised configuration dictionary
+        reader: Frame source (see ``_open_reader``)
+        live_decoder: Listener printing decoded signals (``--decode-live``)
+    """
+    if live_decoder is None:
+        logger.info("=== DRY-RUN MODE — no data will be written or uploaded ===")
+    else:
+        logger.info("=== DECODE-LIVE MODE — no data will be written or uploaded ===")
+
+    # Interactive use: hand blocks on quickly
+    pipeline_config = {**config.get("pipeline", {}), "block_latency_ms": 20}
+    pipeline = CapturePipeline(reader, None, None, None, pipeline_config)
+    frame_log: Optional[FrameLogListener] = None
+    if live_decoder is None:
+        frame_log = FrameLogListener()
+        pipeline.add_listener("frames", frame_log, capacity=1024)
+    else:
+        pipeline.add_listener("decode", live_decoder)
+    diagnostics = start_diagnostics_server(config, pipeline, reader)
 
     try:
         with reader:
-            for frame in reader.read_frames():
-                if shutdown_event.is_set():
-                    break
-                frame_count += 1
-                try:
-                    msg = db.get_message_by_frame_id(frame.arb_id)
-                    decoded = msg.decode(frame.data, decode_choices=False)
-                    ts_str = f"[{frame.timestamp:.3f}]"
-                    for sig_name, value in decoded.items():
-                        sig = msg.get_signal_by_name(sig_name)
-                        unit = sig.unit or ""
-                        print(f"{ts_str} {msg.name}.{sig_name} = {value} {unit}")
-                except KeyError:
-                    logger.debug(
-                        "Unknown frame 0x%03X: %s", frame.arb_id, frame.data.hex()
-                    )
-                except Exception as exc:  # noqa: BLE001
-                    decode_errors += 1
-                    logger.debug("Decode error for 0x%03X: %s", frame.arb_id, exc)
+            logger.info("Listening on %s...", _channel_names(config["can"]))
+            pipeline.start()
+            try:
+                while pipeline.is_alive():
+                    if shutdown_event.wait(timeout=1.0):
+                        break
+            finally:
+                pipeline.stop()
     except KeyboardInterrupt:
         pass
     finally:
         shutdown_event.set()
-        logger.info(
-            "Decode-live finished: %d frames, %d decode errors",
-            frame_count,
-            decode_errors,
+        if diagnostics is not None:
+            diagnostics.stop()
+        if frame_log is not None:
+            logger.info("Dry-run finished. Total frames: %d", frame_log.frames)
+        if live_decoder is not None:
+            _log_live_decoder_stats(live_decoder)
+
+    sys.exit(0)
+
+
+# ---------------------------------------------------------------------------
+# Throughput benchmark (--benchmark)
+# ---------------------------------------------------------------------------
+
+
+def run_benchmark_mode(config: dict, report_path: Optional[str]) -> NoReturn:
+    """
+    Ramp synthetic load through the pipeline and write a JSON report.
+
+    Nothing is uploaded and no CAN interface is opened; see
+    ``benchmark.run_benchmark`` for the ramp and the saturation criteria.
+
+    Args:
+        config: Normalised configuration dictionary
+        report_path: Report file (default ``benchmark-<UTC time>.json``)
+    """
+    logger.info("=== BENCHMARK MODE — synthetic load, nothing is uploaded ===")
+    try:
+        report = run_benchmark(
+            config,
+            resolve_pipeline_config(config),
+            cpu_temp=_read_cpu_temp,
+            should_stop=shutdown_event.is_set,
         )
+    except ValueError as exc:
+        logger.error("Benchmark failed: %s", exc)
+        sys.exit(1)
 
+    path = Path(
+        report_path or f"benchmark-{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}.json"
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2))
+    if report["limit"] is None:
+        logger.info(
+            "Benchmark: sustained every step up to %s frames/s (report: %s)",
+            report["max_sustainable_fps"],
+            path,
+        )
+    else:
+        logger.info(
+            "Benchmark: max sustainable %s frames/s; %s frames/s failed on %s (report: %s)",
+            report["max_sustainable_fps"],
+            report["limit"]["fps"],
+            ", ".join(report["limit"]["reasons"]),
+            path,
+        )
     sys.exit(0)
 
 
@@ -389,27 +659,156 @@ def run_decode_live(config: dict) -> NoReturn:
 # ---------------------------------------------------------------------------
 
 
-def run_agent(config: dict, simulate: bool) -> NoReturn:
+def resolve_pipeline_config(config: dict) -> dict:
+    """
+    Return the ``pipeline`` section with decimation and trigger rules resolved.
+
+    Args:
+        config: Normalised configuration dictionary
+
+    Returns:
+        Pipeline configuration for ``CapturePipeline``
+    """
+    dbc_path = config.get("dbc", {}).get("path")
+    pipeline_config: dict = dict(config.get("pipeline", {}))
+    if pipeline_config.get("decimation"):
+        pipeline_config["decimation"] = resolve_decimation_rules(
+            pipeline_config["decimation"], dbc_path
+        )
+    if pipeline_config.get("trigger"):
+        trigger_config = dict(pipeline_config["trigger"])
+        trigger_config["rules"] = resolve_trigger_rules(
+            trigger_config.get("rules", []), dbc_path
+        )
+        pipeline_config["trigger"] = trigger_config
+    return pipeline_config
+
+
+def create_uploader(config: dict) -> S3Uploader:
+    """
+    Create the S3 uploader from the ``s3``, ``upload`` and ``storage`` sections.
+
+    Args:
+        config: Normalised configuration dictionary
+
+    Returns:
+        S3Uploader instance
+    """
+    s3_config: dict = config["s3"]
+    upload_config: dict = config["upload"]
+    storage_config: dict = config["storage"]
+    return S3Uploader(
+        bucket=s3_config["bucket"],
+        region=s3_config["region"],
+        prefix=s3_config["prefix"],
+        events_prefix=s3_config.get("events_prefix", "events"),
+        max_retries=upload_config["max_retries"],
+        initial_backoff_sec=upload_config["initial_backoff_sec"],
+        max_backoff_sec=upload_config["max_backoff_sec"],
+        archive_dir=storage_config["archive_dir"],
+        pending_dir=storage_config["pending_dir"],
+    )
+
+
+def open_wal(
+    config: dict,
+    batcher: CANFrameBatcher,
+    offline_buffer: Optional[OfflineBuffer],
+) -> Optional[FrameWAL]:
+    """
+    Recover leftover WAL segments, then attach a fresh log to the batcher.
+
+    Recovered batches are written before capture starts and, with uploads
+    enabled, handed to the offline buffer for the pending retry.
+
+    Args:
+        config: Normalised configuration dictionary
+        batcher: Batcher that recovers and then logs frames
+        offline_buffer: Pending queue for recovered files (None = keep local)
+
+    Returns:
+        The attached log, or None when ``wal.enabled`` is off
+    """
+    wal_config: dict = config.get("wal", {})
+    if not wal_config.get("enabled", False):
+        return None
+    # "_" directories are skipped by Hive-partitioned dataset readers
+    wal_dir = wal_config.get("dir") or str(Path(config["storage"]["data_dir"]) / "_wal")
+    for path in recover_segments(wal_dir, batcher):
+        if offline_buffer is not None:
+            offline_buffer.add_to_pending(path)
+
+    can_config: dict = config.get("can", {})
+    fd = bool(can_config.get("fd", False)) or any(
+        isinstance(c, dict) and c.get("fd") for c in can_config.get("channels") or []
+    )
+    batcher.wal = FrameWAL(
+        wal_dir,
+        segment_mb=float(wal_config.get("segment_mb", 16)),
+        max_dlen=CANFD_MAX_DLEN if fd else CAN_MAX_DLEN,
+        sync_interval_ms=float(wal_config.get("sync_interval_ms", 1000)),
+    )
+    return batcher.wal
+
+
+def run_agent(
+    config: dict,
+    simulate: bool,
+    replay_path: Optional[str] = None,
+    replay_speed: float = 1.0,
+    replay_rebase: bool = False,
+    live_decoder: Optional[LiveDecoderListener] = None,
+    runtime: str = "threads",
+    ring_reader: Optional[SharedRingReader] = None,
+    profiler: Optional[Profiler] = None,
+    config_path: Optional[str] = None,
+) -> NoReturn:
     """
     Main agent loop — reads CAN frames, batches to Parquet, uploads to S3.
 
     Args:
         config: Normalised configuration dictionary
-        simulate: When True, use SimulatedCANReader instead of real hardware
+        simulate: When True, generate frames from the DBC instead of reading
+            real hardware (see the ``simulation`` config section)
+        replay_path: Raw Parquet file or directory to replay instead of
+            reading CAN; the agent exits when the replay is done
+        replay_speed: Replay speed factor (0 = as fast as possible)
+        replay_rebase: Shift replayed timestamps to the current time
+        live_decoder: Listener printing decoded signals alongside capture
+            (``--decode-live --capture``)
+        runtime: ``threads`` (a thread per stage, plus the background
+            scheduler) or ``asyncio`` (one event loop, see ``async_runtime``)
+        ring_reader: Read the blocks published by a capture process instead
+            of opening a frame source (writer side of ``run_multiprocess``)
+        profiler: ``--profile`` session timing the pipeline stages; its
+            summary is logged every heartbeat interval
+        config_path: Config file re-read on SIGHUP (and when it changes,
+            with ``reload.watch``); live changes are applied without
+            stopping capture (see ``hot_reload``)
     """
     vehicle_id: str = config["vehicle_id"]
-    s3_config: dict = config["s3"]
-    can_config: dict = config["can"]
-    dbc_config: dict = config["dbc"]
     batch_config: dict = config["batch"]
     storage_config: dict = config["storage"]
     upload_config: dict = config["upload"]
     offline_config: dict = config["offline"]
     monitoring_config: dict = config.get("monitoring", {})
     heartbeat_sec: int = int(monitoring_config.get("heartbeat_interval_seconds", 60))
+    top_ids: int = int(monitoring_config.get("top_ids", 5))
+    realtime_config: dict = dict(config.get("realtime", {}))
+    if replay_path or ring_reader is not None:
+        # Recorded or relayed timestamps say nothing about capture-thread stalls
+        realtime_config["stall_threshold_ms"] = 0
 
     logger.info("Starting CAN telemetry edge agent for vehicle: %s", vehicle_id)
-    logger.info("Mode: %s", "SIMULATION" if simulate else "REAL CAN INTERFACE")
+    if ring_reader is not None:
+        mode = "SHARED-MEMORY WRITER"
+    elif replay_path:
+        mode = "REPLAY"
+    elif simulate:
+        mode = "SIMULATION"
+    else:
+        mode = "REAL CAN INTERFACE"
+    logger.info("Mode: %s (%s runtime)", mode, runtime)
 
     # ---- Component initialisation -------------------------------------- #
     batcher = CANFrameBatcher(
@@ -420,107 +819,177 @@ def run_agent(config: dict, simulate: bool) -> NoReturn:
     )
 
     upload_enabled: bool = bool(upload_config.get("enabled", True))
+    uploader: Optional[S3Uploader] = None
     if not upload_enabled:
         logger.info("Upload disabled — operating in local-only mode")
-        uploader = None
     else:
-        uploader = S3Uploader(
-            bucket=s3_config["bucket"],
-            region=s3_config["region"],
-            prefix=s3_config["prefix"],
-            max_retries=upload_config["max_retries"],
-            initial_backoff_sec=upload_config["initial_backoff_sec"],
-            max_backoff_sec=upload_config["max_backoff_sec"],
-            archive_dir=storage_config["archive_dir"],
-            pending_dir=storage_config["pending_dir"],
-        )
+        uploader = create_uploader(config)
 
     offline_buffer = OfflineBuffer(
         pending_dir=storage_config["pending_dir"],
         max_disk_gb=storage_config["max_disk_gb"],
         max_queue_size=offline_config["max_queue_size"],
+        # Eviction is a scheduled task, off the writer and upload threads
+        enforce_on_add=False,
     )
+    # Before capture starts: frames of a crashed session are written first
+    wal = open_wal(config, batcher, offline_buffer if upload_enabled else None)
 
-    # ---- Background threads ------------------------------------------- #
-    threads: list[threading.Thread] = []
-
-    if uploader is not None:
-        retry_thread = threading.Thread(
-            target=retry_pending_worker,
-            args=(uploader, offline_config["check_interval_sec"]),
-            daemon=True,
-            name="retry-worker",
-        )
-        retry_thread.start()
-        threads.append(retry_thread)
+    # Before any thread starts, so all of them inherit the CPU affinity
+    apply_process_settings(realtime_config)
+    use_asyncio = runtime == "asyncio"
 
     # ---- CAN reader ---------------------------------------------------- #
-    if simulate:
-        logger.info("Using simulated CAN with DBC: %s", dbc_config["path"])
-        reader_ctx: SimulatedCANReader | RealCANReader = SimulatedCANReader(
-            dbc_path=dbc_config["path"], frequency=100
+    reader_ctx = ring_reader or _open_reader(
+        config, simulate, replay_path, replay_speed, replay_rebase
+    )
+
+    # ---- Capture -> writer -> upload pipeline --------------------------- #
+    pipeline_config = resolve_pipeline_config(config)
+    pipeline_class = AsyncCapturePipeline if use_asyncio else CapturePipeline
+    pipeline = pipeline_class(
+        reader_ctx,
+        batcher,
+        uploader,
+        offline_buffer,
+        pipeline_config,
+        realtime_config,
+    )
+
+    if profiler is not None:
+        pipeline.timers = batcher.timers = profiler.timers
+
+    if pipeline.event_capture is not None and not use_asyncio:
+        # Manual trigger: kill -USR1 <pid>
+        signal.signal(signal.SIGUSR1, lambda signum, frame: pipeline.trigger())
+
+    # ---- Listeners fed alongside the writer ----------------------------- #
+    metrics: Optional[MetricsListener] = None
+    if simulate or replay_path or ring_reader is not None:
+        # Hardware readers keep these statistics themselves
+        metrics = MetricsListener(
+            window_sec=int(monitoring_config.get("fps_window_seconds", 10)),
+            missing_gap_factor=float(monitoring_config.get("missing_gap_factor", 10.0)),
         )
-    else:
-        logger.info(
-            "Using real CAN interface: %s %s",
-            can_config["interface"],
-            can_config["channel"],
+        pipeline.add_listener("metrics", metrics)
+    if live_decoder is not None:
+        pipeline.add_listener("decode", live_decoder)
+
+    # ---- Agent self-metrics (/metrics, node-exporter textfile) --------- #
+    textfile: Optional[str] = monitoring_config.get("metrics_textfile")
+    textfile_sec = float(monitoring_config.get("metrics_textfile_interval_seconds", 15))
+    agent_metrics: Optional[AgentMetrics] = None
+    if monitoring_config.get("http_port") or textfile:
+        agent_metrics = AgentMetrics(
+            pipeline, offline_buffer, uploader, reader_ctx, _read_cpu_temp
         )
-        reader_ctx = RealCANReader(config)
+        pipeline.metrics = agent_metrics
+    diagnostics = start_diagnostics_server(
+        config,
+        pipeline,
+        reader_ctx,
+        metrics,
+        agent_metrics.registry if agent_metrics is not None else None,
+    )
 
-        # Health monitor only makes sense for real hardware
-        health_thread = threading.Thread(
-            target=health_monitor_worker,
-            args=(
+    # ---- Background tasks: one scheduler, capture first ----------------- #
+    scheduler = create_scheduler(config, pipeline.capture_backlog)
+    pipeline.budget = scheduler.budget
+    pipeline.upload_max_defer_sec = scheduler.max_defer_sec
+    scheduler.add(
+        "eviction",
+        float(offline_config.get("evict_interval_sec", 10)),
+        offline_buffer.enforce_limits,
+    )
+    # The capture process logs HEALTH for a reader behind a ring
+    if not simulate and not replay_path and ring_reader is None:
+        scheduler.add(
+            "health monitor",
+            heartbeat_sec,
+            functools.partial(
+                log_health,
                 reader_ctx,
                 storage_config["pending_dir"],
                 storage_config["data_dir"],
-                heartbeat_sec,
+                time.time(),
+                top_ids,
+                pipeline,
             ),
-            daemon=True,
-            name="health-monitor",
         )
-        health_thread.start()
-        threads.append(health_thread)
-
-    # ---- Main loop ----------------------------------------------------- #
-    batch_count = 0
-    upload_success = 0
-    upload_failed = 0
+    if textfile and agent_metrics is not None:
+        scheduler.add(
+            "metrics textfile",
+            textfile_sec,
+            functools.partial(write_textfile, agent_metrics.registry, textfile),
+        )
+    if profiler is not None:
+        scheduler.add("profile summary", heartbeat_sec, profiler.summary)
+    if uploader is not None:
 
-    try:
-        with reader_ctx:
-            logger.info("CAN reader initialised, starting frame capture...")
+        def retry_should_stop() -> bool:
+            return (
+                shutdown_event.is_set()
+                or scheduler.budget.reason_to_wait(PRIORITY_UPLOAD) is not None
+            )
 
-            for parquet_path in batcher.process_frames(reader_ctx.read_frames()):
-                if shutdown_event.is_set():
-                    logger.info("Shutdown requested, stopping capture...")
-                    break
+        def retry_pending() -> None:
+            # pipeline.uploader: replaced when a config reload changes upload settings
+            retry_pending_once(pipeline.uploader, retry_should_stop)
 
-                batch_count += 1
-                logger.info("Batch %d written: %s", batch_count, parquet_path)
+        scheduler.add(
+            "pending retry", offline_config["check_interval_sec"], retry_pending, PRIORITY_UPLOAD
+        )
 
-                if uploader is not None:
-                    if uploader.upload(parquet_path):
-                        upload_success += 1
-                    else:
-                        upload_failed += 1
-                        logger.warning(
-                            "Upload failed for batch %d, file moved to pending",
-                            batch_count,
-                        )
+    # ---- Config hot reload (SIGHUP, or reload.watch) --------------------- #
+    if config_path is not None:
+        reload_config: dict = config.get("reload", {})
+
+        def swap_uploader(new_uploader: S3Uploader) -> None:
+            new_uploader.retries = pipeline.uploader.retries
+            pipeline.uploader = new_uploader
+            if agent_metrics is not None:
+                agent_metrics.uploader = new_uploader
+
+        reloader = ConfigReloader(
+            config_path,
+            config,
+            load_config,
+            reader_ctx,
+            batcher,
+            create_uploader if uploader is not None else None,
+            swap_uploader if uploader is not None else None,
+            watch=bool(reload_config.get("watch", False)),
+        )
+        scheduler.add(
+            "config reload", float(reload_config.get("poll_interval_sec", 1)), reloader.poll
+        )
+        signal.signal(signal.SIGHUP, lambda signum, frame: reloader.request())
+    # The asyncio runtime runs the scheduling passes as its one periodic job
+    jobs: list[tuple[str, float, Callable[[], None]]] = []
+    if use_asyncio:
+        jobs.append(("background scheduler", scheduler.tick_sec, scheduler.run_due))
+    else:
+        scheduler.start()
 
-                if batch_count % 10 == 0:
-                    buf_stats = offline_buffer.get_stats()
-                    logger.info(
-                        "Stats: batches=%d upload_ok=%d upload_fail=%d "
-                        "pending=%d disk=%.2f GB",
-                        batch_count,
-                        upload_success,
-                        upload_failed,
-                        buf_stats["pending_count"],
-                        buf_stats["disk_usage_gb"],
-                    )
+    # ---- Main loop ----------------------------------------------------- #
+    try:
+        with reader_ctx:
+            logger.info("CAN reader initialised, starting frame capture...")
+            if realtime_config.get("gc_freeze", True):
+                freeze_gc()
+            if profiler is not None:
+                profiler.start()
+            if use_asyncio:
+                asyncio.run(run_async_agent(pipeline, jobs, shutdown_event))
+            else:
+                pipeline.start()
+                try:
+                    while pipeline.is_alive():
+                        if shutdown_event.wait(timeout=1.0):
+                            logger.info("Shutdown requested, stopping capture...")
+                            break
+                finally:
+                    pipeline.stop()
 
     except KeyboardInterrupt:
         logger.info("Keyboard interrupt received")
@@ -530,18 +999,251 @@ def run_agent(config: dict, simulate: bool) -> NoReturn:
     finally:
         logger.info("Shutting down edge agent...")
         shutdown_event.set()
+        if diagnostics is not None:
+            diagnostics.stop()
 
-        for t in threads:
-            t.join(timeout=5)
+        scheduler.stop()
+        if wal is not None:
+            wal.close()
+        if profiler is not None:
+            profiler.stop()
 
+        p_stats = pipeline.get_stats()
         buf_stats = offline_buffer.get_stats()
         logger.info(
-            "Final stats: batches=%d upload_ok=%d upload_fail=%d pending=%d",
-            batch_count,
-            upload_success,
-            upload_failed,
+            "Final stats: batches=%d upload_ok=%d upload_fail=%d pending=%d "
+            "frames_dropped=%d",
+            p_stats["batches"],
+            p_stats["upload_ok"],
+            p_stats["upload_fail"],
             buf_stats["pending_count"],
+            p_stats["frame_queue"]["dropped_units"],
+        )
+        if "events" in p_stats:
+            ev = p_stats["events"]
+            logger.info(
+                "Event captures: %d written (%d triggers fired, %d absorbed, %d held off)",
+                ev["written"],
+                ev["fired"],
+                ev["absorbed"],
+                ev["held_off"],
+            )
+        if metrics is not None:
+            logger.info("Capture stats: %s", metrics.summary(top_ids))
+        if live_decoder is not None:
+            _log_live_decoder_stats(live_decoder)
+        if "stalls" in p_stats:
+            logger.info(
+                "Capture stalls: %d (max %.1f ms), GC max pause %.1f ms",
+                p_stats["stalls"]["stalls"],
+                p_stats["stalls"]["max_stall_ms"],
+                p_stats["stalls"]["gc_max_pause_ms"],
+            )
+        logger.info("Edge agent stopped")
+
+    sys.exit(0)
+
+
+# ---------------------------------------------------------------------------
+# Multi-process runtime: capture and writer processes around a shared ring
+# ---------------------------------------------------------------------------
+
+
+def _log_level(config: dict) -> int:
+    """Root log level from the ``logging`` config section."""
+    return getattr(logging, config.get("logging", {}).get("level", "INFO").upper(), logging.INFO)
+
+
+def run_capture_process(
+    config: dict,
+    ring_name: str,
+    simulate: bool,
+    replay_path: Optional[str],
+    replay_speed: float,
+    replay_rebase: bool,
+    log_queue: object,
+) -> None:
+    """
+    Capture process: read the frame source and publish blocks into the ring.
+
+    Exits with code 0 when the frame source ends (replay) and lets any
+    error propagate, so the supervisor restarts the process.
+
+    Args:
+        config: Normalised configuration dictionary
+        ring_name: Name of the ``SharedFrameRing`` created by the supervisor
+        simulate: Generate frames from the DBC instead of reading hardware
+        replay_path: Raw Parquet file or directory to replay
+        replay_speed: Replay speed factor (0 = as fast as possible)
+        replay_rebase: Shift replayed timestamps to the current time
+        log_queue: Supervisor log queue
+    """
+    ignore_interrupts()
+    init_child_logging(log_queue, _log_level(config))
+    pipeline_config: dict = config.get("pipeline", {})
+    realtime_config: dict = config.get("realtime", {})
+    monitoring_config: dict = config.get("monitoring", {})
+    storage_config: dict = config["storage"]
+
+    ring = SharedFrameRing.attach(ring_name, "producer")
+    reader = _open_reader(config, simulate, replay_path, replay_speed, replay_rebase)
+
+    def on_term(signum: int, frame: object) -> None:
+        shutdown_event.set()
+        if hasattr(reader, "stop"):
+            reader.stop()
+
+    signal.signal(signal.SIGTERM, on_term)
+
+    # Before the capture settings apply to this thread, so the scheduler is unaffected
+    scheduler = create_scheduler(config)
+    if not simulate and not replay_path:
+        scheduler.add(
+            "health monitor",
+            int(monitoring_config.get("heartbeat_interval_seconds", 60)),
+            functools.partial(
+                log_health,
+                reader,
+                storage_config["pending_dir"],
+                storage_config["data_dir"],
+                time.time(),
+                int(monitoring_config.get("top_ids", 5)),
+            ),
+        )
+        scheduler.start()
+
+    apply_capture_thread_settings(realtime_config)
+    try:
+        with reader:
+            if realtime_config.get("gc_freeze", True):
+                freeze_gc()
+            for block in iter_reader_blocks(
+                reader,
+                ring.block_frames,
+                float(pipeline_config.get("block_latency_ms", 50)),
+            ):
+                if not ring.put(block):
+                    dropped = ring.get_stats()["dropped_blocks"]
+                    if dropped % 100 == 1:
+                        logger.warning(
+                            "Frame ring full, %d blocks dropped so far", dropped
+                        )
+                if shutdown_event.is_set():
+                    break
+    finally:
+        shutdown_event.set()
+        scheduler.stop()
+        ring.close()
+
+
+def run_writer_process(
+    config: dict, ring_name: str, config_path: Optional[str], log_queue: object
+) -> None:
+    """
+    Writer process: run the capture pipeline on the blocks in the ring.
+
+    SIGTERM lets the pipeline write out every block still in the ring, then
+    the process exits as ``run_agent`` does at the end of a replay.  SIGHUP
+    (forwarded by the supervisor) reloads the batching and upload settings.
+
+    Args:
+        config: Normalised configuration dictionary
+        ring_name: Name of the ``SharedFrameRing`` created by the supervisor
+        config_path: Config file re-read on SIGHUP (None = no reload)
+        log_queue: Supervisor log queue
+    """
+    ignore_interrupts()
+    init_child_logging(log_queue, _log_level(config))
+    ring = SharedFrameRing.attach(ring_name, "consumer")
+    reader = SharedRingReader(ring)
+    signal.signal(signal.SIGTERM, lambda signum, frame: reader.stop())
+    try:
+        run_agent(config, simulate=False, ring_reader=reader, config_path=config_path)
+    finally:
+        ring.close()
+
+
+def run_multiprocess(
+    config: dict,
+    simulate: bool,
+    replay_path: Optional[str] = None,
+    replay_speed: float = 1.0,
+    replay_rebase: bool = False,
+    config_path: Optional[str] = None,
+) -> NoReturn:
+    """
+    Run capture and writing in separate processes joined by a shared-memory ring.
+
+    Parquet encoding and compression in the writer process then never hold
+    the GIL of the process receiving frames.  This process only supervises:
+    either child is restarted with backoff if it dies, and the ring keeps
+    the blocks captured meanwhile (up to ``pipeline.shm_slots``).  On
+    shutdown capture stops first, then the writer drains the ring.
+
+    Args:
+        config: Normalised configuration dictionary
+        simulate: Generate frames from the DBC instead of reading hardware
+        replay_path: Raw Parquet file or directory to replay; the agent
+            exits when the replay is done
+        replay_speed: Replay speed factor (0 = as fast as possible)
+        replay_rebase: Shift replayed timestamps to the current time
+        config_path: Config file the writer process re-reads on SIGHUP
+    """
+    pipeline_config: dict = config.get("pipeline", {})
+    monitoring_config: dict = config.get("monitoring", {})
+    heartbeat_sec = int(monitoring_config.get("heartbeat_interval_seconds", 60))
+    shutdown_timeout = float(pipeline_config.get("shutdown_timeout_sec", 30))
+
+    logger.info("Starting CAN telemetry edge agent for vehicle: %s", config["vehicle_id"])
+    logger.info("Mode: capture and writer processes with a shared-memory ring")
+    ring = SharedFrameRing.create(
+        slots=int(pipeline_config.get("shm_slots", 128)),
+        block_frames=int(pipeline_config.get("block_frames", 1024)),
+    )
+    supervisor = ProcessSupervisor()
+    supervisor.add(
+        "capture",
+        run_capture_process,
+        (config, ring.name, simulate, replay_path, replay_speed, replay_rebase),
+        restart_on_success=False,
+    )
+    supervisor.add("writer", run_writer_process, (config, ring.name, config_path))
+    # Manual event trigger and config reload: the writer process runs the pipeline
+    for signum in (signal.SIGUSR1, signal.SIGHUP):
+        signal.signal(signum, lambda signum, frame: supervisor.send_signal("writer", signum))
+
+    def log_ring() -> None:
+        stats = ring.get_stats()
+        procs = supervisor.get_stats()
+        logger.info(
+            "RING: depth=%d/%d frames=%d dropped=%d/%dblocks restarts=capture:%d,writer:%d",
+            stats["depth"],
+            stats["slots"],
+            stats["frames_in"],
+            stats["dropped_frames"],
+            stats["dropped_blocks"],
+            procs["capture"]["restarts"],
+            procs["writer"]["restarts"],
         )
+
+    try:
+        supervisor.start()
+        next_log = time.monotonic() + heartbeat_sec
+        while not shutdown_event.wait(timeout=0.5):
+            if "capture" in supervisor.poll():
+                logger.info("Frame source finished")
+                break
+            if time.monotonic() >= next_log:
+                log_ring()
+                next_log += heartbeat_sec
+    finally:
+        logger.info("Shutting down edge agent...")
+        supervisor.stop("capture", timeout=10)
+        supervisor.stop("writer", timeout=shutdown_timeout + 10)
+        log_ring()
+        supervisor.close()
+        ring.close()
+        ring.unlink()
         logger.info("Edge agent stopped")
 
     sys.exit(0)
@@ -568,8 +1270,29 @@ Examples:
   # Verify CAN connection without writing anything
   python -m src.main --config config-rpi.yaml --dry-run
 
-  # Real-time signal decode and print
+  # Real-time signal decode and print (nothing written)
   python -m src.main --config config-rpi.yaml --decode-live
+
+  # Live dashboard of the latest value of every signal
+  python -m src.main --config config-rpi.yaml --decode-live --dashboard
+
+  # Full capture + upload, watching decoded signals at the same time
+  python -m src.main --config config-rpi.yaml --decode-live --capture --signal-rate 2
+
+  # Capture on a single asyncio event loop instead of a thread per stage
+  python -m src.main --config config-rpi.yaml --runtime asyncio
+
+  # Capture and Parquet writing in separate processes (shared-memory ring)
+  python -m src.main --config config-rpi.yaml --runtime processes
+
+  # Replay a recorded capture through the pipeline as fast as possible
+  python -m src.main --config config.yaml --replay ./data/raw --replay-speed 0
+
+  # Per-stage CPU timings, plus 60 s of stack samples for a flame graph
+  python -m src.main --config config-rpi.yaml --profile --profile-sample 60
+
+  # Find the highest frame rate this device sustains (JSON report)
+  python -m src.main --config config-rpi.yaml --benchmark --benchmark-report bench.json
         """,
     )
 
@@ -594,14 +1317,112 @@ Examples:
         action="store_true",
         help="Read real CAN, decode with DBC, print signal values to stdout",
     )
+    parser.add_argument(
+        "--capture",
+        action="store_true",
+        help="With --decode-live: also batch and upload as in normal mode",
+    )
+    parser.add_argument(
+        "--dashboard",
+        action="store_true",
+        help="With --decode-live: redraw the latest value of each signal in place",
+    )
+    parser.add_argument(
+        "--signal-rate",
+        type=float,
+        default=0.0,
+        metavar="HZ",
+        help="With --decode-live: print each signal at most HZ times per second",
+    )
+    parser.add_argument(
+        "--replay",
+        type=str,
+        metavar="PATH",
+        help="Replay raw Parquet file(s) written by the agent instead of reading CAN",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        help="Replay speed factor: 1 = real time, 10 = 10x, 0 = as fast as possible",
+    )
+    parser.add_argument(
+        "--runtime",
+        choices=("threads", "asyncio", "processes"),
+        default="threads",
+        help=(
+            "Run capture, writing, uploads and timers as threads, on one asyncio loop, "
+            "or with capture and writing in separate processes"
+        ),
+    )
+    parser.add_argument(
+        "--replay-rebase",
+        action="store_true",
+        help="Shift replayed timestamps so the capture starts now",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each pipeline stage (wall and CPU) and log a PROFILE summary every heartbeat",
+    )
+    parser.add_argument(
+        "--profile-sample",
+        type=float,
+        default=0.0,
+        metavar="SEC",
+        help="With --profile: sample stacks for SEC seconds into a collapsed-stack file",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=str,
+        default="./profile",
+        metavar="DIR",
+        help="With --profile: directory for profile-summary.json and stack samples",
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Ramp synthetic frame rates through batching and Parquet writing, then exit",
+    )
+    parser.add_argument(
+        "--benchmark-report",
+        type=str,
+        metavar="PATH",
+        help="With --benchmark: JSON report file (default benchmark-<time>.json)",
+    )
 
     args = parser.parse_args()
 
-    # Mutually exclusive flags
-    if sum([args.simulate, args.dry_run, args.decode_live]) > 1:
-        parser.error(
-            "--simulate, --dry-run, and --decode-live are mutually exclusive"
-        )
+    # One frame source; --dry-run and --decode-live work with any of them
+    if args.simulate and args.replay:
+        parser.error("--simulate and --replay are mutually exclusive")
+    if args.capture and (args.dry_run or not args.decode_live):
+        parser.error("--capture only applies to --decode-live without --dry-run")
+    if args.replay_speed < 0:
+        parser.error("--replay-speed must be >= 0")
+    if args.runtime == "asyncio" and (args.dry_run or (args.decode_live and not args.capture)):
+        parser.error("--runtime asyncio needs the capture pipeline (not --dry-run/--decode-live)")
+    if args.runtime == "processes" and (args.dry_run or args.decode_live):
+        parser.error("--runtime processes does not support --dry-run/--decode-live")
+    if args.profile and (
+        args.runtime == "processes" or args.dry_run or (args.decode_live and not args.capture)
+    ):
+        parser.error("--profile needs the capture pipeline in one process")
+    if args.profile_sample < 0:
+        parser.error("--profile-sample must be >= 0")
+    if args.profile_sample and not args.profile:
+        parser.error("--profile-sample only applies with --profile")
+    if args.benchmark and (
+        args.simulate
+        or args.replay
+        or args.dry_run
+        or args.decode_live
+        or args.profile
+        or args.runtime != "threads"
+    ):
+        parser.error("--benchmark generates its own load and runs on its own")
+    if args.benchmark_report and not args.benchmark:
+        parser.error("--benchmark-report only applies with --benchmark")
 
     try:
         config = load_config(args.config)
@@ -613,13 +1434,47 @@ Examples:
 
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
+    # Replaced where a reload is possible (run_agent, run_multiprocess)
+    signal.signal(signal.SIGHUP, ignore_reload_signal)
+
+    live_decoder: Optional[LiveDecoderListener] = None
+    if args.decode_live:
+        live_decoder = build_live_decoder(
+            config, dashboard=args.dashboard, signal_rate_hz=args.signal_rate
+        )
 
-    if args.dry_run:
-        run_dry_run(config)
-    elif args.decode_live:
-        run_decode_live(config)
+    if args.benchmark:
+        run_benchmark_mode(config, args.benchmark_report)
+    elif args.runtime == "processes":
+        run_multiprocess(
+            config,
+            simulate=args.simulate,
+            replay_path=args.replay,
+            replay_speed=args.replay_speed,
+            replay_rebase=args.replay_rebase,
+            config_path=args.config,
+        )
+    elif args.dry_run or (live_decoder is not None and not args.capture):
+        reader = _open_reader(
+            config, args.simulate, args.replay, args.replay_speed, args.replay_rebase
+        )
+        run_listen_only(config, reader, live_decoder)
     else:
-        run_agent(config, simulate=args.simulate)
+        run_agent(
+            config,
+            simulate=args.simulate,
+            replay_path=args.replay,
+            replay_speed=args.replay_speed,
+            replay_rebase=args.replay_rebase,
+            live_decoder=live_decoder,
+            runtime=args.runtime,
+            profiler=(
+                Profiler(args.profile_dir, sample_sec=args.profile_sample)
+                if args.profile
+                else None
+            ),
+            config_path=args.config,
+        )
 
 
 if __name__ == "__main__":
@@ -8,6 +8,15 @@ from typing import List
 logger = logging.getLogger(__name__)
 
 
+def is_priority_file(path: Path) -> bool:
+    """
+    True for event captures (``<time>Z_event-<trigger>.parquet``).
+
+    Event captures are uploaded before routine batches and evicted last.
+    """
+    return "Z_event-" in path.name
+
+
 class OfflineBuffer:
     """Manages offline buffering with disk space monitoring."""
 
@@ -16,6 +25,7 @@ class OfflineBuffer:
         pending_dir: str = "./data/pending",
         max_disk_gb: float = 10.0,
         max_queue_size: int = 100,
+        enforce_on_add: bool = True,
     ):
         """
         Initialize offline buffer.
@@ -24,10 +34,13 @@ class OfflineBuffer:
             pending_dir: Directory for pending files
             max_disk_gb: Maximum disk usage in GB
             max_queue_size: Maximum number of pending files
+            enforce_on_add: Evict after every added file; disable when
+                ``enforce_limits`` runs as a scheduled task instead
         """
         self.pending_dir = Path(pending_dir)
         self.max_disk_bytes = int(max_disk_gb * 1024 * 1024 * 1024)
         self.max_queue_size = max_queue_size
+        self.enforce_on_add = enforce_on_add
 
         self.pending_dir.mkdir(parents=True, exist_ok=True)
 
@@ -82,13 +95,15 @@ class OfflineBuffer:
         """
         Evict oldest files to free up space.
 
+        Routine batches go before event captures, oldest first.
+
         Args:
             count: Number of files to evict
 
         Returns:
             Number of files actually evicted
         """
-        pending_files = self.get_pending_files()
+        pending_files = sorted(self.get_pending_files(), key=is_priority_file)
 
         if not pending_files:
             return 0
@@ -157,7 +172,8 @@ class OfflineBuffer:
             logger.info(f"Added to pending queue: {pending_path.name}")
 
             # Enforce limits after adding
-            self.enforce_limits()
+            if self.enforce_on_add:
+                self.enforce_limits()
 
             return True
 
@@ -0,0 +1,410 @@
+"""Agent self-metrics in the OpenMetrics / Prometheus text exposition formats."""
+
+import logging
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Default histogram buckets
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+FRAMES_BUCKETS = (100, 1000, 5000, 10_000, 25_000, 50_000, 100_000, 250_000)
+RATIO_BUCKETS = (1.0, 2.0, 3.0, 4.0, 6.0, 8.0, 12.0, 16.0)
+BYTES_PER_SEC_BUCKETS = (1e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6, 1e7, 2.5e7)
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """A metric family: one value per combination of label values."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _samples(self) -> Iterator[tuple[str, str, float]]:
+        """(suffix, label string, value) per exposed sample."""
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in sorted(items):
+            yield "", _labels(self.labelnames, key), value
+
+    def render(self, openmetrics: bool) -> list[str]:
+        """Exposition lines of the family, TYPE/HELP included."""
+        unit = ""
+        for suffix in ("seconds", "bytes", "celsius"):
+            if self.name.endswith("_" + suffix):
+                unit = suffix
+        # Text format 0.0.4 names a counter family after its _total sample
+        family = self.name + ("_total" if self.kind == "counter" and not openmetrics else "")
+        lines = [f"# TYPE {family} {self.kind}"]
+        if unit and openmetrics:
+            lines.append(f"# UNIT {family} {unit}")
+        lines.append(f"# HELP {family} {_escape(self.documentation)}")
+        for suffix, labels, value in self._samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonic total, exposed as ``<name>_total``."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Add to the total."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set_total(self, value: float, **labels: str) -> None:
+        """Mirror a total kept elsewhere (e.g. a component's stats counter)."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def _samples(self) -> Iterator[tuple[str, str, float]]:
+        for _, labels, value in super()._samples():
+            yield "_total", labels, value
+
+
+class Gauge(_Metric):
+    """Current value."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the value."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Distribution of observations over fixed cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: tuple[float, ...],
+        labelnames: tuple[str, ...] = (),
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation."""
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # per-bucket counts (+Inf last), sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            counts = state[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            state[1] += value
+
+    def _samples(self) -> Iterator[tuple[str, str, float]]:
+        with self._lock:
+            items = [(key, list(state[0]), state[1]) for key, state in self._values.items()]
+        for key, counts, total in sorted(items):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                yield "_bucket", _labels(self.labelnames, key, le), cumulative
+            yield "_count", _labels(self.labelnames, key), cumulative
+            yield "_sum", _labels(self.labelnames, key), total
+
+
+class MetricsRegistry:
+    """
+    A set of metric families rendered together.
+
+    Collectors registered with ``add_collector()`` run before every render,
+    so values that components already count (queue depths, pending files)
+    are read at scrape time instead of being pushed from hot paths.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty registry."""
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _add(self, metric: _Metric) -> Any:
+        if any(m.name == metric.name for m in self._metrics):
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """Register a counter (``name`` without the ``_total`` suffix)."""
+        return self._add(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        """Register a gauge."""
+        return self._add(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        buckets: tuple[float, ...] = SECONDS_BUCKETS,
+        labelnames: tuple[str, ...] = (),
+    ) -> Histogram:
+        """Register a histogram."""
+        return self._add(Histogram(name, documentation, buckets, labelnames))
+
+    def add_collector(self, collect: Callable[[], None]) -> None:
+        """Run ``collect`` before every render to refresh sampled values."""
+        self._collectors.append(collect)
+
+    def render(self, openmetrics: bool = True) -> str:
+        """
+        Render every family.
+
+        Args:
+            openmetrics: OpenMetrics 1.0 text (ends with ``# EOF``);
+                otherwise the Prometheus text format 0.0.4 read by the
+                node-exporter textfile collector
+
+        Returns:
+            Exposition text
+        """
+        # One render at a time, so collectors never run concurrently
+        with self._lock:
+            for collect in self._collectors:
+                try:
+                    collect()
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("Metrics collector failed: %s", exc)
+            lines: list[str] = []
+            for metric in self._metrics:
+                lines.extend(metric.render(openmetrics))
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def write_textfile(registry: MetricsRegistry, path: str) -> None:
+    """
+    Write the registry for the node-exporter textfile collector.
+
+    The file is replaced atomically, so node-exporter never reads a partial
+    file.
+
+    Args:
+        registry: Metrics to write
+        path: Target ``*.prom`` file in the collector's directory
+    """
+    target = Path(path)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    tmp.write_text(registry.render(openmetrics=False))
+    os.replace(tmp, target)
+
+
+class AgentMetrics:
+    """
+    The edge agent's own metrics.
+
+    The writer and upload stages record batch writes and uploads as they
+    happen (``observe_write``, ``observe_upload``); everything the
+    components already count is sampled from their ``get_stats()`` when
+    the metrics are rendered.
+    """
+
+    def __init__(
+        self,
+        pipeline: Any,
+        offline_buffer: Any = None,
+        uploader: Any = None,
+        reader: Any = None,
+        cpu_temp: Optional[Callable[[], Optional[float]]] = None,
+    ) -> None:
+        """
+        Register the agent's metric families.
+
+        Args:
+            pipeline: ``CapturePipeline`` (queues, frame and upload counters)
+            offline_buffer: Pending upload directory (None = not reported)
+            uploader: ``S3Uploader`` whose retries are counted (optional)
+            reader: Frame source; its kernel/interface/ring drop counters
+                are reported when present
+            cpu_temp: Returns the CPU temperature in °C, or None
+        """
+        self.pipeline = pipeline
+        self.offline_buffer = offline_buffer
+        self.uploader = uploader
+        self.reader = reader
+        self.cpu_temp = cpu_temp
+        self.start = time.time()
+
+        r = self.registry = MetricsRegistry()
+        self.frames_received = r.counter(
+            "canagent_frames_received", "Frames handed to the pipeline by the CAN reader."
+        )
+        self.frames_dropped = r.counter(
+            "canagent_frames_dropped",
+            "Frames lost, by the stage where they were dropped.",
+            ("stage",),
+        )
+        self.batch_frames = r.histogram(
+            "canagent_batch_frames",
+            "Frames per written Parquet file.",
+            FRAMES_BUCKETS,
+            ("kind",),
+        )
+        self.batch_write_seconds = r.histogram(
+            "canagent_batch_write_seconds",
+            "Time to encode and write one Parquet file.",
+            SECONDS_BUCKETS,
+            ("kind",),
+        )
+        self.compression_ratio = r.histogram(
+            "canagent_batch_compression_ratio",
+            "In-memory Arrow size over written Parquet file size.",
+            RATIO_BUCKETS,
+            ("kind",),
+        )
+        self.upload_seconds = r.histogram(
+            "canagent_upload_seconds",
+            "Time to upload one file, retries included.",
+            SECONDS_BUCKETS,
+            ("result",),
+        )
+        self.upload_throughput = r.histogram(
+            "canagent_upload_throughput_bytes_per_second",
+            "Throughput of successful uploads.",
+            BYTES_PER_SEC_BUCKETS,
+        )
+        self.uploaded_bytes = r.counter(
+            "canagent_uploaded_bytes", "Bytes uploaded by the upload stage."
+        )
+        self.uploads = r.counter("canagent_uploads", "Upload stage outcomes.", ("result",))
+        self.upload_retries = r.counter(
+            "canagent_upload_retries", "Upload attempts repeated after an error."
+        )
+        self.pending_files = r.gauge("canagent_pending_files", "Files waiting for upload.")
+        self.pending_bytes = r.gauge(
+            "canagent_pending_bytes", "Size of the files waiting for upload."
+        )
+        self.queue_depth = r.gauge(
+            "canagent_queue_depth", "Items in a pipeline stage's input queue.", ("queue",)
+        )
+        self.queue_capacity = r.gauge(
+            "canagent_queue_capacity", "Capacity of a pipeline stage's input queue.", ("queue",)
+        )
+        self.cpu_temperature = r.gauge(
+            "canagent_cpu_temperature_celsius", "CPU temperature (Raspberry Pi thermal zone 0)."
+        )
+        self.uptime = r.gauge("canagent_uptime_seconds", "Time since the agent started.")
+        r.add_collector(self._collect)
+
+    def observe_write(self, kind: str, write: Optional[dict]) -> None:
+        """
+        Record one Parquet write.
+
+        Args:
+            kind: ``raw`` for batches, ``event`` for event captures
+            write: ``CANFrameBatcher.last_write``
+        """
+        if write is None:
+            return
+        self.batch_frames.observe(write["frames"], kind=kind)
+        self.batch_write_seconds.observe(write["seconds"], kind=kind)
+        if write["file_bytes"]:
+            self.compression_ratio.observe(write["arrow_bytes"] / write["file_bytes"], kind=kind)
+
+    def observe_upload(self, seconds: float, size: int, ok: bool) -> None:
+        """
+        Record one upload by the upload stage.
+
+        Args:
+            seconds: Wall time of the upload, retries included
+            size: File size in bytes
+            ok: Whether the file reached S3
+        """
+        self.upload_seconds.observe(seconds, result="ok" if ok else "failed")
+        if ok:
+            self.uploaded_bytes.inc(size)
+            if seconds > 0:
+                self.upload_throughput.observe(size / seconds)
+
+    def _collect(self) -> None:
+        """Sample the counters and levels kept by the components."""
+        p_stats = self.pipeline.get_stats()
+        self.frames_received.set_total(self.pipeline.frames_captured)
+        self.uploads.set_total(p_stats["upload_ok"], result="ok")
+        self.uploads.set_total(p_stats["upload_fail"], result="failed")
+        queues = {"frames": p_stats["frame_queue"], "upload": p_stats["upload_queue"]}
+        for name, q_stats in p_stats.get("listeners", {}).items():
+            queues[f"listener-{name}"] = q_stats
+        for name, q_stats in queues.items():
+            self.queue_depth.set(q_stats["depth"], queue=name)
+            self.queue_capacity.set(q_stats["capacity"], queue=name)
+            if name != "upload":
+                self.frames_dropped.set_total(q_stats["dropped_units"], stage=name)
+
+        if self.reader is not None and hasattr(self.reader, "get_stats"):
+            r_stats = self.reader.get_stats()
+            for key, stage in (
+                ("kernel_drops", "kernel"),
+                ("iface_drops", "interface"),
+                ("dropped_frames", "ring"),
+            ):
+                if key in r_stats:
+                    self.frames_dropped.set_total(r_stats[key], stage=stage)
+        if self.uploader is not None:
+            self.upload_retries.set_total(self.uploader.retries)
+        if self.offline_buffer is not None:
+            b_stats = self.offline_buffer.get_stats()
+            self.pending_files.set(b_stats["pending_count"])
+            self.pending_bytes.set(b_stats["disk_usage_bytes"])
+        if self.cpu_temp is not None:
+            temp = self.cpu_temp()
+            if temp is not None:
+                self.cpu_temperature.set(temp)
+        self.uptime.set(round(time.time() - self.start, 1))
@@ -0,0 +1,788 @@
+"""Staged capture pipeline: capture -> writer -> upload, linked by bounded queues."""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from .batcher import CANFrameBatcher
+from .can_reader import CANFrameBlock, frames_to_blocks
+from .change_filter import ChangeOnlyFilter
+from .decimation import DecimationFilter
+from .event_capture import MANUAL, CapturedEvent, EventCapture
+from .listeners import Listener
+from .offline_buffer import OfflineBuffer, is_priority_file
+from .openmetrics import AgentMetrics
+from .profiling import StageTimers, timed
+from .realtime import GCPauseMonitor, StallDetector, apply_capture_thread_settings
+from .scheduler import PRIORITY_UPLOAD, ResourceBudget
+from .uploader import S3Uploader
+
+logger = logging.getLogger(__name__)
+
+# Queue overflow policies
+DROP_NEWEST = "drop_newest"  # reject the item being put
+DROP_OLDEST = "drop_oldest"  # evict the head of the queue to make room
+BLOCK = "block"  # wait up to block_timeout_sec, then reject
+QUEUE_POLICIES = (DROP_NEWEST, DROP_OLDEST, BLOCK)
+
+
+class BoundedQueue:
+    """
+    Thread-safe bounded FIFO with an explicit overflow policy.
+
+    Every item that cannot be queued is handed to ``on_drop`` (if given) and
+    counted, so nothing is lost silently.  ``weight`` maps an item to the
+    number of frames (or bytes, ...) it represents for the ``dropped_units``
+    counter.  Items put with ``urgent=True`` are taken before all routine
+    items (FIFO among themselves).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int,
+        policy: str = DROP_NEWEST,
+        block_timeout_sec: float = 1.0,
+        on_drop: Optional[Callable[[Any], None]] = None,
+        weight: Callable[[Any], int] = lambda item: 1,
+    ) -> None:
+        """
+        Initialize the queue.
+
+        Args:
+            name: Queue name used in logs and metrics
+            capacity: Maximum number of queued items
+            policy: One of ``drop_newest``, ``drop_oldest`` or ``block``
+            block_timeout_sec: Maximum wait for the ``block`` policy
+            on_drop: Callback receiving every dropped item
+            weight: Item -> units for the ``dropped_units`` counter
+        """
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Unknown queue policy {policy!r}, expected one of {QUEUE_POLICIES}")
+
+        self.name = name
+        self.capacity = capacity
+        self.policy = policy
+        self.block_timeout_sec = block_timeout_sec
+        self.on_drop = on_drop
+        self.weight = weight
+
+        self._items: deque = deque()
+        # Number of urgent items at the head of _items
+        self._urgent = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.dropped_units = 0
+        self.max_depth = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _drop(self, item: Any) -> None:
+        """Account a dropped item and hand it to the drop callback."""
+        self.dropped += 1
+        self.dropped_units += self.weight(item)
+        if self.on_drop is not None:
+            try:
+                self.on_drop(item)
+            except Exception as exc:  # noqa: BLE001
+                logger.error("Drop handler for queue %s failed: %s", self.name, exc)
+
+    def put(self, item: Any, urgent: bool = False) -> bool:
+        """
+        Queue an item according to the overflow policy.
+
+        Args:
+            item: Item to queue
+            urgent: Queue ahead of routine items; when the queue is full the
+                newest routine item is evicted to make room, whatever the
+                policy
+
+        Returns:
+            True if the item was queued, False if it was dropped
+        """
+        evicted = None
+        with self._cond:
+            if self._closed:
+                accepted = False
+            elif len(self._items) < self.capacity:
+                accepted = True
+            elif urgent and len(self._items) > self._urgent:
+                evicted = self._items.pop()
+                accepted = True
+            elif self.policy == DROP_OLDEST:
+                evicted = self._items.popleft()
+                self._urgent = max(0, self._urgent - 1)
+                accepted = True
+            elif self.policy == BLOCK:
+                accepted = self._cond.wait_for(
+                    lambda: self._closed or len(self._items) < self.capacity,
+                    timeout=self.block_timeout_sec,
+                ) and not self._closed
+            else:
+                accepted = False
+
+            if accepted and urgent:
+                self._items.insert(self._urgent, item)
+                self._urgent += 1
+            elif accepted:
+                self._items.append(item)
+            if accepted:
+                self.enqueued += 1
+                self.max_depth = max(self.max_depth, len(self._items))
+                self._cond.notify_all()
+
+        # Drop callbacks may do I/O; run them outside the lock
+        if evicted is not None:
+            self._drop(evicted)
+        if not accepted:
+            self._drop(item)
+        return accepted
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Take the oldest item.
+
+        Args:
+            timeout: Maximum wait in seconds (None = until an item or close())
+
+        Returns:
+            The item, or None on timeout or when the queue is closed and empty
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self._closed, timeout=timeout):
+                return None
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._urgent = max(0, self._urgent - 1)
+            self._cond.notify_all()
+            return item
+
+    def drain(self) -> list:
+        """Remove and return every queued item."""
+        with self._cond:
+            items = list(self._items)
+            self._items.clear()
+            self._urgent = 0
+            self._cond.notify_all()
+            return items
+
+    def close(self) -> None:
+        """Reject further puts; consumers drain what is left and then get None."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        """True once close() has been called."""
+        return self._closed
+
+    def get_stats(self) -> dict:
+        """
+        Return queue depth and overflow counters.
+
+        Returns:
+            Dict with keys: depth, capacity, max_depth, enqueued, dropped,
+            dropped_units, policy
+        """
+        return {
+            "depth": len(self._items),
+            "capacity": self.capacity,
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "dropped_units": self.dropped_units,
+            "policy": self.policy,
+        }
+
+
+def iter_reader_blocks(
+    reader: Any, max_frames: int, max_latency_ms: float
+) -> Iterator[CANFrameBlock]:
+    """
+    Return a reader's output as columnar blocks.
+
+    Uses ``read_batches()`` when the reader has it, otherwise packs
+    ``read_frames()`` into blocks.
+    """
+    if hasattr(reader, "read_batches"):
+        return reader.read_batches(max_frames=max_frames, max_latency_ms=max_latency_ms)
+    return frames_to_blocks(reader.read_frames(), max_frames, max_latency_ms)
+
+
+class CapturePipeline:
+    """
+    Runs capture, Parquet writing and S3 upload on separate threads.
+
+    capture thread -> frame queue -> writer thread -> upload queue -> upload thread
+                   -> listener queue -> listener thread (one per listener)
+
+    With ``trigger`` configured, the writer passes every raw block through an
+    ``EventCapture`` ring buffer before decimation and change-only
+    filtering; triggered events are written as separate ``event-<trigger>``
+    files that jump the upload queue.
+
+    The capture thread only moves frame blocks from the reader into the frame
+    queue and the queue of every added ``Listener``.  None of these queues
+    uses the ``block`` policy, so a slow disk, a slow terminal or a network
+    outage cannot stall ``recv()``.  When a queue overflows, blocks are
+    dropped for that consumer only and counted.  When the upload queue
+    overflows, files go straight to the offline buffer's pending directory
+    for the retry worker.
+    """
+
+    def __init__(
+        self,
+        reader: Any,
+        batcher: Optional[CANFrameBatcher],
+        uploader: Optional[S3Uploader],
+        offline_buffer: Optional[OfflineBuffer],
+        config: Optional[dict] = None,
+        realtime: Optional[dict] = None,
+    ) -> None:
+        """
+        Initialize the pipeline.
+
+        Args:
+            reader: CAN reader (``read_batches()`` or ``read_frames()``)
+            batcher: Batcher writing Parquet files, or None to only feed
+                listeners (no writer or upload stage)
+            uploader: S3 uploader, or None for local-only capture
+            offline_buffer: Destination for files the upload queue cannot
+                take (may be None without an uploader)
+            config: ``pipeline`` config section:
+                block_frames (int): Frames per capture block (default 1024)
+                block_latency_ms (float): Max wait for a partial block (default 50)
+                frame_queue_blocks (int): Frame queue capacity (default 256)
+                frame_queue_policy (str): drop_newest | drop_oldest (default drop_newest)
+                upload_queue_files (int): Upload queue capacity (default 16)
+                upload_queue_policy (str): drop_newest | drop_oldest (default
+                    drop_newest); dropped files are moved to pending
+                shutdown_timeout_sec (float): Max time to finish uploads on stop
+                    (default 30)
+                change_only (bool): Drop frames repeating their ID's last
+                    payload before batching (default False)
+                keyframe_sec (float): Keep at least one frame per ID this
+                    often in change-only mode (default 1.0)
+                decimation (list[dict]): Per-ID decimation rules, resolved
+                    by ``resolve_decimation_rules`` (applied before
+                    change-only filtering)
+                trigger (dict): Event capture settings (see
+                    ``EventCapture``), rules resolved by
+                    ``resolve_trigger_rules``
+            realtime: ``realtime`` config section: capture_cpus and
+                fifo_priority for the capture thread (see
+                ``apply_capture_thread_settings``), and stall_threshold_ms
+                (log capture stalls and GC pauses above this, 0 = off)
+        """
+        cfg = config or {}
+        self.reader = reader
+        self.batcher = batcher
+        self.uploader = uploader
+        self.offline_buffer = offline_buffer
+        if batcher is not None and hasattr(reader, "bus_load_summary"):
+            batcher.batch_metadata = self._bus_load_metadata
+
+        self.block_frames = int(cfg.get("block_frames", 1024))
+        self.block_latency_ms = float(cfg.get("block_latency_ms", 50))
+        self.shutdown_timeout_sec = float(cfg.get("shutdown_timeout_sec", 30))
+
+        frame_policy = cfg.get("frame_queue_policy", DROP_NEWEST)
+        if frame_policy == BLOCK:
+            raise ValueError("frame_queue_policy 'block' would stall CAN capture")
+        upload_policy = cfg.get("upload_queue_policy", DROP_NEWEST)
+        if upload_policy == BLOCK:
+            raise ValueError("upload_queue_policy 'block' would stall the writer")
+
+        self.frame_queue = BoundedQueue(
+            "frames",
+            capacity=int(cfg.get("frame_queue_blocks", 256)),
+            policy=frame_policy,
+            weight=len,
+        )
+        self.upload_queue = BoundedQueue(
+            "upload",
+            capacity=int(cfg.get("upload_queue_files", 16)),
+            policy=upload_policy,
+            on_drop=self._spill_to_pending,
+        )
+
+        self.realtime = realtime or {}
+        stall_threshold_ms = float(self.realtime.get("stall_threshold_ms", 0))
+        self.stall_detector: Optional[StallDetector] = None
+        self.gc_monitor: Optional[GCPauseMonitor] = None
+        if stall_threshold_ms > 0:
+            self.stall_detector = StallDetector(stall_threshold_ms, self.block_latency_ms)
+            self.gc_monitor = GCPauseMonitor(stall_threshold_ms)
+
+        # Writer-side filters; listener-only pipelines have no writer stage
+        self.decimator: Optional[DecimationFilter] = None
+        if batcher is not None and cfg.get("decimation"):
+            self.decimator = DecimationFilter(cfg["decimation"])
+
+        self.change_filter: Optional[ChangeOnlyFilter] = None
+        if batcher is not None and cfg.get("change_only", False):
+            self.change_filter = ChangeOnlyFilter(float(cfg.get("keyframe_sec", 1.0)))
+
+        self.event_capture: Optional[EventCapture] = None
+        if batcher is not None and cfg.get("trigger"):
+            self.event_capture = EventCapture(cfg["trigger"])
+
+        self.frames_captured = 0
+        self.batch_count = 0
+        self.event_count = 0
+        self.upload_success = 0
+        self.upload_failed = 0
+
+        # (name, listener, queue) fed by the capture stage
+        self._listeners: list[tuple[str, Listener, BoundedQueue]] = []
+
+        # Write and upload observations and --profile stage timings; set before start()
+        self.metrics: Optional[AgentMetrics] = None
+        self.timers: Optional[StageTimers] = None
+        # Routine uploads wait while this budget says capture needs the CPU,
+        # for at most upload_max_defer_sec in a row
+        self.budget: Optional[ResourceBudget] = None
+        self.upload_max_defer_sec = 900.0
+        self._upload_deferred_since: Optional[float] = None
+        self._upload_overdue = False
+
+        # Newest frame timestamp written and when (monotonic) its block arrived,
+        # to advance the frame clock while the bus is idle
+        self._last_frame_ts: Optional[float] = None
+        self._last_block_at = 0.0
+
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def add_listener(
+        self,
+        name: str,
+        listener: Listener,
+        capacity: int = 64,
+        policy: str = DROP_OLDEST,
+    ) -> None:
+        """
+        Feed every captured block to ``listener`` on its own thread.
+
+        Must be called before ``start()``.
+
+        Args:
+            name: Listener name used in logs, thread names and metrics
+            listener: Consumer of the blocks
+            capacity: Queue capacity in blocks
+            policy: drop_oldest (default: a lagging listener skips ahead) or
+                drop_newest
+        """
+        if self._threads:
+            raise RuntimeError("Listeners must be added before the pipeline starts")
+        if policy == BLOCK:
+            raise ValueError(f"Listener {name!r}: policy 'block' would stall CAN capture")
+        queue = BoundedQueue(f"listener-{name}", capacity=capacity, policy=policy, weight=len)
+        self._listeners.append((name, listener, queue))
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def _spill_to_pending(self, path: Path) -> None:
+        """Upload queue overflow: park the file for the retry worker."""
+        logger.warning("Upload queue full, moving %s to pending", path.name)
+        self.offline_buffer.add_to_pending(path)
+
+    def _dispatch(self, block: CANFrameBlock) -> None:
+        """Hand a captured block to the writer and every listener; never blocks."""
+        with timed(self.timers, "capture.dispatch"):
+            self.frames_captured += block.count
+            if self.stall_detector is not None:
+                self.stall_detector.check(block)
+            if self.batcher is not None and not self.frame_queue.put(block):
+                if self.frame_queue.dropped % 100 == 1:
+                    logger.warning(
+                        "Frame queue full, %d frames dropped so far",
+                        self.frame_queue.dropped_units,
+                    )
+            for _, _, queue in self._listeners:
+                if not queue.put(block) and queue.dropped % 100 == 1:
+                    logger.warning(
+                        "Queue %s full, %d frames skipped so far",
+                        queue.name,
+                        queue.dropped_units,
+                    )
+
+    def _reader_blocks(self) -> Iterator[CANFrameBlock]:
+        """The reader's blocks; with timers, producing each one is timed as capture.recv."""
+        blocks = iter_reader_blocks(self.reader, self.block_frames, self.block_latency_ms)
+        if self.timers is not None:
+            return self.timers.iterate("capture.recv", blocks)
+        return blocks
+
+    def _end_capture(self) -> None:
+        """Close the queues fed by the capture stage."""
+        self.frame_queue.close()
+        for _, _, queue in self._listeners:
+            queue.close()
+
+    def _capture_worker(self) -> None:
+        """Move blocks from the reader into the frame queue; never blocks."""
+        logger.info("Capture stage started")
+        apply_capture_thread_settings(self.realtime)
+        try:
+            for block in self._reader_blocks():
+                self._dispatch(block)
+                if self._stopping.is_set():
+                    break
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Capture stage failed: %s", exc, exc_info=True)
+        finally:
+            self._end_capture()
+            logger.info("Capture stage stopped")
+
+    def _listener_worker(self, name: str, listener: Listener, queue: BoundedQueue) -> None:
+        """Feed queued blocks to one listener until capture ends."""
+        logger.info("Listener %s started", name)
+        stage = f"listener.{name}"
+        try:
+            while True:
+                block = queue.get(timeout=1.0)
+                if block is None:
+                    if queue.closed and not len(queue):
+                        break
+                    listener.on_idle()
+                    continue
+                with timed(self.timers, stage):
+                    listener.on_block(block)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Listener %s failed: %s", name, exc, exc_info=True)
+            # Keep the capture stage from filling a queue nobody reads
+            queue.close()
+            queue.drain()
+        finally:
+            try:
+                listener.stop()
+            except Exception as exc:  # noqa: BLE001
+                logger.error("Listener %s failed to stop: %s", name, exc)
+            logger.info("Listener %s stopped", name)
+
+    def _bus_load_metadata(self, start: float, end: float) -> dict[str, str]:
+        """Bus utilization of a batch window, stored in the batch's Parquet metadata."""
+        channels = self.reader.bus_load_summary(start, end)
+        logger.info(
+            "Batch bus load: %s",
+            " ".join(
+                f"{ch}={s['mean_pct']}% (peak {s['peak_pct']}%)" for ch, s in channels.items()
+            ),
+        )
+        summary = {"window_start": start, "window_end": end, "channels": channels}
+        return {"bus_load": json.dumps(summary)}
+
+    def _handle_written(self, path: Path) -> None:
+        """Hand a freshly written Parquet file to the upload stage."""
+        self.batch_count += 1
+        logger.info("Batch %d written: %s", self.batch_count, path)
+        if self.metrics is not None:
+            self.metrics.observe_write("raw", self.batcher.last_write)
+        if self.uploader is not None:
+            self._queue_upload(path)
+
+        if self.batch_count % 10 == 0:
+            buf_stats = self.offline_buffer.get_stats()
+            logger.info(
+                "Stats: batches=%d upload_ok=%d upload_fail=%d "
+                "pending=%d disk=%.2f GB frames_dropped=%d",
+                self.batch_count,
+                self.upload_success,
+                self.upload_failed,
+                buf_stats["pending_count"],
+                buf_stats["disk_usage_gb"],
+                self.frame_queue.dropped_units,
+            )
+
+    def _write_event(self, event: Optional[CapturedEvent]) -> None:
+        """Write a finished event capture and queue it ahead of routine batches."""
+        if event is None:
+            return
+        path = self.batcher.write_blocks(
+            event.blocks,
+            f"event-{event.name}",
+            event.start_ns,
+            event.end_ns,
+            metadata={
+                "event_trigger": event.name,
+                "event_trigger_ns": str(event.trigger_ns),
+                "event_triggers": str(event.triggers),
+            },
+        )
+        if path is None:
+            return
+        self.event_count += 1
+        logger.info("Event %s written: %s", event.name, path)
+        if self.metrics is not None:
+            self.metrics.observe_write("event", self.batcher.last_write)
+        if self.uploader is not None:
+            self._queue_upload(path, urgent=True)
+
+    def _queue_upload(self, path: Path, urgent: bool = False) -> None:
+        """Hand a written file to the upload stage."""
+        self.upload_queue.put(path, urgent=urgent)
+
+    def _write_block(self, block: CANFrameBlock) -> None:
+        """Filter one captured block and add it to the open batch."""
+        if block.count:
+            self._last_frame_ts = block.last_timestamp
+            self._last_block_at = time.monotonic()
+        if self.event_capture is not None:
+            self._write_event(self.event_capture.add_block(block))
+        with timed(self.timers, "writer.filter"):
+            if self.decimator is not None:
+                block = self.decimator.filter_block(block)
+            if self.change_filter is not None:
+                block = self.change_filter.filter_block(block)
+        path = self.batcher.add_block(block)
+        if path is not None:
+            self._handle_written(path)
+
+    def _idle_frame_time(self) -> float:
+        """
+        Frame-clock time on an idle bus: the newest frame plus the time since it arrived.
+
+        Frame timestamps are not wall-clock time for a replay without
+        ``--replay-rebase``, so the idle time is measured on the monotonic
+        clock and added to the frame clock instead.
+        """
+        if self._last_frame_ts is None:
+            return time.time()
+        return self._last_frame_ts + (time.monotonic() - self._last_block_at)
+
+    def _flush_idle(self) -> None:
+        """Idle bus: still close the batch window and event captures on time."""
+        now = self._idle_frame_time()
+        if self.event_capture is not None:
+            self._write_event(self.event_capture.poll(now))
+        if self.batcher.should_flush(now):
+            path = self.batcher.flush()
+            if path is not None:
+                self._handle_written(path)
+        self.batcher.sync()
+
+    def _finish_writing(self) -> None:
+        """Write out everything still held by the filters and the batcher."""
+        if self.decimator is not None:
+            held = self.decimator.flush()
+            if held is not None:
+                path = self.batcher.add_block(held)
+                if path is not None:
+                    self._handle_written(path)
+        path = self.batcher.flush()
+        if path is not None:
+            self._handle_written(path)
+        if self.event_capture is not None:
+            self._write_event(self.event_capture.finish())
+
+    def _writer_worker(self) -> None:
+        """Batch blocks into Parquet files and queue them for upload."""
+        logger.info("Writer stage started")
+        try:
+            while True:
+                block = self.frame_queue.get(timeout=1.0)
+                if block is None:
+                    if self.frame_queue.closed and not len(self.frame_queue):
+                        break
+                    self._flush_idle()
+                    continue
+                self._write_block(block)
+            self._finish_writing()
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Writer stage failed: %s", exc, exc_info=True)
+        finally:
+            self.upload_queue.close()
+            logger.info("Writer stage stopped")
+
+    def _upload_worker(self) -> None:
+        """Upload written files; failures end up in pending via the uploader."""
+        logger.info("Upload stage started")
+        assert self.uploader is not None
+        while True:
+            path = self.upload_queue.get()
+            if path is None:
+                break
+            if self.budget is not None and not is_priority_file(path):
+                reason = self.budget.wait_for(
+                    PRIORITY_UPLOAD, self._stopping, self._upload_deadline()
+                )
+                self._end_upload_wait(reason)
+            self._upload(path)
+        logger.info("Upload stage stopped")
+
+    def _upload_deadline(self) -> float:
+        """Time after which routine uploads go ahead although the budget is exhausted."""
+        if self._upload_deferred_since is None:
+            self._upload_deferred_since = time.monotonic()
+        return self._upload_deferred_since + self.upload_max_defer_sec
+
+    def _end_upload_wait(self, reason: Optional[str]) -> None:
+        """
+        Record how a budget wait ended.
+
+        Once routine uploads have been held back for ``upload_max_defer_sec``,
+        they go ahead without waiting until the budget allows them again, so
+        the upload queue is slowed down but never starved.
+
+        Args:
+            reason: Reason still holding uploads back at the deadline, or
+                None if the budget allowed the upload
+        """
+        if reason is None:
+            self._upload_deferred_since = None
+            self._upload_overdue = False
+        elif not self._upload_overdue:
+            self._upload_overdue = True
+            logger.warning(
+                "Uploading after %.0f s deferred (%s)", self.upload_max_defer_sec, reason
+            )
+
+    def _upload(self, path: Path) -> None:
+        """Upload one file and count the outcome."""
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = 0
+        ok = False
+        started = time.monotonic()
+        try:
+            with timed(self.timers, "upload.s3"):
+                ok = self.uploader.upload(path)
+            if ok:
+                self.upload_success += 1
+            else:
+                self.upload_failed += 1
+                logger.warning("Upload failed for %s, file moved to pending", path.name)
+        except Exception as exc:  # noqa: BLE001
+            self.upload_failed += 1
+            logger.error("Upload stage error for %s: %s", path, exc)
+        if self.metrics is not None:
+            self.metrics.observe_upload(time.monotonic() - started, size, ok)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start all stage threads."""
+        if self.gc_monitor is not None:
+            self.gc_monitor.install()
+        stages: list[tuple[str, Callable[..., None], tuple]] = [
+            ("capture", self._capture_worker, ())
+        ]
+        if self.batcher is not None:
+            stages.append(("writer", self._writer_worker, ()))
+            if self.uploader is not None:
+                stages.append(("upload", self._upload_worker, ()))
+        for name, listener, queue in self._listeners:
+            stages.append((name, self._listener_worker, (name, listener, queue)))
+
+        for name, target, args in stages:
+            t = threading.Thread(target=target, args=args, daemon=True, name=f"pipeline-{name}")
+            t.start()
+            self._threads.append(t)
+
+    def trigger(self, name: str = MANUAL) -> bool:
+        """
+        Request an event capture from any thread (signal handler, HTTP).
+
+        Args:
+            name: Name recorded for the event
+
+        Returns:
+            False if event capture is not configured
+        """
+        if self.event_capture is None:
+            return False
+        self.event_capture.trigger(name)
+        return True
+
+    def capture_backlog(self) -> float:
+        """Fill level of the frame queue (0 = writer keeping up, 1 = dropping)."""
+        return len(self.frame_queue) / self.frame_queue.capacity
+
+    def is_alive(self) -> bool:
+        """True while the capture stage is still running."""
+        return bool(self._threads) and self._threads[0].is_alive()
+
+    def wait_for_capture(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the capture stage has ended (a finite reader ran out).
+
+        Args:
+            timeout: Longest wait in seconds (None = no limit)
+
+        Returns:
+            True if capture has ended
+        """
+        if self._threads:
+            self._threads[0].join(timeout=timeout)
+        return not self.is_alive()
+
+    def stop(self) -> None:
+        """
+        Stop capture, write out the open batch and finish queued uploads.
+
+        Files still queued after ``shutdown_timeout_sec`` are moved to pending.
+        """
+        self._stopping.set()
+        if hasattr(self.reader, "stop"):
+            self.reader.stop()
+
+        deadline = time.monotonic() + self.shutdown_timeout_sec
+        for t in self._threads:
+            t.join(timeout=max(0.0, deadline - time.monotonic()))
+
+        for path in self.upload_queue.drain():
+            self.offline_buffer.add_to_pending(path)
+
+        if self.gc_monitor is not None:
+            self.gc_monitor.uninstall()
+
+    def get_stats(self) -> dict:
+        """
+        Return batch/upload counters and per-queue metrics.
+
+        Returns:
+            Dict with keys: batches, upload_ok, upload_fail, frame_queue,
+            upload_queue, plus events (trigger counters), decimation and
+            change_only (filter counters),
+            stalls (stall and GC pause counters) and listeners (queue metrics
+            by listener name) when enabled
+        """
+        stats = {
+            "batches": self.batch_count,
+            "upload_ok": self.upload_success,
+            "upload_fail": self.upload_failed,
+            "frame_queue": self.frame_queue.get_stats(),
+            "upload_queue": self.upload_queue.get_stats(),
+        }
+        if self.event_capture is not None:
+            stats["events"] = {**self.event_capture.get_stats(), "written": self.event_count}
+        if self.decimator is not None:
+            stats["decimation"] = self.decimator.get_stats()
+        if self.change_filter is not None:
+            stats["change_only"] = self.change_filter.get_stats()
+        if self._listeners:
+            stats["listeners"] = {
+                name: queue.get_stats() for name, _, queue in self._listeners
+            }
+        if self.stall_detector is not None and self.gc_monitor is not None:
+            stats["stalls"] = {
+                **self.stall_detector.get_stats(),
+                **self.gc_monitor.get_stats(),
+            }
+        return stats
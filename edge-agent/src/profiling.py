@@ -0,0 +1,299 @@
+"""Per-stage timings and a sampling profiler for ``--profile`` runs."""
+
+import contextlib
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import ContextManager, Iterable, Iterator, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class StageTimers:
+    """
+    Wall and CPU time spent per named stage.
+
+    CPU time is the calling thread's (``time.thread_time``), so a stage
+    waiting on a socket, a lock or the GIL accrues wall time only.  Stages
+    are timed on the threads that run them; each record takes a lock, which
+    is cheap next to the per-block work being timed.
+    """
+
+    def __init__(self) -> None:
+        """Create empty timers."""
+        # name -> [calls, wall_sec, cpu_sec, max_wall_sec]
+        self._stats: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, wall: float, cpu: float) -> None:
+        """
+        Add one timed call.
+
+        Args:
+            name: Stage name, ``<thread stage>.<step>`` by convention
+            wall: Elapsed wall time in seconds
+            cpu: Thread CPU time in seconds
+        """
+        with self._lock:
+            entry = self._stats.get(name)
+            if entry is None:
+                entry = self._stats[name] = [0, 0.0, 0.0, 0.0]
+            entry[0] += 1
+            entry[1] += wall
+            entry[2] += cpu
+            if wall > entry[3]:
+                entry[3] = wall
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the body of a ``with`` block as one call of ``name``."""
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - wall, time.thread_time() - cpu)
+
+    def iterate(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        """
+        Yield from ``items``, timing each ``next()`` as one call of ``name``.
+
+        Used for readers: the time to produce a block is the receive stage.
+        """
+        it = iter(items)
+        while True:
+            wall = time.perf_counter()
+            cpu = time.thread_time()
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            self.record(name, time.perf_counter() - wall, time.thread_time() - cpu)
+            yield item
+
+    def snapshot(self) -> dict[str, dict]:
+        """
+        Return the totals so far.
+
+        Returns:
+            Stage name -> dict with keys: calls, wall_sec, cpu_sec,
+            max_wall_ms
+        """
+        with self._lock:
+            items = sorted((name, list(entry)) for name, entry in self._stats.items())
+        return {
+            name: {
+                "calls": calls,
+                "wall_sec": round(wall, 6),
+                "cpu_sec": round(cpu, 6),
+                "max_wall_ms": round(max_wall * 1000, 3),
+            }
+            for name, (calls, wall, cpu, max_wall) in items
+        }
+
+
+def timed(timers: Optional[StageTimers], name: str) -> ContextManager[None]:
+    """``timers.stage(name)``, or a shared no-op context without timers."""
+    if timers is None:
+        return _NULL_CONTEXT
+    return timers.stage(name)
+
+
+@functools.lru_cache(maxsize=4096)
+def _module_name(filename: str) -> str:
+    """Dotted module name of a source file, relative to the longest sys.path entry."""
+    path = os.path.abspath(filename)
+    best = ""
+    for entry in sys.path:
+        root = os.path.abspath(entry or ".")
+        if path.startswith(root + os.sep) and len(root) > len(best):
+            best = root
+    rel = path[len(best) + 1:] if best else os.path.basename(path)
+    return rel.removesuffix(".py").replace(os.sep, ".")
+
+
+class StackSampler:
+    """
+    Wall-clock sampling profiler writing collapsed stacks.
+
+    A daemon thread snapshots every thread's Python stack with
+    ``sys._current_frames()`` every ``interval_ms`` for at most
+    ``duration_sec`` and counts identical stacks.  Nothing is hooked into
+    the profiled code, so the cost is one snapshot per interval.  Threads
+    waiting on I/O or queues are sampled too (their stacks end in the wait).
+    Time spent in C extensions (e.g. Parquet encoding) is attributed to
+    the Python frame that called them.
+
+    The output has one ``thread;frame;frame... count`` line per distinct
+    stack, the input format of ``flamegraph.pl`` and speedscope.
+    """
+
+    def __init__(self, path: Path, duration_sec: float, interval_ms: float = 10) -> None:
+        """
+        Initialize the sampler; ``start()`` begins sampling.
+
+        Args:
+            path: Collapsed-stack output file
+            duration_sec: Sampling stops (and the file is written) after this
+            interval_ms: Time between samples
+        """
+        self.path = path
+        self.duration_sec = duration_sec
+        self.interval = interval_ms / 1000.0
+        self.samples = 0
+        self._stacks: dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._written = False
+        self._lock = threading.Lock()
+
+    def _sample(self) -> None:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{_module_name(code.co_filename)}:{code.co_qualname}")
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            key = ";".join(reversed(stack))
+            self._stacks[key] = self._stacks.get(key, 0) + 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        deadline = time.monotonic() + self.duration_sec
+        while time.monotonic() < deadline and not self._stop.wait(self.interval):
+            self._sample()
+        self.write()
+
+    def start(self) -> None:
+        """Start sampling on a daemon thread."""
+        self._thread = threading.Thread(target=self._run, daemon=True, name="profile-sampler")
+        self._thread.start()
+        logger.info(
+            "Sampling stacks every %.0f ms for %.0f s into %s",
+            self.interval * 1000,
+            self.duration_sec,
+            self.path,
+        )
+
+    def stop(self) -> None:
+        """Stop early; the samples taken so far are written."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def write(self) -> None:
+        """Write the collapsed stacks (once)."""
+        with self._lock:
+            if self._written:
+                return
+            self._written = True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [f"{stack} {count}" for stack, count in sorted(self._stacks.items())]
+        self.path.write_text("\n".join(lines) + "\n")
+        logger.info(
+            "Wrote %d stack samples (%d distinct stacks) to %s "
+            "(flamegraph.pl %s > flame.svg)",
+            self.samples,
+            len(lines),
+            self.path,
+            self.path.name,
+        )
+
+
+class Profiler:
+    """
+    The ``--profile`` session: stage timers, summaries and the stack sampler.
+
+    ``summary()`` logs the stage timings of the last interval as a PROFILE
+    line and rewrites ``profile-summary.json`` in ``out_dir`` with the
+    totals since start.
+    """
+
+    def __init__(
+        self,
+        out_dir: str,
+        sample_sec: float = 0,
+        sample_interval_ms: float = 10,
+    ) -> None:
+        """
+        Initialize the session.
+
+        Args:
+            out_dir: Directory for the summary and collapsed-stack files
+            sample_sec: Run the stack sampler for this long from ``start()``
+                (0 = stage timings only)
+            sample_interval_ms: Stack sampling interval
+        """
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.timers = StageTimers()
+        self.sampler: Optional[StackSampler] = None
+        if sample_sec > 0:
+            stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+            self.sampler = StackSampler(
+                self.out_dir / f"stacks-{stamp}.collapsed", sample_sec, sample_interval_ms
+            )
+        self._started = time.monotonic()
+        self._cpu_started = time.process_time()
+        self._last = (self._started, {})
+
+    def start(self) -> None:
+        """Start the sampler, if configured."""
+        self._started = time.monotonic()
+        self._cpu_started = time.process_time()
+        self._last = (self._started, {})
+        if self.sampler is not None:
+            self.sampler.start()
+
+    def summary(self) -> None:
+        """Log the last interval's stage timings and write the JSON totals."""
+        now = time.monotonic()
+        totals = self.timers.snapshot()
+        since, previous = self._last
+        self._last = (now, totals)
+        elapsed = max(now - since, 1e-9)
+
+        parts = []
+        for name, stats in totals.items():
+            before = previous.get(name, {"calls": 0, "wall_sec": 0.0, "cpu_sec": 0.0})
+            calls = stats["calls"] - before["calls"]
+            if not calls:
+                continue
+            wall = stats["wall_sec"] - before["wall_sec"]
+            cpu = stats["cpu_sec"] - before["cpu_sec"]
+            parts.append(
+                f"{name} cpu={cpu / elapsed * 100:.1f}% wall={wall / elapsed * 100:.1f}% "
+                f"n={calls} avg={wall / calls * 1000:.2f}ms"
+            )
+        if parts:
+            logger.info("PROFILE (%.0f s): %s", elapsed, " | ".join(parts))
+
+        run_sec = now - self._started
+        summary = {
+            "elapsed_sec": round(run_sec, 3),
+            "process_cpu_sec": round(time.process_time() - self._cpu_started, 3),
+            "stages": totals,
+        }
+        tmp = self.out_dir / "profile-summary.json.tmp"
+        tmp.write_text(json.dumps(summary, indent=2))
+        os.replace(tmp, self.out_dir / "profile-summary.json")
+
+    def stop(self) -> None:
+        """Write the final summary and the collapsed stacks."""
+        if self.sampler is not None:
+            self.sampler.stop()
+        self.summary()
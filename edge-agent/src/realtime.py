@@ -0,0 +1,217 @@
+"""CPU affinity, real-time scheduling, GC control and stall detection for capture."""
+
+import gc
+import logging
+import os
+import time
+from typing import Optional
+
+from .can_reader import CANFrameBlock
+
+logger = logging.getLogger(__name__)
+
+
+def _set_affinity(cpus: list[int], what: str) -> None:
+    """Pin the calling thread to ``cpus`` (Linux: pid 0 = calling thread)."""
+    if not hasattr(os, "sched_setaffinity"):
+        logger.warning("CPU affinity not supported on this platform")
+        return
+    try:
+        os.sched_setaffinity(0, set(cpus))
+        logger.info("Pinned %s to CPU(s) %s", what, sorted(cpus))
+    except OSError as exc:
+        logger.warning("Could not pin %s to CPU(s) %s: %s", what, cpus, exc)
+
+
+def apply_process_settings(config: dict) -> None:
+    """
+    Apply process-wide settings from the ``realtime`` config section.
+
+    Must run on the main thread before any worker thread is started: Linux
+    threads inherit the affinity of the thread that creates them, so
+    ``other_cpus`` keeps upload, health and retry threads off the capture core.
+
+    Args:
+        config: ``realtime`` config section:
+            other_cpus (list[int], optional): CPUs for all non-capture threads
+            gc_thresholds (list[int], optional): ``gc.set_threshold()`` values;
+                a large third value defers full (gen-2) collections
+    """
+    other_cpus = config.get("other_cpus")
+    if other_cpus:
+        _set_affinity(other_cpus, "agent threads")
+
+    thresholds = config.get("gc_thresholds")
+    if thresholds:
+        gc.set_threshold(*(int(t) for t in thresholds))
+        logger.info("GC thresholds set to %s", gc.get_threshold())
+
+
+def freeze_gc() -> None:
+    """
+    Move every object created during startup to the permanent generation.
+
+    Config, DBC and pyarrow objects are then never scanned again, which keeps
+    later (especially gen-2) collections short.
+    """
+    gc.collect()
+    gc.freeze()
+    logger.info("GC frozen: %d objects moved to the permanent generation", gc.get_freeze_count())
+
+
+def apply_capture_thread_settings(config: dict) -> None:
+    """
+    Apply per-thread settings to the calling (capture) thread.
+
+    Threads started by the capture thread afterwards, such as the per-channel
+    receive threads of a multi-channel reader, inherit these settings.
+
+    Args:
+        config: ``realtime`` config section:
+            capture_cpus (list[int], optional): CPUs for the capture thread,
+                ideally cores isolated with ``isolcpus=``
+            fifo_priority (int, optional): Request SCHED_FIFO at this priority
+                (1-99); needs CAP_SYS_NICE or a suitable RLIMIT_RTPRIO
+    """
+    capture_cpus = config.get("capture_cpus")
+    if capture_cpus:
+        _set_affinity(capture_cpus, "capture thread")
+
+    priority = config.get("fifo_priority")
+    if priority:
+        if not hasattr(os, "sched_setscheduler"):
+            logger.warning("SCHED_FIFO not supported on this platform")
+            return
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(int(priority)))
+            logger.info("Capture thread running SCHED_FIFO priority %d", int(priority))
+        except OSError as exc:
+            logger.warning("SCHED_FIFO priority %s not permitted: %s", priority, exc)
+
+
+class StallDetector:
+    """
+    Detects capture stalls from the age of the blocks handed to the pipeline.
+
+    Readers hand over a block at most ``block_latency_ms`` after its first
+    frame was received by the kernel.  If the first frame's (kernel) timestamp
+    is older than that by more than ``threshold_ms``, the capture thread was
+    not running: a GC pause, preemption or a slow consumer.  Only meaningful
+    with wall-clock frame timestamps (real hardware).
+    """
+
+    def __init__(self, threshold_ms: float, block_latency_ms: float) -> None:
+        """
+        Initialize the detector.
+
+        Args:
+            threshold_ms: Delay beyond the block latency that counts as a stall
+            block_latency_ms: The readers' block latency bound
+        """
+        self.threshold_ms = threshold_ms
+        self.block_latency_ms = block_latency_ms
+        self.stalls = 0
+        self.max_stall_ms = 0.0
+        self._last_log = 0.0
+
+    def check(self, block: CANFrameBlock) -> Optional[float]:
+        """
+        Check a freshly received block.
+
+        Args:
+            block: Block just returned by the reader
+
+        Returns:
+            Stall duration in ms, or None if the block was on time
+        """
+        now = time.time()
+        stall_ms = (now - block.first_timestamp) * 1000 - self.block_latency_ms
+        if stall_ms <= self.threshold_ms:
+            return None
+
+        self.stalls += 1
+        if stall_ms > self.max_stall_ms:
+            self.max_stall_ms = stall_ms
+        # At most one log line per second; the counters keep the rest
+        if now - self._last_log >= 1.0:
+            self._last_log = now
+            logger.warning(
+                "Capture stall: %.1f ms (threshold %.0f ms, %d stalls so far)",
+                stall_ms,
+                self.threshold_ms,
+                self.stalls,
+            )
+        return stall_ms
+
+    def get_stats(self) -> dict:
+        """
+        Return stall counters.
+
+        Returns:
+            Dict with keys: stalls, max_stall_ms
+        """
+        return {"stalls": self.stalls, "max_stall_ms": round(self.max_stall_ms, 1)}
+
+
+class GCPauseMonitor:
+    """
+    Times every garbage collection via ``gc.callbacks``.
+
+    Collections longer than ``threshold_ms`` are logged with their
+    generation, so capture stalls can be attributed to GC (or ruled out).
+    """
+
+    def __init__(self, threshold_ms: float) -> None:
+        """
+        Initialize the monitor (not yet installed).
+
+        Args:
+            threshold_ms: Log collections longer than this
+        """
+        self.threshold_ms = threshold_ms
+        self.collections = [0, 0, 0]
+        self.long_pauses = 0
+        self.max_pause_ms = 0.0
+        self._start = 0.0
+
+    def _callback(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._start = time.perf_counter()
+            return
+        pause_ms = (time.perf_counter() - self._start) * 1000
+        generation = info.get("generation", 0)
+        self.collections[generation] += 1
+        if pause_ms > self.max_pause_ms:
+            self.max_pause_ms = pause_ms
+        if pause_ms > self.threshold_ms:
+            self.long_pauses += 1
+            logger.warning(
+                "GC gen-%d pause: %.1f ms (%d objects collected)",
+                generation,
+                pause_ms,
+                info.get("collected", 0),
+            )
+
+    def install(self) -> None:
+        """Start timing collections."""
+        if self._callback not in gc.callbacks:
+            gc.callbacks.append(self._callback)
+
+    def uninstall(self) -> None:
+        """Stop timing collections."""
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+    def get_stats(self) -> dict:
+        """
+        Return GC counters.
+
+        Returns:
+            Dict with keys: gc_collections (per generation), gc_long_pauses,
+            gc_max_pause_ms
+        """
+        return {
+            "gc_collections": list(self.collections),
+            "gc_long_pauses": self.long_pauses,
+            "gc_max_pause_ms": round(self.max_pause_ms, 1),
+        }
@@ -0,0 +1,276 @@
+"""Replay of recorded raw Parquet captures as a CAN reader."""
+
+import bisect
+import logging
+import time
+from array import array
+from pathlib import Path
+from typing import Generator, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from .can_reader import CANFrame, CANFrameBlock
+from .offline_buffer import is_priority_file
+
+logger = logging.getLogger(__name__)
+
+# Columns read from raw files; "channel" is optional (older files lack it)
+_REPLAY_COLUMNS = ["timestamp", "arb_id", "dlc", "data"]
+
+
+def find_replay_files(path: str | Path) -> list[Path]:
+    """
+    Resolve a replay source to an ordered list of Parquet files.
+
+    Args:
+        path: A raw Parquet file or a directory searched recursively
+
+    Returns:
+        Files sorted by path (batcher file names sort chronologically);
+        event captures found in a directory are skipped, since their frames
+        duplicate the routine batches
+
+    Raises:
+        FileNotFoundError: If the path does not exist or holds no Parquet files
+    """
+    source = Path(path)
+    if source.is_file():
+        return [source]
+    files = (
+        sorted(p for p in source.rglob("*.parquet") if not is_priority_file(p))
+        if source.is_dir()
+        else []
+    )
+    if not files:
+        raise FileNotFoundError(f"No Parquet files found at {source}")
+    return files
+
+
+def _batch_to_block(batch: pa.RecordBatch, timestamps: array, channel: str) -> CANFrameBlock:
+    """
+    Copy a raw record batch into a ``CANFrameBlock``.
+
+    Fixed-width columns are copied straight from the Arrow buffers, so no
+    per-frame Python objects are created.
+
+    Args:
+        batch: Record batch with the raw columns
+        timestamps: Already converted (and possibly rebased) ns timestamps
+        channel: Channel name used when the batch has no channel column
+
+    Returns:
+        Block holding every row of the batch
+    """
+    n = batch.num_rows
+    arb_ids = batch.column("arb_id")
+    dlcs = batch.column("dlc")
+    data = batch.column("data")
+    if data.type != pa.binary():
+        data = data.cast(pa.binary())
+
+    block = CANFrameBlock(0, channel=channel)
+    block.capacity = n
+    block.count = n
+    block.timestamps_ns = timestamps
+    block.arb_ids = array("I")
+    block.arb_ids.frombytes(arb_ids.buffers()[1].slice(arb_ids.offset * 4, n * 4))
+    block.dlcs = array("B")
+    block.dlcs.frombytes(dlcs.buffers()[1].slice(dlcs.offset, n))
+
+    offsets = array("i")
+    offsets.frombytes(data.buffers()[1].slice(data.offset * 4, (n + 1) * 4))
+    base = offsets[0]
+    block.payload = bytearray(data.buffers()[2].slice(base, offsets[n] - base))
+    if base:
+        offsets = array("i", [o - base for o in offsets])
+    block.offsets = offsets
+
+    if "channel" in batch.schema.names:
+        channels = batch.column("channel")
+        unique = pc.unique(channels).to_pylist()
+        if len(unique) == 1:
+            block.channel = unique[0]
+        else:
+            block.channels = channels.to_pylist()
+    return block
+
+
+class ReplayCANReader:
+    """
+    Replays raw Parquet files written by ``CANFrameBatcher``.
+
+    Files are streamed in record batches (at most ``max_frames`` rows each,
+    read row group by row group), so memory stays bounded regardless of the
+    capture size.  Frames are released at their recorded pace divided by
+    ``speed``; ``speed=0`` replays as fast as possible.  With ``rebase`` the
+    timestamps are shifted so the first frame lands at the replay start time
+    (inter-frame gaps are preserved), which keeps new batch files out of the
+    original capture's partitions.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        speed: float = 1.0,
+        rebase: bool = False,
+        channel: str = "replay",
+    ) -> None:
+        """
+        Initialize the replay reader.
+
+        Args:
+            path: Raw Parquet file or directory of files
+            speed: Replay speed factor (1.0 = real time, 0 = unthrottled)
+            rebase: Shift timestamps to the replay start time
+            channel: Channel name for files without a channel column
+        """
+        if speed < 0:
+            raise ValueError(f"Replay speed must be >= 0, got {speed}")
+        self.path = Path(path)
+        self.speed = speed
+        self.rebase = rebase
+        self.channel = channel
+        self.files: list[Path] = []
+
+        self._running: bool = False
+        self._stats: dict[str, int] = {"frames": 0, "files": 0}
+
+        logger.info(
+            "Initializing replay reader: path=%s speed=%s rebase=%s",
+            self.path,
+            f"{speed}x" if speed else "max",
+            rebase,
+        )
+
+    def __enter__(self) -> "ReplayCANReader":
+        """Context manager entry: resolve the files to replay."""
+        self.files = find_replay_files(self.path)
+        logger.info("Replaying %d file(s) from %s", len(self.files), self.path)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: object,
+    ) -> None:
+        """Context manager exit."""
+        self.close()
+
+    def read_batches(
+        self,
+        max_frames: int = 1024,
+        max_latency_ms: float = 50.0,
+    ) -> Generator[CANFrameBlock, None, None]:
+        """
+        Yield recorded frames as columnar ``CANFrameBlock`` chunks.
+
+        When pacing, a block spans at most ``max_latency_ms`` of replay time
+        and is released once the replay clock reaches its last frame.
+
+        Args:
+            max_frames: Maximum frames per block
+            max_latency_ms: Maximum replay-time span of a block
+
+        Yields:
+            Non-empty CANFrameBlock objects
+        """
+        if not self.files:
+            self.files = find_replay_files(self.path)
+
+        span_ns = int(max_latency_ms * 1e6 * self.speed) if self.speed else 0
+        self._running = True
+        wall_start = time.time()
+        first_ns: Optional[int] = None
+        shift_ns = 0
+
+        for path in self.files:
+            if not self._running:
+                break
+            parquet = pq.ParquetFile(path)
+            columns = list(_REPLAY_COLUMNS)
+            if "channel" in parquet.schema_arrow.names:
+                columns.append("channel")
+            self._stats["files"] += 1
+            logger.info("Replaying %s (%d rows)", path, parquet.metadata.num_rows)
+
+            for batch in parquet.iter_batches(batch_size=max_frames, columns=columns):
+                if not self._running:
+                    break
+                if not batch.num_rows:
+                    continue
+
+                ts_col = batch.column("timestamp").cast(pa.int64())
+                if first_ns is None:
+                    first_ns = ts_col[0].as_py()
+                    if self.rebase:
+                        shift_ns = int(wall_start * 1e9) - first_ns
+                if shift_ns:
+                    ts_col = pc.add(ts_col, shift_ns)
+                timestamps = array("q")
+                timestamps.frombytes(
+                    ts_col.buffers()[1].slice(ts_col.offset * 8, batch.num_rows * 8)
+                )
+
+                if not self.speed:
+                    block = _batch_to_block(batch, timestamps, self.channel)
+                    self._stats["frames"] += block.count
+                    yield block
+                    continue
+
+                # Paced: cut the batch so no block spans more than max_latency
+                start = 0
+                n = batch.num_rows
+                origin = first_ns + shift_ns
+                while start < n and self._running:
+                    limit = timestamps[start] + span_ns
+                    end = max(start + 1, bisect.bisect_right(timestamps, limit, start, n))
+                    release = wall_start + (timestamps[end - 1] - origin) / 1e9 / self.speed
+                    delay = release - time.time()
+                    if delay > 0:
+                        time.sleep(delay)
+                    block = _batch_to_block(
+                        batch.slice(start, end - start), timestamps[start:end], self.channel
+                    )
+                    self._stats["frames"] += block.count
+                    yield block
+                    start = end
+
+        elapsed = time.time() - wall_start
+        logger.info(
+            "Replay finished: %d frames from %d file(s) in %.2f s (%.0f fps)",
+            self._stats["frames"],
+            self._stats["files"],
+            elapsed,
+            self._stats["frames"] / elapsed if elapsed > 0 else 0.0,
+        )
+
+    def read_frames(self) -> Generator[CANFrame, None, None]:
+        """
+        Yield recorded frames one by one (slow path; prefer ``read_batches()``).
+
+        Yields:
+            CANFrame objects in file order
+        """
+        for block in self.read_batches():
+            yield from block.frames()
+
+    def get_stats(self) -> dict:
+        """
+        Return replay statistics.
+
+        Returns:
+            Dict with keys: frames, files
+        """
+        return dict(self._stats)
+
+    def stop(self) -> None:
+        """Signal the replay loop to exit on next iteration."""
+        self._running = False
+
+    def close(self) -> None:
+        """Stop replaying."""
+        self.stop()
+        logger.info("Replay reader closed")
@@ -0,0 +1,352 @@
+"""Background task scheduler with a CPU load and thermal budget."""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Task priorities, lowest value first.  Essential tasks (health log, metrics,
+# disk eviction) are cheap and always run; uploads and maintenance yield to
+# capture when the budget is exhausted.
+PRIORITY_ESSENTIAL = 0
+PRIORITY_UPLOAD = 1
+PRIORITY_MAINTENANCE = 2
+
+
+class ResourceBudget:
+    """
+    Decides whether background work may run right now.
+
+    Inputs, refreshed by ``sample()``: system CPU load (busy share of all
+    cores since the previous sample, from ``/proc/stat``), the CPU
+    temperature and the fill level of the capture queue.  Capture always
+    wins: a backlog in front of the writer defers every non-essential task.
+    Maintenance backs off first as the SoC heats up; uploads are paused
+    only close to the firmware throttling point.
+    """
+
+    def __init__(
+        self,
+        cpu_temp: Optional[Callable[[], Optional[float]]] = None,
+        capture_backlog: Optional[Callable[[], float]] = None,
+        max_cpu_pct: float = 85.0,
+        backoff_temp_c: float = 75.0,
+        pause_temp_c: float = 80.0,
+        max_capture_backlog: float = 0.5,
+        stat_path: str = "/proc/stat",
+    ) -> None:
+        """
+        Initialize the budget.
+
+        Args:
+            cpu_temp: Returns the CPU temperature in °C, or None if unknown
+            capture_backlog: Returns the capture queue fill level (0..1)
+            max_cpu_pct: System CPU load above which non-essential tasks wait
+            backoff_temp_c: Maintenance tasks wait from this temperature
+            pause_temp_c: Uploads wait too from this temperature (the Pi
+                firmware throttles the clock at 80 °C)
+            max_capture_backlog: Capture queue fill level above which
+                non-essential tasks wait
+            stat_path: Kernel CPU counters
+        """
+        self.cpu_temp = cpu_temp
+        self.capture_backlog = capture_backlog
+        self.max_cpu_pct = max_cpu_pct
+        self.backoff_temp_c = backoff_temp_c
+        self.pause_temp_c = pause_temp_c
+        self.max_capture_backlog = max_capture_backlog
+        self.stat_path = stat_path
+
+        self.cpu_pct: Optional[float] = None
+        self.temp_c: Optional[float] = None
+        self.backlog = 0.0
+        self._cpu_times: Optional[tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    def _read_cpu_times(self) -> Optional[tuple[int, int]]:
+        """(busy, total) jiffies summed over all cores."""
+        try:
+            with open(self.stat_path) as f:
+                fields = [int(v) for v in f.readline().split()[1:]]
+        except (OSError, ValueError):
+            return None
+        # user nice system idle iowait irq softirq steal ...
+        idle = fields[3] + (fields[4] if len(fields) > 4 else 0)
+        total = sum(fields[:8])
+        return total - idle, total
+
+    def sample(self) -> None:
+        """Refresh CPU load, temperature and capture backlog."""
+        with self._lock:
+            times = self._read_cpu_times()
+            if times is not None and self._cpu_times is not None:
+                busy = times[0] - self._cpu_times[0]
+                total = times[1] - self._cpu_times[1]
+                if total > 0:
+                    self.cpu_pct = 100.0 * busy / total
+            elif times is None and hasattr(os, "getloadavg"):
+                self.cpu_pct = 100.0 * os.getloadavg()[0] / (os.cpu_count() or 1)
+            self._cpu_times = times
+            self.temp_c = self.cpu_temp() if self.cpu_temp is not None else None
+            self.backlog = self.capture_backlog() if self.capture_backlog is not None else 0.0
+
+    def reason_to_wait(self, priority: int) -> Optional[str]:
+        """
+        Why a task of ``priority`` must wait, from the last sample.
+
+        Args:
+            priority: ``PRIORITY_*`` constant
+
+        Returns:
+            ``capture``, ``thermal`` or ``cpu``; None when it may run
+        """
+        if priority <= PRIORITY_ESSENTIAL:
+            return None
+        with self._lock:
+            if self.backlog > self.max_capture_backlog:
+                return "capture"
+            if self.temp_c is not None:
+                if self.temp_c >= self.pause_temp_c:
+                    return "thermal"
+                if priority >= PRIORITY_MAINTENANCE and self.temp_c >= self.backoff_temp_c:
+                    return "thermal"
+            if self.cpu_pct is not None and self.cpu_pct > self.max_cpu_pct:
+                return "cpu"
+        return None
+
+    def wait_for(
+        self,
+        priority: int,
+        stop: threading.Event,
+        deadline: Optional[float] = None,
+        poll_sec: float = 1.0,
+    ) -> Optional[str]:
+        """
+        Block until a task of ``priority`` may run, ``stop`` is set or ``deadline`` passes.
+
+        Samples on every poll; used by stages that run outside the
+        scheduler (the pipeline's upload stage).
+
+        Args:
+            priority: ``PRIORITY_*`` constant
+            stop: Ends the wait when set
+            deadline: ``time.monotonic()`` time after which the task runs
+                regardless (None = no limit)
+            poll_sec: Time between samples
+
+        Returns:
+            The reason still holding the task back when the deadline
+            passed; None when it may run or ``stop`` was set
+        """
+        while not stop.is_set():
+            reason = self.reason_to_wait(priority)
+            if reason is None:
+                return None
+            timeout = poll_sec
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic())
+                if timeout <= 0:
+                    return reason
+            if stop.wait(timeout=timeout):
+                break
+            self.sample()
+        return None
+
+    def get_stats(self) -> dict:
+        """
+        Get the last readings.
+
+        Returns:
+            Dict with keys: cpu_pct, temp_c, capture_backlog
+        """
+        with self._lock:
+            return {
+                "cpu_pct": round(self.cpu_pct, 1) if self.cpu_pct is not None else None,
+                "temp_c": self.temp_c,
+                "capture_backlog": round(self.backlog, 3),
+            }
+
+
+@dataclass
+class ScheduledTask:
+    """One periodic background task."""
+
+    name: str
+    interval_sec: float
+    func: Callable[[], None]
+    priority: int = PRIORITY_ESSENTIAL
+    next_due: float = 0.0
+    # When the task became due and was first held back (0 = not deferred)
+    deferred_since: float = 0.0
+    runs: int = 0
+    deferrals: int = 0
+    errors: int = 0
+
+
+class BackgroundScheduler:
+    """
+    Runs the agent's periodic tasks, one at a time, by priority.
+
+    Replaces a thread per job: a single (niced) thread wakes every
+    ``tick_sec``, samples the ``ResourceBudget`` and runs the due tasks in
+    priority order (see ``run_due``).  A task the budget holds back stays due and is retried
+    on every tick; after ``max_defer_sec`` it runs regardless, so uploads
+    are slowed down, never starved.  The first run of a task is one
+    interval after it is added.
+
+    With the asyncio runtime, ``run_due`` is called from the loop's
+    periodic job instead of ``start()``.
+    """
+
+    def __init__(
+        self,
+        budget: ResourceBudget,
+        tick_sec: float = 1.0,
+        max_defer_sec: float = 900.0,
+        nice: int = 10,
+    ) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            budget: Resource budget consulted before each non-essential task
+            tick_sec: Time between scheduling passes
+            max_defer_sec: Longest a due task is held back by the budget
+            nice: Nice value of the scheduler thread (0 = unchanged)
+        """
+        self.budget = budget
+        self.tick_sec = tick_sec
+        self.max_defer_sec = max_defer_sec
+        self.nice = nice
+        self.tasks: list[ScheduledTask] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Thread running the current upload or maintenance task
+        self._lane: Optional[threading.Thread] = None
+
+    def add(
+        self,
+        name: str,
+        interval_sec: float,
+        func: Callable[[], None],
+        priority: int = PRIORITY_ESSENTIAL,
+    ) -> None:
+        """
+        Schedule ``func`` every ``interval_sec``.
+
+        Args:
+            name: Task name for logs
+            interval_sec: Time between runs
+            func: Blocking callable; exceptions are logged and the task continues
+            priority: ``PRIORITY_*`` constant
+        """
+        self.tasks.append(
+            ScheduledTask(name, interval_sec, func, priority, time.monotonic() + interval_sec)
+        )
+        self.tasks.sort(key=lambda t: t.priority)
+        logger.info("Scheduled %s (interval=%d s, priority=%d)", name, interval_sec, priority)
+
+    def _renice(self) -> None:
+        if self.nice:
+            try:
+                # Linux: the niceness of a thread is set through its TID
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), self.nice)
+            except (AttributeError, OSError) as exc:
+                logger.debug("Could not renice %s: %s", threading.current_thread().name, exc)
+
+    def _execute(self, task: ScheduledTask) -> None:
+        try:
+            task.func()
+        except Exception as exc:  # noqa: BLE001
+            task.errors += 1
+            logger.error("Error in %s: %s", task.name, exc)
+        task.runs += 1
+        task.next_due = time.monotonic() + task.interval_sec
+
+    def _execute_in_lane(self, task: ScheduledTask) -> None:
+        self._renice()
+        self._execute(task)
+
+    def run_due(self) -> None:
+        """
+        Run every due task the budget allows, highest priority first.
+
+        Essential tasks run on the calling thread.  Uploads and maintenance
+        can block on the network for minutes, so they run on a separate
+        lane thread, one at a time; a due task waits while the lane is busy.
+        """
+        self.budget.sample()
+        for task in self.tasks:
+            if self._stop.is_set():
+                return
+            now = time.monotonic()
+            if now < task.next_due:
+                continue
+            if task.priority > PRIORITY_ESSENTIAL and self._lane is not None:
+                if self._lane.is_alive():
+                    continue
+                self._lane = None
+            reason = self.budget.reason_to_wait(task.priority)
+            if reason is not None:
+                if not task.deferred_since:
+                    task.deferred_since = now
+                    logger.info("Deferring %s (%s)", task.name, reason)
+                if now - task.deferred_since < self.max_defer_sec:
+                    task.deferrals += 1
+                    continue
+                logger.warning(
+                    "Running %s after %.0f s deferred (%s)",
+                    task.name,
+                    now - task.deferred_since,
+                    reason,
+                )
+            task.deferred_since = 0.0
+            if task.priority <= PRIORITY_ESSENTIAL:
+                self._execute(task)
+                continue
+            # Not due again until this run has finished
+            task.next_due = float("inf")
+            self._lane = threading.Thread(
+                target=self._execute_in_lane,
+                args=(task,),
+                daemon=True,
+                name=f"task-{task.name.replace(' ', '-')}",
+            )
+            self._lane.start()
+
+    def _run(self) -> None:
+        self._renice()
+        while not self._stop.wait(timeout=self.tick_sec):
+            self.run_due()
+        logger.info("Background scheduler stopped")
+
+    def start(self) -> None:
+        """Run the scheduler on a daemon thread."""
+        self._thread = threading.Thread(target=self._run, daemon=True, name="scheduler")
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop after the tasks in progress (waiting at most ``timeout`` for each)."""
+        self._stop.set()
+        for thread in (self._thread, self._lane):
+            if thread is not None:
+                thread.join(timeout=timeout)
+
+    def get_stats(self) -> dict:
+        """
+        Get per-task counters and the budget readings.
+
+        Returns:
+            Dict with keys: budget, tasks (name -> runs, deferrals, errors)
+        """
+        return {
+            "budget": self.budget.get_stats(),
+            "tasks": {
+                t.name: {"runs": t.runs, "deferrals": t.deferrals, "errors": t.errors}
+                for t in self.tasks
+            },
+        }
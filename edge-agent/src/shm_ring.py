@@ -0,0 +1,395 @@
+"""Shared-memory ring of frame blocks between a capture and a writer process."""
+
+import logging
+import time
+from array import array
+from multiprocessing import shared_memory
+from typing import Generator, Iterator, Optional
+
+from .can_reader import CANFD_MAX_DLEN, CANFrame, CANFrameBlock
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = 0x43414E52494E4701  # "CANRING" + layout version
+
+# Header words (uint64).  Every counter has exactly one writing process, so
+# no lock is shared between them: a process that dies cannot leave one held.
+_H_MAGIC = 0
+_H_SLOTS = 1
+_H_FRAMES = 2  # frames per slot
+_H_DLEN = 3  # payload bytes per frame
+_H_WRITE = 4  # blocks published (producer)
+_H_READ = 5  # blocks consumed (consumer)
+_H_DROPPED_BLOCKS = 6  # blocks rejected because the ring was full (producer)
+_H_DROPPED_FRAMES = 7  # frames in those blocks (producer)
+_H_FRAMES_IN = 8  # frames published (producer)
+_H_CHANNELS = 9  # entries in the channel name table (producer)
+_H_PRODUCERS = 10  # producer attaches, i.e. capture (re)starts
+_H_CONSUMERS = 11  # consumer attaches, i.e. writer (re)starts
+_HEADER_WORDS = 16
+
+_MAX_CHANNELS = 16
+_NAME_BYTES = 32
+_NAMES_OFFSET = _HEADER_WORDS * 8
+_SLOTS_OFFSET = _NAMES_OFFSET + _MAX_CHANNELS * _NAME_BYTES
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+class _Slot:
+    """Typed views of one slot, laid out like the columns of a ``CANFrameBlock``."""
+
+    __slots__ = ("count", "timestamps_ns", "arb_ids", "dlcs", "channels", "offsets", "payload")
+
+    def __init__(self, buf: memoryview, frames: int, max_dlen: int) -> None:
+        pos = 0
+
+        def take(size: int, fmt: str) -> memoryview:
+            nonlocal pos
+            view = buf[pos:pos + size].cast(fmt)
+            pos += _align(size)
+            return view
+
+        self.count = take(8, "Q")
+        self.timestamps_ns = take(8 * frames, "q")
+        self.arb_ids = take(4 * frames, "I")
+        self.dlcs = take(frames, "B")
+        self.channels = take(frames, "B")
+        self.offsets = take(4 * (frames + 1), "i")
+        self.payload = take(frames * max_dlen, "B")
+
+    @staticmethod
+    def size(frames: int, max_dlen: int) -> int:
+        return (
+            8
+            + _align(8 * frames)
+            + _align(4 * frames)
+            + 2 * _align(frames)
+            + _align(4 * (frames + 1))
+            + _align(frames * max_dlen)
+        )
+
+    def release(self) -> None:
+        for name in self.__slots__:
+            getattr(self, name).release()
+
+
+class SharedFrameRing:
+    """
+    Fixed ring of frame blocks in ``multiprocessing.shared_memory``.
+
+    One capture process ``put()``s blocks and one writer process ``get()``s
+    them.  Each slot holds a block's columns in the ``CANFrameBlock`` layout
+    (timestamps, IDs, DLCs, payload offsets and payload bytes, plus a channel
+    index per row), so both sides move a block with one slice copy per column
+    and never touch individual frames; the batcher then wraps the columns as
+    Arrow buffers without copying.
+
+    A full ring rejects the newest block and counts it; the capture side
+    never waits for the writer.  The published and consumed block counters
+    live in the segment, so either process can be restarted and re-attach
+    by name: a new writer resumes at the first unconsumed block and a new
+    capture process keeps appending.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        """Wrap an initialized segment; use ``create()`` or ``attach()``."""
+        self._shm = shm
+        self._owner = owner
+        buf = shm.buf
+        self._header = buf[:_NAMES_OFFSET].cast("Q")
+        if self._header[_H_MAGIC] != _MAGIC:
+            raise ValueError(f"Shared memory {shm.name!r} does not hold a frame ring")
+        self._names = buf[_NAMES_OFFSET:_SLOTS_OFFSET]
+        self.slots = self._header[_H_SLOTS]
+        self.block_frames = self._header[_H_FRAMES]
+        self.max_dlen = self._header[_H_DLEN]
+        slot_size = _Slot.size(self.block_frames, self.max_dlen)
+        self._slots = [
+            _Slot(
+                buf[_SLOTS_OFFSET + i * slot_size:_SLOTS_OFFSET + (i + 1) * slot_size],
+                self.block_frames,
+                self.max_dlen,
+            )
+            for i in range(self.slots)
+        ]
+        self._channel_index: dict[str, int] = {}
+        self._channel_names: list[str] = []
+        self._load_channel_names()
+
+    @classmethod
+    def create(
+        cls,
+        slots: int = 128,
+        block_frames: int = 1024,
+        max_dlen: int = CANFD_MAX_DLEN,
+        name: Optional[str] = None,
+    ) -> "SharedFrameRing":
+        """
+        Allocate a new ring; the creating process should ``unlink()`` it at exit.
+
+        Args:
+            slots: Ring capacity in blocks
+            block_frames: Frames per slot (the capture block size)
+            max_dlen: Payload bytes reserved per frame
+            name: Shared memory name (default: generated)
+
+        Returns:
+            The new ring
+        """
+        if slots < 2 or block_frames < 1:
+            raise ValueError("A frame ring needs at least 2 slots of at least 1 frame")
+        size = _SLOTS_OFFSET + slots * _Slot.size(block_frames, max_dlen)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = shm.buf[:_NAMES_OFFSET].cast("Q")
+        header[_H_SLOTS] = slots
+        header[_H_FRAMES] = block_frames
+        header[_H_DLEN] = max_dlen
+        header[_H_MAGIC] = _MAGIC
+        header.release()
+        logger.info(
+            "Shared frame ring %s: %d slots x %d frames (%.1f MB)",
+            shm.name,
+            slots,
+            block_frames,
+            size / 1e6,
+        )
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, role: str) -> "SharedFrameRing":
+        """
+        Open an existing ring from another process.
+
+        Args:
+            name: Shared memory name (``ring.name`` in the creating process)
+            role: ``producer`` or ``consumer``; counted for restart reporting
+
+        Returns:
+            The attached ring
+        """
+        ring = cls(shared_memory.SharedMemory(name=name), owner=False)
+        ring._header[_H_PRODUCERS if role == "producer" else _H_CONSUMERS] += 1
+        return ring
+
+    @property
+    def name(self) -> str:
+        """Shared memory name to pass to ``attach()``."""
+        return self._shm.name
+
+    def __len__(self) -> int:
+        """Blocks published but not yet consumed."""
+        return self._header[_H_WRITE] - self._header[_H_READ]
+
+    # ------------------------------------------------------------------
+    # Channel names
+    # ------------------------------------------------------------------
+
+    def _load_channel_names(self) -> None:
+        """Read channel names registered since the last call."""
+        for i in range(len(self._channel_names), self._header[_H_CHANNELS]):
+            raw = bytes(self._names[i * _NAME_BYTES:(i + 1) * _NAME_BYTES])
+            name = raw.rstrip(b"\x00").decode()
+            self._channel_names.append(name)
+            self._channel_index[name] = i
+
+    def _channel(self, name: str) -> int:
+        """Index of a channel name, registering it on first use (producer only)."""
+        index = self._channel_index.get(name)
+        if index is not None:
+            return index
+        index = self._header[_H_CHANNELS]
+        if index >= _MAX_CHANNELS:
+            raise ValueError(f"Frame ring holds at most {_MAX_CHANNELS} channel names")
+        encoded = name.encode()[:_NAME_BYTES]
+        self._names[index * _NAME_BYTES:index * _NAME_BYTES + len(encoded)] = encoded
+        # Publish the name after it is written
+        self._header[_H_CHANNELS] = index + 1
+        self._channel_names.append(name)
+        self._channel_index[name] = index
+        return index
+
+    # ------------------------------------------------------------------
+    # Producer / consumer
+    # ------------------------------------------------------------------
+
+    def put(self, block: CANFrameBlock) -> bool:
+        """
+        Copy a block into the next free slot (capture process).
+
+        Args:
+            block: Block with at most ``block_frames`` frames
+
+        Returns:
+            False if the ring was full and the block was dropped
+        """
+        n = block.count
+        if n > self.block_frames or block.offsets[n] > self.block_frames * self.max_dlen:
+            raise ValueError(
+                f"Block of {n} frames does not fit a {self.block_frames}-frame ring slot"
+            )
+        header = self._header
+        seq = header[_H_WRITE]
+        if seq - header[_H_READ] >= self.slots:
+            header[_H_DROPPED_BLOCKS] += 1
+            header[_H_DROPPED_FRAMES] += n
+            return False
+
+        slot = self._slots[seq % self.slots]
+        slot.timestamps_ns[:n] = memoryview(block.timestamps_ns)[:n]
+        slot.arb_ids[:n] = memoryview(block.arb_ids)[:n]
+        slot.dlcs[:n] = memoryview(block.dlcs)[:n]
+        slot.offsets[:n + 1] = memoryview(block.offsets)[:n + 1]
+        end = block.offsets[n]
+        slot.payload[:end] = memoryview(block.payload)[:end]
+        if block.channels is None:
+            slot.channels[:n] = bytes([self._channel(block.channel)]) * n
+        else:
+            slot.channels[:n] = bytes(self._channel(name) for name in block.channels)
+        slot.count[0] = n
+
+        # Publish only after the slot is complete
+        header[_H_FRAMES_IN] += n
+        header[_H_WRITE] = seq + 1
+        return True
+
+    def get(self) -> Optional[CANFrameBlock]:
+        """
+        Copy the oldest published block out of the ring (writer process).
+
+        Returns:
+            A process-local block, or None if the ring is empty
+        """
+        header = self._header
+        seq = header[_H_READ]
+        if seq >= header[_H_WRITE]:
+            return None
+
+        slot = self._slots[seq % self.slots]
+        n = slot.count[0]
+        block = CANFrameBlock(0)
+        block.capacity = block.count = n
+        block.timestamps_ns = array("q")
+        block.timestamps_ns.frombytes(slot.timestamps_ns[:n].cast("B"))
+        block.arb_ids = array("I")
+        block.arb_ids.frombytes(slot.arb_ids[:n].cast("B"))
+        block.dlcs = array("B")
+        block.dlcs.frombytes(slot.dlcs[:n].cast("B"))
+        block.offsets = array("i")
+        block.offsets.frombytes(slot.offsets[:n + 1].cast("B"))
+        block.payload = bytearray(slot.payload[:block.offsets[n]])
+        channels = bytes(slot.channels[:n])
+
+        # The slot may be reused from here on
+        header[_H_READ] = seq + 1
+
+        if max(channels, default=0) >= len(self._channel_names):
+            self._load_channel_names()
+        names = self._channel_names
+        if n and channels.count(channels[0]) == n:
+            block.channel = names[channels[0]]
+        elif n:
+            block.channel = names[channels[0]]
+            block.channels = [names[i] for i in channels]
+        return block
+
+    def get_stats(self) -> dict:
+        """
+        Return ring counters.
+
+        Returns:
+            Dict with keys: depth, slots, frames_in, dropped_blocks,
+            dropped_frames (rejected because the ring was full),
+            capture_starts and writer_starts (process attaches)
+        """
+        header = self._header
+        return {
+            "depth": len(self),
+            "slots": self.slots,
+            "frames_in": header[_H_FRAMES_IN],
+            "dropped_blocks": header[_H_DROPPED_BLOCKS],
+            "dropped_frames": header[_H_DROPPED_FRAMES],
+            "capture_starts": header[_H_PRODUCERS],
+            "writer_starts": header[_H_CONSUMERS],
+        }
+
+    def close(self) -> None:
+        """Release this process's mapping."""
+        for slot in self._slots:
+            slot.release()
+        self._slots = []
+        self._header.release()
+        self._names.release()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Remove the segment (creating process, after every user closed it)."""
+        if self._owner:
+            self._shm.unlink()
+
+
+class SharedRingReader:
+    """
+    Frame source for the writer process: yields the blocks in a ``SharedFrameRing``.
+
+    Plugs into ``CapturePipeline`` like a hardware reader.  ``stop()`` ends
+    the stream once the ring is empty, so blocks captured before the capture
+    process was stopped are still written.
+    """
+
+    def __init__(self, ring: SharedFrameRing, poll_interval_ms: float = 5.0) -> None:
+        """
+        Initialize the reader.
+
+        Args:
+            ring: Ring attached as consumer
+            poll_interval_ms: Sleep between checks of an empty ring
+        """
+        self.ring = ring
+        self.poll_interval = poll_interval_ms / 1000.0
+        self._stopping = False
+
+    def read_batches(
+        self, max_frames: int = 1024, max_latency_ms: float = 50.0
+    ) -> Generator[CANFrameBlock, None, None]:
+        """
+        Yield blocks as the capture process publishes them.
+
+        Block size and latency were decided by the capture process; the
+        arguments are accepted for interface compatibility.
+        """
+        ring = self.ring
+        while True:
+            block = ring.get()
+            if block is not None:
+                yield block
+            elif self._stopping:
+                break
+            else:
+                time.sleep(self.poll_interval)
+
+    def read_frames(self) -> Iterator[CANFrame]:
+        """Yield the ring's frames one by one (slow path)."""
+        for block in self.read_batches():
+            yield from block.frames()
+
+    def stop(self) -> None:
+        """End the stream once every published block has been yielded."""
+        self._stopping = True
+
+    def get_stats(self) -> dict:
+        """Return the ring counters (see ``SharedFrameRing.get_stats``)."""
+        return self.ring.get_stats()
+
+    def __enter__(self) -> "SharedRingReader":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: object,
+    ) -> None:
+        self.stop()
@@ -0,0 +1,207 @@
+"""Child-process supervision for the multi-process capture runtime."""
+
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import signal
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Restart backoff, as for CAN reconnects: 1 s doubling to 30 s
+_BACKOFF_INITIAL_SEC = 1.0
+_BACKOFF_MAX_SEC = 30.0
+
+
+def init_child_logging(log_queue: Any, level: int) -> None:
+    """
+    Send a child process's log records to the supervisor's handlers.
+
+    One process owns the console and rotating log file, so rotation is
+    never done by two processes at once.
+
+    Args:
+        log_queue: Queue from ``ProcessSupervisor.log_queue``
+        level: Root logger level
+    """
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+
+
+@dataclass
+class _Child:
+    """A supervised child process and its restart state."""
+
+    name: str
+    target: Callable[..., None]
+    args: tuple
+    restart_on_success: bool
+    process: Optional[multiprocessing.process.BaseProcess] = None
+    started: float = 0.0
+    restarts: int = 0
+    backoff: float = _BACKOFF_INITIAL_SEC
+    restart_at: Optional[float] = None
+    finished: bool = False
+
+
+class ProcessSupervisor:
+    """
+    Starts named child processes and restarts the ones that die.
+
+    Children are started with the ``spawn`` method, so they share nothing
+    with the supervisor but their arguments (no inherited threads or locks)
+    and log through ``log_queue``.  A child that exits with an error is
+    restarted after a backoff that doubles up to 30 s and resets once the
+    child has stayed up that long.  A child registered with
+    ``restart_on_success=False`` that exits with code 0 is reported by
+    ``poll()`` as finished instead.
+    """
+
+    def __init__(self) -> None:
+        """Create the log queue and start forwarding child logs."""
+        self._ctx = multiprocessing.get_context("spawn")
+        self.log_queue = self._ctx.Queue()
+        self._log_listener = logging.handlers.QueueListener(
+            self.log_queue, *logging.getLogger().handlers, respect_handler_level=True
+        )
+        self._log_listener.start()
+        self._children: dict[str, _Child] = {}
+
+    def add(
+        self,
+        name: str,
+        target: Callable[..., None],
+        args: tuple = (),
+        restart_on_success: bool = True,
+    ) -> None:
+        """
+        Register a child; started by ``start()``.
+
+        Args:
+            name: Child name (process name ``agent-<name>``)
+            target: Module-level function run in the child; it is called as
+                ``target(*args, log_queue)``
+            args: Picklable arguments
+            restart_on_success: Restart the child after a clean exit too
+        """
+        self._children[name] = _Child(name, target, args, restart_on_success)
+
+    def _spawn(self, child: _Child) -> None:
+        process = self._ctx.Process(
+            target=child.target,
+            args=(*child.args, self.log_queue),
+            name=f"agent-{child.name}",
+            daemon=True,
+        )
+        process.start()
+        child.process = process
+        child.started = time.monotonic()
+        child.restart_at = None
+        logger.info("Started %s process (pid %d)", child.name, process.pid)
+
+    def start(self) -> None:
+        """Start every registered child."""
+        for child in self._children.values():
+            self._spawn(child)
+
+    def poll(self) -> list[str]:
+        """
+        Restart dead children whose backoff has passed.
+
+        Returns:
+            Names of children that finished cleanly and are not restarted
+        """
+        now = time.monotonic()
+        finished = []
+        for child in self._children.values():
+            if child.finished:
+                continue
+            process = child.process
+            if child.restart_at is None and process is not None and not process.is_alive():
+                code = process.exitcode
+                if code == 0 and not child.restart_on_success:
+                    child.finished = True
+                    finished.append(child.name)
+                    logger.info("%s process finished", child.name)
+                    continue
+                if now - child.started >= _BACKOFF_MAX_SEC:
+                    child.backoff = _BACKOFF_INITIAL_SEC
+                logger.error(
+                    "%s process exited with code %s, restarting in %.0f s",
+                    child.name,
+                    code,
+                    child.backoff,
+                )
+                child.restart_at = now + child.backoff
+                child.backoff = min(child.backoff * 2, _BACKOFF_MAX_SEC)
+            if child.restart_at is not None and now >= child.restart_at:
+                child.restarts += 1
+                self._spawn(child)
+        return finished
+
+    def stop(self, name: str, timeout: float) -> Optional[int]:
+        """
+        Ask a child to exit with SIGTERM; kill it after ``timeout``.
+
+        Args:
+            name: Child name
+            timeout: Seconds to wait for a clean exit
+
+        Returns:
+            The exit code, or None if the child was not running
+        """
+        child = self._children[name]
+        child.finished = True
+        process = child.process
+        if process is None or process.exitcode is not None:
+            return None
+        process.terminate()
+        process.join(timeout)
+        if process.is_alive():
+            logger.warning("%s process did not exit in %.0f s, killing it", name, timeout)
+            process.kill()
+            process.join()
+        return process.exitcode
+
+    def send_signal(self, name: str, signum: int) -> None:
+        """Forward a signal to a running child (e.g. SIGUSR1 to the writer)."""
+        process = self._children[name].process
+        if process is not None and process.is_alive():
+            os.kill(process.pid, signum)
+
+    def close(self) -> None:
+        """Stop forwarding child logs (after every child has stopped)."""
+        self._log_listener.stop()
+        self.log_queue.close()
+
+    def get_stats(self) -> dict:
+        """
+        Return per-child process state.
+
+        Returns:
+            {name: {"pid", "alive", "restarts"}}
+        """
+        return {
+            name: {
+                "pid": child.process.pid if child.process is not None else None,
+                "alive": child.process is not None and child.process.is_alive(),
+                "restarts": child.restarts,
+            }
+            for name, child in self._children.items()
+        }
+
+
+def ignore_interrupts() -> None:
+    """
+    Leave Ctrl-C to the supervisor, which stops children in order.
+
+    SIGHUP is ignored too: the supervisor forwards config reloads to the
+    child that handles them.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
@@ -4,11 +4,13 @@ import logging
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Tuple
+from typing import Callable, Optional, Tuple
 
 import boto3
 from botocore.exceptions import ClientError, EndpointConnectionError
 
+from .offline_buffer import is_priority_file
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +22,7 @@ class S3Uploader:
         bucket: str,
         region: str = "us-east-1",
         prefix: str = "raw",
+        events_prefix: str = "events",
         max_retries: int = 5,
         initial_backoff_sec: int = 2,
         max_backoff_sec: int = 300,
@@ -33,6 +36,8 @@ class S3Uploader:
             bucket: S3 bucket name
             region: AWS region
             prefix: S3 prefix for uploads
+            events_prefix: S3 prefix for event captures, kept out of ``prefix``
+                so the decoder and crawler see each frame only once
             max_retries: Maximum retry attempts
             initial_backoff_sec: Initial backoff delay in seconds
             max_backoff_sec: Maximum backoff delay in seconds
@@ -42,12 +47,16 @@ class S3Uploader:
         self.bucket = bucket
         self.region = region
         self.prefix = prefix
+        self.events_prefix = events_prefix
         self.max_retries = max_retries
         self.initial_backoff_sec = initial_backoff_sec
         self.max_backoff_sec = max_backoff_sec
         self.archive_dir = Path(archive_dir)
         self.pending_dir = Path(pending_dir)
 
+        # Attempts repeated after an error, across all uploads
+        self.retries = 0
+
         # Create directories
         self.archive_dir.mkdir(parents=True, exist_ok=True)
         self.pending_dir.mkdir(parents=True, exist_ok=True)
@@ -57,13 +66,17 @@ class S3Uploader:
 
         logger.info(
             f"Initialized S3 uploader: bucket={bucket}, region={region}, "
-            f"prefix={prefix}"
+            f"prefix={prefix}, events_prefix={events_prefix}"
         )
 
     def _get_s3_key(self, local_path: Path) -> str:
         """
         Generate S3 key from local Hive-partitioned path.
 
+        Event captures repeat frames of a routine batch, so they are keyed
+        under ``events_prefix`` instead of ``prefix``.  The choice is made
+        from the file name, which survives the move to the pending directory.
+
         Args:
             local_path: Local file path
 
@@ -84,7 +97,8 @@ class S3Uploader:
         filename = local_path.name
 
         # Build S3 key: prefix/vehicle_id=X/year=Y/month=M/day=D/file.parquet
-        key_parts = [self.prefix] + partition_parts + [filename]
+        prefix = self.events_prefix if is_priority_file(local_path) else self.prefix
+        key_parts = [prefix] + partition_parts + [filename]
         s3_key = "/".join(key_parts)
 
         return s3_key
@@ -136,6 +150,7 @@ class S3Uploader:
                 )
                 if attempt < self.max_retries - 1:
                     logger.info(f"Retrying in {backoff}s...")
+                    self.retries += 1
                     time.sleep(backoff)
                     backoff = min(backoff * 2, self.max_backoff_sec)
                 else:
@@ -150,6 +165,7 @@ class S3Uploader:
                 )
                 if attempt < self.max_retries - 1:
                     logger.info(f"Retrying in {backoff}s...")
+                    self.retries += 1
                     time.sleep(backoff)
                     backoff = min(backoff * 2, self.max_backoff_sec)
                 else:
@@ -260,14 +276,22 @@ class S3Uploader:
 
         return success
 
-    def retry_pending(self) -> Tuple[int, int]:
+    def retry_pending(self, should_stop: Optional[Callable[[], bool]] = None) -> Tuple[int, int]:
         """
         Retry uploading files in pending directory.
 
+        Event captures are sent first, then routine batches, oldest first.
+
+        Args:
+            should_stop: Checked before each file; True ends the pass early
+
         Returns:
             Tuple of (successful_count, failed_count)
         """
-        pending_files = list(self.pending_dir.glob("*.parquet"))
+        pending_files = sorted(
+            self.pending_dir.glob("*.parquet"),
+            key=lambda p: (not is_priority_file(p), p.stat().st_mtime),
+        )
 
         if not pending_files:
             return (0, 0)
@@ -278,6 +302,10 @@ class S3Uploader:
         fail_count = 0
 
         for pending_path in pending_files:
+            if should_stop is not None and should_stop():
+                logger.info("Pending retry paused, resuming on the next pass")
+                break
+
             # Generate S3 key from filename
             # Need to reconstruct partition path from filename
             # This is a simplified version - in production, store metadata
@@ -0,0 +1,430 @@
+"""Memory-mapped write-ahead log for frames held by the batcher."""
+
+import logging
+import mmap
+import os
+import struct
+import time
+from array import array
+from pathlib import Path
+from typing import Optional
+
+from .can_reader import CAN_MAX_DLEN, CANFD_MAX_DLEN, CANFrame, CANFrameBlock
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"CANWAL02"
+# Segments of the first layout, without the suppressed count, are still read
+_MAGIC_V1 = b"CANWAL01"
+# magic, record size, payload width, created (ns), channel names in use
+_HEADER = struct.Struct("=8sIIqI")
+_HEADER_BYTES = mmap.PAGESIZE
+_MAX_CHANNELS = 16
+_NAME_BYTES = 32
+_NAMES_OFFSET = 64
+
+# Record flag: written completely (unwritten space is zero-filled)
+_VALID = 1
+
+_SEGMENT_GLOB = "wal-*.seg"
+
+
+def _record_struct(payload_width: int, v1: bool = False) -> tuple[struct.Struct, int]:
+    """
+    Record layout for a payload width and its size rounded up to a power of two.
+
+    A power-of-two record never straddles a page, so a torn write at power
+    loss damages at most the record being written.  ``v1`` selects the
+    ``CANWAL01`` layout, which has no suppressed count.
+    """
+    if v1:
+        # timestamp_ns, arb_id, dlc, channel index, payload length, flags, payload
+        record = struct.Struct(f"=qIBBBB{payload_width}s")
+    else:
+        # timestamp_ns, arb_id, suppressed (change-only count), dlc, channel
+        # index, payload length, flags, payload
+        record = struct.Struct(f"=qIIBBBB{payload_width}s")
+    size = 1
+    while size < record.size:
+        size *= 2
+    return record, size
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Persist file creations and deletions in ``directory``."""
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_file(path: Path) -> None:
+    """Persist a file's contents."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _segment_seq(path: Path) -> int:
+    return int(path.stem.split("-", 1)[1])
+
+
+class _Segment:
+    """One preallocated, memory-mapped segment file."""
+
+    def __init__(self, path: Path, size: int, payload_width: int) -> None:
+        self.path = path
+        self.payload_width = payload_width
+        self.record, self.record_size = _record_struct(payload_width)
+        self.capacity = (size - _HEADER_BYTES) // self.record_size
+        self.count = 0
+        self.channels: dict[str, int] = {}
+
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self.mm = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        _HEADER.pack_into(self.mm, 0, _MAGIC, self.record_size, payload_width, time.time_ns(), 0)
+
+    @property
+    def is_full(self) -> bool:
+        return self.count >= self.capacity
+
+    def channel(self, name: str) -> int:
+        """Index of a channel name in this segment's table, adding it on first use."""
+        index = self.channels.get(name)
+        if index is None:
+            index = len(self.channels)
+            if index >= _MAX_CHANNELS:
+                raise ValueError(f"WAL segment holds at most {_MAX_CHANNELS} channel names")
+            start = _NAMES_OFFSET + index * _NAME_BYTES
+            self.mm[start:start + _NAME_BYTES] = name.encode()[:_NAME_BYTES].ljust(
+                _NAME_BYTES, b"\x00"
+            )
+            struct.pack_into("=I", self.mm, _HEADER.size - 4, index + 1)
+            self.channels[name] = index
+        return index
+
+    def append(
+        self, ts_ns: int, arb_id: int, suppressed: int, dlc: int, channel: int, data: bytes
+    ) -> None:
+        self.record.pack_into(
+            self.mm,
+            _HEADER_BYTES + self.count * self.record_size,
+            ts_ns,
+            arb_id,
+            suppressed,
+            dlc,
+            channel,
+            len(data),
+            _VALID,
+            data,
+        )
+        self.count += 1
+
+    def close(self) -> None:
+        self.mm.flush()
+        self.mm.close()
+
+
+class FrameWAL:
+    """
+    Append-only log of the frames in the batcher's open window.
+
+    Every frame added to the batch is also written as a fixed-width record
+    into a preallocated segment file mapped with ``mmap``; nothing is
+    serialized beyond a ``struct.pack_into`` per frame.  Dirty pages are
+    flushed to storage (msync) at most every ``sync_interval_ms``.  When the
+    batch is safely on disk as Parquet, ``commit()`` deletes its segments.
+    Segments found at startup therefore hold exactly the frames of batches
+    that never made it to Parquet; ``recover_segments()`` writes them out.
+
+    Used from the writer thread only.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_mb: float = 16,
+        max_dlen: int = CAN_MAX_DLEN,
+        sync_interval_ms: float = 1000,
+    ) -> None:
+        """
+        Initialize the log; segments are created on the first append.
+
+        Args:
+            directory: Segment directory (leftover segments must be recovered
+                before the log is used)
+            segment_mb: Size of each preallocated segment file
+            max_dlen: Payload bytes per record (8 for CAN, 64 for CAN-FD);
+                a longer payload starts a new segment with CAN-FD records
+            sync_interval_ms: Minimum time between msyncs (0 = after every
+                append, < 0 = leave write-back to the kernel)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = max(int(segment_mb * 1024 * 1024), 2 * _HEADER_BYTES)
+        self.max_dlen = max_dlen
+        self.sync_interval = sync_interval_ms / 1000.0
+
+        existing = [_segment_seq(p) for p in self.directory.glob(_SEGMENT_GLOB)]
+        self._next_seq = max(existing, default=0) + 1
+        self._segments: list[_Segment] = []
+        self._dirty = False
+        self._last_sync = time.monotonic()
+
+        self._stats = {"records": 0, "syncs": 0, "commits": 0, "segments": 0}
+
+        logger.info(
+            "Frame WAL in %s: %.0f MB segments, sync every %.0f ms",
+            self.directory,
+            self.segment_bytes / (1024 * 1024),
+            sync_interval_ms,
+        )
+
+    def _segment(self, payload_len: int = 0) -> _Segment:
+        """Current segment, opening a new one if it is full or too narrow."""
+        if payload_len > self.max_dlen:
+            if payload_len > CANFD_MAX_DLEN:
+                raise ValueError(f"{payload_len}-byte payload exceeds the WAL record width")
+            logger.info("CAN-FD payload seen, widening WAL records to %d bytes", CANFD_MAX_DLEN)
+            self.max_dlen = CANFD_MAX_DLEN
+        current = self._segments[-1] if self._segments else None
+        if (
+            current is not None
+            and not current.is_full
+            and current.payload_width >= self.max_dlen
+        ):
+            return current
+        if self._segments:
+            self._segments[-1].mm.flush()
+        path = self.directory / f"wal-{self._next_seq:08d}.seg"
+        self._next_seq += 1
+        segment = _Segment(path, self.segment_bytes, self.max_dlen)
+        _fsync_dir(self.directory)
+        self._segments.append(segment)
+        self._stats["segments"] += 1
+        return segment
+
+    def append_block(self, block: CANFrameBlock) -> None:
+        """
+        Log every frame of a block.
+
+        Args:
+            block: Block being added to the batch
+        """
+        if not block.count:
+            return
+        ts, arb_ids, dlcs, offsets, payload = (
+            block.timestamps_ns, block.arb_ids, block.dlcs, block.offsets, block.payload
+        )
+        channels, suppressed = block.channels, block.suppressed
+        segment = self._segment()
+        channel = segment.channel(block.channel)
+        for i in range(block.count):
+            data = payload[offsets[i]:offsets[i + 1]]
+            if segment.is_full or len(data) > segment.payload_width:
+                segment = self._segment(len(data))
+                channel = segment.channel(block.channel)
+            segment.append(
+                ts[i],
+                arb_ids[i],
+                0 if suppressed is None else suppressed[i],
+                dlcs[i],
+                channel if channels is None else segment.channel(channels[i]),
+                data,
+            )
+        self._stats["records"] += block.count
+        self._dirty = True
+        self.sync(force=False)
+
+    def append_frame(self, frame: CANFrame) -> None:
+        """
+        Log a single frame.
+
+        Args:
+            frame: Frame being added to the batch
+        """
+        segment = self._segment(len(frame.data))
+        segment.append(
+            int(frame.timestamp * 1e9),
+            frame.arb_id,
+            0,
+            frame.dlc,
+            segment.channel(frame.channel),
+            frame.data,
+        )
+        self._stats["records"] += 1
+        self._dirty = True
+        self.sync(force=False)
+
+    def sync(self, force: bool = True) -> None:
+        """
+        Flush logged records to storage.
+
+        Args:
+            force: Sync now; otherwise only if ``sync_interval_ms`` has passed
+        """
+        if not self._dirty or not self._segments:
+            return
+        now = time.monotonic()
+        if not force and (self.sync_interval < 0 or now - self._last_sync < self.sync_interval):
+            return
+        self._segments[-1].mm.flush()
+        self._dirty = False
+        self._last_sync = now
+        self._stats["syncs"] += 1
+
+    def commit(self, written: Path) -> None:
+        """
+        Drop the segments of a batch once its Parquet file is durable.
+
+        Args:
+            written: The batch file; fsynced before the segments are deleted
+        """
+        _fsync_file(written)
+        _fsync_dir(written.parent)
+        self._discard()
+        self._stats["commits"] += 1
+
+    def _discard(self) -> None:
+        if not self._segments:
+            return
+        for segment in self._segments:
+            segment.mm.close()
+            segment.path.unlink()
+        self._segments = []
+        self._dirty = False
+        _fsync_dir(self.directory)
+
+    def close(self) -> None:
+        """Sync and unmap open segments, keeping them for recovery."""
+        for segment in self._segments:
+            segment.close()
+        self._segments = []
+
+    def get_stats(self) -> dict:
+        """
+        Return WAL counters.
+
+        Returns:
+            Dict with keys: records, syncs, commits, segments (created) and
+            open_segments
+        """
+        return {**self._stats, "open_segments": len(self._segments)}
+
+
+def read_segment(path: Path, block_frames: int = 1024) -> list[CANFrameBlock]:
+    """
+    Read the complete records of a segment file.
+
+    Suppressed counts are restored as the blocks' ``suppressed`` column
+    (left unset when every count is zero, as for ``CANWAL01`` segments).
+
+    Args:
+        path: Segment file
+        block_frames: Frames per returned block
+
+    Returns:
+        Blocks in logged order
+    """
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, record_size, width, _created, n_channels = _HEADER.unpack_from(mm, 0)
+            if magic not in (_MAGIC, _MAGIC_V1):
+                raise ValueError(f"{path.name} is not a WAL segment")
+            v1 = magic == _MAGIC_V1
+            names = [
+                bytes(mm[_NAMES_OFFSET + i * _NAME_BYTES:_NAMES_OFFSET + (i + 1) * _NAME_BYTES])
+                .rstrip(b"\x00")
+                .decode()
+                for i in range(n_channels)
+            ]
+            record, size = _record_struct(width, v1)
+            if size != record_size:
+                raise ValueError(f"{path.name} has an unexpected record size")
+
+            blocks: list[CANFrameBlock] = []
+            counts: list[array] = []
+            block: Optional[CANFrameBlock] = None
+            for offset in range(_HEADER_BYTES, len(mm) - record_size + 1, record_size):
+                if v1:
+                    ts, arb_id, dlc, channel, length, flags, data = record.unpack_from(mm, offset)
+                    suppressed = 0
+                else:
+                    ts, arb_id, suppressed, dlc, channel, length, flags, data = (
+                        record.unpack_from(mm, offset)
+                    )
+                if flags != _VALID or channel >= len(names):
+                    break
+                if block is None or block.is_full:
+                    block = CANFrameBlock(block_frames, max_dlen=width, channel=names[0])
+                    blocks.append(block)
+                    counts.append(array("I"))
+                block.append_frame(
+                    CANFrame(ts / 1e9, arb_id, dlc, data[:length], channel=names[channel])
+                )
+                counts[-1].append(suppressed)
+    for block, block_counts in zip(blocks, counts):
+        if any(block_counts):
+            block.suppressed = block_counts
+    return blocks
+
+
+def recover_segments(directory: str, batcher: object) -> list[Path]:
+    """
+    Write the frames of leftover WAL segments as Parquet batches.
+
+    Call before a ``FrameWAL`` is attached to ``batcher``.  Segments are
+    written in order through the batcher's usual windowing and deleted
+    afterwards; a segment that cannot be read is renamed to ``*.bad``.
+
+    Args:
+        directory: WAL segment directory
+        batcher: ``CANFrameBatcher`` to write with
+
+    Returns:
+        Paths of the written Parquet files
+    """
+    wal_dir = Path(directory)
+    segments = sorted(wal_dir.glob(_SEGMENT_GLOB), key=_segment_seq)
+    if not segments:
+        return []
+
+    written: list[Path] = []
+    frames = 0
+    for path in segments:
+        try:
+            blocks = read_segment(path)
+        except (OSError, ValueError, struct.error) as exc:
+            logger.error("Unreadable WAL segment %s: %s", path.name, exc)
+            path.rename(path.with_suffix(".bad"))
+            continue
+        for block in blocks:
+            frames += block.count
+            # Timestamps are in the past: windows close on the frames themselves
+            out = batcher.add_block(block)
+            if out is not None:
+                written.append(out)
+    out = batcher.flush()
+    if out is not None:
+        written.append(out)
+
+    for path in written:
+        _fsync_file(path)
+        _fsync_dir(path.parent)
+    for path in segments:
+        path.unlink(missing_ok=True)
+    _fsync_dir(wal_dir)
+    logger.warning(
+        "Recovered %d frames from %d WAL segment(s) into %d file(s)",
+        frames,
+        len(segments),
+        len(written),
+    )
+    return written
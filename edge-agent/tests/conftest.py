@@ -0,0 +1,50 @@
+"""Stand-ins shared by the edge agent tests."""
+
+import threading
+
+from src.can_reader import CAN_MAX_DLEN, CANFrameBlock
+
+# Frame timestamps start here (November 2023)
+BASE = 1_700_000_000.0
+
+
+class ListReader:
+    """Reader yielding a fixed list of frames, then ending."""
+
+    def __init__(self, frames, stats=None):
+        self.frames = frames
+        self.stats = stats or {}
+        self.stopped = False
+
+    def read_frames(self):
+        yield from self.frames
+
+    def stop(self):
+        self.stopped = True
+
+    def get_stats(self):
+        return dict(self.stats)
+
+
+class RecordingUploader:
+    """Uploader stand-in that records each path; blocks until ``release`` is set if asked."""
+
+    def __init__(self, blocked=False):
+        self.release = threading.Event()
+        if not blocked:
+            self.release.set()
+        self.uploaded = []
+        self.retries = 0
+
+    def upload(self, path):
+        self.release.wait(timeout=5)
+        self.uploaded.append(path)
+        return True
+
+
+def make_block(rows, channel="can0", max_dlen=CAN_MAX_DLEN):
+    """Build a block from (seconds after BASE, arb_id, payload) tuples."""
+    block = CANFrameBlock(len(rows), max_dlen=max_dlen, channel=channel)
+    for offset, arb_id, data in rows:
+        block.append(BASE + offset, arb_id, len(data), data)
+    return block
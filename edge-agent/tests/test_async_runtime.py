@@ -0,0 +1,152 @@
+"""Tests for the asyncio runtime."""
+
+import asyncio
+import socket
+import struct
+import time
+
+import pyarrow.parquet as pq
+
+from conftest import BASE, ListReader, RecordingUploader
+from src.async_runtime import AsyncCapturePipeline, run_periodic
+from src.batcher import CANFrameBatcher
+from src.can_reader import CANFrame, RawSocketCANReader
+from src.listeners import MetricsListener
+from src.offline_buffer import OfflineBuffer
+
+
+def _pipeline(tmp_path, reader, uploader=None, cfg=None):
+    batcher = CANFrameBatcher("VIN", window_sec=1, max_frames=100_000, output_dir=str(tmp_path))
+    buffer = OfflineBuffer(str(tmp_path / "pending"), max_disk_gb=1)
+    return AsyncCapturePipeline(reader, batcher, uploader, buffer, cfg or {"block_frames": 64})
+
+
+def test_async_pipeline_writes_and_uploads(tmp_path):
+    """Test a reader that ends drives capture, writing, uploads and listeners to completion."""
+    frames = [
+        CANFrame(timestamp=BASE + i * 0.01, arb_id=0x100, dlc=8, data=bytes([i % 256]) * 8)
+        for i in range(300)
+    ]
+    uploader = RecordingUploader()
+    pipeline = _pipeline(tmp_path, ListReader(frames), uploader)
+    metrics = MetricsListener()
+    pipeline.add_listener("metrics", metrics)
+
+    asyncio.run(pipeline.run(asyncio.Event()))
+
+    assert pipeline.batch_count == 3
+    assert sorted(uploader.uploaded) == sorted(tmp_path.rglob("*_raw.parquet"))
+    assert sum(pq.read_metadata(p).num_rows for p in uploader.uploaded) == 300
+    assert metrics.summary().startswith("frames=300")
+    assert pipeline.get_stats()["upload_ok"] == 3
+
+
+def test_async_pipeline_drains_raw_socket_until_stopped(tmp_path):
+    """Test a raw socket registered with the loop is drained and stop() flushes the batch."""
+    config = {"can": {"interface": "socketcan_raw", "channel": "vcan0", "bitrate": 500000}}
+    reader = RawSocketCANReader(config)
+    rx, tx = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    reader.sock = rx
+    pipeline = _pipeline(tmp_path, reader, cfg={"block_frames": 16, "block_latency_ms": 10})
+
+    async def scenario():
+        stop = asyncio.Event()
+        running = asyncio.create_task(pipeline.run(stop))
+        for i in range(40):
+            tx.send(struct.pack("=IB3x8s", 0x200 + i % 4, 8, bytes([i]) * 8))
+            if i % 10 == 9:
+                await asyncio.sleep(0.05)
+        await asyncio.sleep(0.1)
+        # Full blocks and the latency timer both handed blocks on
+        assert pipeline.frame_queue.get_stats()["enqueued"] >= 3
+        stop.set()
+        await running
+
+    asyncio.run(scenario())
+    tx.close()
+    reader.close()
+
+    assert reader.get_stats()["frames"] == 40
+    files = list(tmp_path.rglob("*_raw.parquet"))
+    assert sum(pq.read_metadata(p).num_rows for p in files) == 40
+
+
+class _FailingSocket:
+    """Readable socket whose receive fails, as when the interface goes down."""
+
+    def __init__(self, sock):
+        self._sock = sock
+
+    def fileno(self):
+        return self._sock.fileno()
+
+    def settimeout(self, timeout):
+        pass
+
+    def recvmsg_into(self, buffers, ancbufsize):
+        raise OSError("Network is down")
+
+    def close(self):
+        self._sock.close()
+
+
+def test_async_pipeline_reconnects_raw_socket_off_the_loop(tmp_path):
+    """Test a socket error reconnects on a thread and the new socket is watched."""
+    config = {"can": {"interface": "socketcan_raw", "channel": "vcan0", "bitrate": 500000}}
+    reader = RawSocketCANReader(config)
+    old_rx, old_tx = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    rx, tx = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    reader.sock = _FailingSocket(old_rx)
+    reader._reconnect_delay = 0.2
+
+    def connect():
+        reader.sock = rx
+        return True
+
+    reader.connect = connect
+    pipeline = _pipeline(tmp_path, reader, cfg={"block_frames": 16, "block_latency_ms": 10})
+    ticks = []
+
+    async def scenario():
+        stop = asyncio.Event()
+        running = asyncio.create_task(pipeline.run(stop))
+        ticks.append(time.monotonic())
+        old_tx.send(b"x")  # readable, receive fails
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks.append(time.monotonic())
+        await asyncio.sleep(0.3)
+        for i in range(10):
+            tx.send(struct.pack("=IB3x8s", 0x300, 8, bytes([i]) * 8))
+        await asyncio.sleep(0.1)
+        stop.set()
+        await running
+
+    asyncio.run(scenario())
+    old_tx.close()
+    tx.close()
+    reader.close()
+
+    # The loop kept running through the 0.2 s reconnect delay
+    assert ticks[-1] - ticks[0] < 0.15
+    assert reader.get_stats()["bus_off"] == 1
+    assert reader.get_stats()["frames"] == 10
+
+
+def test_run_periodic_survives_errors_and_stops():
+    """Test a failing job keeps being scheduled until stop is set."""
+    calls = []
+
+    def job():
+        calls.append(1)
+        raise RuntimeError("boom")
+
+    async def scenario():
+        stop = asyncio.Event()
+        task = asyncio.create_task(run_periodic("job", 0.01, job, stop))
+        await asyncio.sleep(0.1)
+        stop.set()
+        await asyncio.wait_for(task, 1)
+
+    asyncio.run(scenario())
+    assert len(calls) >= 3
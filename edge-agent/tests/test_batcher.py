@@ -8,7 +8,7 @@ import pyarrow.parquet as pq
 import pytest
 
 from src.batcher import CANFrameBatcher
-from src.can_reader import CANFrame
+from src.can_reader import CANFrame, CANFrameBlock
 
 
 @pytest.fixture
@@ -97,6 +97,7 @@ def test_batcher_schema(temp_output_dir, sample_frames):
     assert str(table.schema.field("dlc").type) == "uint8"
     assert str(table.schema.field("data").type) == "binary"
     assert str(table.schema.field("vehicle_id").type) == "string"
+    assert str(table.schema.field("channel").type) == "string"
 
 
 def test_batcher_window_timing(temp_output_dir):
@@ -231,3 +232,95 @@ def test_batcher_vehicle_id_in_data(temp_output_dir, sample_frames):
     # Verify all rows have correct vehicle_id
     vehicle_ids = table.column("vehicle_id").to_pylist()
     assert all(vid == vehicle_id for vid in vehicle_ids)
+
+
+def _frames_to_block(frames):
+    """Pack CANFrame objects into a columnar block."""
+    block = CANFrameBlock(capacity=len(frames))
+    for f in frames:
+        block.append(f.timestamp, f.arb_id, f.dlc, f.data)
+    return block
+
+
+def test_batcher_add_block_matches_add_frame(temp_output_dir, sample_frames):
+    """Test columnar blocks produce the same rows as individual frames."""
+    batcher = CANFrameBatcher(vehicle_id="TEST123", output_dir=temp_output_dir)
+
+    for frame in sample_frames[:40]:
+        batcher.add_frame(frame)
+    frame_table = pq.read_table(batcher.flush())
+
+    batcher.add_block(_frames_to_block(sample_frames[:40]))
+    block_table = pq.read_table(batcher.flush())
+
+    assert block_table.schema == frame_table.schema
+    assert block_table.column("arb_id").to_pylist() == frame_table.column("arb_id").to_pylist()
+    assert block_table.column("data").to_pylist() == [f.data for f in sample_frames[:40]]
+    assert block_table.column("timestamp").cast("int64").to_pylist() == (
+        frame_table.column("timestamp").cast("int64").to_pylist()
+    )
+
+
+def test_batcher_mixed_frames_and_blocks_keep_order(temp_output_dir, sample_frames):
+    """Test frames added before a block are written ahead of it."""
+    batcher = CANFrameBatcher(vehicle_id="TEST123", output_dir=temp_output_dir)
+
+    for frame in sample_frames[:5]:
+        batcher.add_frame(frame)
+    batcher.add_block(_frames_to_block(sample_frames[5:20]))
+
+    table = pq.read_table(batcher.flush())
+    assert table.column("data").to_pylist() == [f.data for f in sample_frames[:20]]
+
+
+def test_batcher_process_blocks(temp_output_dir, sample_frames):
+    """Test process_blocks flushes on the window and at the end."""
+    batcher = CANFrameBatcher(
+        vehicle_id="TEST123",
+        window_sec=0.5,
+        output_dir=temp_output_dir,
+    )
+
+    blocks = [_frames_to_block(sample_frames[i:i + 10]) for i in range(0, 100, 10)]
+    output_paths = list(batcher.process_blocks(iter(blocks)))
+
+    assert len(output_paths) >= 2
+    assert sum(pq.read_table(p).num_rows for p in output_paths) == 100
+
+
+def test_batcher_early_flushes_get_their_own_files(temp_output_dir):
+    """Test batches closed by max_frames within one second do not overwrite each other."""
+    batcher = CANFrameBatcher(
+        vehicle_id="TEST123", window_sec=60, max_frames=10, output_dir=temp_output_dir
+    )
+    frames = [
+        CANFrame(timestamp=1_700_000_000.0 + i * 0.001, arb_id=0x100, dlc=1, data=bytes([i]))
+        for i in range(50)
+    ]
+    blocks = [_frames_to_block(frames[i:i + 10]) for i in range(0, 50, 10)]
+    output_paths = list(batcher.process_blocks(iter(blocks)))
+
+    assert len(set(output_paths)) == 5
+    assert sum(pq.read_table(p).num_rows for p in output_paths) == 50
+
+    # Same start time again: a new name, never the existing file
+    batcher.add_frame(frames[0])
+    again = batcher.flush()
+    assert again not in output_paths
+    assert pq.read_table(output_paths[0]).num_rows == 10
+
+
+def test_batcher_writes_channel_column(temp_output_dir):
+    """Test the source channel of each frame is carried into Parquet."""
+    batcher = CANFrameBatcher(vehicle_id="TEST123", output_dir=temp_output_dir)
+
+    batcher.add_frame(CANFrame(timestamp=1.0, arb_id=0x100, dlc=1, data=b"\x01", channel="can0"))
+    batcher.add_frame(CANFrame(timestamp=1.1, arb_id=0x200, dlc=1, data=b"\x02", channel="can1"))
+
+    block = CANFrameBlock(capacity=2, channel="can0")
+    block.append_frame(CANFrame(timestamp=1.2, arb_id=0x100, dlc=1, data=b"\x03", channel="can0"))
+    block.append_frame(CANFrame(timestamp=1.3, arb_id=0x200, dlc=1, data=b"\x04", channel="can1"))
+    batcher.add_block(block)
+
+    table = pq.read_table(batcher.flush())
+    assert table.column("channel").to_pylist() == ["can0", "can1", "can0", "can1"]
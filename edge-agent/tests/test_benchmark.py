@@ -0,0 +1,48 @@
+"""Tests for the --benchmark throughput ramp."""
+
+from pathlib import Path
+
+from src.benchmark import assess_step, run_benchmark
+
+DBC_PATH = str(Path(__file__).parents[2] / "sample-data" / "dbc" / "ev_powertrain.dbc")
+
+
+def test_ramp_reports_steps_and_uploads(tmp_path):
+    """Test each step measures the pipeline and the upload stand-in receives files."""
+    config = {
+        "vehicle_id": "BENCH",
+        "dbc": {"path": DBC_PATH},
+        "benchmark": {
+            "start_fps": 500,
+            "max_fps": 1000,
+            "step_factor": 2,
+            "step_sec": 0.6,
+            "batch_interval_sec": 0.2,
+            "upload_dir": str(tmp_path / "uploads"),
+        },
+    }
+    report = run_benchmark(config, cpu_temp=lambda: 50.0)
+
+    assert [step["target_fps"] for step in report["steps"]] == [500, 1000]
+    assert report["limit"] is None and report["max_sustainable_fps"] == 1000
+    for step in report["steps"]:
+        assert step["sustained"] and step["dropped_frames"] == 0
+        assert step["frames"] == step["target_fps"] * 0.6
+        assert step["uploads"] >= 2 and step["cpu_temp_c"] == 50.0
+        assert step["writer_lag_p99_ms"] >= step["writer_lag_p50_ms"] > 0
+    assert len(list((tmp_path / "uploads").rglob("*.parquet"))) == sum(
+        step["uploads"] for step in report["steps"]
+    )
+
+
+def test_assess_step_reasons():
+    """Test drops, latency and a missed rate each mark a step unsustainable."""
+    step = {
+        "target_fps": 10000,
+        "achieved_fps": 9000,
+        "dropped_frames": 3,
+        "writer_lag_p99_ms": 1500.0,
+    }
+    assert assess_step(step, max_latency_ms=1000) == ["drops", "latency", "capture"]
+    step.update(achieved_fps=9990, dropped_frames=0, writer_lag_p99_ms=20.0)
+    assert assess_step(step, max_latency_ms=1000) == []
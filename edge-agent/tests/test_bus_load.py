@@ -0,0 +1,126 @@
+"""Tests for bus-load accounting."""
+
+import json
+import socket
+import struct
+
+import pyarrow.parquet as pq
+import pytest
+
+from src.batcher import CANFrameBatcher
+from src.bus_load import BusLoadMeter, frame_bits
+from src.can_reader import CAN_EFF_FLAG, CANFrame, RawSocketCANReader
+from src.offline_buffer import OfflineBuffer
+from src.pipeline import CapturePipeline
+
+BASE = 1_700_000_000
+
+
+def test_frame_bits_classic_worst_case():
+    """Test the classic CAN model matches the textbook worst-case lengths."""
+    assert frame_bits(8) == (135, 0)
+    assert frame_bits(8, extended=True) == (160, 0)
+    assert frame_bits(0) == (55, 0)
+
+
+def test_frame_bits_fd_phases():
+    """Test CAN-FD frames split into arbitration and data phase bits."""
+    nominal, data = frame_bits(64, fd=True)
+    assert nominal == 17 + 4 + 13
+    assert data == 517 + 129 + 4 + 21 + 7
+    # CRC17 for payloads up to 16 bytes
+    assert frame_bits(16, fd=True)[1] == 133 + 33 + 4 + 17 + 6
+
+
+def test_meter_per_second_utilization():
+    """Test 500 standard 8-byte frames per second on 500 kbit/s load 13.5 %."""
+    meter = BusLoadMeter(bitrate=500_000, window_sec=2)
+    for second in range(3):
+        for i in range(500):
+            meter.record(BASE + second + i / 500, 8)
+
+    assert meter.per_second(BASE, BASE + 2) == [
+        (BASE, 13.5), (BASE + 1, 13.5), (BASE + 2, 13.5)
+    ]
+    assert meter.get_stats(now=BASE + 2.5) == {"bus_load_pct": 13.5, "bus_load_peak_pct": 13.5}
+    summary = meter.summary(BASE, BASE + 3)
+    assert summary["mean_pct"] == pytest.approx(13.5 * 3 / 4, abs=0.01)
+    assert summary["peak_pct"] == 13.5
+
+
+def test_meter_fd_bitrate_switch():
+    """Test BRS frames spend their data phase at the data bitrate."""
+    meter = BusLoadMeter(bitrate=500_000, data_bitrate=2_000_000)
+    nominal, data = frame_bits(64, fd=True)
+    meter.record(BASE, 64, fd=True, brs=True)
+    meter.record(BASE + 1, 64, fd=True)
+
+    slow, fast = meter.per_second(BASE, BASE + 1)[1][1], meter.per_second(BASE, BASE)[0][1]
+    assert fast == round((nominal / 500_000 + data / 2_000_000) * 100, 2)
+    assert slow == round((nominal + data) / 500_000 * 100, 2)
+
+
+def test_raw_reader_reports_bus_load():
+    """Test the raw reader accounts standard and extended frames."""
+    config = {"can": {"interface": "socketcan_raw", "channel": "vcan0", "bitrate": 500000}}
+    reader = RawSocketCANReader(config)
+    rx, tx = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    reader.sock = rx
+    tx.send(struct.pack("=IB3x8s", 0x100, 8, bytes(8)))
+    tx.send(struct.pack("=IB3x8s", 0x18FF0100 | CAN_EFF_FLAG, 8, bytes(8)))
+
+    frames = []
+    for frame in reader.read_frames():
+        frames.append(frame)
+        if len(frames) == 2:
+            reader.stop()
+    tx.close()
+    reader.close()
+
+    second = int(frames[0].timestamp)
+    busy = sum(u for _, u in reader.bus_load.per_second(second, second + 1))
+    assert busy == pytest.approx((135 + 160) / 500_000 * 100, abs=0.01)
+    assert "bus_load_pct" in reader.get_stats()
+
+
+class _MeteredReader:
+    """Reader yielding a fixed list of frames with a bus-load meter."""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.channel = "can0"
+        self.bus_load = BusLoadMeter(bitrate=500_000)
+
+    def read_frames(self):
+        for frame in self.frames:
+            self.bus_load.record(frame.timestamp, len(frame.data))
+            yield frame
+
+    def bus_load_summary(self, start, end):
+        return {self.channel: self.bus_load.summary(start, end)}
+
+
+def test_pipeline_stores_bus_load_in_batch_metadata(tmp_path):
+    """Test every batch carries its per-second utilization in the Parquet metadata."""
+    frames = [
+        CANFrame(timestamp=BASE + i * 0.002, arb_id=0x100, dlc=8, data=bytes(8))
+        for i in range(1000)
+    ]
+    batcher = CANFrameBatcher("VEH", window_sec=1, output_dir=str(tmp_path / "data"))
+    buffer = OfflineBuffer(pending_dir=str(tmp_path / "pending"))
+
+    pipeline = CapturePipeline(
+        _MeteredReader(frames), batcher, None, buffer, {"block_frames": 100}
+    )
+    pipeline.start()
+    assert pipeline.wait_for_capture(timeout=5)
+    pipeline.stop()
+
+    batches = sorted((tmp_path / "data").rglob("*.parquet"))
+    assert len(batches) == 2
+    assert sorted(p.name for p in (tmp_path / "data").rglob("*") if p.is_file()) == sorted(
+        p.name for p in batches
+    )
+    first = json.loads(pq.read_schema(batches[0]).metadata[b"bus_load"])
+    assert first["window_start"] == BASE
+    assert first["channels"]["can0"]["per_second"][0] == [BASE, 13.5]
@@ -0,0 +1,124 @@
+"""Tests for DBC-derived kernel CAN filters."""
+
+from pathlib import Path
+
+import cantools
+import pytest
+
+from src.can_filters import build_filters, filters_from_dbc, resolve_filters
+
+SAMPLE_DBC = Path(__file__).resolve().parents[2] / "sample-data" / "dbc" / "ev_powertrain.dbc"
+
+
+def _admits(filters, arb_id, extended=False):
+    return any(
+        f["extended"] == extended and (arb_id & f["can_mask"]) == (f["can_id"] & f["can_mask"])
+        for f in filters
+    )
+
+
+def _admitted(filters):
+    """Every standard ID the filters let through."""
+    return {i for i in range(0x800) if _admits(filters, i)}
+
+
+def test_adjacent_ids_merge_without_loss():
+    """Test 0x100-0x103 collapse into one exact filter."""
+    filters = build_filters([(0x100 + i, False) for i in range(4)])
+
+    assert filters == [{"can_id": 0x100, "can_mask": 0x7FC, "extended": False}]
+    assert _admitted(filters) == {0x100, 0x101, 0x102, 0x103}
+
+
+def test_reduce_many_ids_keeps_wanted_and_rejects_denied():
+    """Test a large DBC-sized ID set reduces to the budget, admitting every wanted ID."""
+    ids = sorted({(i * 37 + 11) % 0x800 for i in range(300)})
+    denied = {(i * 37 + 12) % 0x800 for i in range(20)} - set(ids)
+    filters = build_filters([(i, False) for i in ids], max_filters=16)
+    assert len(filters) == 16
+    assert set(ids) <= _admitted(filters)
+
+    filters = build_filters([(i, False) for i in ids], deny=denied, max_filters=16)
+    admitted = _admitted(filters)
+    assert set(ids) <= admitted
+    assert not admitted & denied
+
+
+def test_unmergeable_ids_stay_exact():
+    """Test IDs below the filter budget are admitted exactly."""
+    ids = [0x0A5, 0x1A0, 0x2B3, 0x355]
+    filters = build_filters([(i, False) for i in ids], max_filters=16)
+
+    assert len(filters) == 4
+    assert _admitted(filters) == set(ids)
+
+
+def test_reduction_respects_budget_and_deny_list():
+    """Test lossy merging fits max_filters, keeps every ID and admits no denied ID."""
+    ids = [0x100, 0x105, 0x10A, 0x120, 0x200, 0x210, 0x333, 0x400]
+    deny = [0x300]
+    filters = build_filters([(i, False) for i in ids], deny=deny, max_filters=3)
+
+    assert len(filters) <= 3
+    admitted = _admitted(filters)
+    assert set(ids) <= admitted
+    assert not admitted & set(deny)
+
+
+def test_reduction_stops_short_rather_than_admit_denied():
+    """Test the deny list wins over max_filters."""
+    ids = [0x100, 0x105, 0x10A, 0x120, 0x200, 0x210, 0x333, 0x400]
+    deny = [0x101, 0x300]
+    filters = build_filters([(i, False) for i in ids], deny=deny, max_filters=1)
+
+    assert len(filters) > 1
+    admitted = _admitted(filters)
+    assert set(ids) <= admitted
+    assert not admitted & set(deny)
+
+
+def test_denied_ids_are_dropped_from_wanted():
+    """Test a denied ID is not admitted even when requested."""
+    filters = build_filters([(0x100, False), (0x101, False)], deny=[0x101])
+
+    assert filters == [{"can_id": 0x100, "can_mask": 0x7FF, "extended": False}]
+
+
+def test_extended_ids_are_filtered_separately():
+    """Test standard and extended IDs never share a filter."""
+    filters = build_filters([(0x100, False), (0x18FF0100, True), (0x18FF0101, True)])
+
+    assert {"can_id": 0x100, "can_mask": 0x7FF, "extended": False} in filters
+    assert {"can_id": 0x18FF0100, "can_mask": 0x1FFFFFFE, "extended": True} in filters
+    assert len(filters) == 2
+
+
+def test_filters_from_dbc_covers_every_message():
+    """Test filters derived from the sample DBC admit all of its messages."""
+    db = cantools.database.load_file(str(SAMPLE_DBC))
+    filters = filters_from_dbc(str(SAMPLE_DBC), allow=[0x7DF], max_filters=2)
+
+    assert len(filters) <= 2
+    for message in db.messages:
+        assert _admits(filters, message.frame_id, bool(message.is_extended_frame))
+    assert _admits(filters, 0x7DF)
+
+
+def test_resolve_filters():
+    """Test can.filters: "dbc" is replaced and other values pass through."""
+    explicit = {"can": {"filters": [{"can_id": 1, "can_mask": 0x7FF}]}, "dbc": {}}
+    assert resolve_filters(explicit) is explicit
+
+    config = {
+        "can": {"channel": "can0", "filters": "dbc", "filter_deny": [0x1A1]},
+        "dbc": {"path": str(SAMPLE_DBC)},
+    }
+    resolved = resolve_filters(config)
+    assert isinstance(resolved["can"]["filters"], list)
+    assert _admits(resolved["can"]["filters"], 0x1A0)
+    assert not _admits(resolved["can"]["filters"], 0x1A1)
+    assert resolved["can"]["channel"] == "can0"
+    assert config["can"]["filters"] == "dbc"
+
+    with pytest.raises(ValueError, match="dbc.path"):
+        resolve_filters({"can": {"filters": "dbc"}, "dbc": {"path": None}})
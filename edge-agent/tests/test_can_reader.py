@@ -1,12 +1,27 @@
 """Tests for CAN reader implementations."""
 
+import socket
+import struct
 import tempfile
 from pathlib import Path
 
 import cantools
 import pytest
 
-from src.can_reader import CANFrame, SimulatedCANReader
+from src.can_reader import (
+    CAN_EFF_FLAG,
+    CAN_ERR_BUSOFF,
+    CAN_ERR_FLAG,
+    CANFrame,
+    CANFrameBlock,
+    LoadGeneratorCANReader,
+    MultiChannelCANReader,
+    RawSocketCANReader,
+    RealCANReader,
+    SimulatedCANReader,
+    create_reader,
+    create_simulated_reader,
+)
 
 
 @pytest.fixture
@@ -151,6 +166,114 @@ def test_simulated_reader_respects_duration(sample_dbc):
     assert 0.8 * duration_sec <= actual_duration <= 1.2 * duration_sec
 
 
+@pytest.fixture
+def cycle_time_dbc():
+    """Create a DBC with GenMsgCycleTime attributes (10 ms and 100 ms)."""
+    dbc_content = """VERSION ""
+
+BS_:
+
+BU_: TestECU
+
+BO_ 256 Fast: 8 TestECU
+ SG_ Motor_RPM : 0|16@1+ (1,0) [0|12000] "rpm" TestECU
+
+BO_ 512 Slow: 8 TestECU
+ SG_ Coolant_Temp : 0|8@1+ (1,-40) [-40|120] "degC" TestECU
+
+BO_ 768 NoCycle: 8 TestECU
+ SG_ Flow : 0|8@1+ (1,0) [0|100] "" TestECU
+
+BA_DEF_ BO_ "GenMsgCycleTime" INT 0 65535;
+BA_DEF_DEF_ "GenMsgCycleTime" 0;
+BA_ "GenMsgCycleTime" BO_ 256 10;
+BA_ "GenMsgCycleTime" BO_ 512 100;
+"""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.dbc', delete=False) as f:
+        f.write(dbc_content)
+        return f.name
+
+
+def _generate(dbc_path, **kwargs):
+    reader = LoadGeneratorCANReader(dbc_path, realtime=False, **kwargs)
+    with reader:
+        blocks = list(reader.read_batches(max_frames=256, max_latency_ms=20))
+    return reader, blocks
+
+
+def test_load_generator_uses_dbc_cycle_times(cycle_time_dbc):
+    """Test every message is scheduled at its GenMsgCycleTime."""
+    reader, blocks = _generate(
+        cycle_time_dbc, duration_sec=2.0, default_cycle_ms=50, rate_scale=10
+    )
+    counts = {}
+    for block in blocks:
+        for arb_id in block.arb_ids[:block.count]:
+            counts[arb_id] = counts.get(arb_id, 0) + 1
+
+    # 2 s at 10x: 10 ms -> 2000, 100 ms -> 200, default 50 ms -> 400 frames
+    assert counts == {256: 2000, 512: 200, 768: 400}
+    assert reader.get_stats()["frames"] == 2600
+    assert reader.get_stats()["target_fps"] == 1300.0
+
+
+def test_load_generator_schedule_is_ordered_and_periodic(cycle_time_dbc):
+    """Test frames come out in timestamp order with exact periods."""
+    _, blocks = _generate(cycle_time_dbc, duration_sec=1.0)
+    timestamps = [ts for block in blocks for ts in block.timestamps_ns[:block.count]]
+    assert timestamps == sorted(timestamps)
+    assert all(block.count <= 256 for block in blocks)
+
+    fast = [
+        block.timestamps_ns[i]
+        for block in blocks
+        for i in range(block.count)
+        if block.arb_ids[i] == 256
+    ]
+    gaps = {round((b - a) / 1e6, 3) for a, b in zip(fast, fast[1:])}
+    assert gaps == {10.0}
+
+
+def test_load_generator_is_deterministic(cycle_time_dbc):
+    """Test the same seed reproduces payloads and relative timestamps."""
+
+    def run(seed):
+        _, blocks = _generate(cycle_time_dbc, duration_sec=3.0, seed=seed)
+        frames = [frame for block in blocks for frame in block.frames()]
+        start = frames[0].timestamp
+        offsets = [frame.timestamp - start for frame in frames]
+        return [(frame.arb_id, frame.data) for frame in frames], offsets
+
+    first, first_offsets = run(7)
+    second, second_offsets = run(7)
+    assert first == second
+    assert second_offsets == pytest.approx(first_offsets, abs=1e-6)
+    assert run(8)[0] != first
+
+
+def test_load_generator_payloads_decode(cycle_time_dbc):
+    """Test generated payloads decode within the DBC signal ranges."""
+    db = cantools.database.load_file(cycle_time_dbc)
+    _, blocks = _generate(cycle_time_dbc, duration_sec=1.0)
+    for block in blocks:
+        for frame in block.frames():
+            message = db.get_message_by_frame_id(frame.arb_id)
+            for signal in message.signals:
+                value = message.decode(frame.data)[signal.name]
+                assert signal.minimum <= value <= signal.maximum
+
+
+def test_create_simulated_reader(sample_dbc):
+    """Test simulation.load_test selects the load generator."""
+    config = {"dbc": {"path": sample_dbc}}
+    assert isinstance(create_simulated_reader(config), SimulatedCANReader)
+
+    config["simulation"] = {"load_test": True, "rate_scale": 100, "seed": 1}
+    reader = create_simulated_reader(config)
+    assert isinstance(reader, LoadGeneratorCANReader)
+    assert reader.rate_scale == 100.0
+
+
 @pytest.mark.parametrize("frequency", [10, 50, 100])
 def test_simulated_reader_frequency(sample_dbc, frequency):
     """Test simulation respects configured frequency."""
@@ -170,3 +293,241 @@ def test_simulated_reader_frequency(sample_dbc, frequency):
     # With tolerance for timing variations
     expected = frequency * duration_sec * 1  # 1 message in DBC
     assert 0.5 * expected <= frame_count <= 1.5 * expected
+
+
+def test_frame_block_append_and_frames():
+    """Test CANFrameBlock stores variable-length payloads back to back."""
+    block = CANFrameBlock(capacity=3, channel="can1")
+    block.append(1.5, 0x100, 2, b"\x01\x02")
+    block.append(2.5, 0x200, 0, b"")
+    block.append(3.5, 0x300, 8, bytes(range(8)))
+
+    assert len(block) == 3
+    assert block.is_full
+    assert block.first_timestamp == 1.5
+    assert block.last_timestamp == 3.5
+    assert list(block.offsets[:4]) == [0, 2, 2, 10]
+
+    frames = list(block.frames())
+    assert [f.arb_id for f in frames] == [0x100, 0x200, 0x300]
+    assert [f.data for f in frames] == [b"\x01\x02", b"", bytes(range(8))]
+    assert all(f.channel == "can1" for f in frames)
+
+
+def _raw_config(interface="socketcan_raw"):
+    return {"can": {"interface": interface, "channel": "vcan0", "bitrate": 500000}}
+
+
+def _can_frame(can_id, data):
+    """Pack a classic ``struct can_frame``."""
+    return struct.pack("=IB3x8s", can_id, len(data), data)
+
+
+@pytest.fixture
+def raw_reader():
+    """RawSocketCANReader wired to a datagram socketpair instead of AF_CAN."""
+    reader = RawSocketCANReader(_raw_config())
+    rx, tx = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    reader.sock = rx
+    yield reader, tx
+    tx.close()
+    reader.close()
+
+
+def test_create_reader_selects_backend():
+    """Test can.interface selects the reader implementation."""
+    assert isinstance(create_reader(_raw_config()), RawSocketCANReader)
+    assert isinstance(create_reader(_raw_config("socketcan")), RealCANReader)
+
+
+def test_raw_reader_decodes_frames(raw_reader):
+    """Test raw struct can_frame decoding of standard and extended IDs."""
+    reader, tx = raw_reader
+    tx.send(_can_frame(0x1A0, b"\x01\x02\x03"))
+    tx.send(_can_frame(CAN_ERR_FLAG | CAN_ERR_BUSOFF, bytes(8)))
+    tx.send(_can_frame(CAN_EFF_FLAG | 0x18FEF100, bytes(range(8))))
+
+    frames = []
+    for frame in reader.read_frames():
+        frames.append(frame)
+        if len(frames) == 2:
+            reader.stop()
+
+    assert [f.arb_id for f in frames] == [0x1A0, 0x18FEF100]
+    assert frames[0].data == b"\x01\x02\x03"
+    assert frames[0].dlc == 3
+    assert frames[1].data == bytes(range(8))
+    assert all(f.channel == "vcan0" and not f.is_fd for f in frames)
+
+    stats = reader.get_stats()
+    assert stats["frames"] == 2
+    assert stats["errors"] == 1
+    assert stats["bus_off"] == 1
+
+
+def test_raw_reader_read_batches(raw_reader):
+    """Test read_batches fills columnar blocks straight from the socket buffer."""
+    reader, tx = raw_reader
+    for i in range(5):
+        tx.send(_can_frame(0x100 + i, bytes([i] * 8)))
+
+    blocks = []
+    for block in reader.read_batches(max_frames=2, max_latency_ms=10):
+        blocks.append(block)
+        if sum(b.count for b in blocks) == 5:
+            reader.stop()
+
+    assert [b.count for b in blocks] == [2, 2, 1]
+    frames = [f for b in blocks for f in b.frames()]
+    assert [f.arb_id for f in frames] == [0x100, 0x101, 0x102, 0x103, 0x104]
+    assert frames[4].data == bytes([4] * 8)
+
+
+class _FakeChannelReader:
+    """Stand-in channel reader yielding pre-built blocks."""
+
+    def __init__(self, channel, timestamps, block_frames=1):
+        self.channel = channel
+        self.fd = False
+        self.timestamps = timestamps
+        self.block_frames = block_frames
+        self.stopped = False
+
+    def read_batches(self, max_frames=1024, max_latency_ms=50.0):
+        for i in range(0, len(self.timestamps), self.block_frames):
+            chunk = self.timestamps[i:i + self.block_frames]
+            block = CANFrameBlock(len(chunk), channel=self.channel)
+            for ts in chunk:
+                block.append(ts, 0x100, 1, bytes([round(ts * 1000) % 256]))
+            yield block
+
+    def stop(self):
+        self.stopped = True
+
+    def close(self):
+        self.stop()
+
+    def get_stats(self, top_n=5):
+        n = len(self.timestamps)
+        return {
+            "frames": n,
+            "errors": 0,
+            "bus_off": 0,
+            "kernel_drops": 1,
+            "iface_drops": 0,
+            "seq_gaps": 0,
+            "seq_lost": 0,
+            "seq_repeats": 0,
+            "frames_per_sec": float(n),
+            "bus_load_pct": 0.0,
+            "bus_load_peak_pct": 0.0,
+            "top_ids": [],
+            "missing_ids": [],
+        }
+
+
+def _multi_reader(timestamps_by_channel, window_ms=50, block_frames=1):
+    config = _raw_config()
+    config["can"]["channels"] = list(timestamps_by_channel)
+    config["can"]["reorder_window_ms"] = window_ms
+    reader = create_reader(config)
+    reader.readers = [
+        _FakeChannelReader(ch, ts, block_frames) for ch, ts in timestamps_by_channel.items()
+    ]
+    return reader
+
+
+def test_multi_channel_merge_orders_by_timestamp():
+    """Test frames from several channels are merged in timestamp order."""
+    reader = _multi_reader({
+        "can0": [100.000, 100.010, 100.020, 100.030],
+        "can1": [100.005, 100.015, 100.025],
+    })
+    assert isinstance(reader, MultiChannelCANReader)
+
+    frames = []
+    with reader:
+        for frame in reader.read_frames():
+            frames.append(frame)
+            if len(frames) == 7:
+                reader.stop()
+
+    assert [f.timestamp for f in frames] == sorted(f.timestamp for f in frames)
+    assert [f.channel for f in frames[:4]] == ["can0", "can1", "can0", "can1"]
+    assert all(r.stopped for r in reader.readers)
+
+    stats = reader.get_stats()
+    assert stats["frames"] == 7
+    assert stats["late_frames"] == 0
+    assert set(stats["channels"]) == {"can0", "can1"}
+
+
+def test_multi_channel_read_batches_tracks_channel_per_row():
+    """Test merged blocks keep the source channel of every row."""
+    reader = _multi_reader({"can0": [1.0, 1.2], "can1": [1.1]})
+
+    rows = []
+    with reader:
+        for block in reader.read_batches(max_frames=8, max_latency_ms=10):
+            rows.extend(block.frames())
+            if len(rows) == 3:
+                reader.stop()
+
+    assert [f.channel for f in rows] == ["can0", "can1", "can0"]
+
+
+def test_multi_channel_merges_blocks_by_row():
+    """Test interleaved multi-row blocks are merged row by row, payloads intact."""
+    can0 = [10.000 + i * 0.002 for i in range(50)]
+    can1 = [10.001 + i * 0.002 for i in range(50)]
+    # Window longer than the whole capture: merged at the idle tick
+    reader = _multi_reader({"can0": can0, "can1": can1}, window_ms=500, block_frames=16)
+
+    blocks = []
+    with reader:
+        for block in reader.read_batches(max_frames=32, max_latency_ms=1000):
+            blocks.append(block)
+            if sum(b.count for b in blocks) == 100:
+                reader.stop()
+
+    assert all(b.count <= 32 for b in blocks)
+    rows = [f for b in blocks for f in b.frames()]
+    assert [round(f.timestamp, 6) for f in rows] == [round(t, 6) for t in sorted(can0 + can1)]
+    assert [f.channel for f in rows[:4]] == ["can0", "can1", "can0", "can1"]
+    assert all(f.data == bytes([round(f.timestamp * 1000) % 256]) for f in rows)
+    assert reader.get_stats()["late_frames"] == 0
+
+
+def test_create_reader_single_entry_channels_list():
+    """Test a one-element channels list builds a plain reader on that channel."""
+    config = _raw_config()
+    config["can"]["channels"] = [{"channel": "can1", "bitrate": 250000}]
+    reader = create_reader(config)
+    assert isinstance(reader, RawSocketCANReader)
+    assert reader.channel == "can1"
+    assert reader.bitrate == 250000
+
+
+def test_raw_reader_sequence_checks():
+    """Test rolling-counter gaps are reported through get_stats()."""
+    config = _raw_config()
+    config["can"]["sequence_checks"] = [{"arb_id": 0x1A0, "byte": 0, "mask": 0x0F}]
+    reader = RawSocketCANReader(config)
+    rx, tx = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    reader.sock = rx
+
+    for counter in [1, 2, 6]:
+        tx.send(_can_frame(0x1A0, bytes([counter, 0xAA])))
+
+    received = 0
+    for _ in reader.read_frames():
+        received += 1
+        if received == 3:
+            reader.stop()
+    tx.close()
+    reader.close()
+
+    stats = reader.get_stats()
+    assert stats["seq_gaps"] == 1
+    assert stats["seq_lost"] == 3
+    assert stats["kernel_drops"] == 0
@@ -0,0 +1,73 @@
+"""Tests for change-only capture."""
+
+import tempfile
+
+import pyarrow.parquet as pq
+import pytest
+
+from conftest import BASE, make_block
+from src.batcher import CANFrameBatcher
+from src.change_filter import ChangeOnlyFilter
+
+
+def test_repeated_payloads_are_suppressed_and_counted():
+    """Test identical payloads are dropped and counted on the next kept frame."""
+    f = ChangeOnlyFilter(keyframe_sec=10.0)
+    out = f.filter_block(make_block([
+        (0.00, 0x100, b"\x01"),
+        (0.01, 0x100, b"\x01"),
+        (0.02, 0x200, b"\x07"),
+        (0.03, 0x100, b"\x01"),
+        (0.04, 0x100, b"\x02"),
+        (0.05, 0x200, b"\x07"),
+    ]))
+
+    assert list(out.arb_ids[:out.count]) == [0x100, 0x200, 0x100]
+    assert [f.data for f in out.frames()] == [b"\x01", b"\x07", b"\x02"]
+    assert list(out.suppressed) == [0, 0, 2]
+    assert out.timestamps_ns[2] == int((BASE + 0.04) * 1e9)
+    assert f.get_stats() == {"frames_in": 6, "frames_kept": 3, "suppressed": 3, "ratio": 0.5}
+
+
+def test_keyframe_forces_repeat_and_state_spans_blocks():
+    """Test a repeat is kept once keyframe_sec has passed, across blocks."""
+    f = ChangeOnlyFilter(keyframe_sec=1.0)
+    first = f.filter_block(make_block([(0.0, 0x100, b"\xAA"), (0.5, 0x100, b"\xAA")]))
+    second = f.filter_block(make_block([(0.9, 0x100, b"\xAA"), (1.0, 0x100, b"\xAA")]))
+
+    assert first.count == 1
+    assert second.count == 1
+    assert second.timestamps_ns[0] == int((BASE + 1.0) * 1e9)
+    assert list(second.suppressed) == [2]
+
+
+def test_channels_are_tracked_separately():
+    """Test the same ID on two channels is not treated as a repeat."""
+    f = ChangeOnlyFilter()
+    assert f.filter_block(make_block([(0.0, 0x100, b"\x01")], channel="can0")).count == 1
+    assert f.filter_block(make_block([(0.1, 0x100, b"\x01")], channel="can1")).count == 1
+
+
+def test_unchanged_block_is_passed_through():
+    """Test a block without repeats is returned as is (no copy)."""
+    f = ChangeOnlyFilter()
+    block = make_block([(0.0, 0x100, b"\x01"), (0.1, 0x100, b"\x02")])
+    assert f.filter_block(block) is block
+
+
+def test_invalid_keyframe_interval():
+    with pytest.raises(ValueError):
+        ChangeOnlyFilter(keyframe_sec=0)
+
+
+def test_suppressed_column_written_to_parquet():
+    """Test filtered blocks write their counts to the suppressed column."""
+    f = ChangeOnlyFilter(keyframe_sec=10.0)
+    rows = [(i * 0.01, 0x100, b"\x01") for i in range(5)] + [(0.05, 0x100, b"\x02")]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        batcher = CANFrameBatcher(vehicle_id="TEST", output_dir=tmpdir)
+        batcher.add_block(f.filter_block(make_block(rows)))
+        table = pq.read_table(batcher.flush())
+
+    assert table.num_rows == 2
+    assert table.column("suppressed").to_pylist() == [0, 4]
@@ -0,0 +1,115 @@
+"""Tests for per-ID decimation."""
+
+from pathlib import Path
+
+import cantools
+import pytest
+
+from conftest import BASE, make_block
+from src.decimation import DecimationFilter, raw_signal_value, resolve_decimation_rules
+
+SAMPLE_DBC = Path(__file__).resolve().parents[2] / "sample-data" / "dbc" / "ev_powertrain.dbc"
+
+
+def _ids(block):
+    return list(block.arb_ids[:block.count])
+
+
+def test_every_nth_keeps_one_in_n():
+    """Test every_nth keeps frames 0, n, 2n of the ID and passes other IDs."""
+    f = DecimationFilter([{"arb_id": 0x100, "policy": "every_nth", "n": 4}])
+    rows = [(i * 0.001, 0x100, b"\x00") for i in range(10)] + [(0.02, 0x200, b"\x01")]
+    out = f.filter_block(make_block(rows))
+
+    assert _ids(out) == [0x100, 0x100, 0x100, 0x200]
+    assert [round(t / 1e9 - BASE, 3) for t in out.timestamps_ns[:3]] == [0.0, 0.004, 0.008]
+    stats = f.get_stats()
+    assert stats["frames_in"] == 11
+    assert stats["frames_kept"] == 4
+    assert stats["removed"] == {"every_nth": 7, "interval": 0, "min_max": 0}
+
+
+def test_interval_keeps_at_most_one_per_interval_across_blocks():
+    """Test interval decimation of a 1 kHz ID down to 10 Hz."""
+    f = DecimationFilter([{"arb_id": 0x100, "policy": "interval", "interval_ms": 100}])
+    kept = 0
+    for start in range(0, 1000, 250):
+        block = make_block([(i * 0.001, 0x100, b"\x00") for i in range(start, start + 250)])
+        kept += f.filter_block(block).count
+
+    assert kept == 10
+    assert f.get_stats()["removed"]["interval"] == 990
+
+
+def test_min_max_keeps_extremes_per_window():
+    """Test min_max keeps the min and max frame of each window, released late."""
+    f = DecimationFilter([{
+        "arb_id": 0x100, "policy": "min_max", "interval_ms": 100, "start_bit": 0, "length": 8,
+    }])
+    values = [5, 9, 1, 7, 3]  # window 0: min 1, max 9
+    rows = [(i * 0.01, 0x100, bytes([v])) for i, v in enumerate(values)]
+    first = f.filter_block(make_block(rows))
+    assert first.count == 0
+
+    second = f.filter_block(make_block([(0.15, 0x100, b"\x04"), (0.16, 0x100, b"\x04")]))
+    assert [fr.data for fr in second.frames()] == [b"\x09", b"\x01"]
+
+    held = f.flush()
+    assert [fr.data for fr in held.frames()] == [b"\x04"]
+    assert f.flush() is None
+    assert f.get_stats()["removed"]["min_max"] == 4
+
+
+def test_raw_signal_value_matches_cantools_layouts():
+    """Test raw extraction for Intel, Motorola and signed signals."""
+    dbc = """VERSION ""
+
+BS_:
+
+BU_: ECU
+
+BO_ 256 Mixed: 8 ECU
+ SG_ Intel : 12|10@1- (1,0) [-512|511] "" ECU
+ SG_ Motorola : 39|12@0+ (1,0) [0|4095] "" ECU
+"""
+    message = cantools.database.load_string(dbc).get_message_by_name("Mixed")
+    data = message.encode({"Intel": -300, "Motorola": 2748})
+    for signal in message.signals:
+        rule = {
+            "start_bit": signal.start,
+            "length": signal.length,
+            "byte_order": signal.byte_order,
+            "is_signed": signal.is_signed,
+        }
+        assert raw_signal_value(data, rule) == message.decode(data)[signal.name]
+    assert raw_signal_value(b"\x00", {
+        "start_bit": 0, "length": 16, "byte_order": "little_endian", "is_signed": False,
+    }) is None
+
+
+def test_resolve_rules_from_dbc_and_validation():
+    """Test message/signal names resolve via the DBC and bad rules are rejected."""
+    rules = resolve_decimation_rules(
+        [
+            {"message": "BMS_PackStatus", "signal": "Pack_Voltage", "policy": "min_max",
+             "interval_ms": 1000},
+            {"arb_id": 0x2B0, "policy": "every_nth", "n": 10},
+        ],
+        str(SAMPLE_DBC),
+    )
+    assert rules[0]["arb_id"] == 0x1A1
+    assert (rules[0]["start_bit"], rules[0]["length"]) == (0, 16)
+    assert rules[1] == {"arb_id": 0x2B0, "policy": "every_nth", "n": 10}
+    DecimationFilter(rules)
+
+    with pytest.raises(ValueError, match="dbc.path"):
+        resolve_decimation_rules([{"message": "X", "policy": "interval"}], None)
+    for bad in [
+        {"arb_id": 1, "policy": "median"},
+        {"arb_id": 1, "policy": "every_nth"},
+        {"arb_id": 1, "policy": "interval", "interval_ms": 0},
+        {"arb_id": 1, "policy": "min_max", "interval_ms": 10},
+        {"policy": "every_nth", "n": 2},
+    ]:
+        with pytest.raises(ValueError):
+            DecimationFilter([bad])
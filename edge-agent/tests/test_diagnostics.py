@@ -0,0 +1,116 @@
+"""Tests for the diagnostics HTTP server."""
+
+import json
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import cantools
+import pytest
+
+from src.can_reader import CANFrameBlock
+from src.diagnostics import DiagnosticsServer, RecentDataListener, uptime_status
+from src.live_decoder import CompiledDecoder
+
+BASE = 1_700_000_000.0
+SAMPLE_DBC = Path(__file__).resolve().parents[2] / "sample-data" / "dbc" / "ev_powertrain.dbc"
+
+
+@pytest.fixture(scope="module")
+def db():
+    return cantools.database.load_file(str(SAMPLE_DBC))
+
+
+def _pack_blocks(db, seconds, per_block=50):
+    """Blocks of BMS_PackStatus at 10 Hz with a voltage ramp, plus 0x7FF filler."""
+    message = db.get_message_by_name("BMS_PackStatus")
+    rows = []
+    for i in range(seconds * 10):
+        values = {s.name: 0 for s in message.signals}
+        values["Pack_Voltage"] = 100 + i
+        rows.append((i / 10, message.frame_id, message.encode(values, strict=False)))
+        rows.append((i / 10 + 0.05, 0x7FF, b"\x01\x02"))
+    blocks = []
+    for start in range(0, len(rows), per_block):
+        block = CANFrameBlock(per_block, max_dlen=8)
+        for offset, arb_id, data in rows[start:start + per_block]:
+            block.append(BASE + offset, arb_id, len(data), data)
+        blocks.append(block)
+    return blocks
+
+
+def test_recent_data_window_and_signal_ranges(db):
+    """Test old blocks are evicted and signal ranges cover the kept window."""
+    recent = RecentDataListener(window_sec=20, decoder=CompiledDecoder(db))
+    for block in _pack_blocks(db, 60):
+        recent.on_block(block)
+
+    stats = recent.get_stats()
+    assert stats["newest"] - stats["oldest"] <= 22.5
+    voltage = recent.signals()["BMS_PackStatus.Pack_Voltage"]
+    assert voltage["value"] == 699
+    assert voltage["samples"] == 600
+    # Ranges use 10 s buckets: the window from 39.95 s reaches back to 30 s
+    assert voltage["min"] == 400
+    assert voltage["max"] == 699
+
+    history = recent.signal_history("BMS_PackStatus.Pack_Voltage", seconds=1)
+    assert [v for _, v in history] == [690 + i for i in range(10)]
+    assert recent.signal_history("BMS_PackStatus.Nope") is None
+
+
+def test_recent_frames_query_and_frame_cap(db):
+    """Test frame queries filter by ID and limit, and the frame cap holds."""
+    recent = RecentDataListener(window_sec=300, max_frames=200)
+    for block in _pack_blocks(db, 60):
+        recent.on_block(block)
+
+    assert recent.get_stats()["frames"] <= 200
+    frames = recent.frames(seconds=2, arb_id=0x7FF, limit=5)
+    assert len(frames) == 5
+    assert all(f["arb_id"] == 0x7FF and f["data"] == "0102" for f in frames)
+    assert frames == sorted(frames, key=lambda f: f["timestamp"])
+    assert frames[-1]["timestamp"] == pytest.approx(BASE + 59.95)
+    assert recent.signals() == {}
+
+
+def test_server_endpoints(db):
+    """Test the JSON endpoints over a real socket."""
+    recent = RecentDataListener(decoder=CompiledDecoder(db))
+    for block in _pack_blocks(db, 5):
+        recent.on_block(block)
+    triggered = []
+    server = DiagnosticsServer(
+        0,
+        recent,
+        uptime_status(BASE, {"buffer": recent.get_stats, "broken": lambda: 1 / 0}),
+        trigger=lambda name: triggered.append(name) or True,
+        host="127.0.0.1",
+    )
+    server.start()
+    url = f"http://127.0.0.1:{server.port}"
+
+    def get(path):
+        with urllib.request.urlopen(url + path, timeout=5) as resp:
+            return json.loads(resp.read())
+
+    try:
+        status = get("/api/status")
+        assert status["buffer"]["frames"] == 100
+        assert "division by zero" in status["broken"]["error"]
+        assert get("/api/frames?arb_id=0x7FF&limit=3")[0]["arb_id"] == 0x7FF
+        assert get("/api/signals")["BMS_PackStatus.Pack_Voltage"]["max"] == 149
+        samples = get("/api/signals/BMS_PackStatus.Pack_Voltage?seconds=0.5")["samples"]
+        assert [v for _, v in samples] == [145, 146, 147, 148, 149]
+
+        request = urllib.request.Request(url + "/api/trigger?name=tech", method="POST")
+        with urllib.request.urlopen(request, timeout=5) as resp:
+            assert resp.status == 202
+        assert triggered == ["tech"]
+
+        for path, code in [("/api/signals/Nope.Nope", 404), ("/api/frames?limit=x", 400)]:
+            with pytest.raises(urllib.error.HTTPError) as exc:
+                get(path)
+            assert exc.value.code == code
+    finally:
+        server.stop()
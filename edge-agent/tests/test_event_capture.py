@@ -0,0 +1,134 @@
+"""Tests for event-triggered capture."""
+
+from pathlib import Path
+
+import pytest
+
+from conftest import BASE, make_block
+from src.event_capture import EventCapture, resolve_trigger_rules
+
+SAMPLE_DBC = Path(__file__).resolve().parents[2] / "sample-data" / "dbc" / "ev_powertrain.dbc"
+
+
+def _feed(capture, seconds, extra=(), per_block=10):
+    """Feed 100 Hz frames of 0x100 (plus ``extra`` rows) in 0.1 s blocks."""
+    rows = sorted([(i / 100, 0x100, b"\x00") for i in range(int(seconds * 100))] + list(extra))
+    events = []
+    for start in range(0, len(rows), per_block):
+        event = capture.add_block(make_block(rows[start:start + per_block]))
+        if event is not None:
+            events.append(event)
+    return events
+
+
+def _frames_in_window(event):
+    return sum(
+        1
+        for b in event.blocks
+        for t in b.timestamps_ns[:b.count]
+        if event.start_ns <= t <= event.end_ns
+    )
+
+
+def test_frame_trigger_captures_pre_and_post_window():
+    """Test a matching frame yields pre_sec before and post_sec after it."""
+    capture = EventCapture({
+        "pre_sec": 1, "post_sec": 0.5,
+        "rules": [{"name": "dm1", "arb_id": 0x18FECA00, "mask": 0x00FFFF00}],
+    })
+    events = _feed(capture, 5, extra=[(2.005, 0x18FECA17, b"\x01")])
+
+    assert len(events) == 1
+    event = events[0]
+    assert event.name == "dm1"
+    assert event.trigger_ns == int((BASE + 2.005) * 1e9)
+    assert event.end_ns - event.start_ns == int(1.5e9)
+    # 150 frames of 0x100 in the 1.5 s window, plus the trigger frame
+    assert _frames_in_window(event) == 151
+    assert capture.get_stats()["events"] == 1
+    # The ring only holds the pre-trigger window
+    assert capture.get_stats()["ring_frames"] <= 110
+
+
+def test_threshold_fires_on_edge_and_absorbs_during_event():
+    """Test a threshold fires once per crossing; re-fires after re-arming."""
+    capture = EventCapture({
+        "pre_sec": 0.1, "post_sec": 0.7,
+        "rules": [{
+            "name": "hot", "type": "threshold", "arb_id": 0x200,
+            "start_bit": 0, "length": 8, "scale": 0.5, "offset": -20, "above": 60,
+        }],
+    })
+    # 0xC8 -> 80 (above), 0x64 -> 30 (inside)
+    values = [0x64, 0xC8, 0xC8, 0x64, 0xC8, 0x64, 0x64, 0xC8]
+    extra = [(0.5 + 0.2 * i, 0x200, bytes([v])) for i, v in enumerate(values)]
+    events = _feed(capture, 3, extra=extra)
+
+    assert [round(e.trigger_ns / 1e9 - BASE, 1) for e in events] == [0.7, 1.9]
+    # The crossing at 1.3 s fell inside the first event's window
+    assert events[0].triggers == 2
+    stats = capture.get_stats()
+    assert stats["fired"] == 2 and stats["absorbed"] == 1
+
+
+def test_holdoff_suppresses_repeated_fault_frames():
+    """Test a periodic fault frame produces one event per hold-off period."""
+    capture = EventCapture({
+        "pre_sec": 0, "post_sec": 0.2, "holdoff_sec": 1,
+        "rules": [{"name": "dtc", "arb_id": 0x7E8}],
+    })
+    extra = [(0.5 * i + 0.001, 0x7E8, b"\x01") for i in range(6)]
+    events = _feed(capture, 3, extra=extra)
+
+    assert [round(e.trigger_ns / 1e9 - BASE, 1) for e in events] == [0.0, 1.5]
+    assert capture.get_stats()["held_off"] == 4
+
+
+def test_manual_trigger_and_finish():
+    """Test trigger() opens an event at the next block; finish() returns it early."""
+    capture = EventCapture({"pre_sec": 0.5, "post_sec": 10})
+    _feed(capture, 1)
+    capture.trigger("button")
+    assert capture.get_stats()["open"] is False
+
+    capture.add_block(make_block([(1.0, 0x100, b"\x00")]))
+    assert capture.get_stats()["open"] is True
+    event = capture.finish()
+    assert event.name == "button"
+    assert _frames_in_window(event) == 51
+    assert capture.finish() is None
+
+
+def test_poll_closes_event_on_idle_bus():
+    """Test poll() completes an event whose window passed without frames."""
+    capture = EventCapture({"pre_sec": 0.5, "post_sec": 1, "rules": [{"arb_id": 0x7E8}]})
+    _feed(capture, 1, extra=[(0.995, 0x7E8, b"\x01")])
+    assert capture.poll(BASE + 1.5) is None
+    event = capture.poll(BASE + 2.5)
+    assert event.name == "0x7E8"
+
+
+def test_trigger_rules_resolve_and_validate():
+    """Test DBC names resolve to scaled signal layouts and bad rules are rejected."""
+    rules = resolve_trigger_rules(
+        [{"name": "ov", "type": "threshold", "message": "BMS_PackStatus",
+          "signal": "Pack_Voltage", "above": 410}],
+        str(SAMPLE_DBC),
+    )
+    assert rules[0]["arb_id"] == 0x1A1
+    assert "scale" in rules[0] and "offset" in rules[0]
+    EventCapture({"rules": rules})
+
+    for bad in [
+        {"arb_id": 1, "type": "pattern"},
+        {"type": "frame"},
+        {"arb_id": 1, "type": "threshold", "start_bit": 0, "length": 8},
+        {"arb_id": 1, "type": "threshold", "above": 1},
+        {"arb_id": 1, "name": "manual"},
+    ]:
+        with pytest.raises(ValueError):
+            EventCapture({"rules": [bad]})
+    with pytest.raises(ValueError):
+        EventCapture({"rules": [{"arb_id": 1, "name": "a"}, {"arb_id": 2, "name": "a"}]})
+    with pytest.raises(ValueError):
+        EventCapture({"pre_sec": -1})
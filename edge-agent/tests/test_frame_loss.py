@@ -0,0 +1,70 @@
+"""Tests for frame-loss detection."""
+
+import pytest
+
+from src.frame_loss import (
+    InterfaceDropMonitor,
+    SequenceChecker,
+    read_interface_counters,
+    sequence_checker_from_config,
+)
+
+
+def _frame(counter, byte=7):
+    data = bytearray(8)
+    data[byte] = counter
+    return bytes(data)
+
+
+def test_sequence_checker_counts_gaps_and_lost_frames():
+    """Test counter jumps are reported as lost frames."""
+    checker = SequenceChecker([{"arb_id": 0x1A0, "byte": 7, "mask": 0x0F}])
+    for counter in [0, 1, 2, 5, 6, 6, 7]:
+        checker.check(0x1A0, _frame(counter))
+
+    assert checker.get_stats() == {"seq_gaps": 1, "seq_lost": 2, "seq_repeats": 1}
+
+
+def test_sequence_checker_wraps_with_mask():
+    """Test the counter modulus follows the mask, including shifted masks."""
+    checker = SequenceChecker([{"arb_id": 0x100, "byte": 0, "mask": 0xF0}])
+    for counter in [14, 15, 0, 1]:
+        checker.check(0x100, _frame(counter << 4 | 0x3, byte=0))
+    assert checker.get_stats()["seq_gaps"] == 0
+
+    checker.check(0x100, _frame(3 << 4, byte=0))
+    assert checker.get_stats()["seq_lost"] == 1
+
+
+def test_sequence_checker_reset_and_membership():
+    checker = SequenceChecker([{"arb_id": 0x100, "byte": 0}])
+    assert 0x100 in checker
+    assert 0x200 not in checker
+
+    checker.check(0x100, _frame(10, byte=0))
+    checker.reset()
+    checker.check(0x100, _frame(200, byte=0))
+    assert checker.get_stats()["seq_gaps"] == 0
+
+
+def test_sequence_checker_rejects_bad_mask():
+    with pytest.raises(ValueError):
+        SequenceChecker([{"arb_id": 0x100, "byte": 0, "mask": 0x100}])
+
+
+def test_sequence_checker_from_config():
+    assert sequence_checker_from_config({}) is None
+    checker = sequence_checker_from_config({"sequence_checks": [{"arb_id": 1, "byte": 0}]})
+    assert 1 in checker
+
+
+def test_interface_counters_missing_interface():
+    """Test unknown interfaces report no counters and no drops."""
+    assert read_interface_counters("does-not-exist0") == {}
+    assert InterfaceDropMonitor("does-not-exist0").get_drops() == 0
+
+
+def test_interface_drop_monitor_is_relative_to_start():
+    """Test drops are reported relative to the baseline at construction."""
+    monitor = InterfaceDropMonitor("lo")
+    assert monitor.get_drops() == 0
@@ -0,0 +1,91 @@
+"""Tests for the frame statistics engine."""
+
+import pytest
+
+from src.frame_stats import FrameStats, format_id_summary
+
+
+def test_frames_per_sec_uses_bucket_window():
+    """Test frame rate is averaged over the bucket window."""
+    stats = FrameStats(window_sec=10)
+    for i in range(200):
+        stats.record(0x100, 1000.0 + i * 0.05)  # 20 fps for 10 s
+
+    assert stats.total == 200
+    assert stats.frames_per_sec(now=1009.9) == pytest.approx(20.0)
+    # Buckets older than the window no longer count
+    assert stats.frames_per_sec(now=1015.5) == pytest.approx(8.0)
+    assert stats.frames_per_sec(now=1100.0) == 0.0
+
+
+def test_per_id_rate_and_jitter():
+    """Test inter-arrival mean, stddev and max gap per arbitration ID."""
+    stats = FrameStats()
+    t = 0.0
+    for gap in [0.01, 0.01, 0.03, 0.01, 0.01]:
+        stats.record(0x200, t)
+        t += gap
+    stats.record(0x200, t)
+
+    s = stats.id_stats(now=t)[0x200]
+    assert s["count"] == 6
+    assert s["gap_mean_ms"] == pytest.approx(14.0)
+    assert s["max_gap_ms"] == pytest.approx(30.0)
+    assert s["gap_stddev_ms"] == pytest.approx(8.944, rel=1e-3)
+    # Recent rate: one late frame barely moves a 10 s average
+    assert s["rate_hz"] == pytest.approx(100.0, rel=1e-2)
+
+
+def test_rate_follows_changed_and_stopped_period():
+    """Test the per-ID rate tracks the recent period, not the lifetime average."""
+    stats = FrameStats(window_sec=10)
+    t = 0.0
+    for _ in range(2000):  # 100 Hz for 20 s
+        stats.record(0x100, t)
+        t += 0.01
+    for _ in range(300):  # then 10 Hz for 30 s
+        stats.record(0x100, t)
+        t += 0.1
+    last = t - 0.1
+
+    assert stats.id_stats(now=last)[0x100]["rate_hz"] == pytest.approx(10.0, rel=0.05)
+    # Silent for 5 s: the rate decays instead of holding the last period
+    assert stats.id_stats(now=last + 5.0)[0x100]["rate_hz"] == pytest.approx(0.2)
+
+
+def test_top_ids_sorted_by_rate():
+    """Test the noisiest IDs are reported first."""
+    stats = FrameStats()
+    for i in range(100):
+        stats.record(0x100, i * 0.01)  # 100 Hz
+        if i % 10 == 0:
+            stats.record(0x200, i * 0.01)  # 10 Hz
+
+    top = stats.top_ids(1, now=0.99)
+    assert [s["arb_id"] for s in top] == [0x100]
+    assert [s["arb_id"] for s in stats.top_ids(5, now=0.99)] == [0x100, 0x200]
+
+
+def test_missing_ids_after_silence():
+    """Test a periodic ID is flagged once it stops for many periods."""
+    stats = FrameStats(missing_gap_factor=10)
+    for i in range(50):
+        stats.record(0x300, i * 0.5)  # 2 Hz until t=24.5
+    for i in range(50):
+        stats.record(0x100, 24.0 + i * 0.01)  # 100 Hz until t=24.49
+    stats.record(0x400, 0.0)  # single frame: never considered periodic
+
+    assert stats.missing_ids(now=24.6) == []
+    assert stats.missing_ids(now=29.0) == [0x100]
+    assert stats.missing_ids(now=40.0) == [0x100, 0x300]
+
+
+def test_format_id_summary():
+    """Test HEALTH line formatting of top and missing IDs."""
+    stats = FrameStats()
+    for i in range(11):
+        stats.record(0x1A0, i * 0.1)
+
+    parts = format_id_summary(stats.top_ids(1, now=1.0), [0x2B0])
+    assert parts == ["top=0x1A0:10.0Hz±0.0ms", "missing=0x2B0"]
+    assert format_id_summary([], []) == []
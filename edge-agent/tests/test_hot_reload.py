@@ -0,0 +1,86 @@
+"""Tests for applying config changes to a running agent."""
+
+import yaml
+
+from src.batcher import CANFrameBatcher
+from src.can_reader import CANFrame
+from src.hot_reload import ConfigReloader, restart_required
+
+
+class _FilterReader:
+    def __init__(self):
+        self.filters = []
+
+    def set_filters(self, filters):
+        self.filters.append(filters)
+
+
+def _frame(ts):
+    return CANFrame(ts, 0x100, 8, bytes(8))
+
+
+def test_batcher_limits_change_at_the_next_window(tmp_path):
+    """Test the open batch keeps its window; the following one uses the new length."""
+    batcher = CANFrameBatcher("VEH", window_sec=10, output_dir=str(tmp_path))
+    t0 = 1_700_000_000.0
+    assert batcher.add_frame(_frame(t0)) is None
+    batcher.reconfigure(window_sec=2, max_frames=50)
+    assert batcher.add_frame(_frame(t0 + 5)) is None  # old 10 s window still open
+    assert batcher.add_frame(_frame(t0 + 10)) is not None
+    assert (batcher.window_sec, batcher.max_frames) == (10, 100000)
+
+    assert batcher.add_frame(_frame(t0 + 11)) is None
+    assert (batcher.window_sec, batcher.max_frames) == (2, 50)
+    assert batcher.add_frame(_frame(t0 + 13)) is not None
+
+
+def test_reloader_applies_live_keys_and_reports_the_rest(tmp_path):
+    """Test filters, batch limits and the uploader change live; a bad file is ignored."""
+    path = tmp_path / "config.yaml"
+    config = {
+        "can": {"channel": "can0", "filters": [{"can_id": 0x100, "can_mask": 0x7FF}]},
+        "batch": {"interval_sec": 60, "max_frames": 100000},
+        "s3": {"bucket": "a", "region": "us-east-1", "prefix": "raw"},
+        "upload": {"enabled": True, "max_retries": 5},
+        "storage": {"data_dir": "./data"},
+    }
+    path.write_text(yaml.safe_dump(config))
+
+    def load(p):
+        with open(p) as f:
+            return yaml.safe_load(f)
+
+    reader = _FilterReader()
+    batcher = CANFrameBatcher("VEH", window_sec=60, output_dir=str(tmp_path / "data"))
+    swapped = []
+    reloader = ConfigReloader(
+        str(path),
+        load(path),
+        load,
+        reader,
+        batcher,
+        create_uploader=lambda cfg: ("uploader", cfg["s3"]["bucket"], cfg["upload"]["max_retries"]),
+        swap_uploader=swapped.append,
+        watch=True,
+    )
+
+    new = load(path)
+    new["can"]["filters"] = []
+    new["can"]["channel"] = "can1"
+    new["batch"]["interval_sec"] = 30
+    new["s3"]["bucket"] = "b"
+    new["upload"]["max_retries"] = 2
+    path.write_text(yaml.safe_dump(new))
+    reloader._mtime = 0  # coarse file system timestamps
+    reloader.poll()
+
+    assert reader.filters == [[]]
+    assert batcher._next_limits == (30, 100000)
+    assert swapped == [("uploader", "b", 2)]
+    assert reloader.config["can"] == {"channel": "can0", "filters": []}
+    assert restart_required(reloader.config, new) == ["can.channel"]
+
+    path.write_text("batch: [unclosed")
+    reloader.request()
+    reloader.poll()
+    assert reloader.reloads == 1 and reloader.config["batch"]["interval_sec"] == 30
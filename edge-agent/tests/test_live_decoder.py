@@ -0,0 +1,130 @@
+"""Tests for --decode-live decoding and output."""
+
+import io
+from pathlib import Path
+
+import cantools
+import pytest
+
+from src.can_reader import CANFrameBlock
+from src.live_decoder import (
+    CompiledDecoder,
+    DashboardOutput,
+    LiveDecoderListener,
+    ScrollingOutput,
+    decode_block,
+)
+
+DBC_PATH = Path(__file__).parents[2] / "sample-data" / "dbc" / "ev_powertrain.dbc"
+
+
+@pytest.fixture
+def db():
+    return cantools.database.load_file(str(DBC_PATH))
+
+
+def _block(db, rows):
+    """Build a block from (timestamp, message name, signal values) tuples."""
+    block = CANFrameBlock(len(rows) + 1)
+    for ts, name, values in rows:
+        message = db.get_message_by_name(name)
+        data = message.encode(values)
+        block.append(ts, message.frame_id, len(data), data)
+    return block
+
+
+def test_compiled_decoder(db):
+    """Test decoding through the compiled table and unknown-ID caching."""
+    decoder = CompiledDecoder(db)
+    message = db.get_message_by_name("MotorCtrl_Status")
+    data = message.encode({"Motor_RPM": 3000, "Motor_Torque": 120.5, "Motor_Power": 40})
+
+    signals = decoder.decode(message.frame_id, data)
+    assert ("MotorCtrl_Status.Motor_RPM", 3000, "rpm") in signals
+    assert len(signals) == 3
+
+    assert decoder.decode(0x7FF, b"") is None
+    assert decoder.decode(0x7FF, b"") is None
+    assert decoder.unknown_ids == {0x7FF}
+
+    assert decoder.decode(message.frame_id, b"\x00") is None
+    assert decoder.decode_errors == 1
+
+
+def test_scrolling_output_is_buffered_and_throttled(db):
+    """Test per-signal throttling and a single write per flush."""
+    stream = io.StringIO()
+    output = ScrollingOutput(stream, min_interval_sec=0.1, flush_interval_sec=3600)
+    rows = [
+        (
+            100.0 + i * 0.01,
+            "MotorCtrl_Status",
+            {"Motor_RPM": i, "Motor_Torque": 0, "Motor_Power": 0},
+        )
+        for i in range(25)
+    ]
+    decoder = CompiledDecoder(db)
+    block = _block(db, rows)
+    block.capacity = block.count  # full block: reader is busy, keep buffering
+
+    decode_block(decoder, block, output)
+    assert stream.getvalue() == ""
+
+    output.flush()
+    lines = stream.getvalue().splitlines()
+    # 0.00, 0.10, 0.20 per signal (allowing float rounding at the boundary)
+    assert 3 * 3 <= len(lines) <= 3 * 4
+    assert lines[0] == "[100.000] MotorCtrl_Status.Motor_RPM = 0 rpm"
+    assert output.throttled == 25 * 3 - len(lines)
+
+
+def test_decode_block_flushes_when_idle(db):
+    """Test a partial block flushes the scrolling buffer immediately."""
+    stream = io.StringIO()
+    output = ScrollingOutput(stream, flush_interval_sec=3600)
+    block = CANFrameBlock(4)
+    message = db.get_message_by_name("BMS_PackStatus")
+    data = message.encode({"Pack_Voltage": 400, "Pack_Current": 10, "Pack_SOC": 80})
+    block.append(1.0, message.frame_id, len(data), data)
+
+    decode_block(CompiledDecoder(db), block, output)
+    assert "BMS_PackStatus.Pack_SOC = 80" in stream.getvalue()
+
+
+def test_dashboard_keeps_latest_value(db):
+    """Test the dashboard shows the last value and sample count per signal."""
+    stream = io.StringIO()
+    output = DashboardOutput(stream, refresh_sec=3600)
+    decoder = CompiledDecoder(db)
+    message = db.get_message_by_name("CoolantLoop")
+    for i in range(3):
+        values = {"Coolant_Inlet": 20 + i, "Coolant_Outlet": 30, "Flow_Rate": 5, "Pump_Duty": 50}
+        output.add(float(i), decoder.decode(message.frame_id, message.encode(values)))
+
+    screen = output.render()
+    row = next(line for line in screen.splitlines() if "Coolant_Inlet" in line)
+    assert row.split()[1:] == ["22", "degC", "3", "2.000"]
+
+    output.flush()
+    assert stream.getvalue().startswith("\x1b[H\x1b[J")
+
+
+def test_live_decoder_listener_flushes_on_idle_and_stop(db):
+    """Test the listener decodes blocks and flushes when idle or stopped."""
+    stream = io.StringIO()
+    listener = LiveDecoderListener(
+        CompiledDecoder(db), ScrollingOutput(stream, flush_interval_sec=3600)
+    )
+    rows = [(100.0, "BMS_PackStatus", {"Pack_Voltage": 400, "Pack_Current": 0, "Pack_SOC": 80})]
+    block = _block(db, rows)
+    block.capacity = block.count
+
+    listener.on_block(block)
+    assert stream.getvalue() == ""
+    listener.on_idle()
+    assert len(stream.getvalue().splitlines()) == 3
+
+    listener.on_block(block)
+    listener.stop()
+    assert len(stream.getvalue().splitlines()) == 6
+    assert listener.frames == 2
@@ -0,0 +1,91 @@
+"""Tests for the agent's OpenMetrics exposition."""
+
+import urllib.request
+
+from conftest import BASE, ListReader, RecordingUploader
+from src.batcher import CANFrameBatcher
+from src.can_reader import CANFrame
+from src.diagnostics import DiagnosticsServer, RecentDataListener
+from src.offline_buffer import OfflineBuffer
+from src.openmetrics import AgentMetrics, MetricsRegistry, write_textfile
+from src.pipeline import CapturePipeline
+
+
+def test_registry_renders_both_formats(tmp_path):
+    """Test counters, gauges and cumulative histograms in OpenMetrics and 0.0.4 text."""
+    registry = MetricsRegistry()
+    frames = registry.counter("t_frames", "Frames.", ("stage",))
+    temp = registry.gauge("t_temperature_celsius", 'CPU "zone 0".')
+    latency = registry.histogram("t_write_seconds", "Writes.", (0.1, 1.0))
+    frames.inc(3, stage='a"b')
+    frames.inc(stage='a"b')
+    temp.set(51.5)
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.observe(value)
+
+    text = registry.render()
+    lines = text.splitlines()
+    assert "# TYPE t_frames counter" in lines
+    assert 't_frames_total{stage="a\\"b"} 4' in lines
+    assert "# UNIT t_temperature_celsius celsius" in lines
+    assert "t_temperature_celsius 51.5" in lines
+    assert 't_write_seconds_bucket{le="0.1"} 1' in lines
+    assert 't_write_seconds_bucket{le="1.0"} 3' in lines
+    assert 't_write_seconds_bucket{le="+Inf"} 4' in lines
+    assert "t_write_seconds_count 4" in lines
+    assert "t_write_seconds_sum 4.25" in lines
+    assert lines[-1] == "# EOF"
+
+    path = tmp_path / "agent.prom"
+    write_textfile(registry, str(path))
+    prom = path.read_text().splitlines()
+    assert "# TYPE t_frames_total counter" in prom
+    assert "# EOF" not in prom and not any(line.startswith("# UNIT") for line in prom)
+    assert [p.name for p in tmp_path.iterdir()] == ["agent.prom"]
+
+
+def test_pipeline_metrics_served_on_metrics_endpoint(tmp_path):
+    """Test pipeline writes, uploads and sampled counters reach /metrics."""
+    frames = [
+        CANFrame(BASE + i * 0.01, 0x100, 8, bytes([i % 256]) * 8) for i in range(300)
+    ]
+    batcher = CANFrameBatcher("VEH", window_sec=1, output_dir=str(tmp_path / "data"))
+    buffer = OfflineBuffer(pending_dir=str(tmp_path / "pending"))
+    reader = ListReader(frames, stats={"kernel_drops": 7})
+    uploader = RecordingUploader()
+    uploader.retries = 2
+    pipeline = CapturePipeline(reader, batcher, uploader, buffer, {"block_frames": 10})
+    metrics = AgentMetrics(pipeline, buffer, uploader, reader, cpu_temp=lambda: 48.0)
+    pipeline.metrics = metrics
+    pipeline.start()
+    assert pipeline.wait_for_capture(timeout=5)
+    pipeline.stop()
+
+    server = DiagnosticsServer(
+        0, RecentDataListener(), lambda: {}, host="127.0.0.1", metrics=metrics.registry
+    )
+    server.start()
+    try:
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.port}/metrics",
+            headers={"Accept": "application/openmetrics-text; version=1.0.0"},
+        )
+        with urllib.request.urlopen(request, timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("application/openmetrics-text")
+            lines = response.read().decode().splitlines()
+    finally:
+        server.stop()
+
+    batches = len(uploader.uploaded)
+    assert batches >= 3
+    assert "canagent_frames_received_total 300" in lines
+    assert 'canagent_frames_dropped_total{stage="kernel"} 7' in lines
+    assert 'canagent_frames_dropped_total{stage="frames"} 0' in lines
+    assert f'canagent_batch_frames_count{{kind="raw"}} {batches}' in lines
+    assert 'canagent_batch_frames_sum{kind="raw"} 300.0' in lines
+    assert f'canagent_uploads_total{{result="ok"}} {batches}' in lines
+    assert f'canagent_upload_seconds_count{{result="ok"}} {batches}' in lines
+    assert "canagent_upload_retries_total 2" in lines
+    assert 'canagent_queue_capacity{queue="upload"} 16' in lines
+    assert "canagent_pending_files 0" in lines
+    assert "canagent_cpu_temperature_celsius 48.0" in lines
@@ -0,0 +1,427 @@
+"""Tests for the staged capture pipeline."""
+
+import threading
+import time
+from pathlib import Path
+
+import pyarrow.parquet as pq
+import pytest
+
+from conftest import ListReader, RecordingUploader
+from src.batcher import CANFrameBatcher
+from src.can_reader import CANFrame
+from src.listeners import Listener, MetricsListener
+from src.offline_buffer import OfflineBuffer
+from src.pipeline import BoundedQueue, CapturePipeline
+from src.scheduler import ResourceBudget
+
+
+def _wait_for_capture(pipeline):
+    """Let the capture stage reach the end of the reader before stop()."""
+    assert pipeline.wait_for_capture(timeout=5)
+
+
+@pytest.fixture
+def frames():
+    base = 1_700_000_000.0
+    return [
+        CANFrame(timestamp=base + i * 0.01, arb_id=0x100, dlc=8, data=bytes([i % 256]) * 8)
+        for i in range(300)
+    ]
+
+
+def test_bounded_queue_drop_newest():
+    """Test drop_newest rejects puts when full and counts them."""
+    dropped = []
+    q = BoundedQueue("t", capacity=2, on_drop=dropped.append)
+
+    assert q.put(1) and q.put(2)
+    assert not q.put(3)
+    assert dropped == [3]
+    assert q.get_stats()["dropped"] == 1
+    assert [q.get(0), q.get(0), q.get(0)] == [1, 2, None]
+
+
+def test_bounded_queue_drop_oldest():
+    """Test drop_oldest evicts the head to make room."""
+    q = BoundedQueue("t", capacity=2, policy="drop_oldest", weight=lambda x: x)
+
+    for item in (1, 2, 3):
+        assert q.put(item)
+    assert q.drain() == [2, 3]
+    stats = q.get_stats()
+    assert stats["dropped"] == 1
+    assert stats["dropped_units"] == 1
+    assert stats["max_depth"] == 2
+
+
+def test_bounded_queue_block_times_out():
+    """Test block policy waits, then drops when no room frees up."""
+    q = BoundedQueue("t", capacity=1, policy="block", block_timeout_sec=0.05)
+    q.put("a")
+    start = time.monotonic()
+    assert not q.put("b")
+    assert time.monotonic() - start >= 0.05
+
+
+def test_bounded_queue_close_wakes_consumer():
+    """Test get() returns None once the queue is closed and empty."""
+    q = BoundedQueue("t", capacity=4)
+    q.put("x")
+    q.close()
+    assert q.get() == "x"
+    assert q.get() is None
+    assert not q.put("y")
+
+
+def test_bounded_queue_urgent_items_go_first():
+    """Test urgent items jump routine ones and evict the newest routine item."""
+    dropped = []
+    q = BoundedQueue("t", capacity=3, on_drop=dropped.append)
+    q.put("r1")
+    q.put("r2")
+    q.put("u1", urgent=True)
+    assert q.put("u2", urgent=True)
+    assert dropped == ["r2"]
+    assert [q.get(0), q.get(0), q.get(0)] == ["u1", "u2", "r1"]
+
+
+def test_bounded_queue_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        BoundedQueue("t", capacity=1, policy="spill")
+
+
+def test_pipeline_writes_and_uploads(tmp_path, frames):
+    """Test frames flow through writer and upload stages into files."""
+    batcher = CANFrameBatcher("VEH", window_sec=1, output_dir=str(tmp_path / "data"))
+    uploader = RecordingUploader()
+    buffer = OfflineBuffer(pending_dir=str(tmp_path / "pending"))
+
+    pipeline = CapturePipeline(
+        ListReader(frames), batcher, uploader, buffer, {"block_frames": 10}
+    )
+    pipeline.start()
+    _wait_for_capture(pipeline)
+    pipeline.stop()
+
+    stats = pipeline.get_stats()
+    assert stats["batches"] == len(uploader.uploaded) >= 3
+    assert stats["upload_ok"] == stats["batches"]
+    assert sum(pq.read_table(p).num_rows for p in uploader.uploaded) == 300
+    assert stats["frame_queue"]["dropped"] == 0
+
+
+def test_pipeline_budget_defers_uploads_at_most_max_defer(tmp_path, frames):
+    """Test routine uploads held back by the budget go ahead after upload_max_defer_sec."""
+    batcher = CANFrameBatcher("VEH", window_sec=1, output_dir=str(tmp_path / "data"))
+    uploader = RecordingUploader()
+    buffer = OfflineBuffer(pending_dir=str(tmp_path / "pending"))
+    pipeline = CapturePipeline(
+        ListReader(frames), batcher, uploader, buffer, {"block_frames": 10}
+    )
+    # Capture backlog reported as high for the whole run
+    pipeline.budget = ResourceBudget(capture_backlog=lambda: 0.9, stat_path="/nonexistent")
+    pipeline.budget.sample()
+    pipeline.upload_max_defer_sec = 0.2
+    pipeline.start()
+
+    deadline = time.monotonic() + 5
+    while not pipeline.upload_queue.closed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    while len(uploader.uploaded) < pipeline.batch_count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(uploader.uploaded) == pipeline.batch_count >= 2
+    pipeline.stop()
+
+
+def test_pipeline_capture_not_blocked_by_upload(tmp_path, frames):
+    """Test a stuck upload spills files to pending instead of stalling capture."""
+    batcher = CANFrameBatcher("VEH", window_sec=1, output_dir=str(tmp_path / "data"))
+    uploader = RecordingUploader(blocked=True)
+    buffer = OfflineBuffer(pending_dir=str(tmp_path / "pending"))
+
+    pipeline = CapturePipeline(
+        ListReader(frames),
+        batcher,
+        uploader,
+        buffer,
+        {"upload_queue_files": 1, "block_frames": 10, "shutdown_timeout_sec": 2},
+    )
+    pipeline.start()
+
+    # Capture and writing finish although the first upload is still blocked
+    deadline = time.monotonic() + 5
+    while not pipeline.upload_queue.closed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not pipeline.is_alive()
+    assert pipeline.upload_queue.closed
+
+    uploader.release.set()
+    pipeline.stop()
+
+    stats = pipeline.get_stats()
+    assert stats["upload_queue"]["dropped"] >= 1
+    pending = list(Path(tmp_path / "pending").glob("*.parquet"))
+    assert len(pending) == stats["upload_queue"]["dropped"]
+    assert len(uploader.uploaded) + len(pending) == stats["batches"]
+
+
+def test_pipeline_rejects_blocking_frame_queue(tmp_path):
+    batcher = CANFrameBatcher("VEH", output_dir=str(tmp_path))
+    buffer = OfflineBuffer(pending_dir=str(tmp_path / "pending"))
+    with pytest.raises(ValueError):
+        CapturePipeline(ListReader([]), batcher, None, buffer, {"frame_queue_policy": "block"})
+
+
+def test_pipeline_change_only(tmp_path):
+    """Test change-only mode writes one row per payload change."""
+    base = 1_700_000_000.0
+    frames = [
+        CANFrame(timestamp=base + i * 0.01, arb_id=0x100, dlc=1, data=bytes([i // 50]))
+        for i in range(300)
+    ]
+    batcher = CANFrameBatcher("VEH", window_sec=10, output_dir=str(tmp_path / "data"))
+    buffer = OfflineBuffer(pending_dir=str(tmp_path / "pending"))
+
+    pipeline = CapturePipeline(
+        ListReader(frames),
+        batcher,
+        None,
+        buffer,
+        {"block_frames": 32, "change_only": True, "keyframe_sec": 10},
+    )
+    pipeline.start()
+    _wait_for_capture(pipeline)
+    pipeline.stop()
+
+    tables = [pq.read_table(p) for p in (tmp_path / "data").rglob("*.parquet")]
+    assert sum(t.num_rows for t in tables) == 6
+    assert sum(sum(t.column("suppressed").to_pylist()) for t in tables) == 245
+    assert pipeline.get_stats()["change_only"]["suppressed"] == 294
+
+
+def test_pipeline_decimation(tmp_path):
+    """Test decimation thins a 1 kHz ID to 10 Hz before batching."""
+    base = 1_700_000_000.0
+    frames = [
+        CANFrame(timestamp=base + i * 0.001, arb_id=0x100 if i % 10 else 0x200, dlc=1, data=b"\x00")
+        for i in range(1000)
+    ]
+    batcher = CANFrameBatcher("VEH", window_sec=10, output_dir=str(tmp_path / "data"))
+    buffer = OfflineBuffer(pending_dir=str(tmp_path / "pending"))
+
+    pipeline = CapturePipeline(
+        ListReader(frames),
+        batcher,
+        None,
+        buffer,
+        {
+            "block_frames": 64,
+            "decimation": [{"arb_id": 0x100, "policy": "interval", "interval_ms": 100}],
+        },
+    )
+    pipeline.start()
+    _wait_for_capture(pipeline)
+    pipeline.stop()
+
+    tables = [pq.read_table(p) for p in (tmp_path / "data").rglob("*.parquet")]
+    ids = [i for t in tables for i in t.column("arb_id").to_pylist()]
+    assert ids.count(0x100) == 10
+    assert ids.count(0x200) == 100
+    assert pipeline.get_stats()["decimation"]["removed"]["interval"] == 890
+
+
+def test_pipeline_uploads_batch_closed_by_held_decimation_frames(tmp_path):
+    """Test a batch closed on shutdown by the released min_max frames is still uploaded."""
+    base = 1_700_000_000.0
+    frames = [
+        CANFrame(
+            timestamp=base + i * 0.001,
+            arb_id=0x100 if i % 2 else 0x200,
+            dlc=1,
+            data=bytes([i if i % 2 else 0]),
+        )
+        for i in range(198)
+    ]
+    # 99 kept 0x200 frames stay under max_frames until the 2 held frames arrive
+    batcher = CANFrameBatcher(
+        "VEH", window_sec=10, max_frames=100, output_dir=str(tmp_path / "data")
+    )
+    uploader = RecordingUploader()
+    buffer = OfflineBuffer(pending_dir=str(tmp_path / "pending"))
+    rule = {
+        "arb_id": 0x100, "policy": "min_max", "interval_ms": 10_000, "start_bit": 0, "length": 8
+    }
+
+    pipeline = CapturePipeline(
+        ListReader(frames), batcher, uploader, buffer, {"block_frames": 64, "decimation": [rule]}
+    )
+    pipeline.start()
+    _wait_for_capture(pipeline)
+    pipeline.stop()
+
+    assert pipeline.batch_count == 1
+    assert len(uploader.uploaded) == 1
+    assert pq.read_metadata(uploader.uploaded[0]).num_rows == 101
+
+
+class _PausingReader(ListReader):
+    """Reader that pauses halfway, as a replay does over a recording gap."""
+
+    def read_frames(self):
+        half = len(self.frames) // 2
+        yield from self.frames[:half]
+        time.sleep(1.5)
+        yield from self.frames[half:]
+
+
+def test_pipeline_idle_flush_follows_frame_clock(tmp_path, frames):
+    """Test an idle gap shorter than the window does not close a window of old frames."""
+    batcher = CANFrameBatcher("VEH", window_sec=10, output_dir=str(tmp_path / "data"))
+    buffer = OfflineBuffer(pending_dir=str(tmp_path / "pending"))
+
+    pipeline = CapturePipeline(_PausingReader(frames), batcher, None, buffer, {"block_frames": 50})
+    pipeline.start()
+    _wait_for_capture(pipeline)
+    pipeline.stop()
+
+    # Frame timestamps are years old; wall-clock time would have flushed at the gap
+    assert pipeline.batch_count == 1
+    assert pq.read_metadata(next((tmp_path / "data").rglob("*.parquet"))).num_rows == 300
+
+
+def test_pipeline_reports_stalls(tmp_path, frames):
+    """Test stall detection counts blocks delivered long after capture."""
+    batcher = CANFrameBatcher("VEH", window_sec=1, output_dir=str(tmp_path / "data"))
+    buffer = OfflineBuffer(pending_dir=str(tmp_path / "pending"))
+
+    pipeline = CapturePipeline(
+        ListReader(frames),
+        batcher,
+        None,
+        buffer,
+        {"block_frames": 100},
+        {"stall_threshold_ms": 20},
+    )
+    pipeline.start()
+    _wait_for_capture(pipeline)
+    pipeline.stop()
+
+    stalls = pipeline.get_stats()["stalls"]
+    assert stalls["stalls"] == 3
+    assert len(stalls["gc_collections"]) == 3
+
+
+class _RecordingListener(Listener):
+    """Listener collecting block sizes; optionally slow."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.counts = []
+        self.stopped = False
+
+    def on_block(self, block):
+        time.sleep(self.delay)
+        self.counts.append(block.count)
+
+    def stop(self):
+        self.stopped = True
+
+
+def test_pipeline_fans_out_to_listeners(tmp_path, frames):
+    """Test the writer and every listener see the same frames."""
+    batcher = CANFrameBatcher("VEH", window_sec=10, output_dir=str(tmp_path / "data"))
+    buffer = OfflineBuffer(pending_dir=str(tmp_path / "pending"))
+    pipeline = CapturePipeline(ListReader(frames), batcher, None, buffer, {"block_frames": 50})
+    listener = _RecordingListener()
+    metrics = MetricsListener()
+    pipeline.add_listener("recorder", listener)
+    pipeline.add_listener("metrics", metrics)
+
+    pipeline.start()
+    with pytest.raises(RuntimeError):
+        pipeline.add_listener("late", _RecordingListener())
+    _wait_for_capture(pipeline)
+    pipeline.stop()
+
+    assert sum(listener.counts) == 300
+    assert listener.stopped
+    stats = metrics.get_stats()
+    assert stats["frames"] == 300
+    assert stats["top_ids"][0]["rate_hz"] == pytest.approx(100.0, rel=0.01)
+    tables = [pq.read_table(p) for p in (tmp_path / "data").rglob("*.parquet")]
+    assert sum(t.num_rows for t in tables) == 300
+    assert pipeline.get_stats()["listeners"]["recorder"]["enqueued"] == 6
+
+
+def test_slow_listener_skips_blocks_without_stalling_capture(tmp_path, frames):
+    """Test a slow listener loses its own oldest blocks while the writer gets all."""
+    batcher = CANFrameBatcher("VEH", window_sec=10, output_dir=str(tmp_path / "data"))
+    buffer = OfflineBuffer(pending_dir=str(tmp_path / "pending"))
+    pipeline = CapturePipeline(ListReader(frames), batcher, None, buffer, {"block_frames": 10})
+    slow = _RecordingListener(delay=0.05)
+    pipeline.add_listener("slow", slow, capacity=2)
+
+    start = time.monotonic()
+    pipeline.start()
+    _wait_for_capture(pipeline)
+    capture_sec = time.monotonic() - start
+    pipeline.stop()
+
+    assert capture_sec < 0.5
+    stats = pipeline.get_stats()
+    assert stats["listeners"]["slow"]["dropped"] > 0
+    assert sum(slow.counts) + stats["listeners"]["slow"]["dropped_units"] == 300
+    assert stats["frame_queue"]["dropped"] == 0
+    tables = [pq.read_table(p) for p in (tmp_path / "data").rglob("*.parquet")]
+    assert sum(t.num_rows for t in tables) == 300
+
+
+def test_pipeline_without_batcher_only_feeds_listeners(frames):
+    """Test a listen-only pipeline runs no writer and writes nothing."""
+    # Writer-side filters are ignored, so unresolved rule names do no harm
+    config = {"block_frames": 100, "decimation": [{"message": "Status", "policy": "interval"}]}
+    pipeline = CapturePipeline(ListReader(frames), None, None, None, config)
+    listener = _RecordingListener()
+    pipeline.add_listener("recorder", listener)
+    with pytest.raises(ValueError):
+        pipeline.add_listener("blocking", _RecordingListener(), policy="block")
+
+    pipeline.start()
+    _wait_for_capture(pipeline)
+    pipeline.stop()
+
+    assert [t.name for t in pipeline._threads] == ["pipeline-capture", "pipeline-recorder"]
+    assert listener.counts == [100, 100, 100]
+    assert pipeline.get_stats()["frame_queue"]["enqueued"] == 0
+
+
+def test_pipeline_writes_triggered_event_ahead_of_batches(tmp_path, frames):
+    """Test a trigger writes a tagged full-rate file that is uploaded first."""
+    frames = list(frames)
+    frames[150] = CANFrame(timestamp=frames[150].timestamp, arb_id=0x7E0, dlc=1, data=b"\x01")
+    batcher = CANFrameBatcher("VEH", window_sec=10, output_dir=str(tmp_path / "data"))
+    uploader = RecordingUploader()
+    buffer = OfflineBuffer(pending_dir=str(tmp_path / "pending"))
+    config = {
+        "block_frames": 10,
+        "decimation": [{"arb_id": 0x100, "policy": "every_nth", "n": 10}],
+        "trigger": {"pre_sec": 0.5, "post_sec": 0.2, "rules": [{"name": "dtc", "arb_id": 0x7E0}]},
+    }
+
+    pipeline = CapturePipeline(ListReader(frames), batcher, uploader, buffer, config)
+    pipeline.start()
+    _wait_for_capture(pipeline)
+    pipeline.stop()
+
+    assert uploader.uploaded[0].name.endswith("Z_event-dtc.parquet")
+    # Kept apart from the routine batches
+    assert uploader.uploaded[0].relative_to(tmp_path / "data").parts[0] == "events"
+    event = pq.read_table(uploader.uploaded[0])
+    # Full rate around the trigger at frame 150: 50 frames before, 20 after
+    assert event.num_rows == 71
+    assert event.schema.metadata[b"event_trigger"] == b"dtc"
+    # The routine batch is still decimated: every 10th 0x100 frame plus the DTC
+    assert pq.read_table(uploader.uploaded[1]).num_rows == 31
+    stats = pipeline.get_stats()["events"]
+    assert stats["written"] == 1 and stats["fired"] == 1
@@ -0,0 +1,64 @@
+"""Tests for --profile stage timings and stack sampling."""
+
+import json
+import threading
+import time
+
+from src.profiling import Profiler, StageTimers, StackSampler, timed
+
+
+def test_stage_timers_split_wall_and_cpu():
+    """Test waiting accrues wall time only and iterate() times each next()."""
+    timers = StageTimers()
+    with timers.stage("sleep"):
+        time.sleep(0.05)
+    with timed(timers, "spin"):
+        end = time.thread_time() + 0.02
+        while time.thread_time() < end:
+            pass
+    with timed(None, "ignored"):
+        pass
+
+    def produce():
+        for i in range(3):
+            time.sleep(0.01)
+            yield i
+
+    assert list(timers.iterate("recv", produce())) == [0, 1, 2]
+
+    stats = timers.snapshot()
+    assert set(stats) == {"sleep", "spin", "recv"}
+    assert stats["sleep"]["wall_sec"] >= 0.045 and stats["sleep"]["cpu_sec"] < 0.02
+    assert stats["spin"]["cpu_sec"] >= 0.015
+    assert stats["recv"]["calls"] == 3 and stats["recv"]["wall_sec"] >= 0.025
+
+
+def test_sampler_writes_collapsed_stacks_and_summary(tmp_path):
+    """Test stacks of other threads are counted and the summary JSON is written."""
+    stop = threading.Event()
+
+    def wait_here():
+        stop.wait(5)
+
+    worker = threading.Thread(target=wait_here, name="worker")
+    worker.start()
+    sampler = StackSampler(tmp_path / "stacks.collapsed", duration_sec=0.2, interval_ms=5)
+    sampler.start()
+    sampler._thread.join(timeout=5)
+    stop.set()
+    worker.join()
+
+    lines = (tmp_path / "stacks.collapsed").read_text().splitlines()
+    assert sampler.samples > 5
+    worker_lines = [line for line in lines if line.startswith("worker;")]
+    assert worker_lines and all("wait_here" in line for line in worker_lines)
+    stack, count = worker_lines[0].rsplit(" ", 1)
+    assert int(count) > 0 and ";threading:Event.wait" in stack
+
+    profiler = Profiler(str(tmp_path / "profile"))
+    profiler.start()
+    with profiler.timers.stage("writer.parquet"):
+        pass
+    profiler.stop()
+    summary = json.loads((tmp_path / "profile" / "profile-summary.json").read_text())
+    assert summary["stages"]["writer.parquet"]["calls"] == 1
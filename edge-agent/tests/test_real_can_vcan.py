@@ -260,6 +260,36 @@ class TestRealCANReaderWithVCAN:
         assert "frames_per_sec" in stats
         assert stats["errors"] == 0
 
+    def test_read_batches_returns_columnar_blocks(self):
+        """read_batches() drains frames into blocks without CANFrame objects."""
+        FRAME_COUNT = 10
+        reader = RealCANReader(_make_config())
+        blocks = []
+
+        def read_worker():
+            with reader:
+                total = 0
+                for block in reader.read_batches(max_frames=4, max_latency_ms=20):
+                    blocks.append(block)
+                    total += block.count
+                    if total >= FRAME_COUNT:
+                        reader.stop()
+
+        thread = threading.Thread(target=read_worker, daemon=True)
+        thread.start()
+        time.sleep(0.2)
+
+        frames = [(0x300 + i, bytes([i] * 8)) for i in range(FRAME_COUNT)]
+        _send_frames(VCAN_IFACE, frames, delay=0.005)
+        thread.join(timeout=5.0)
+        reader.stop()
+
+        assert sum(b.count for b in blocks) >= FRAME_COUNT
+        assert all(0 < b.count <= 4 for b in blocks)
+        received = [f for b in blocks for f in b.frames()]
+        assert received[0].arb_id == 0x300
+        assert received[0].data == bytes([0] * 8)
+
     def test_stop_breaks_read_loop(self):
         """Calling stop() terminates the read_frames generator promptly."""
         reader = RealCANReader(_make_config())
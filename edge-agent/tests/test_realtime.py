@@ -0,0 +1,82 @@
+"""Tests for capture-thread real-time tuning and stall detection."""
+
+import gc
+import os
+import threading
+import time
+
+import pytest
+
+from src.can_reader import CANFrameBlock
+from src.realtime import (
+    GCPauseMonitor,
+    StallDetector,
+    apply_capture_thread_settings,
+    apply_process_settings,
+)
+
+
+def _block_at(timestamp):
+    block = CANFrameBlock(1)
+    block.append(timestamp, 0x100, 1, b"\x00")
+    return block
+
+
+def test_stall_detector():
+    """Test blocks older than latency + threshold are counted as stalls."""
+    detector = StallDetector(threshold_ms=20, block_latency_ms=50)
+
+    assert detector.check(_block_at(time.time() - 0.03)) is None
+    stall = detector.check(_block_at(time.time() - 0.2))
+    assert stall == pytest.approx(150, abs=20)
+    assert detector.get_stats()["stalls"] == 1
+    assert detector.get_stats()["max_stall_ms"] == pytest.approx(150, abs=20)
+
+
+def test_gc_pause_monitor_times_collections():
+    """Test collections are counted per generation while installed."""
+    monitor = GCPauseMonitor(threshold_ms=1000)
+    monitor.install()
+    try:
+        gc.collect(2)
+    finally:
+        monitor.uninstall()
+    gc.collect(2)
+
+    stats = monitor.get_stats()
+    assert stats["gc_collections"][2] == 1
+    assert stats["gc_long_pauses"] == 0
+    assert stats["gc_max_pause_ms"] >= 0
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="Linux only")
+def test_capture_thread_affinity_is_per_thread():
+    """Test pinning applies to the calling thread only."""
+    before = os.sched_getaffinity(0)
+    cpu = min(before)
+    seen = {}
+
+    def worker():
+        apply_capture_thread_settings({"capture_cpus": [cpu]})
+        seen["affinity"] = os.sched_getaffinity(0)
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+
+    assert seen["affinity"] == {cpu}
+    assert os.sched_getaffinity(0) == before
+
+
+def test_invalid_cpu_is_logged_not_raised():
+    """Test an unusable CPU list only produces a warning."""
+    apply_capture_thread_settings({"capture_cpus": [4096]})
+
+
+def test_gc_thresholds():
+    before = gc.get_threshold()
+    try:
+        apply_process_settings({"gc_thresholds": [5000, 20, 500]})
+        assert gc.get_threshold() == (5000, 20, 500)
+    finally:
+        gc.set_threshold(*before)
@@ -0,0 +1,125 @@
+"""Tests for replay of recorded raw Parquet files."""
+
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from src.batcher import CANFrameBatcher
+from src.can_reader import CANFrame
+from src.replay import ReplayCANReader, find_replay_files
+
+
+@pytest.fixture
+def temp_output_dir():
+    """Create temporary output directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield tmpdir
+
+
+@pytest.fixture
+def recorded_frames():
+    """Two seconds of frames at 100 Hz with variable payload lengths."""
+    base_time = float(int(time.time()) - 3600)
+    return [
+        CANFrame(
+            timestamp=base_time + i * 0.01,
+            arb_id=0x100 + (i % 3),
+            dlc=i % 9,
+            data=bytes([i % 256] * (i % 9)),
+            channel="can0" if i % 2 else "can1",
+        )
+        for i in range(200)
+    ]
+
+
+def _record(frames, output_dir):
+    """Write frames to raw Parquet files in one-second batches."""
+    batcher = CANFrameBatcher(vehicle_id="TEST", window_sec=1, output_dir=output_dir)
+    return list(batcher.process_frames(iter(frames)))
+
+
+def _replay(reader, max_frames=64):
+    with reader:
+        return [
+            frame
+            for block in reader.read_batches(max_frames=max_frames, max_latency_ms=50)
+            for frame in block.frames()
+        ]
+
+
+def test_replay_reproduces_recorded_frames(recorded_frames, temp_output_dir):
+    """Test an unthrottled replay yields exactly the recorded frames."""
+    paths = _record(recorded_frames, temp_output_dir)
+    assert len(paths) > 1
+
+    reader = ReplayCANReader(temp_output_dir, speed=0)
+    replayed = _replay(reader)
+
+    assert len(replayed) == len(recorded_frames)
+    for original, frame in zip(recorded_frames, replayed):
+        assert frame.arb_id == original.arb_id
+        assert frame.dlc == original.dlc
+        assert frame.data == original.data
+        assert frame.channel == original.channel
+        assert frame.timestamp == pytest.approx(original.timestamp, abs=1e-6)
+    assert reader.get_stats() == {"frames": 200, "files": len(paths)}
+
+
+def test_replay_rebase_shifts_to_now(recorded_frames, temp_output_dir):
+    """Test rebasing moves the first frame to the replay start and keeps gaps."""
+    _record(recorded_frames, temp_output_dir)
+
+    before = time.time()
+    replayed = _replay(ReplayCANReader(temp_output_dir, speed=0, rebase=True))
+
+    assert replayed[0].timestamp == pytest.approx(before, abs=1.0)
+    gap = replayed[10].timestamp - replayed[0].timestamp
+    assert gap == pytest.approx(0.1, abs=1e-6)
+
+
+def test_replay_speed_factor_paces_output(recorded_frames, temp_output_dir):
+    """Test a 10x replay of two recorded seconds takes about 0.2 s."""
+    _record(recorded_frames, temp_output_dir)
+
+    reader = ReplayCANReader(temp_output_dir, speed=10)
+    start = time.monotonic()
+    replayed = _replay(reader, max_frames=1024)
+    elapsed = time.monotonic() - start
+
+    assert len(replayed) == len(recorded_frames)
+    assert 0.15 <= elapsed <= 0.6
+    assert [f.data for f in replayed] == [f.data for f in recorded_frames]
+
+
+def test_replay_stop_ends_stream(recorded_frames, temp_output_dir):
+    """Test stop() ends the replay early."""
+    _record(recorded_frames, temp_output_dir)
+
+    reader = ReplayCANReader(temp_output_dir, speed=0)
+    received = 0
+    with reader:
+        for block in reader.read_batches(max_frames=10):
+            received += block.count
+            reader.stop()
+    assert received == 10
+
+
+def test_find_replay_files(temp_output_dir):
+    """Test replay sources resolve to sorted Parquet files."""
+    with pytest.raises(FileNotFoundError):
+        find_replay_files(temp_output_dir)
+    with pytest.raises(FileNotFoundError):
+        find_replay_files(Path(temp_output_dir) / "missing.parquet")
+
+    base = Path(temp_output_dir)
+    (base / "b").mkdir()
+    (base / "a").mkdir()
+    event = "a/20240101T000000Z_event-dm1.parquet"
+    for name in ["b/2.parquet", "a/1.parquet", "a/notes.txt", event]:
+        (base / name).write_bytes(b"")
+
+    assert find_replay_files(base) == [base / "a/1.parquet", base / "b/2.parquet"]
+    assert find_replay_files(base / "b/2.parquet") == [base / "b/2.parquet"]
+    assert find_replay_files(base / event) == [base / event]
@@ -0,0 +1,98 @@
+"""Tests for the background scheduler and its resource budget."""
+
+import threading
+import time
+
+from src.scheduler import (
+    PRIORITY_ESSENTIAL,
+    PRIORITY_MAINTENANCE,
+    PRIORITY_UPLOAD,
+    BackgroundScheduler,
+    ResourceBudget,
+)
+
+
+def _write_stat(path, busy, idle):
+    path.write_text(f"cpu  {busy} 0 0 {idle} 0 0 0 0 0 0\ncpu0 {busy} 0 0 {idle} 0 0 0 0 0 0\n")
+
+
+def test_budget_tiers_by_cpu_temperature_and_capture(tmp_path):
+    """Test heavy work waits on CPU load, heat (maintenance first) and capture backlog."""
+    stat = tmp_path / "stat"
+    readings = {"temp": 50.0, "backlog": 0.0}
+    budget = ResourceBudget(
+        cpu_temp=lambda: readings["temp"],
+        capture_backlog=lambda: readings["backlog"],
+        max_cpu_pct=80,
+        stat_path=str(stat),
+    )
+    _write_stat(stat, 100, 900)
+    budget.sample()
+    _write_stat(stat, 190, 910)  # 90 of 100 jiffies busy
+    budget.sample()
+    assert budget.get_stats()["cpu_pct"] == 90.0
+    assert budget.reason_to_wait(PRIORITY_UPLOAD) == "cpu"
+    assert budget.reason_to_wait(PRIORITY_ESSENTIAL) is None
+
+    _write_stat(stat, 200, 1000)  # 10 % busy
+    readings["temp"] = 77.0
+    budget.sample()
+    assert budget.reason_to_wait(PRIORITY_UPLOAD) is None
+    assert budget.reason_to_wait(PRIORITY_MAINTENANCE) == "thermal"
+    readings["temp"] = 81.0
+    budget.sample()
+    assert budget.reason_to_wait(PRIORITY_UPLOAD) == "thermal"
+
+    readings.update(temp=50.0, backlog=0.8)
+    budget.sample()
+    assert budget.reason_to_wait(PRIORITY_UPLOAD) == "capture"
+
+
+def test_scheduler_defers_heavy_tasks_off_the_essential_lane():
+    """Test essential tasks run while uploads wait for capture, then uploads run on the lane."""
+    backlog = {"value": 0.9}
+    budget = ResourceBudget(capture_backlog=lambda: backlog["value"], stat_path="/nonexistent")
+    budget.max_cpu_pct = 1000  # ignore the host's load average
+    scheduler = BackgroundScheduler(budget, nice=0)
+    calls = []
+
+    def failing():
+        calls.append("health")
+        raise RuntimeError("boom")
+
+    scheduler.add("health", 0, failing)
+    scheduler.add("retry", 0, lambda: calls.append("retry"), PRIORITY_UPLOAD)
+    scheduler.run_due()
+    scheduler.run_due()
+    assert calls == ["health", "health"]
+    stats = scheduler.get_stats()["tasks"]
+    assert stats["health"] == {"runs": 2, "deferrals": 0, "errors": 2}
+    assert stats["retry"]["deferrals"] == 2
+
+    backlog["value"] = 0.0
+    scheduler.run_due()
+    scheduler._lane.join(timeout=5)
+    assert calls.count("retry") == 1
+
+    # Held back longer than max_defer_sec: runs anyway
+    backlog["value"] = 0.9
+    scheduler.max_defer_sec = 0.05
+    scheduler.run_due()
+    time.sleep(0.06)
+    scheduler.run_due()
+    scheduler._lane.join(timeout=5)
+    assert calls.count("retry") == 2
+    scheduler.stop()
+
+
+def test_budget_wait_ends_at_deadline():
+    """Test wait_for returns the holding reason once its deadline has passed."""
+    budget = ResourceBudget(capture_backlog=lambda: 0.9, stat_path="/nonexistent")
+    budget.sample()
+    stop = threading.Event()
+
+    started = time.monotonic()
+    reason = budget.wait_for(PRIORITY_UPLOAD, stop, deadline=started + 0.1, poll_sec=0.02)
+    assert reason == "capture"
+    assert 0.1 <= time.monotonic() - started < 1.0
+    assert budget.wait_for(PRIORITY_ESSENTIAL, stop, deadline=started) is None
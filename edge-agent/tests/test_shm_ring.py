@@ -0,0 +1,92 @@
+"""Tests for the shared-memory frame ring and process supervision."""
+
+import sys
+import time
+
+import pytest
+
+from conftest import BASE, make_block
+from src.can_reader import CANFrame, CANFrameBlock
+from src.shm_ring import SharedFrameRing, SharedRingReader
+from src.supervisor import ProcessSupervisor
+
+
+def _block(n, start=0, channel="can0"):
+    rows = [
+        (i * 0.001, 0x100 + i, bytes([i % 256]) * (8 if i % 2 else 3))
+        for i in range(start, start + n)
+    ]
+    return make_block(rows, channel, max_dlen=64)
+
+
+@pytest.fixture
+def ring():
+    ring = SharedFrameRing.create(slots=4, block_frames=16)
+    yield ring
+    ring.close()
+    ring.unlink()
+
+
+def test_ring_round_trip_and_overflow(ring):
+    """Test blocks come back column for column and a full ring counts drops."""
+    mixed = CANFrameBlock(2, channel="can0")
+    mixed.append_frame(CANFrame(BASE, 0x1, 1, b"\x01", channel="can0"))
+    mixed.append_frame(CANFrame(BASE + 1, 0x2, 2, b"\x02\x03", channel="can1"))
+    blocks = [_block(16), _block(5, start=16, channel="can1"), mixed]
+    for block in blocks:
+        assert ring.put(block)
+    assert ring.put(_block(1))
+    assert not ring.put(_block(7))
+
+    stats = ring.get_stats()
+    assert stats["depth"] == 4
+    assert stats["dropped_blocks"] == 1 and stats["dropped_frames"] == 7
+
+    for expected in blocks:
+        got = ring.get()
+        assert list(got.frames()) == list(expected.frames())
+    assert ring.get().count == 1
+    assert ring.get() is None
+    # Slots are reused once consumed
+    assert ring.put(_block(3)) and ring.get().count == 3
+
+    with pytest.raises(ValueError):
+        ring.put(_block(17))
+
+
+def test_attached_consumer_resumes_and_reader_drains(ring):
+    """Test a re-attached consumer starts at the first unconsumed block."""
+    for i in range(3):
+        ring.put(_block(4, start=4 * i, channel=f"can{i}"))
+    assert ring.get().channel == "can0"
+
+    consumer = SharedFrameRing.attach(ring.name, "consumer")
+    reader = SharedRingReader(consumer)
+    reader.stop()
+    blocks = list(reader.read_batches())
+    assert [b.channel for b in blocks] == ["can1", "can2"]
+    assert reader.get_stats()["writer_starts"] == 1
+    consumer.close()
+
+
+def _exit_with(code, log_queue):
+    sys.exit(code)
+
+
+def test_supervisor_restarts_failed_child_and_reports_finished():
+    """Test a failing child is restarted and a clean exit ends a one-shot child."""
+    supervisor = ProcessSupervisor()
+    supervisor.add("once", _exit_with, (0,), restart_on_success=False)
+    supervisor.add("crashy", _exit_with, (3,))
+    supervisor.start()
+    try:
+        finished = []
+        deadline = time.monotonic() + 10
+        while supervisor.get_stats()["crashy"]["restarts"] < 1 and time.monotonic() < deadline:
+            finished += supervisor.poll()
+            time.sleep(0.05)
+        assert finished == ["once"]
+        assert supervisor.get_stats()["crashy"]["restarts"] == 1
+    finally:
+        supervisor.stop("crashy", timeout=5)
+        supervisor.close()
@@ -1,5 +1,6 @@
 """Tests for S3 uploader with mocked S3."""
 
+import os
 import tempfile
 from pathlib import Path
 
@@ -130,6 +131,26 @@ def test_uploader_s3_key_generation(s3_bucket, temp_dirs):
     assert s3_key == "raw/vehicle_id=VIN123/year=2025/month=02/day=12/test.parquet"
 
 
+@mock_aws
+def test_uploader_keys_event_captures_under_events_prefix(s3_bucket, temp_dirs):
+    """Test event captures are keyed outside the raw prefix, also from pending."""
+    uploader = S3Uploader(
+        bucket=s3_bucket,
+        region='us-east-1',
+        prefix='raw',
+        archive_dir=temp_dirs['archive'],
+        pending_dir=temp_dirs['pending'],
+    )
+
+    name = "20250212T101500.000000000Z_event-dm1.parquet"
+    test_path = Path(f"./data/events/vehicle_id=VIN123/year=2025/month=02/day=12/{name}")
+
+    assert uploader._get_s3_key(test_path) == (
+        f"events/vehicle_id=VIN123/year=2025/month=02/day=12/{name}"
+    )
+    assert uploader._get_s3_key(Path(temp_dirs['pending']) / name) == f"events/{name}"
+
+
 @mock_aws
 def test_uploader_nonexistent_file(s3_bucket, temp_dirs):
     """Test upload of nonexistent file."""
@@ -170,6 +191,32 @@ def test_uploader_retry_pending(s3_bucket, temp_dirs, sample_parquet_file):
     assert (Path(temp_dirs['archive']) / pending_file.name).exists()
 
 
+def test_uploader_retry_pending_sends_events_first(s3_bucket, temp_dirs, sample_parquet_file):
+    """Test event captures in pending are retried before older routine batches."""
+    uploader = S3Uploader(
+        bucket=s3_bucket,
+        region='us-east-1',
+        prefix='raw',
+        archive_dir=temp_dirs['archive'],
+        pending_dir=temp_dirs['pending'],
+    )
+    pending = Path(temp_dirs['pending'])
+    names = [
+        "20240101T000000Z_raw.parquet",
+        "20240101T000100Z_raw.parquet",
+        "20240101T000030Z_event-dm1.parquet",
+    ]
+    for i, name in enumerate(names):
+        path = pending / name
+        path.write_bytes(sample_parquet_file.read_bytes())
+        os.utime(path, (1_700_000_000 + i, 1_700_000_000 + i))
+
+    order = []
+    uploader._upload_with_retry = lambda path, key: order.append(path.name) or True
+    assert uploader.retry_pending() == (3, 0)
+    assert order == [names[2], names[0], names[1]]
+
+
 def test_uploader_exponential_backoff(s3_bucket, temp_dirs):
     """Test exponential backoff calculation."""
     uploader = S3Uploader(
@@ -0,0 +1,123 @@
+"""Tests for the frame write-ahead log and crash recovery."""
+
+import mmap
+import struct
+from array import array
+
+import pyarrow.parquet as pq
+import pytest
+
+from conftest import BASE, make_block
+from src.batcher import CANFrameBatcher
+from src.can_reader import CANFrame, CANFrameBlock
+from src.wal import FrameWAL, read_segment, recover_segments
+
+
+def _block(n, start=0, channel="can0", dlen=8):
+    rows = [(i * 0.001, 0x100 + i % 50, bytes([i % 256]) * dlen) for i in range(start, start + n)]
+    return make_block(rows, channel, max_dlen=64)
+
+
+def test_wal_round_trip_rollover_and_widening(tmp_path):
+    """Test records come back in order across segments, channels and widths."""
+    wal = FrameWAL(str(tmp_path), segment_mb=0.01, sync_interval_ms=0)
+    mixed = CANFrameBlock(2, channel="can0")
+    mixed.append_frame(CANFrame(BASE + 1, 0x1, 1, b"\x01", channel="can0"))
+    mixed.append_frame(CANFrame(BASE + 2, 0x2, 2, b"\x02\x03", channel="can1"))
+    expected = [_block(600), mixed, _block(3, start=600, dlen=64)]
+    for block in expected:
+        wal.append_block(block)
+    wal.append_frame(CANFrame(BASE + 3, 0x3, 3, b"abc", channel="can2"))
+    wal.close()
+
+    segments = sorted(tmp_path.glob("wal-*.seg"))
+    assert len(segments) > 2
+    frames = [f for path in segments for b in read_segment(path) for f in b.frames()]
+    want = [f for b in expected for f in b.frames()]
+    want.append(CANFrame(BASE + 3, 0x3, 3, b"abc", channel="can2"))
+    assert [(f.arb_id, f.dlc, f.data, f.channel) for f in frames] == [
+        (f.arb_id, f.dlc, f.data, f.channel) for f in want
+    ]
+    assert [round(f.timestamp, 6) for f in frames] == [round(f.timestamp, 6) for f in want]
+
+    with pytest.raises(ValueError):
+        FrameWAL(str(tmp_path / "x")).append_frame(CANFrame(BASE, 0x1, 15, bytes(65)))
+
+
+def test_flush_commits_and_crash_is_recovered(tmp_path):
+    """Test written batches drop their segments and a crashed window is recovered."""
+    out = tmp_path / "raw"
+    wal_dir = tmp_path / "raw" / "_wal"
+    batcher = CANFrameBatcher("V1", window_sec=3600, output_dir=str(out))
+    batcher.wal = FrameWAL(str(wal_dir))
+    batcher.add_block(_block(100))
+    assert batcher.flush() is not None
+    assert not list(wal_dir.glob("*.seg"))
+
+    batcher.add_block(_block(250, start=100))
+    batcher.add_frame(CANFrame(BASE + 1, 0x7FF, 2, b"\x01\x02", channel="can1"))
+    batcher.wal.close()  # crash: the window is never flushed
+
+    recovered = CANFrameBatcher("V1", window_sec=3600, output_dir=str(out))
+    written = recover_segments(str(wal_dir), recovered)
+    assert len(written) == 1
+    table = pq.read_table(written[0])
+    assert table.num_rows == 251
+    assert table.column("channel").to_pylist()[-1] == "can1"
+    assert not list(wal_dir.glob("*.seg"))
+    assert recover_segments(str(wal_dir), recovered) == []
+
+
+def test_unreadable_segment_is_set_aside(tmp_path):
+    """Test a segment with a bad header is renamed instead of blocking startup."""
+    (tmp_path / "wal-00000001.seg").write_bytes(b"garbage" * 1000)
+    wal = FrameWAL(str(tmp_path))
+    wal.append_block(_block(10))
+    wal.close()
+
+    batcher = CANFrameBatcher("V1", output_dir=str(tmp_path / "raw"))
+    written = recover_segments(str(tmp_path), batcher)
+    assert len(written) == 1 and pq.read_table(written[0]).num_rows == 10
+    assert [p.name for p in tmp_path.glob("wal-*")] == ["wal-00000001.bad"]
+
+
+def test_suppressed_counts_survive_recovery(tmp_path):
+    """Test change-only suppressed counts are logged and restored after a crash."""
+    wal_dir = tmp_path / "_wal"
+    block = _block(5)
+    block.suppressed = array("I", [0, 3, 0, 250, 70000])
+    batcher = CANFrameBatcher("V1", window_sec=3600, output_dir=str(tmp_path / "raw"))
+    batcher.wal = FrameWAL(str(wal_dir))
+    batcher.add_block(block)
+    batcher.add_block(_block(2, start=5))
+    batcher.wal.close()
+
+    (segment,) = wal_dir.glob("wal-*.seg")
+    assert [list(b.suppressed) for b in read_segment(segment, block_frames=4)] == [
+        [0, 3, 0, 250],
+        [70000, 0, 0],
+    ]
+    recovered = CANFrameBatcher("V1", window_sec=3600, output_dir=str(tmp_path / "raw"))
+    (written,) = recover_segments(str(wal_dir), recovered)
+    assert pq.read_table(written).column("suppressed").to_pylist() == [0, 3, 0, 250, 70000, 0, 0]
+
+
+def test_first_layout_segments_are_still_read(tmp_path):
+    """Test a CANWAL01 segment (no suppressed count) is recovered with zero counts."""
+    header = struct.Struct("=8sIIqI")  # magic, record size, width, created, channels
+    record = struct.Struct("=qIBBBB8s")
+    path = tmp_path / "wal-00000001.seg"
+    path.write_bytes(bytes(mmap.PAGESIZE + 4 * 32))
+    with open(path, "r+b") as f, mmap.mmap(f.fileno(), 0) as mm:
+        header.pack_into(mm, 0, b"CANWAL01", 32, 8, 0, 1)
+        mm[64:68] = b"can0"
+        for i in range(3):
+            record.pack_into(
+                mm, mmap.PAGESIZE + i * 32, int((BASE + i) * 1e9), 0x100 + i, 1, 0, 1, 1, bytes([i])
+            )
+
+    (block,) = read_segment(path)
+    assert [(f.arb_id, f.data, f.channel) for f in block.frames()] == [
+        (0x100, b"\x00", "can0"), (0x101, b"\x01", "can0"), (0x102, b"\x02", "can0")
+    ]
+    assert block.suppressed is None
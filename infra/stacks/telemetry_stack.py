@@ -234,7 +234,8 @@ class TelemetryStack(Stack):
             layers=[self.decoder_layer],
         )
 
-        # S3 trigger for decoder
+        # S3 trigger for decoder (event captures under events/ repeat frames
+        # already in raw/, so they are neither decoded nor crawled)
         self.data_bucket.add_event_notification(
             s3.EventType.OBJECT_CREATED,
             s3n.LambdaDestination(self.decoder_lambda),
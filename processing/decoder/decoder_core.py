@@ -13,6 +13,11 @@ def decode_raw_table(table: pa.Table, dbc: cantools.database.Database) -> pa.Tab
     """
     Decode raw CAN frames to signal values.
 
+    Raw files written in change-only mode carry a ``suppressed`` column (the
+    number of identical frames the edge agent dropped before each kept frame);
+    it is passed through to every decoded signal row so queries can rebuild
+    step signals.  Older files without the column decode with 0.
+
     Args:
         table: PyArrow table with raw CAN frames
         dbc: Loaded cantools database
@@ -25,14 +30,18 @@ def decode_raw_table(table: pa.Table, dbc: cantools.database.Database) -> pa.Tab
     arb_ids = table.column("arb_id").to_pylist()
     data_bytes_list = table.column("data").to_pylist()
     vehicle_ids = table.column("vehicle_id").to_pylist()
+    if "suppressed" in table.column_names:
+        suppressed_list = table.column("suppressed").to_pylist()
+    else:
+        suppressed_list = [0] * len(table)
 
     # Decode each frame
     decoded_rows: list[dict[str, Any]] = []
     decode_errors = 0
     unknown_ids = set()
 
-    for i, (timestamp, arb_id, data_bytes, vehicle_id) in enumerate(
-        zip(timestamps, arb_ids, data_bytes_list, vehicle_ids)
+    for i, (timestamp, arb_id, data_bytes, vehicle_id, suppressed) in enumerate(
+        zip(timestamps, arb_ids, data_bytes_list, vehicle_ids, suppressed_list)
     ):
         try:
             # Find message by arbitration ID
@@ -61,6 +70,7 @@ def decode_raw_table(table: pa.Table, dbc: cantools.database.Database) -> pa.Tab
                         "signal_name": signal_name,
                         "value": float(value),
                         "unit": signal.unit if signal.unit else "",
+                        "suppressed": suppressed,
                     })
 
             except Exception as e:
@@ -93,6 +103,7 @@ def decode_raw_table(table: pa.Table, dbc: cantools.database.Database) -> pa.Tab
             "signal_name": pa.array([], type=pa.string()),
             "value": pa.array([], type=pa.float64()),
             "unit": pa.array([], type=pa.string()),
+            "suppressed": pa.array([], type=pa.uint32()),
         })
 
     # Convert to PyArrow table
@@ -103,6 +114,7 @@ def decode_raw_table(table: pa.Table, dbc: cantools.database.Database) -> pa.Tab
         "signal_name": pa.array([r["signal_name"] for r in decoded_rows], type=pa.string()),
         "value": pa.array([r["value"] for r in decoded_rows], type=pa.float64()),
         "unit": pa.array([r["unit"] for r in decoded_rows], type=pa.string()),
+        "suppressed": pa.array([r["suppressed"] for r in decoded_rows], type=pa.uint32()),
     })
 
     return decoded_table
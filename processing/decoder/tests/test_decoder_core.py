@@ -108,3 +108,23 @@ def test_decode_unknown_arb_id(sample_dbc):
 
     # Should return empty table (unknown ID skipped)
     assert len(decoded) == 0
+
+
+def test_decode_passes_through_suppressed(sample_dbc):
+    """Test the change-only suppressed count is carried to every signal row."""
+    message = sample_dbc.get_message_by_name("TestMessage")
+    data = bytes(message.encode({"TestSignal": 25.0, "TestSignal2": 500}))
+    columns = {
+        "timestamp": pa.array([1_000_000_000, 2_000_000_000], type=pa.timestamp("ns")),
+        "arb_id": pa.array([message.frame_id] * 2, type=pa.uint32()),
+        "dlc": pa.array([message.length] * 2, type=pa.uint8()),
+        "data": pa.array([data] * 2, type=pa.binary()),
+        "vehicle_id": pa.array(["TEST01"] * 2, type=pa.string()),
+    }
+
+    decoded = decode_raw_table(pa.table(columns), sample_dbc)
+    assert decoded.column("suppressed").to_pylist() == [0, 0, 0, 0]
+
+    columns["suppressed"] = pa.array([0, 99], type=pa.uint32())
+    decoded = decode_raw_table(pa.table(columns), sample_dbc)
+    assert decoded.column("suppressed").to_pylist() == [0, 0, 99, 99]